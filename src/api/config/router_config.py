@@ -20,6 +20,7 @@ from src.api.routers import (
     reports,
     auth,
     system,
+    stream,
 )
 from src.api.utils.security import get_current_user
 
@@ -100,6 +101,13 @@ def get_router_configs() -> List[Dict[str, Any]]:
             "tags": ["⚙️ 系統管理"],
             "dependencies": [Depends(get_current_user)],
         },
+        {
+            "router": stream.router,
+            "prefix": "/api/v1/stream",
+            "tags": ["📶 即時推送"],
+            # WebSocket 不支援 HTTPBearer 依賴，認證在各端點內處理
+            "dependencies": [],
+        },
     ]
 
 
@@ -9,6 +9,9 @@ from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from fastapi import FastAPI
 
+from src.api.utils.event_gateway import event_gateway
+from src.api.utils.offload import service_executor
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,6 +52,9 @@ class LifespanManager:
             # 初始化定時任務調度器
             await self._initialize_scheduler()
 
+            # 推送閘道訂閱事件總線
+            event_gateway.start()
+
             logger.info("應用啟動初始化完成")
 
         except Exception as e:
@@ -61,14 +67,19 @@ class LifespanManager:
         """應用關閉清理
 
         執行所有必要的清理任務，包括：
+        - 停止推送閘道
         - 關閉資料庫連接
         - 清理快取系統
         - 停止監控系統
         - 停止定時任務調度器
+        - 關閉同步服務呼叫的執行池
         """
         logger.info("開始應用關閉清理...")
 
         try:
+            # 停止推送閘道，關閉所有推送連線
+            event_gateway.stop()
+
             # 停止定時任務調度器
             if self.scheduler_initialized:
                 await self._cleanup_scheduler()
@@ -85,6 +96,9 @@ class LifespanManager:
             if self.database_initialized:
                 await self._cleanup_database()
 
+            # 關閉同步服務呼叫的執行池，等待執行中的呼叫完成
+            service_executor.shutdown(wait=True)
+
             logger.info("應用關閉清理完成")
 
         except Exception as e:
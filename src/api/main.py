@@ -32,8 +32,9 @@ from src.api.config.router_config import register_routers
 from src.api.core.lifespan import lifespan
 from src.api.middleware.auth import AuthMiddleware
 from src.api.middleware.rate_limit import RateLimitMiddleware
-from src.api.middleware.logging import LoggingMiddleware
+from src.api.middleware.logging import LoggingMiddleware, metrics_response
 from src.api.utils.exceptions import setup_exception_handlers
+from src.api.utils.json_response import FastJSONResponse
 from src.api.models.responses import APIResponse, ErrorResponse
 
 # 設定日誌
@@ -62,6 +63,7 @@ def create_app() -> FastAPI:
         redoc_url=app_settings["redoc_url"],
         openapi_url=app_settings["openapi_url"],
         lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
 
     # 配置中間件
@@ -152,6 +154,11 @@ def _add_basic_routes(application: FastAPI) -> None:
                 detail="系統健康檢查失敗",
             ) from e
 
+    @application.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus 指標抓取端點"""
+        return metrics_response()
+
     @application.get("/api/info", response_model=APIResponse)
     async def api_info():
         """API 資訊"""
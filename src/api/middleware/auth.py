@@ -13,6 +13,10 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 import logging
 import os
+import threading
+import time
+
+from .auth_cache import BloomFilter, VerifiedTokenCache
 
 logger = logging.getLogger(__name__)
 
@@ -34,18 +38,35 @@ if (
     )
     raise ValueError("生產環境必須設定安全的 JWT_SECRET_KEY")
 
+# 已驗證 Token 快取，由中間件與 verify_token 依賴共用
+verified_token_cache = VerifiedTokenCache()
+
 
 class AuthMiddleware(BaseHTTPMiddleware):
-    """認證中間件"""
+    """認證中間件
+
+    驗證通過的 Token 載荷保存在 ``VerifiedTokenCache`` 中，同一 Token 的後續請求只需
+    一次雜湊與字典查詢，不再重新解碼與驗證簽名。
+    """
 
-    def __init__(self, app):
+    def __init__(self, app, token_cache: Optional[VerifiedTokenCache] = None):
+        """初始化認證中間件
+
+        Args:
+            app: ASGI 應用
+            token_cache: 已驗證 Token 快取，預設使用模組共用的快取
+        """
         super().__init__(app)
         self.security = HTTPBearer()
+        self.token_cache = (
+            token_cache if token_cache is not None else verified_token_cache
+        )
 
         # 不需要認證的路徑
         self.public_paths = {
             "/",
             "/health",
+            "/metrics",
             "/docs",
             "/redoc",
             "/openapi.json",
@@ -82,24 +103,29 @@ class AuthMiddleware(BaseHTTPMiddleware):
         if TokenBlacklist.is_blacklisted(token):
             return self._unauthorized_response("Token 已失效")
 
-        # 驗證 Token
-        try:
-            logger.debug("驗證 Token: %s...", token[:20])
-            payload = self._verify_token(token)
-            logger.debug("Token 驗證成功，用戶: %s", payload.get("username"))
-
-            # 將用戶資訊添加到請求狀態
-            request.state.user = payload
-            request.state.user_id = payload.get("user_id")
-            request.state.username = payload.get("username")
-            request.state.role = payload.get("role")
-
-        except HTTPException as e:
-            logger.warning("Token 驗證失敗 (HTTPException): %s", e.detail)
-            return self._unauthorized_response(e.detail)
-        except Exception as e:
-            logger.error("Token 驗證錯誤: %s", e)
-            return self._unauthorized_response("Token 驗證失敗")
+        # 驗證 Token，快取命中時略過解碼與簽名驗證
+        payload = self.token_cache.get(token)
+        if payload is None:
+            try:
+                payload = self._verify_token(token)
+                logger.debug("Token 驗證成功，用戶: %s", payload.get("username"))
+            except HTTPException as e:
+                logger.warning("Token 驗證失敗 (HTTPException): %s", e.detail)
+                return self._unauthorized_response(e.detail)
+            except Exception as e:
+                logger.error("Token 驗證錯誤: %s", e)
+                return self._unauthorized_response("Token 驗證失敗")
+            self.token_cache.put(token, payload)
+
+        # 將用戶資訊添加到請求狀態
+        role = payload.get("role")
+        request.state.user = payload
+        request.state.user_id = payload.get("user_id")
+        request.state.username = payload.get("username")
+        request.state.role = role
+        request.state.permissions = PermissionChecker.role_mask(role)
+
+        SessionManager.update_activity(token)
 
         # 繼續處理請求
         response = await call_next(request)
@@ -268,11 +294,37 @@ class PermissionChecker:
         "readonly": ["monitoring", "reports"],
     }
 
+    # 由 compile_permissions() 預先編譯的權限位元與角色權限位元集
+    PERMISSION_BITS: Dict[str, int] = {}
+    ROLE_MASKS: Dict[str, int] = {}
+
+    @classmethod
+    def compile_permissions(cls) -> None:
+        """將角色權限映射編譯為位元集
+
+        修改 ``ROLE_PERMISSIONS`` 後需要重新呼叫。
+        """
+        bits: Dict[str, int] = {}
+        masks: Dict[str, int] = {}
+        for role, permissions in cls.ROLE_PERMISSIONS.items():
+            mask = 0
+            for permission in permissions:
+                bit = bits.setdefault(permission, 1 << len(bits))
+                mask |= bit
+            masks[role] = mask
+        cls.PERMISSION_BITS = bits
+        cls.ROLE_MASKS = masks
+
+    @classmethod
+    def role_mask(cls, role: Optional[str]) -> int:
+        """取得角色的權限位元集，未知角色返回 0"""
+        return cls.ROLE_MASKS.get(role, 0)
+
     @classmethod
     def has_permission(cls, role: str, permission: str) -> bool:
         """檢查角色是否有指定權限"""
-        role_permissions = cls.ROLE_PERMISSIONS.get(role, [])
-        return permission in role_permissions
+        bit = cls.PERMISSION_BITS.get(permission, 0)
+        return bool(cls.ROLE_MASKS.get(role, 0) & bit)
 
     @classmethod
     def require_permission(cls, permission: str):
@@ -322,20 +374,32 @@ class PermissionChecker:
         return decorator
 
 
+PermissionChecker.compile_permissions()
+
+
 # Token 黑名單管理（簡化版本，實際應該使用 Redis）
 class TokenBlacklist:
-    """Token 黑名單管理"""
+    """Token 黑名單管理
+
+    查詢先經過布隆過濾器，未被撤銷的 Token 不需要查詢黑名單集合。布隆過濾器不支援
+    刪除，移除的 Token 仍可能通過過濾器，再由集合給出精確結果。
+    """
 
     _blacklist = set()
+    _bloom = BloomFilter()
 
     @classmethod
     def add_token(cls, token: str):
         """添加 Token 到黑名單"""
         cls._blacklist.add(token)
+        cls._bloom.add(token)
+        verified_token_cache.invalidate(token)
 
     @classmethod
     def is_blacklisted(cls, token: str) -> bool:
         """檢查 Token 是否在黑名單中"""
+        if token not in cls._bloom:
+            return False
         return token in cls._blacklist
 
     @classmethod
@@ -346,16 +410,45 @@ class TokenBlacklist:
     @classmethod
     def clear_expired_tokens(cls):
         """清理過期的 Token（定期任務）"""
-        # 實際實現中應該檢查 Token 的過期時間
-        # 這裡簡化處理
-        logger.info("清理過期 Token 任務執行（簡化版本）")
+        now = time.time()
+        expired = set()
+        for token in cls._blacklist:
+            try:
+                payload = jwt.decode(
+                    token,
+                    options={"verify_signature": False, "verify_exp": False},
+                )
+            except jwt.InvalidTokenError:
+                continue
+            exp = payload.get("exp")
+            if exp is not None and exp < now:
+                expired.add(token)
+
+        # 過期 Token 已無法通過驗證，移除後重建過濾器以清除其位元
+        cls._blacklist -= expired
+        bloom = BloomFilter()
+        for token in cls._blacklist:
+            bloom.add(token)
+        cls._bloom = bloom
+        logger.info(
+            "清理過期 Token %d 個，黑名單剩餘 %d 個", len(expired), len(cls._blacklist)
+        )
 
 
 # 用戶會話管理
 class SessionManager:
-    """用戶會話管理"""
+    """用戶會話管理
+
+    活動時間採用延遲寫入：``update_activity`` 只記錄時間戳，每隔
+    ``ACTIVITY_FLUSH_SECONDS`` 或讀取會話前才合併到會話資料，請求路徑上不修改會話。
+    """
 
     _active_sessions = {}  # 實際應該使用 Redis
+    _pending_activity: Dict[str, float] = {}
+    _last_flush = 0.0
+    _flush_lock = threading.Lock()
+
+    ACTIVITY_FLUSH_SECONDS = 5.0
 
     @classmethod
     def create_session(cls, user_id: str, token: str, device_info: Dict[str, Any]):
@@ -372,19 +465,34 @@ class SessionManager:
 
     @classmethod
     def update_activity(cls, token: str):
-        """更新會話活動時間"""
-        if token in cls._active_sessions:
-            cls._active_sessions[token]["last_activity"] = datetime.now()
+        """記錄會話活動時間，延遲寫入會話資料"""
+        now = time.time()
+        cls._pending_activity[token] = now
+        if now - cls._last_flush >= cls.ACTIVITY_FLUSH_SECONDS:
+            cls.flush_activity()
+
+    @classmethod
+    def flush_activity(cls):
+        """將暫存的活動時間寫入會話資料"""
+        with cls._flush_lock:
+            pending, cls._pending_activity = cls._pending_activity, {}
+            cls._last_flush = time.time()
+            for token, timestamp in pending.items():
+                session = cls._active_sessions.get(token)
+                if session is not None:
+                    session["last_activity"] = datetime.fromtimestamp(timestamp)
 
     @classmethod
     def end_session(cls, token: str):
         """結束會話"""
         cls._active_sessions.pop(token, None)
+        cls._pending_activity.pop(token, None)
         TokenBlacklist.add_token(token)
 
     @classmethod
     def get_user_sessions(cls, user_id: str) -> List[Dict[str, Any]]:
         """獲取用戶的所有會話"""
+        cls.flush_activity()
         return [
             session
             for session in cls._active_sessions.values()
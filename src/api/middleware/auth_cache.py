@@ -0,0 +1,172 @@
+"""認證快取
+
+此模組提供認證中間件在熱路徑上使用的快取結構，讓高頻輪詢的端點不必在每個請求
+重新解碼與驗證 JWT：
+
+- ``VerifiedTokenCache``：以 Token 的 SHA-256 雜湊為鍵保存已驗證的載荷，存活時間
+  不超過 Token 的 ``exp``，以 LRU 限制項目數量
+- ``BloomFilter``：黑名單的前置過濾器，絕大多數未被撤銷的 Token 不需要查詢黑名單集合
+
+Example:
+    ```python
+    cache = VerifiedTokenCache(max_size=10_000, max_ttl=300)
+    payload = cache.get(token)
+    if payload is None:
+        payload = verify(token)
+        cache.put(token, payload)
+    ```
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+DEFAULT_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+DEFAULT_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+
+
+def token_digest(token: str) -> bytes:
+    """計算 Token 的 SHA-256 雜湊
+
+    快取只保存雜湊而非原始 Token，避免記憶體中留下可直接重放的憑證。
+
+    Args:
+        token: JWT Token 字串
+
+    Returns:
+        bytes: 32 位元組的雜湊值
+    """
+    return hashlib.sha256(token.encode()).digest()
+
+
+class VerifiedTokenCache:
+    """已驗證 Token 快取
+
+    項目的到期時間取 Token ``exp`` 與 ``max_ttl`` 兩者中較早者，過期的 Token 不會
+    從快取返回；``max_ttl`` 同時限制了密鑰輪換或角色變更後舊載荷被沿用的時間。
+    """
+
+    def __init__(
+        self, max_size: int = DEFAULT_CACHE_SIZE, max_ttl: float = DEFAULT_CACHE_TTL
+    ):
+        """初始化快取
+
+        Args:
+            max_size: 最多保存的 Token 數量
+            max_ttl: 單一項目的最長存活秒數
+        """
+        self.max_size = max(1, max_size)
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """取得已驗證的載荷
+
+        Args:
+            token: JWT Token 字串
+            now: 當前時間戳，預設為 ``time.time()``
+
+        Returns:
+            Optional[Dict[str, Any]]: 未過期的載荷，未命中時返回 None
+        """
+        key = token_digest(token)
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if now >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return payload
+
+    def put(
+        self, token: str, payload: Dict[str, Any], now: Optional[float] = None
+    ) -> None:
+        """保存已驗證的載荷
+
+        Args:
+            token: JWT Token 字串
+            payload: 驗證通過的 Token 載荷
+            now: 當前時間戳，預設為 ``time.time()``
+        """
+        now = time.time() if now is None else now
+        expires_at = now + self.max_ttl
+        exp = payload.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now:
+            return
+
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """移除指定 Token 的快取項目"""
+        key = token_digest(token)
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """清空快取"""
+        with self._lock:
+            self._entries.clear()
+
+
+class BloomFilter:
+    """布隆過濾器
+
+    以雙重雜湊從一次 SHA-256 計算出 ``k`` 個位元位置。查詢結果為 False 時元素必定
+    不在集合中；為 True 時可能是誤判，需要再查詢精確的集合。不支援刪除元素。
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        """初始化過濾器
+
+        Args:
+            capacity: 預期元素數量
+            error_rate: 元素數量達到 ``capacity`` 時的目標誤判率
+        """
+        capacity = max(1, capacity)
+        self.num_bits = max(
+            8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: Union[str, bytes]):
+        if isinstance(item, str):
+            item = item.encode()
+        digest = hashlib.sha256(item).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: Union[str, bytes]) -> None:
+        """加入元素"""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: Union[str, bytes]) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def clear(self) -> None:
+        """清空過濾器"""
+        self._bits = bytearray(len(self._bits))
@@ -2,17 +2,38 @@
 
 此模組實現了 API 請求日誌記錄功能，提供完整的請求追蹤和審計功能。
 包含請求日誌、響應日誌、效能監控、錯誤追蹤等功能。
+
+請求路徑上只做取樣判斷與擷取原始資料，敏感資料遮罩與 JSON 序列化在背景執行緒中
+執行；處理時間寫入固定分桶的 Prometheus 直方圖，不再逐筆寫入日誌。
 """
 
-import time
+import itertools
 import json
-import uuid
+import os
+import queue
+import random
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl
+
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Histogram,
+        generate_latest,
+    )
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
 # 導入敏感資料遮罩功能
 from src.log_system.data_masking import mask_sensitive_data
 
@@ -23,16 +44,164 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 預設取樣率與各路由前綴的取樣率（最長前綴優先），錯誤與慢請求一律記錄
+DEFAULT_SAMPLE_RATE = float(os.getenv("API_LOG_SAMPLE_RATE", "1.0"))
+ROUTE_SAMPLE_RATES: Dict[str, float] = {
+    "/api/v1/monitoring": 0.01,
+    "/api/v1/data": 0.1,
+}
+
+# 請求體最多擷取的位元組數
+MAX_BODY_BYTES = int(os.getenv("API_LOG_MAX_BODY_BYTES", "4096"))
+
+# 慢請求門檻（秒）
+SLOW_REQUEST_SECONDS = 1.0
+VERY_SLOW_REQUEST_SECONDS = 5.0
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+if PROMETHEUS_AVAILABLE:
+    # 使用獨立的 registry，避免重複匯入時在預設 registry 重複註冊
+    API_METRICS_REGISTRY = CollectorRegistry()
+    REQUEST_LATENCY = Histogram(
+        "api_request_duration_seconds",
+        "API 請求處理時間（秒）",
+        ["method", "route", "status_code"],
+        buckets=LATENCY_BUCKETS,
+        registry=API_METRICS_REGISTRY,
+    )
+else:
+    API_METRICS_REGISTRY = None
+    REQUEST_LATENCY = None
+
+# 請求 ID：行程前綴加遞增序號，前綴區分不同 worker 與重啟
+_REQUEST_ID_PREFIX = f"{os.getpid():x}{int(time.time()):x}"
+_request_counter = itertools.count(1)
+
+
+def next_request_id() -> str:
+    """產生請求 ID
+
+    Returns:
+        str: 同一行程內單調遞增的請求 ID
+    """
+    return f"{_REQUEST_ID_PREFIX}-{next(_request_counter):x}"
+
+
+def metrics_response() -> Response:
+    """輸出 Prometheus 抓取格式的 API 指標
+
+    Returns:
+        Response: 文字格式的指標回應，prometheus_client 未安裝時返回 503
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return Response("prometheus_client 套件未安裝", status_code=503)
+    return Response(
+        generate_latest(API_METRICS_REGISTRY), media_type=CONTENT_TYPE_LATEST
+    )
+
+
+class BackgroundLogWriter:
+    """背景日誌寫入器
+
+    請求路徑只把建立日誌內容的函數放入有界佇列，由背景執行緒執行遮罩、序列化與
+    寫入。佇列已滿時丟棄該筆日誌並計數，不阻塞請求。
+    """
+
+    def __init__(self, max_queue_size: int = 10_000):
+        """初始化寫入器
+
+        Args:
+            max_queue_size: 佇列最多保存的日誌筆數
+        """
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def submit(self, level: int, label: str, build: Callable[[], Dict[str, Any]]):
+        """提交一筆日誌
+
+        Args:
+            level: 日誌等級
+            label: 日誌訊息前綴
+            build: 在背景執行緒中建立日誌內容的函數
+        """
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait((level, label, build))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """等待佇列中的日誌全部寫入"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="api-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            level, label, build = self._queue.get()
+            try:
+                logger.log(
+                    level,
+                    "%s: %s",
+                    label,
+                    json.dumps(build(), ensure_ascii=False, default=str),
+                )
+            except Exception as e:
+                logger.error("寫入%s日誌失敗: %s", label, e)
+            finally:
+                self._queue.task_done()
+
+
+# 全域背景日誌寫入器實例
+log_writer = BackgroundLogWriter()
+
 
 class LoggingMiddleware(BaseHTTPMiddleware):
     """日誌中間件"""
 
-    def __init__(self, app):
+    def __init__(
+        self,
+        app,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        route_sample_rates: Optional[Dict[str, float]] = None,
+        max_body_bytes: int = MAX_BODY_BYTES,
+        writer: Optional[BackgroundLogWriter] = None,
+    ):
+        """初始化日誌中間件
+
+        Args:
+            app: ASGI 應用
+            sample_rate: 未設定路由取樣率時的預設取樣率
+            route_sample_rates: 路由前綴與取樣率的映射
+            max_body_bytes: 請求體最多擷取的位元組數，超過時只記錄大小
+            writer: 背景日誌寫入器，預設使用模組共用的寫入器
+        """
         super().__init__(app)
+        self.sample_rate = sample_rate
+        self.max_body_bytes = max_body_bytes
+        self.writer = writer if writer is not None else log_writer
+
+        # 依前綴長度排序，最長前綴優先匹配
+        rates = ROUTE_SAMPLE_RATES if route_sample_rates is None else route_sample_rates
+        self.route_sample_rates = sorted(
+            rates.items(), key=lambda item: len(item[0]), reverse=True
+        )
 
         # 不記錄日誌的路徑
         self.skip_paths = {
             "/health",
+            "/metrics",
             "/docs",
             "/redoc",
             "/openapi.json",
@@ -52,7 +221,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         """處理請求日誌記錄"""
         # 生成請求 ID
-        request_id = str(uuid.uuid4())
+        request_id = next_request_id()
         request.state.request_id = request_id
 
         # 檢查是否需要跳過日誌記錄
@@ -60,20 +229,28 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
 
         # 記錄請求開始時間
-        start_time = time.time()
+        start_time = time.perf_counter()
+        sampled = random.random() < self._sample_rate(request.url.path)
 
         # 記錄請求資訊
-        await self._log_request(request, request_id)
+        if sampled:
+            await self._log_request(request, request_id)
 
         # 處理請求
         try:
             response = await call_next(request)
 
             # 計算處理時間
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start_time
+            self._observe_latency(request, response.status_code, process_time)
 
-            # 記錄響應資訊
-            await self._log_response(request, response, request_id, process_time)
+            # 錯誤與慢請求不受取樣影響
+            if (
+                sampled
+                or response.status_code >= 400
+                or process_time > SLOW_REQUEST_SECONDS
+            ):
+                self._log_response(request, response, request_id, process_time)
 
             # 添加請求 ID 到響應標頭
             response.headers["X-Request-ID"] = request_id
@@ -83,16 +260,40 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
         except Exception as e:
             # 計算處理時間
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start_time
+            self._observe_latency(request, 500, process_time)
 
             # 記錄錯誤
-            await self._log_error(request, e, request_id, process_time)
+            self._log_error(request, e, request_id, process_time)
 
             # 重新拋出異常
             raise
 
+    def _sample_rate(self, path: str) -> float:
+        """取得路徑的取樣率"""
+        for prefix, rate in self.route_sample_rates:
+            if path.startswith(prefix):
+                return rate
+        return self.sample_rate
+
+    def _observe_latency(self, request: Request, status_code: int, seconds: float):
+        """將處理時間寫入直方圖
+
+        以路由模板而非實際路徑作為標籤，避免路徑參數造成標籤數量無限增長。
+        """
+        if REQUEST_LATENCY is None:
+            return
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        REQUEST_LATENCY.labels(request.method, route_path, str(status_code)).observe(
+            seconds
+        )
+
     async def _log_request(self, request: Request, request_id: str):
-        """記錄請求資訊"""
+        """記錄請求資訊
+
+        只擷取原始資料，遮罩與序列化交由背景寫入器執行。
+        """
         try:
             # 獲取請求基本資訊
             request_data = {
@@ -102,7 +303,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 "url": str(request.url),
                 "path": request.url.path,
                 "query_params": dict(request.query_params),
-                "headers": self._mask_sensitive_data(dict(request.headers)),
+                "headers": dict(request.headers),
                 "client_ip": self._get_client_ip(request),
                 "user_agent": request.headers.get("user-agent", ""),
                 "content_type": request.headers.get("content-type", ""),
@@ -116,18 +317,25 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 request_data["user_role"] = getattr(request.state, "role", "")
 
             # 記錄請求體（僅對特定方法和內容類型）
-            if request.method in ["POST", "PUT", "PATCH"]:
-                request_data["body"] = await self._get_request_body(request)
+            has_body = request.method in ["POST", "PUT", "PATCH"]
+            raw_body = await self._get_request_body(request) if has_body else None
 
-            # 記錄日誌
-            logger.info(
-                "API請求: %s", json.dumps(request_data, ensure_ascii=False, default=str)
-            )
+            def build() -> Dict[str, Any]:
+                request_data["headers"] = self._mask_sensitive_data(
+                    request_data["headers"]
+                )
+                if has_body:
+                    request_data["body"] = self._parse_request_body(
+                        raw_body, request_data["content_type"]
+                    )
+                return request_data
+
+            self.writer.submit(logging.INFO, "API請求", build)
 
         except Exception as e:
             logger.error("記錄請求日誌失敗: %s", e)
 
-    async def _log_response(
+    def _log_response(
         self, request: Request, response: Response, request_id: str, process_time: float
     ):
         """記錄響應資訊"""
@@ -137,39 +345,38 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 "timestamp": datetime.now().isoformat(),
                 "status_code": response.status_code,
                 "process_time": round(process_time, 4),
-                "response_headers": self._mask_sensitive_data(dict(response.headers)),
+                "response_headers": dict(response.headers),
                 "content_type": response.headers.get("content-type", ""),
                 "content_length": response.headers.get("content-length", 0),
             }
 
             # 記錄響應體（僅對錯誤響應或特定狀態碼）
             if response.status_code >= 400:
-                response_data["response_body"] = await self._get_response_body(response)
+                response_data["response_body"] = {"note": "響應體內容省略"}
 
             # 根據狀態碼選擇日誌等級
             if response.status_code >= 500:
-                logger.error(
-                    "API響應: %s",
-                    json.dumps(response_data, ensure_ascii=False, default=str),
-                )
+                level = logging.ERROR
             elif response.status_code >= 400:
-                logger.warning(
-                    "API響應: %s",
-                    json.dumps(response_data, ensure_ascii=False, default=str),
-                )
+                level = logging.WARNING
             else:
-                logger.info(
-                    "API響應: %s",
-                    json.dumps(response_data, ensure_ascii=False, default=str),
+                level = logging.INFO
+
+            def build() -> Dict[str, Any]:
+                response_data["response_headers"] = self._mask_sensitive_data(
+                    response_data["response_headers"]
                 )
+                return response_data
+
+            self.writer.submit(level, "API響應", build)
 
-            # 記錄效能指標
-            self._log_performance_metrics(request, response, process_time)
+            # 記錄慢請求
+            self._log_slow_request(request, response, process_time)
 
         except Exception as e:
             logger.error("記錄響應日誌失敗: %s", e)
 
-    async def _log_error(
+    def _log_error(
         self, request: Request, error: Exception, request_id: str, process_time: float
     ):
         """記錄錯誤資訊"""
@@ -191,9 +398,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 error_data["user_id"] = request.state.user_id
                 error_data["username"] = getattr(request.state, "username", "")
 
-            logger.error(
-                "API錯誤: %s", json.dumps(error_data, ensure_ascii=False, default=str)
-            )
+            self.writer.submit(logging.ERROR, "API錯誤", lambda: error_data)
 
         except Exception as e:
             logger.error("記錄錯誤日誌失敗: %s", e)
@@ -211,53 +416,63 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
         return request.client.host if request.client else "unknown"
 
-    async def _get_request_body(self, request: Request) -> Optional[Dict[str, Any]]:
-        """獲取請求體"""
+    async def _get_request_body(self, request: Request) -> Optional[bytes]:
+        """讀取不超過擷取上限的原始請求體
+
+        沒有 Content-Length 或超過上限的請求體不讀取，避免大型上傳被整個讀入記憶體。
+
+        Returns:
+            Optional[bytes]: 原始請求體，未讀取時返回 None
+        """
+        content_type = request.headers.get("content-type", "")
+        if "application/json" not in content_type and (
+            "application/x-www-form-urlencoded" not in content_type
+        ):
+            return None
+
         try:
-            content_type = request.headers.get("content-type", "")
+            content_length = int(request.headers.get("content-length", ""))
+        except ValueError:
+            return None
+        if content_length > self.max_body_bytes:
+            return None
 
-            if "application/json" in content_type:
-                # 讀取 JSON 請求體
-                body = await request.body()
-                if body:
-                    json_data = json.loads(body.decode())
-                    return self._mask_sensitive_data(json_data)
-
-            elif "application/x-www-form-urlencoded" in content_type:
-                # 讀取表單資料
-                form_data = await request.form()
-                return self._mask_sensitive_data(dict(form_data))
-
-            elif "multipart/form-data" in content_type:
+        try:
+            return await request.body()
+        except Exception as e:
+            logger.warning("讀取請求體失敗: %s", e)
+            return None
+
+    def _parse_request_body(
+        self, body: Optional[bytes], content_type: str
+    ) -> Optional[Dict[str, Any]]:
+        """解析並遮罩請求體（在背景寫入器中執行）"""
+        try:
+            if "multipart/form-data" in content_type:
                 # 處理檔案上傳
                 return {
                     "content_type": "multipart/form-data",
                     "note": "檔案上傳內容已省略",
                 }
 
-            else:
-                return {"content_type": content_type, "note": "非 JSON 內容已省略"}
+            if body is None:
+                return {
+                    "content_type": content_type,
+                    "note": f"請求體超過 {self.max_body_bytes} 位元組或非 JSON 內容，已省略",
+                }
 
-        except Exception as e:
-            logger.warning("讀取請求體失敗: %s", e)
-            return {"error": "無法讀取請求體"}
+            if not body:
+                return None
 
-    async def _get_response_body(self, response: Response) -> Optional[Dict[str, Any]]:
-        """獲取響應體
+            if "application/json" in content_type:
+                return self._mask_sensitive_data(json.loads(body.decode()))
 
-        Args:
-            response: HTTP 響應物件
+            # 表單資料
+            return self._mask_sensitive_data(dict(parse_qsl(body.decode())))
 
-        Returns:
-            Optional[Dict[str, Any]]: 響應體資料或 None
-        """
-        try:
-            # 注意：這裡只是示例，實際實現需要更複雜的處理
-            # 因為響應體可能已經被消費
-            return {"note": "響應體內容省略"}
         except Exception as e:
-            logger.warning("讀取響應體失敗: %s", e)
-            return {"error": "無法讀取響應體"}
+            logger.warning("解析請求體失敗: %s", e)
+            return {"error": "無法讀取請求體"}
 
     def _mask_sensitive_data(self, data: Any) -> Any:
         """遮罩敏感資料"""
@@ -285,30 +500,28 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
         return data
 
-    def _log_performance_metrics(
+    def _log_slow_request(
         self, request: Request, response: Response, process_time: float
     ):
-        """記錄效能指標"""
-        try:
-            # 效能指標
-            metrics = {
-                "endpoint": request.url.path,
-                "method": request.method,
-                "status_code": response.status_code,
-                "process_time": process_time,
-                "timestamp": datetime.now().isoformat(),
-            }
+        """記錄慢請求
 
-            # 慢請求警告
-            if process_time > 5.0:  # 超過 5 秒
-                logger.warning(
-                    "慢請求警告: %s", json.dumps(metrics, ensure_ascii=False)
-                )
-            elif process_time > 1.0:  # 超過 1 秒
-                logger.info("效能監控: %s", json.dumps(metrics, ensure_ascii=False))
+        一般請求的處理時間只寫入直方圖，超過門檻的請求才另外寫入日誌。
+        """
+        if process_time <= SLOW_REQUEST_SECONDS:
+            return
+
+        metrics = {
+            "endpoint": request.url.path,
+            "method": request.method,
+            "status_code": response.status_code,
+            "process_time": process_time,
+            "timestamp": datetime.now().isoformat(),
+        }
 
-        except Exception as e:
-            logger.error("記錄效能指標失敗: %s", e)
+        if process_time > VERY_SLOW_REQUEST_SECONDS:
+            self.writer.submit(logging.WARNING, "慢請求警告", lambda: metrics)
+        else:
+            self.writer.submit(logging.INFO, "效能監控", lambda: metrics)
 
 
 class AuditLogger:
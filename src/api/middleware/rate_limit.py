@@ -5,15 +5,20 @@
 """
 
 import time
-import asyncio
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Optional
 from collections import deque
 from fastapi import Request, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 import logging
 
+from src.api.middleware.rate_limit_store import (
+    RateLimitResult,
+    RateLimitStore,
+    create_rate_limit_store,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -136,16 +141,27 @@ class SlidingWindowCounter:
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """速率限制中間件"""
+    """速率限制中間件
+
+    限制狀態保存在可替換的 ``RateLimitStore`` 中，預設依環境變數
+    ``API_RATE_LIMIT_BACKEND`` 建立；多個 worker 需共用限制時使用 sqlite 或 redis。
+    """
+
+    # 令牌桶：容量 10，每秒補充 2 個令牌
+    TOKEN_BUCKET_CAPACITY = 10
+    TOKEN_BUCKET_REFILL_RATE = 2.0
 
-    def __init__(self, app):
+    def __init__(self, app, store: Optional[RateLimitStore] = None):
+        """初始化中間件
+
+        Args:
+            app: ASGI 應用
+            store: 限制狀態存儲，預設依環境變數建立
+        """
         super().__init__(app)
 
-        # 存儲各種限制器
-        self.ip_limiters: Dict[str, SlidingWindowCounter] = {}
-        self.user_limiters: Dict[str, SlidingWindowCounter] = {}
-        self.endpoint_limiters: Dict[str, SlidingWindowCounter] = {}
-        self.token_buckets: Dict[str, TokenBucket] = {}
+        # 限制狀態存儲
+        self.store = store or create_rate_limit_store()
 
         # 預設規則
         self.default_rules = {
@@ -166,9 +182,6 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # 白名單 IP
         self.whitelist_ips = {"127.0.0.1", "localhost", "::1"}
 
-        # 清理任務
-        self._start_cleanup_task()
-
     async def dispatch(self, request: Request, call_next):
         """處理請求速率限制"""
         # 獲取客戶端 IP
@@ -190,18 +203,20 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         try:
             # 檢查各種限制
-            self._check_ip_limit(client_ip)
+            ip_result = await self._check_ip_limit(client_ip)
 
             if user_id:
-                self._check_user_limit(user_id)
+                await self._check_user_limit(user_id)
 
-            self._check_endpoint_limit(endpoint)
+            endpoint_result = await self._check_endpoint_limit(endpoint)
 
             # 檢查令牌桶限制
-            self._check_token_bucket_limit(client_ip)
+            await self._check_token_bucket_limit(client_ip)
 
         except HTTPException as e:
-            return self._rate_limit_response(e.detail, client_ip, endpoint)
+            return self._rate_limit_response(
+                e.detail, endpoint, (e.headers or {}).get("Retry-After")
+            )
 
         # 記錄請求
         self._record_request(client_ip, user_id, endpoint)
@@ -210,7 +225,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
 
         # 添加速率限制標頭
-        self._add_rate_limit_headers(response, client_ip, endpoint)
+        self._add_rate_limit_headers(response, ip_result, endpoint_result)
 
         return response
 
@@ -246,75 +261,57 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         return False
 
-    def _check_ip_limit(self, ip: str):
-        """檢查 IP 限制"""
-        rule = self.default_rules["ip"]
-
-        if ip not in self.ip_limiters:
-            self.ip_limiters[ip] = SlidingWindowCounter(
-                rule.window_seconds, rule.max_requests
-            )
+    async def _check_limit(
+        self, key: str, rule: RateLimitRule, message: str
+    ) -> RateLimitResult:
+        """檢查滑動窗口限制
 
-        limiter = self.ip_limiters[ip]
-
-        if not limiter.is_allowed():
-            reset_time = limiter.get_reset_time()
+        Raises:
+            HTTPException: 超過限制
+        """
+        result = await self.store.hit(key, rule.max_requests, rule.window_seconds)
+        if not result.allowed:
+            retry_after = max(1, int(result.reset_at - time.time()))
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"IP 請求過於頻繁，請在 {int(reset_time - time.time())} 秒後重試",
-            )
-
-    def _check_user_limit(self, user_id: str):
-        """檢查用戶限制"""
-        rule = self.default_rules["user"]
-
-        if user_id not in self.user_limiters:
-            self.user_limiters[user_id] = SlidingWindowCounter(
-                rule.window_seconds, rule.max_requests
+                detail=f"{message}，請在 {retry_after} 秒後重試",
+                headers={"Retry-After": str(retry_after)},
             )
+        return result
 
-        limiter = self.user_limiters[user_id]
+    async def _check_ip_limit(self, ip: str) -> RateLimitResult:
+        """檢查 IP 限制"""
+        return await self._check_limit(
+            f"ip:{ip}", self.default_rules["ip"], "IP 請求過於頻繁"
+        )
 
-        if not limiter.is_allowed():
-            reset_time = limiter.get_reset_time()
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"用戶請求過於頻繁，請在 {int(reset_time - time.time())} 秒後重試",
-            )
+    async def _check_user_limit(self, user_id: str) -> RateLimitResult:
+        """檢查用戶限制"""
+        return await self._check_limit(
+            f"user:{user_id}", self.default_rules["user"], "用戶請求過於頻繁"
+        )
 
-    def _check_endpoint_limit(self, endpoint: str):
+    async def _check_endpoint_limit(self, endpoint: str) -> Optional[RateLimitResult]:
         """檢查端點限制"""
         # 檢查是否有特定端點規則
         rule = self.endpoint_rules.get(endpoint)
         if not rule:
-            return
+            return None
 
-        if endpoint not in self.endpoint_limiters:
-            self.endpoint_limiters[endpoint] = SlidingWindowCounter(
-                rule.window_seconds, rule.max_requests
-            )
-
-        limiter = self.endpoint_limiters[endpoint]
+        return await self._check_limit(f"endpoint:{endpoint}", rule, "端點請求過於頻繁")
 
-        if not limiter.is_allowed():
-            reset_time = limiter.get_reset_time()
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"端點請求過於頻繁，請在 {int(reset_time - time.time())} 秒後重試",
-            )
-
-    def _check_token_bucket_limit(self, client_ip: str):
+    async def _check_token_bucket_limit(self, client_ip: str):
         """檢查令牌桶限制"""
-        if client_ip not in self.token_buckets:
-            # 創建令牌桶：容量 10，每秒補充 2 個令牌
-            self.token_buckets[client_ip] = TokenBucket(10, 2.0)
-
-        bucket = self.token_buckets[client_ip]
-
-        if not bucket.consume():
+        allowed = await self.store.consume(
+            f"bucket:{client_ip}",
+            self.TOKEN_BUCKET_CAPACITY,
+            self.TOKEN_BUCKET_REFILL_RATE,
+        )
+        if not allowed:
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail="請求過於頻繁，請稍後重試",
+                headers={"Retry-After": "1"},
             )
 
     def _record_request(self, ip: str, user_id: Optional[str], endpoint: str):
@@ -328,46 +325,38 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # 這裡可以添加請求記錄邏輯
         logger.debug("請求記錄: IP=%s, User=%s, Endpoint=%s", ip, user_id, endpoint)
 
-    def _add_rate_limit_headers(self, response, ip: str, endpoint: str):
+    def _add_rate_limit_headers(
+        self,
+        response,
+        ip_result: RateLimitResult,
+        endpoint_result: Optional[RateLimitResult],
+    ):
         """添加速率限制標頭"""
-        # 獲取 IP 限制器資訊
-        if ip in self.ip_limiters:
-            limiter = self.ip_limiters[ip]
-            remaining = limiter.get_remaining_requests()
-            reset_time = int(limiter.get_reset_time())
-
-            response.headers["X-RateLimit-Limit"] = str(
-                self.default_rules["ip"].max_requests
-            )
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
-            response.headers["X-RateLimit-Reset"] = str(reset_time)
+        response.headers["X-RateLimit-Limit"] = str(ip_result.limit)
+        response.headers["X-RateLimit-Remaining"] = str(ip_result.remaining)
+        response.headers["X-RateLimit-Reset"] = str(int(ip_result.reset_at))
 
         # 添加端點特定限制資訊
-        if endpoint in self.endpoint_limiters:
-            limiter = self.endpoint_limiters[endpoint]
-            remaining = limiter.get_remaining_requests()
-
-            response.headers["X-RateLimit-Endpoint-Remaining"] = str(remaining)
+        if endpoint_result is not None:
+            response.headers["X-RateLimit-Endpoint-Remaining"] = str(
+                endpoint_result.remaining
+            )
 
     def _rate_limit_response(
-        self, message: str, ip: str, endpoint: str
+        self, message: str, endpoint: str, retry_after: Optional[str] = None
     ) -> JSONResponse:
         """返回速率限制響應
 
         Args:
             message: 錯誤訊息
-            ip: 客戶端 IP 地址
             endpoint: API 端點路徑
+            retry_after: 重試等待秒數
 
         Returns:
             JSONResponse: 速率限制響應
         """
         # 獲取重試時間
-        retry_after = 60  # 預設 60 秒
-
-        if ip in self.ip_limiters:
-            reset_time = self.ip_limiters[ip].get_reset_time()
-            retry_after = max(1, int(reset_time - time.time()))
+        retry_after = int(retry_after or 60)  # 預設 60 秒
 
         response = JSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -384,55 +373,6 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         response.headers["Retry-After"] = str(retry_after)
         return response
 
-    def _start_cleanup_task(self):
-        """啟動清理任務"""
-
-        async def cleanup_task():
-            while True:
-                await asyncio.sleep(300)  # 每 5 分鐘清理一次
-                self._cleanup_expired_limiters()
-
-        # 在實際應用中，應該使用適當的任務調度器
-        asyncio.create_task(cleanup_task())
-
-    def _cleanup_expired_limiters(self):
-        """清理過期的限制器"""
-        current_time = time.time()
-
-        # 清理 IP 限制器
-        expired_ips = [
-            ip
-            for ip, limiter in self.ip_limiters.items()
-            if not limiter.requests or limiter.requests[-1] < current_time - 3600
-        ]
-        for ip in expired_ips:
-            del self.ip_limiters[ip]
-
-        # 清理用戶限制器
-        expired_users = [
-            user_id
-            for user_id, limiter in self.user_limiters.items()
-            if not limiter.requests or limiter.requests[-1] < current_time - 3600
-        ]
-        for user_id in expired_users:
-            del self.user_limiters[user_id]
-
-        # 清理端點限制器
-        expired_endpoints = [
-            endpoint
-            for endpoint, limiter in self.endpoint_limiters.items()
-            if not limiter.requests or limiter.requests[-1] < current_time - 3600
-        ]
-        for endpoint in expired_endpoints:
-            del self.endpoint_limiters[endpoint]
-
-        logger.info(
-            "清理過期限制器: IP=%d, User=%d, Endpoint=%d",
-            len(expired_ips),
-            len(expired_users),
-            len(expired_endpoints),
-        )
-
 
 class RateLimitConfig:
     """速率限制配置"""
@@ -0,0 +1,529 @@
+"""速率限制狀態存儲
+
+此模組提供速率限制中間件使用的可替換狀態存儲。每個限制鍵只保存固定大小的狀態，
+單次檢查為 O(1)，不需要定期掃描所有限制鍵：
+
+- 滑動窗口：保存當前與前一個固定窗口的計數，以前一窗口計數依剩餘比例加權估算
+  滑動窗口內的請求數
+- 令牌桶：保存剩餘令牌數與上次補充時間
+
+存儲後端：
+
+- ``MemoryRateLimitStore``：行程內存儲，以 LRU 限制鍵的數量，每個 worker 各自計數
+- ``SQLiteRateLimitStore``：同一主機上的多個 worker 共用一個 SQLite 檔案
+- ``RedisRateLimitStore``：多台主機共用，需要安裝 ``redis``，以 Lua 腳本保證原子性
+
+Example:
+    ```python
+    store = create_rate_limit_store("sqlite", sqlite_path="/tmp/rate_limit.db")
+    result = await store.hit("ip:10.0.0.1", limit=100, window_seconds=60)
+    if not result.allowed:
+        ...
+    ```
+"""
+
+import itertools
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import redis.asyncio as redis_asyncio
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis_asyncio = None
+    REDIS_AVAILABLE = False
+
+from src.api.utils.offload import run_sync
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_KEYS = 100_000
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """速率限制檢查結果
+
+    Attributes:
+        allowed: 是否允許請求
+        limit: 窗口內最大請求數
+        remaining: 剩餘請求數
+        reset_at: 當前窗口結束的時間戳
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_at: float
+
+
+def _sliding_window(
+    state: Optional[tuple], limit: int, window_seconds: float, now: float
+) -> tuple:
+    """計算滑動窗口檢查結果
+
+    Args:
+        state: 既有狀態 (窗口編號, 當前計數, 前一窗口計數)，沒有時為 None
+        limit: 窗口內最大請求數
+        window_seconds: 窗口大小（秒）
+        now: 當前時間戳
+
+    Returns:
+        tuple: (新狀態, RateLimitResult)
+    """
+    window = int(now // window_seconds)
+    current = previous = 0
+    if state is not None:
+        if state[0] == window:
+            current, previous = state[1], state[2]
+        elif state[0] == window - 1:
+            previous = state[1]
+
+    window_start = window * window_seconds
+    weight = 1.0 - (now - window_start) / window_seconds
+    estimated = previous * weight + current
+    allowed = estimated + 1 <= limit
+    if allowed:
+        current += 1
+        estimated += 1
+
+    result = RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=max(0, int(limit - math.ceil(estimated))),
+        reset_at=window_start + window_seconds,
+    )
+    return (window, current, previous), result
+
+
+def _token_bucket(
+    state: Optional[tuple], capacity: int, refill_rate: float, now: float
+) -> tuple:
+    """計算令牌桶消費結果
+
+    Args:
+        state: 既有狀態 (剩餘令牌, 上次補充時間)，沒有時為 None
+        capacity: 桶容量
+        refill_rate: 令牌補充速率（每秒）
+        now: 當前時間戳
+
+    Returns:
+        tuple: (新狀態, 是否成功消費)
+    """
+    tokens, last_refill = state if state is not None else (float(capacity), now)
+    tokens = min(capacity, tokens + max(0.0, now - last_refill) * refill_rate)
+    if tokens >= 1:
+        return (tokens - 1, now), True
+    return (tokens, now), False
+
+
+class RateLimitStore(ABC):
+    """速率限制狀態存儲介面"""
+
+    @abstractmethod
+    async def hit(
+        self,
+        key: str,
+        limit: int,
+        window_seconds: float,
+        now: Optional[float] = None,
+    ) -> RateLimitResult:
+        """記錄一次請求並檢查滑動窗口限制
+
+        超過限制的請求不計入窗口。
+
+        Args:
+            key: 限制鍵
+            limit: 窗口內最大請求數
+            window_seconds: 窗口大小（秒）
+            now: 當前時間戳，預設為 time.time()
+
+        Returns:
+            RateLimitResult: 檢查結果
+        """
+
+    @abstractmethod
+    async def consume(
+        self,
+        key: str,
+        capacity: int,
+        refill_rate: float,
+        now: Optional[float] = None,
+    ) -> bool:
+        """從令牌桶消費一個令牌
+
+        Args:
+            key: 限制鍵
+            capacity: 桶容量
+            refill_rate: 令牌補充速率（每秒）
+            now: 當前時間戳，預設為 time.time()
+
+        Returns:
+            bool: 是否成功消費
+        """
+
+    async def close(self) -> None:
+        """釋放存儲資源"""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """行程內速率限制存儲
+
+    以 OrderedDict 實作 LRU，限制鍵數量超過上限時淘汰最久未使用的鍵，
+    記憶體用量不隨客戶端 IP 數量無限增長。
+    """
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS):
+        """初始化存儲
+
+        Args:
+            max_keys: 最多保存的限制鍵數量
+        """
+        self.max_keys = max(1, max_keys)
+        self._states: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    async def hit(
+        self,
+        key: str,
+        limit: int,
+        window_seconds: float,
+        now: Optional[float] = None,
+    ) -> RateLimitResult:
+        now = time.time() if now is None else now
+        with self._lock:
+            state, result = _sliding_window(
+                self._states.get(key), limit, window_seconds, now
+            )
+            self._store(key, state)
+        return result
+
+    async def consume(
+        self,
+        key: str,
+        capacity: int,
+        refill_rate: float,
+        now: Optional[float] = None,
+    ) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            state, allowed = _token_bucket(
+                self._states.get(key), capacity, refill_rate, now
+            )
+            self._store(key, state)
+        return allowed
+
+    def _store(self, key: str, state: tuple) -> None:
+        self._states[key] = state
+        self._states.move_to_end(key)
+        if len(self._states) > self.max_keys:
+            self._states.popitem(last=False)
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """以 SQLite 檔案在同一主機的多個 worker 間共用的速率限制存儲
+
+    每次檢查在 ``BEGIN IMMEDIATE`` 交易中讀取並更新單一列，多個行程同時檢查
+    同一個鍵時不會重複計數。每列與 Redis 後端相同地依規則記錄過期時間：
+    滑動窗口保留兩個窗口，令牌桶保留到補滿為止；過期的列依過期時間索引
+    分批刪除。
+
+    SQLite 呼叫在卸載執行緒池中執行，等待其他 worker 釋放寫入鎖時不會阻塞
+    事件迴圈；每個執行緒使用各自的連線。
+    """
+
+    # 卸載執行器的路由鍵
+    OFFLOAD_ROUTE = "rate_limit.sqlite"
+
+    # 每寫入多少次清理一次過期的列
+    PRUNE_INTERVAL = 1000
+
+    def __init__(self, path: str):
+        """初始化存儲
+
+        Args:
+            path: SQLite 檔案路徑
+        """
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        # 由多個卸載執行緒遞增，itertools.count 的 next() 為原子操作
+        self._writes = itertools.count(1)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # 滑動窗口存 (窗口編號, 當前計數, 前一窗口計數)，令牌桶存 (剩餘令牌, 上次補充時間, 0)
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                a REAL NOT NULL,
+                b REAL NOT NULL,
+                c REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_rate_limits_expires "
+            "ON rate_limits (expires_at)"
+        )
+
+    async def hit(
+        self,
+        key: str,
+        limit: int,
+        window_seconds: float,
+        now: Optional[float] = None,
+    ) -> RateLimitResult:
+        now = time.time() if now is None else now
+
+        def update(row):
+            state = (int(row[0]), int(row[1]), int(row[2])) if row else None
+            return _sliding_window(state, limit, window_seconds, now)
+
+        # 估算需要前一窗口的計數，保留兩個窗口
+        return await run_sync(
+            self._update,
+            key,
+            now,
+            now + 2 * window_seconds,
+            update,
+            route=self.OFFLOAD_ROUTE,
+        )
+
+    async def consume(
+        self,
+        key: str,
+        capacity: int,
+        refill_rate: float,
+        now: Optional[float] = None,
+    ) -> bool:
+        now = time.time() if now is None else now
+
+        def update(row):
+            state, allowed = _token_bucket(
+                (row[0], row[1]) if row else None, capacity, refill_rate, now
+            )
+            return state + (0,), allowed
+
+        # 超過補滿所需時間後狀態等同於新的令牌桶
+        return await run_sync(
+            self._update,
+            key,
+            now,
+            now + capacity / refill_rate + 1,
+            update,
+            route=self.OFFLOAD_ROUTE,
+        )
+
+    async def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            # 捨棄各執行緒保存的已關閉連線
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=5.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _update(self, key: str, now: float, expires_at: float, update):
+        """在寫入交易中讀取、計算並寫回單一限制鍵的狀態
+
+        Args:
+            key: 限制鍵
+            now: 目前時間戳，早於此時間過期的列會被清理
+            expires_at: 此鍵的狀態可被刪除的時間
+            update: 由目前狀態列計算 (新狀態, 結果) 的函數
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT a, b, c FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            state, result = update(row)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, a, b, c, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, state[0], state[1], state[2], expires_at),
+            )
+            if next(self._writes) % self.PRUNE_INTERVAL == 0:
+                conn.execute("DELETE FROM rate_limits WHERE expires_at < ?", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+
+# KEYS[1]: 限制鍵；ARGV: limit, window_seconds, now
+_REDIS_SLIDING_WINDOW = """
+local window = math.floor(tonumber(ARGV[3]) / tonumber(ARGV[2]))
+local state = redis.call('HMGET', KEYS[1], 'w', 'c', 'p')
+local current, previous = 0, 0
+if state[1] then
+    local stored = tonumber(state[1])
+    if stored == window then
+        current, previous = tonumber(state[2]), tonumber(state[3])
+    elseif stored == window - 1 then
+        previous = tonumber(state[2])
+    end
+end
+local window_start = window * tonumber(ARGV[2])
+local weight = 1 - (tonumber(ARGV[3]) - window_start) / tonumber(ARGV[2])
+local estimated = previous * weight + current
+local allowed = 0
+if estimated + 1 <= tonumber(ARGV[1]) then
+    allowed = 1
+    current = current + 1
+    estimated = estimated + 1
+end
+redis.call('HSET', KEYS[1], 'w', window, 'c', current, 'p', previous)
+redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2]) * 2))
+return {allowed, tostring(estimated)}
+"""
+
+# KEYS[1]: 限制鍵；ARGV: capacity, refill_rate, now
+_REDIS_TOKEN_BUCKET = """
+local capacity, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 't', 'r')
+local tokens, last = capacity, now
+if state[1] then
+    tokens, last = tonumber(state[1]), tonumber(state[2])
+end
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'r', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return allowed
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """以 Redis 在多台主機間共用的速率限制存儲
+
+    檢查與更新以 Lua 腳本在 Redis 端原子執行，每個限制鍵為一個設有過期時間的
+    hash。任何支援 EVALSHA 的 Redis 相容服務皆可使用。
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "rl:"):
+        """初始化存儲
+
+        Args:
+            url: Redis 連線 URL
+            prefix: 限制鍵前綴
+
+        Raises:
+            ImportError: 未安裝 redis
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("RedisRateLimitStore 需要安裝 redis: pip install redis")
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._sliding_window = self._client.register_script(_REDIS_SLIDING_WINDOW)
+        self._token_bucket = self._client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def hit(
+        self,
+        key: str,
+        limit: int,
+        window_seconds: float,
+        now: Optional[float] = None,
+    ) -> RateLimitResult:
+        now = time.time() if now is None else now
+        allowed, estimated = await self._sliding_window(
+            keys=[self.prefix + key], args=[limit, window_seconds, now]
+        )
+        window_start = (now // window_seconds) * window_seconds
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=limit,
+            remaining=max(0, int(limit - math.ceil(float(estimated)))),
+            reset_at=window_start + window_seconds,
+        )
+
+    async def consume(
+        self,
+        key: str,
+        capacity: int,
+        refill_rate: float,
+        now: Optional[float] = None,
+    ) -> bool:
+        now = time.time() if now is None else now
+        allowed = await self._token_bucket(
+            keys=[self.prefix + key], args=[capacity, refill_rate, now]
+        )
+        return bool(allowed)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_rate_limit_store(
+    backend: Optional[str] = None,
+    max_keys: int = DEFAULT_MAX_KEYS,
+    sqlite_path: Optional[str] = None,
+    redis_url: Optional[str] = None,
+) -> RateLimitStore:
+    """依設定建立速率限制存儲
+
+    未指定的參數從環境變數 ``API_RATE_LIMIT_BACKEND``（memory / sqlite / redis）、
+    ``API_RATE_LIMIT_SQLITE_PATH`` 與 ``API_RATE_LIMIT_REDIS_URL`` 讀取。
+
+    Args:
+        backend: 存儲後端
+        max_keys: 行程內存儲最多保存的限制鍵數量
+        sqlite_path: SQLite 檔案路徑
+        redis_url: Redis 連線 URL
+
+    Returns:
+        RateLimitStore: 速率限制存儲
+
+    Raises:
+        ValueError: 不支持的存儲後端
+    """
+    backend = (backend or os.getenv("API_RATE_LIMIT_BACKEND", "memory")).lower()
+    if backend == "memory":
+        return MemoryRateLimitStore(max_keys=max_keys)
+    if backend == "sqlite":
+        return SQLiteRateLimitStore(
+            sqlite_path
+            or os.getenv("API_RATE_LIMIT_SQLITE_PATH", "./cache/rate_limits.db")
+        )
+    if backend == "redis":
+        return RedisRateLimitStore(
+            redis_url
+            or os.getenv("API_RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+        )
+    raise ValueError(f"不支持的速率限制存儲後端: {backend}")
@@ -17,6 +17,7 @@ API 路由模組
 - risk_management: 風險管理
 - monitoring: 監控
 - reports: 報告
+- stream: 即時推送
 """
 
 # 導入認證處理器作為 auth 模組
@@ -31,6 +32,7 @@ from . import trading
 from . import risk_management
 from . import monitoring
 from . import reports
+from . import stream
 
 __all__ = [
     "auth",
@@ -43,5 +45,6 @@ __all__ = [
     "trading",
     "risk_management",
     "monitoring",
-    "reports"
+    "reports",
+    "stream"
 ]
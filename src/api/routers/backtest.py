@@ -5,16 +5,24 @@
 交易記錄查詢和報表匯出等功能。
 """
 
+import base64
+import binascii
 import io
+import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+import numpy as np
 
 from fastapi import APIRouter, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, validator
 
 from src.api.models.responses import APIResponse, COMMON_RESPONSES
+from src.api.utils.downsampling import DOWNSAMPLE_METHODS, downsample_indices
+from src.api.utils.offload import run_sync
+from src.api.utils.streaming import STREAM_FORMATS, stream_batches
 from src.core.backtest.service import BacktestService
 from src.core.backtest.config import BacktestConfig
 
@@ -24,6 +32,12 @@ router = APIRouter()
 # 初始化回測服務
 backtest_service = BacktestService()
 
+# 串流回應每次從資料庫讀取的記錄數
+STREAM_BATCH_SIZE = 5000
+
+# 交易記錄中只用於產生分頁游標的欄位
+_CURSOR_KEYS = ("id", "entry_date")
+
 
 # ==================== 請求模型 ====================
 
@@ -165,6 +179,14 @@ class TransactionRecord(BaseModel):
     cash_balance: float = Field(..., description="現金餘額")
 
 
+class TransactionPage(BaseModel):
+    """交易明細分頁模型"""
+
+    items: List[TransactionRecord] = Field(..., description="交易記錄")
+    next_cursor: Optional[str] = Field(default=None, description="下一頁游標")
+    has_more: bool = Field(..., description="是否還有下一頁")
+
+
 class ChartData(BaseModel):
     """圖表數據模型"""
 
@@ -173,6 +195,7 @@ class ChartData(BaseModel):
     benchmark_values: Optional[List[float]] = Field(default=None, description="基準值")
     drawdown: List[float] = Field(..., description="回撤")
     returns: List[float] = Field(..., description="回報率")
+    total_points: Optional[int] = Field(default=None, description="降採樣前的點數")
 
 
 class BacktestResults(BaseModel):
@@ -202,6 +225,110 @@ class StrategyOption(BaseModel):
     enabled: bool = Field(..., description="是否啟用")
 
 
+# ==================== 輔助函數 ====================
+
+
+def _encode_cursor(transaction: Dict[str, Any]) -> str:
+    """以最後一筆交易的 (entry_date, id) 產生分頁游標"""
+    key = json.dumps([transaction["entry_date"], transaction["id"]])
+    return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    """解析分頁游標
+
+    Raises:
+        HTTPException: 游標格式錯誤
+    """
+    try:
+        entry_date, record_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return str(entry_date), int(record_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="無效的分頁游標"
+        ) from e
+
+
+def _to_transaction_record(transaction: Dict[str, Any]) -> TransactionRecord:
+    """將服務返回的交易記錄轉為響應模型"""
+    return TransactionRecord(
+        date=transaction["date"],
+        symbol=transaction["symbol"],
+        action=transaction["action"],
+        quantity=transaction["quantity"],
+        price=transaction["price"],
+        amount=transaction["amount"],
+        commission=transaction.get("commission", 0.0),
+        tax=transaction.get("tax", 0.0),
+        net_amount=transaction.get("net_amount", transaction["amount"]),
+        portfolio_value=transaction.get("portfolio_value", 0.0),
+        cash_balance=transaction.get("cash_balance", 0.0),
+    )
+
+
+def _downsample_chart(
+    chart_data: Dict[str, Any], max_points: Optional[int], method: str
+) -> Dict[str, Any]:
+    """將圖表序列降採樣到指定點數
+
+    以組合價值序列選取保留點，所有與日期等長的序列套用同一組索引；
+    最大回撤所在的點一律保留，避免降採樣後圖上看不到最大回撤。
+    """
+    dates = chart_data.get("dates", [])
+    total_points = len(dates)
+    if max_points is None or total_points <= max_points:
+        return {**chart_data, "total_points": total_points}
+
+    values = chart_data.get("portfolio_values", [])
+    indices = downsample_indices(values, max_points - 1, method)
+    drawdown = chart_data.get("drawdown") or []
+    if len(drawdown) == total_points:
+        deepest = int(np.nanargmax(np.abs(np.asarray(drawdown, dtype="float64"))))
+        indices = np.union1d(indices, [deepest])
+
+    result = {"total_points": total_points}
+    for key, series in chart_data.items():
+        if isinstance(series, list) and len(series) == total_points:
+            result[key] = [series[i] for i in indices]
+        else:
+            result[key] = series
+    return result
+
+
+def _iter_transaction_batches(backtest_id: str) -> Iterator[List[Dict[str, Any]]]:
+    """以鍵集分頁逐批讀取完整交易記錄"""
+    after = None
+    while True:
+        batch = backtest_service.get_transaction_records(
+            backtest_id, after=after, limit=STREAM_BATCH_SIZE
+        )
+        if not batch:
+            return
+        after = (batch[-1]["entry_date"], batch[-1]["id"])
+        # 游標用的內部欄位不輸出
+        yield [
+            {key: value for key, value in record.items() if key not in _CURSOR_KEYS}
+            for record in batch
+        ]
+        if len(batch) < STREAM_BATCH_SIZE:
+            return
+
+
+def _iter_equity_batches(chart_data: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+    """將完整權益曲線轉為逐日記錄批次"""
+    dates = chart_data.get("dates", [])
+    columns = {
+        key: series
+        for key, series in chart_data.items()
+        if key != "dates" and isinstance(series, list) and len(series) == len(dates)
+    }
+    for start in range(0, len(dates), STREAM_BATCH_SIZE):
+        yield [
+            {"date": date, **{key: series[i] for key, series in columns.items()}}
+            for i, date in enumerate(dates[start : start + STREAM_BATCH_SIZE], start)
+        ]
+
+
 # ==================== API 端點實作 ====================
 
 
@@ -232,10 +359,14 @@ async def start_backtest(request: BacktestCreateRequest):
         )
 
         # 啟動回測
-        backtest_id = backtest_service.start_backtest(config)
+        backtest_id = await run_sync(
+            backtest_service.start_backtest, config, route="backtest"
+        )
 
         # 獲取回測資訊
-        backtest_info = backtest_service.get_backtest_info(backtest_id)
+        backtest_info = await run_sync(
+            backtest_service.get_backtest_info, backtest_id, route="backtest"
+        )
 
         if not backtest_info:
             raise HTTPException(
@@ -281,7 +412,9 @@ async def get_backtest_status(backtest_id: str):
     """查詢回測狀態"""
     try:
         # 獲取回測狀態
-        status_info = backtest_service.get_backtest_status(backtest_id)
+        status_info = await run_sync(
+            backtest_service.get_backtest_status, backtest_id, route="backtest"
+        )
 
         if not status_info:
             raise HTTPException(
@@ -343,7 +476,9 @@ async def get_backtest_results(backtest_id: str):
     """獲取回測結果"""
     try:
         # 檢查回測是否存在
-        backtest_info = backtest_service.get_backtest_info(backtest_id)
+        backtest_info = await run_sync(
+            backtest_service.get_backtest_info, backtest_id, route="backtest"
+        )
         if not backtest_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="回測任務不存在"
@@ -357,14 +492,18 @@ async def get_backtest_results(backtest_id: str):
             )
 
         # 獲取回測結果
-        results = backtest_service.get_backtest_results(backtest_id)
+        results = await run_sync(
+            backtest_service.get_backtest_results, backtest_id, route="backtest"
+        )
         if not results:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="回測結果不存在"
             )
 
         # 獲取效能指標
-        metrics = backtest_service.get_performance_metrics(backtest_id)
+        metrics = await run_sync(
+            backtest_service.get_performance_metrics, backtest_id, route="backtest"
+        )
         if not metrics:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="效能指標不存在"
@@ -456,7 +595,9 @@ async def get_available_strategies():
     """獲取可用策略列表"""
     try:
         # 獲取可用策略
-        strategies = backtest_service.get_available_strategies()
+        strategies = await run_sync(
+            backtest_service.get_available_strategies, route="backtest"
+        )
 
         strategy_options = [
             StrategyOption(
@@ -492,7 +633,9 @@ async def delete_backtest(backtest_id: str):
     """刪除回測任務"""
     try:
         # 檢查回測是否存在
-        backtest_info = backtest_service.get_backtest_info(backtest_id)
+        backtest_info = await run_sync(
+            backtest_service.get_backtest_info, backtest_id, route="backtest"
+        )
         if not backtest_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="回測任務不存在"
@@ -506,7 +649,9 @@ async def delete_backtest(backtest_id: str):
             )
 
         # 刪除回測
-        success = backtest_service.delete_backtest(backtest_id)
+        success = await run_sync(
+            backtest_service.delete_backtest, backtest_id, route="backtest"
+        )
 
         if not success:
             raise HTTPException(
@@ -541,7 +686,9 @@ async def get_backtest_metrics(backtest_id: str):
     """獲取效能指標"""
     try:
         # 檢查回測是否存在
-        backtest_info = backtest_service.get_backtest_info(backtest_id)
+        backtest_info = await run_sync(
+            backtest_service.get_backtest_info, backtest_id, route="backtest"
+        )
         if not backtest_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="回測任務不存在"
@@ -555,7 +702,9 @@ async def get_backtest_metrics(backtest_id: str):
             )
 
         # 獲取效能指標
-        metrics = backtest_service.get_performance_metrics(backtest_id)
+        metrics = await run_sync(
+            backtest_service.get_performance_metrics, backtest_id, route="backtest"
+        )
         if not metrics:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="效能指標不存在"
@@ -590,22 +739,26 @@ async def get_backtest_metrics(backtest_id: str):
 
 @router.get(
     "/{backtest_id}/transactions",
-    response_model=APIResponse[List[TransactionRecord]],
+    response_model=APIResponse[TransactionPage],
     responses=COMMON_RESPONSES,
     summary="獲取交易明細",
-    description="獲取回測任務的詳細交易記錄",
+    description="以游標分頁獲取回測任務的詳細交易記錄，next_cursor 為下一頁的游標",
 )
 async def get_backtest_transactions(
     backtest_id: str,
-    page: int = Query(default=1, ge=1, description="頁碼"),
-    page_size: int = Query(default=50, ge=1, le=200, description="每頁數量"),
+    cursor: Optional[str] = Query(default=None, description="分頁游標，首頁不需提供"),
+    page_size: int = Query(default=50, ge=1, le=1000, description="每頁數量"),
     symbol: Optional[str] = Query(default=None, description="股票代碼篩選"),
     action: Optional[str] = Query(default=None, description="交易動作篩選 (buy/sell)"),
 ):
     """獲取交易明細"""
     try:
+        after = _decode_cursor(cursor) if cursor else None
+
         # 檢查回測是否存在
-        backtest_info = backtest_service.get_backtest_info(backtest_id)
+        backtest_info = await run_sync(
+            backtest_service.get_backtest_info, backtest_id, route="backtest"
+        )
         if not backtest_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="回測任務不存在"
@@ -618,41 +771,28 @@ async def get_backtest_transactions(
                 detail=f"回測任務尚未完成，當前狀態: {backtest_info['status']}",
             )
 
-        # 獲取交易記錄
-        transactions = backtest_service.get_transaction_records(
-            backtest_id, symbol=symbol, action=action
+        # 多讀一筆以判斷是否還有下一頁
+        transactions = await run_sync(
+            backtest_service.get_transaction_records,
+            backtest_id,
+            symbol=symbol,
+            action=action,
+            after=after,
+            limit=page_size + 1,
+            route="backtest",
         )
+        has_more = len(transactions) > page_size
+        transactions = transactions[:page_size]
 
-        if not transactions:
-            return APIResponse(success=True, message="無交易記錄", data=[])
-
-        # 分頁處理
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_transactions = transactions[start_idx:end_idx]
-
-        # 轉換為響應模型
-        transaction_records = [
-            TransactionRecord(
-                date=transaction["date"],
-                symbol=transaction["symbol"],
-                action=transaction["action"],
-                quantity=transaction["quantity"],
-                price=transaction["price"],
-                amount=transaction["amount"],
-                commission=transaction.get("commission", 0.0),
-                tax=transaction.get("tax", 0.0),
-                net_amount=transaction.get("net_amount", transaction["amount"]),
-                portfolio_value=transaction.get("portfolio_value", 0.0),
-                cash_balance=transaction.get("cash_balance", 0.0),
-            )
-            for transaction in paginated_transactions
-        ]
-
-        return APIResponse(
-            success=True, message="交易明細獲取成功", data=transaction_records
+        response_data = TransactionPage(
+            items=[_to_transaction_record(record) for record in transactions],
+            next_cursor=_encode_cursor(transactions[-1]) if has_more else None,
+            has_more=has_more,
         )
 
+        message = "交易明細獲取成功" if transactions else "無交易記錄"
+        return APIResponse(success=True, message=message, data=response_data)
+
     except HTTPException:
         raise
     except Exception as e:
@@ -668,13 +808,27 @@ async def get_backtest_transactions(
     response_model=APIResponse[ChartData],
     responses=COMMON_RESPONSES,
     summary="獲取圖表數據",
-    description="獲取回測任務的圖表數據，用於績效視覺化",
+    description="獲取回測任務的圖表數據，可指定 max_points 在伺服器端降採樣",
 )
-async def get_backtest_charts(backtest_id: str):
+async def get_backtest_charts(
+    backtest_id: str,
+    max_points: Optional[int] = Query(
+        default=None, ge=10, le=20000, description="最大點數，未指定時返回完整序列"
+    ),
+    downsample: str = Query(default="lttb", description="降採樣方法 (lttb, minmax)"),
+):
     """獲取圖表數據"""
     try:
+        if downsample not in DOWNSAMPLE_METHODS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"不支援的降採樣方法: {downsample}，支援方法: {', '.join(DOWNSAMPLE_METHODS)}",
+            )
+
         # 檢查回測是否存在
-        backtest_info = backtest_service.get_backtest_info(backtest_id)
+        backtest_info = await run_sync(
+            backtest_service.get_backtest_info, backtest_id, route="backtest"
+        )
         if not backtest_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="回測任務不存在"
@@ -688,18 +842,25 @@ async def get_backtest_charts(backtest_id: str):
             )
 
         # 獲取圖表數據
-        chart_data = backtest_service.get_chart_data(backtest_id)
+        chart_data = await run_sync(
+            backtest_service.get_chart_data, backtest_id, route="backtest"
+        )
         if not chart_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="圖表數據不存在"
             )
 
+        chart_data = await run_sync(
+            _downsample_chart, chart_data, max_points, downsample, route="backtest"
+        )
+
         response_data = ChartData(
             dates=chart_data.get("dates", []),
             portfolio_values=chart_data.get("portfolio_values", []),
             benchmark_values=chart_data.get("benchmark_values"),
             drawdown=chart_data.get("drawdown", []),
             returns=chart_data.get("returns", []),
+            total_points=chart_data.get("total_points"),
         )
 
         return APIResponse(success=True, message="圖表數據獲取成功", data=response_data)
@@ -714,6 +875,81 @@ async def get_backtest_charts(backtest_id: str):
         ) from e
 
 
+@router.get(
+    "/{backtest_id}/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "完整解析度的資料串流",
+            "content": {media_type: {} for media_type in STREAM_FORMATS.values()},
+        }
+    },
+    summary="串流回測資料",
+    description="以 NDJSON 或 Arrow IPC 串流返回完整的交易記錄或權益曲線",
+)
+async def stream_backtest_data(
+    backtest_id: str,
+    dataset: str = Query(..., description="資料集 (transactions, equity)"),
+    stream_format: str = Query(
+        default="ndjson", alias="format", description="串流格式 (ndjson, arrow)"
+    ),
+):
+    """串流回測資料"""
+    try:
+        if dataset not in ("transactions", "equity"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"不支援的資料集: {dataset}，支援資料集: transactions, equity",
+            )
+        if stream_format not in STREAM_FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"不支援的串流格式: {stream_format}，支援格式: {', '.join(STREAM_FORMATS)}",
+            )
+
+        # 檢查回測是否存在
+        backtest_info = await run_sync(
+            backtest_service.get_backtest_info, backtest_id, route="backtest"
+        )
+        if not backtest_info:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="回測任務不存在"
+            )
+
+        # 檢查回測是否已完成
+        if backtest_info["status"] != "completed":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"回測任務尚未完成，當前狀態: {backtest_info['status']}",
+            )
+
+        if dataset == "transactions":
+            # 交易記錄在串流過程中逐批讀取
+            batches = _iter_transaction_batches(backtest_id)
+        else:
+            chart_data = await run_sync(
+                backtest_service.get_chart_data, backtest_id, route="backtest"
+            )
+            if not chart_data:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="圖表數據不存在"
+                )
+            batches = _iter_equity_batches(chart_data)
+
+        return stream_batches(
+            batches, stream_format, f"backtest_{dataset}_{backtest_id}"
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("串流回測資料失敗: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"串流回測資料失敗: {str(e)}",
+        ) from e
+
+
 @router.get(
     "/{backtest_id}/export",
     response_class=StreamingResponse,
@@ -750,7 +986,9 @@ async def export_backtest_report(
             )
 
         # 檢查回測是否存在
-        backtest_info = backtest_service.get_backtest_info(backtest_id)
+        backtest_info = await run_sync(
+            backtest_service.get_backtest_info, backtest_id, route="backtest"
+        )
         if not backtest_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="回測任務不存在"
@@ -764,11 +1002,13 @@ async def export_backtest_report(
             )
 
         # 生成報表
-        report_data = backtest_service.generate_report(
+        report_data = await run_sync(
+            backtest_service.generate_report,
             backtest_id,
             format=export_format.lower(),
             include_charts=include_charts,
             include_transactions=include_transactions,
+            route="backtest.export",
         )
 
         if not report_data:
@@ -832,8 +1072,11 @@ async def get_backtests(
     """獲取回測列表"""
     try:
         # 獲取回測列表
-        backtests = backtest_service.get_backtest_list(
-            status=backtest_status, strategy_id=strategy_id
+        backtests = await run_sync(
+            backtest_service.get_backtest_list,
+            status=backtest_status,
+            strategy_id=strategy_id,
+            route="backtest",
         )
 
         # 分頁處理
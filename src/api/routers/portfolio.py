@@ -19,6 +19,7 @@ from src.api.models.responses import (
     PaginationMeta,
     COMMON_RESPONSES,
 )
+from src.api.utils.offload import run_sync
 from src.core.portfolio_service import PortfolioService, Portfolio, PortfolioHolding
 
 logger = logging.getLogger(__name__)
@@ -355,7 +356,9 @@ async def create_portfolio(request: PortfolioCreateRequest):
         )
 
         # 保存投資組合
-        saved_portfolio = portfolio_service.create_portfolio(portfolio)
+        saved_portfolio = await run_sync(
+            portfolio_service.create_portfolio, portfolio, route="portfolio"
+        )
 
         if not saved_portfolio:
             raise HTTPException(
@@ -400,12 +403,14 @@ async def list_portfolios(
     """查詢投資組合列表"""
     try:
         # 獲取投資組合列表
-        portfolios, total_count = portfolio_service.list_portfolios(
+        portfolios, total_count = await run_sync(
+            portfolio_service.list_portfolios,
             page=page,
             page_size=page_size,
             search=search,
             sort_by=sort_by,
             sort_order=sort_order,
+            route="portfolio",
         )
 
         # 轉換為摘要模型
@@ -453,7 +458,9 @@ async def get_portfolio(portfolio_id: str):
     """查詢特定投資組合詳情"""
     try:
         # 獲取投資組合
-        portfolio = portfolio_service.get_portfolio(portfolio_id)
+        portfolio = await run_sync(
+            portfolio_service.get_portfolio, portfolio_id, route="portfolio"
+        )
 
         if not portfolio:
             raise HTTPException(
@@ -488,7 +495,9 @@ async def update_portfolio(portfolio_id: str, request: PortfolioUpdateRequest):
     """更新投資組合配置"""
     try:
         # 檢查投資組合是否存在
-        existing_portfolio = portfolio_service.get_portfolio(portfolio_id)
+        existing_portfolio = await run_sync(
+            portfolio_service.get_portfolio, portfolio_id, route="portfolio"
+        )
         if not existing_portfolio:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="投資組合不存在"
@@ -537,8 +546,11 @@ async def update_portfolio(portfolio_id: str, request: PortfolioUpdateRequest):
             update_data["total_value"] = total_value
 
         # 更新投資組合
-        updated_portfolio = portfolio_service.update_portfolio(
-            portfolio_id, update_data
+        updated_portfolio = await run_sync(
+            portfolio_service.update_portfolio,
+            portfolio_id,
+            update_data,
+            route="portfolio",
         )
 
         if not updated_portfolio:
@@ -578,14 +590,18 @@ async def delete_portfolio(portfolio_id: str):
     """刪除投資組合"""
     try:
         # 檢查投資組合是否存在
-        existing_portfolio = portfolio_service.get_portfolio(portfolio_id)
+        existing_portfolio = await run_sync(
+            portfolio_service.get_portfolio, portfolio_id, route="portfolio"
+        )
         if not existing_portfolio:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="投資組合不存在"
             )
 
         # 刪除投資組合
-        success = portfolio_service.delete_portfolio(portfolio_id)
+        success = await run_sync(
+            portfolio_service.delete_portfolio, portfolio_id, route="portfolio"
+        )
 
         if not success:
             raise HTTPException(
@@ -623,18 +639,22 @@ async def rebalance_portfolio(portfolio_id: str, request: RebalanceRequest):
     """執行投資組合再平衡"""
     try:
         # 檢查投資組合是否存在
-        portfolio = portfolio_service.get_portfolio(portfolio_id)
+        portfolio = await run_sync(
+            portfolio_service.get_portfolio, portfolio_id, route="portfolio"
+        )
         if not portfolio:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="投資組合不存在"
             )
 
         # 執行再平衡
-        rebalance_result = portfolio_service.rebalance_portfolio(
+        rebalance_result = await run_sync(
+            portfolio_service.rebalance_portfolio,
             portfolio_id=portfolio_id,
             method=request.method,
             target_weights=request.target_weights,
             constraints=request.constraints,
+            route="portfolio",
         )
 
         if not rebalance_result:
@@ -688,7 +708,9 @@ async def get_portfolio_performance(
     """查詢績效指標"""
     try:
         # 檢查投資組合是否存在
-        portfolio = portfolio_service.get_portfolio(portfolio_id)
+        portfolio = await run_sync(
+            portfolio_service.get_portfolio, portfolio_id, route="portfolio"
+        )
         if not portfolio:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="投資組合不存在"
@@ -717,11 +739,13 @@ async def get_portfolio_performance(
                 )
 
         # 計算績效指標
-        performance_metrics = portfolio_service.calculate_performance_metrics(
+        performance_metrics = await run_sync(
+            portfolio_service.calculate_performance_metrics,
             portfolio_id=portfolio_id,
             start_date=start_dt,
             end_date=end_dt,
             benchmark=benchmark or portfolio.benchmark,
+            route="portfolio",
         )
 
         if not performance_metrics:
@@ -774,17 +798,21 @@ async def get_portfolio_risk_metrics(
     """查詢風險指標"""
     try:
         # 檢查投資組合是否存在
-        portfolio = portfolio_service.get_portfolio(portfolio_id)
+        portfolio = await run_sync(
+            portfolio_service.get_portfolio, portfolio_id, route="portfolio"
+        )
         if not portfolio:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="投資組合不存在"
             )
 
         # 計算風險指標
-        risk_metrics = portfolio_service.calculate_risk_metrics(
+        risk_metrics = await run_sync(
+            portfolio_service.calculate_risk_metrics,
             portfolio_id=portfolio_id,
             confidence_level=confidence_level,
             lookback_days=lookback_days,
+            route="portfolio",
         )
 
         if not risk_metrics:
@@ -10,6 +10,7 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query, status
 
 from src.api.models.responses import APIResponse, COMMON_RESPONSES
+from src.api.utils.offload import run_sync
 from src.services.report_service import ReportService
 from .models import AnalyticsReportRequest, AnalyticsReport, ReportResponse
 
@@ -42,7 +43,8 @@ async def generate_analytics_report(request: AnalyticsReportRequest):
     """
     try:
         # 生成報表
-        report_result = report_service.generate_analytics_report(
+        report_result = await run_sync(
+            report_service.generate_analytics_report,
             start_date=request.start_date,
             end_date=request.end_date,
             analysis_type=request.analysis_type,
@@ -50,6 +52,7 @@ async def generate_analytics_report(request: AnalyticsReportRequest):
             factors=request.factors,
             include_predictions=request.include_predictions,
             format=request.format,
+            route="reports.generate",
         )
 
         if not report_result["success"]:
@@ -131,11 +134,13 @@ async def get_factor_analysis(
             ]
 
         # 執行因子分析
-        factor_analysis = report_service.get_factor_analysis(
+        factor_analysis = await run_sync(
+            report_service.get_factor_analysis,
             start_date=start_date,
             end_date=end_date,
             portfolio_ids=portfolio_list,
             factors=factor_list,
+            route="reports",
         )
 
         # 模擬因子分析結果
@@ -236,12 +241,14 @@ async def get_attribution_analysis(
             portfolio_list = [pid.strip() for pid in portfolio_ids.split(",")]
 
         # 執行績效歸因分析
-        attribution_analysis = report_service.get_attribution_analysis(
+        attribution_analysis = await run_sync(
+            report_service.get_attribution_analysis,
             start_date=start_date,
             end_date=end_date,
             portfolio_ids=portfolio_list,
             benchmark=benchmark,
             attribution_method=attribution_method,
+            route="reports",
         )
 
         # 模擬績效歸因分析結果
@@ -362,12 +369,14 @@ async def get_correlation_analysis(
             symbol_list = [symbol.strip() for symbol in symbols.split(",")]
 
         # 執行相關性分析
-        correlation_analysis = report_service.get_correlation_analysis(
+        correlation_analysis = await run_sync(
+            report_service.get_correlation_analysis,
             start_date=start_date,
             end_date=end_date,
             symbols=symbol_list,
             method=method,
             rolling_window=rolling_window,
+            route="reports",
         )
 
         # 模擬相關性分析結果
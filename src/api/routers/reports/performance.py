@@ -10,6 +10,7 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query, status
 
 from src.api.models.responses import APIResponse, COMMON_RESPONSES
+from src.api.utils.offload import run_sync
 from src.services.report_service import ReportService
 from .models import PerformanceReportRequest, PerformanceReport, ReportResponse
 
@@ -42,7 +43,8 @@ async def generate_performance_report(request: PerformanceReportRequest):
     """
     try:
         # 生成報表
-        report_result = report_service.generate_performance_report(
+        report_result = await run_sync(
+            report_service.generate_performance_report,
             start_date=request.start_date,
             end_date=request.end_date,
             portfolio_ids=request.portfolio_ids,
@@ -50,6 +52,7 @@ async def generate_performance_report(request: PerformanceReportRequest):
             include_benchmark=request.include_benchmark,
             metrics=request.metrics,
             format=request.format,
+            route="reports.generate",
         )
 
         if not report_result["success"]:
@@ -118,12 +121,14 @@ async def get_performance_data(
             portfolio_list = [pid.strip() for pid in portfolio_ids.split(",")]
 
         # 獲取績效數據
-        performance_data = report_service.get_performance_data(
+        performance_data = await run_sync(
+            report_service.get_performance_data,
             start_date=start_date,
             end_date=end_date,
             portfolio_ids=portfolio_list,
             benchmark=benchmark,
             include_benchmark=include_benchmark,
+            route="reports",
         )
 
         # 模擬績效數據
@@ -233,11 +238,13 @@ async def compare_portfolio_performance(
             metrics_list = [metric.strip() for metric in metrics.split(",")]
 
         # 獲取比較數據
-        comparison_data = report_service.compare_portfolio_performance(
+        comparison_data = await run_sync(
+            report_service.compare_portfolio_performance,
             start_date=start_date,
             end_date=end_date,
             portfolio_ids=portfolio_list,
             metrics=metrics_list,
+            route="reports",
         )
 
         # 模擬比較數據
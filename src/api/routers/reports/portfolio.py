@@ -10,6 +10,7 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query, Path, status
 
 from src.api.models.responses import APIResponse, COMMON_RESPONSES
+from src.api.utils.offload import run_sync
 from src.services.report_service import ReportService
 from .models import PortfolioReportRequest, PortfolioReport, ReportResponse
 
@@ -42,7 +43,8 @@ async def generate_portfolio_report(request: PortfolioReportRequest):
     """
     try:
         # 生成報表
-        report_result = report_service.generate_portfolio_report(
+        report_result = await run_sync(
+            report_service.generate_portfolio_report,
             start_date=request.start_date,
             end_date=request.end_date,
             portfolio_ids=request.portfolio_ids,
@@ -50,6 +52,7 @@ async def generate_portfolio_report(request: PortfolioReportRequest):
             include_transactions=request.include_transactions,
             groupby=request.groupby,
             format=request.format,
+            route="reports.generate",
         )
 
         if not report_result["success"]:
@@ -122,13 +125,15 @@ async def get_portfolio_data(
             portfolio_list = [pid.strip() for pid in portfolio_ids.split(",")]
 
         # 獲取投資組合數據
-        portfolio_data = report_service.get_portfolio_data(
+        portfolio_data = await run_sync(
+            report_service.get_portfolio_data,
             start_date=start_date,
             end_date=end_date,
             portfolio_ids=portfolio_list,
             include_positions=include_positions,
             include_transactions=include_transactions,
             groupby=groupby,
+            route="reports",
         )
 
         # 模擬投資組合數據
@@ -272,8 +277,12 @@ async def get_portfolio_allocation(
     """
     try:
         # 獲取配置分析數據
-        allocation_data = report_service.get_portfolio_allocation(
-            portfolio_id=portfolio_id, groupby=groupby, as_of_date=as_of_date
+        allocation_data = await run_sync(
+            report_service.get_portfolio_allocation,
+            portfolio_id=portfolio_id,
+            groupby=groupby,
+            as_of_date=as_of_date,
+            route="reports",
         )
 
         # 模擬配置分析數據
@@ -10,6 +10,7 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query, status
 
 from src.api.models.responses import APIResponse, COMMON_RESPONSES
+from src.api.utils.offload import run_sync
 from src.services.report_service import ReportService
 from .models import RiskReportRequest, RiskReport, ReportResponse
 
@@ -42,7 +43,8 @@ async def generate_risk_report(request: RiskReportRequest):
     """
     try:
         # 生成報表
-        report_result = report_service.generate_risk_report(
+        report_result = await run_sync(
+            report_service.generate_risk_report,
             start_date=request.start_date,
             end_date=request.end_date,
             portfolio_ids=request.portfolio_ids,
@@ -50,6 +52,7 @@ async def generate_risk_report(request: RiskReportRequest):
             confidence_levels=request.confidence_levels,
             include_stress_test=request.include_stress_test,
             format=request.format,
+            route="reports.generate",
         )
 
         if not report_result["success"]:
@@ -122,12 +125,14 @@ async def get_risk_data(
         confidence_list = [float(cl.strip()) for cl in confidence_levels.split(",")]
 
         # 獲取風險數據
-        risk_data = report_service.get_risk_data(
+        risk_data = await run_sync(
+            report_service.get_risk_data,
             start_date=start_date,
             end_date=end_date,
             portfolio_ids=portfolio_list,
             confidence_levels=confidence_list,
             include_stress_test=include_stress_test,
+            route="reports",
         )
 
         # 模擬風險數據
@@ -277,10 +282,12 @@ async def run_stress_test(
             scenario_list = [scenario.strip() for scenario in scenarios.split(",")]
 
         # 執行壓力測試
-        stress_test_result = report_service.run_stress_test(
+        stress_test_result = await run_sync(
+            report_service.run_stress_test,
             portfolio_ids=portfolio_list,
             scenarios=scenario_list,
             custom_shocks=custom_shocks,
+            route="reports",
         )
 
         # 模擬壓力測試結果
@@ -10,6 +10,7 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query, status
 
 from src.api.models.responses import APIResponse, COMMON_RESPONSES
+from src.api.utils.offload import run_sync
 from src.services.report_service import ReportService
 from .models import TradingReportRequest, TradingReport, ReportResponse
 
@@ -42,7 +43,8 @@ async def generate_trading_report(request: TradingReportRequest):
     """
     try:
         # 生成報表
-        report_result = report_service.generate_trading_report(
+        report_result = await run_sync(
+            report_service.generate_trading_report,
             start_date=request.start_date,
             end_date=request.end_date,
             portfolio_ids=request.portfolio_ids,
@@ -51,6 +53,7 @@ async def generate_trading_report(request: TradingReportRequest):
             include_costs=request.include_costs,
             include_performance=request.include_performance,
             format=request.format,
+            route="reports.generate",
         )
 
         if not report_result["success"]:
@@ -127,13 +130,15 @@ async def get_trading_data(
             symbol_list = [symbol.strip() for symbol in symbols.split(",")]
 
         # 獲取交易數據
-        trading_data = report_service.get_trading_data(
+        trading_data = await run_sync(
+            report_service.get_trading_data,
             start_date=start_date,
             end_date=end_date,
             portfolio_ids=portfolio_list,
             symbols=symbol_list,
             include_costs=include_costs,
             include_performance=include_performance,
+            route="reports",
         )
 
         # 模擬交易數據
@@ -269,11 +274,13 @@ async def get_execution_quality(
             order_type_list = [ot.strip() for ot in order_types.split(",")]
 
         # 獲取執行品質數據
-        execution_quality = report_service.get_execution_quality(
+        execution_quality = await run_sync(
+            report_service.get_execution_quality,
             start_date=start_date,
             end_date=end_date,
             symbols=symbol_list,
             order_types=order_type_list,
+            route="reports",
         )
 
         # 模擬執行品質數據
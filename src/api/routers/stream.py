@@ -0,0 +1,121 @@
+"""即時推送路由
+
+提供行情、訂單狀態與損益的 WebSocket 與 SSE 推送端點，資料來自事件總線，
+取代儀表板對監控與交易端點的輪詢。
+
+WebSocket 不經過 HTTP 認證中間件，以查詢參數 ``token`` 帶入訪問 Token；
+SSE 端點使用一般的 Bearer Token 認證。
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    status,
+)
+from fastapi.responses import StreamingResponse
+
+from src.api.middleware.auth import (
+    TokenBlacklist,
+    TokenManager,
+    verified_token_cache,
+)
+from src.api.models.responses import APIResponse
+from src.api.utils.event_gateway import event_gateway, iter_sse, serve_websocket
+from src.api.utils.security import get_current_user
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """拆分以逗號分隔的查詢參數"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _authenticate(token: str) -> Optional[Dict[str, Any]]:
+    """驗證 WebSocket 的訪問 Token，失敗時返回 None"""
+    if TokenBlacklist.is_blacklisted(token):
+        return None
+    # 快取由認證中間件共用，也可能存有刷新 Token，命中時同樣檢查類型
+    payload = verified_token_cache.get(token)
+    if payload is None:
+        try:
+            payload = TokenManager.verify_token(token)
+        except HTTPException:
+            return None
+        if payload.get("type") == "access":
+            verified_token_cache.put(token, payload)
+    if payload.get("type") != "access":
+        return None
+    return payload
+
+
+@router.websocket("/ws")
+async def stream_websocket(
+    websocket: WebSocket,
+    token: str = Query(..., description="訪問 Token"),
+    topics: Optional[str] = Query(None, description="訂閱主題，以逗號分隔"),
+    symbols: Optional[str] = Query(None, description="股票代號，以逗號分隔"),
+    resume_from: Optional[int] = Query(None, description="最後收到的訊息序號"),
+):
+    """WebSocket 推送端點
+
+    連線後先收到一則快照（或以 ``resume_from`` 恢復時的遺漏增量），之後持續收到
+    增量訊息。
+    """
+    if _authenticate(token) is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    try:
+        client = event_gateway.connect(_split(topics), _split(symbols), resume_from)
+    except ValueError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+
+    await websocket.accept()
+    await serve_websocket(websocket, event_gateway, client)
+
+
+@router.get("/sse")
+async def stream_sse(
+    request: Request,
+    topics: Optional[str] = Query(None, description="訂閱主題，以逗號分隔"),
+    symbols: Optional[str] = Query(None, description="股票代號，以逗號分隔"),
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    current_user: dict = Depends(get_current_user),
+):
+    """SSE 推送端點
+
+    事件 ID 為訊息序號，瀏覽器自動重連時帶回 ``Last-Event-ID`` 即可恢復。
+    """
+    try:
+        client = event_gateway.connect(_split(topics), _split(symbols), last_event_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    logger.debug("SSE 推送連線: %s", current_user.get("username"))
+    return StreamingResponse(
+        iter_sse(event_gateway, client),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats", response_model=APIResponse)
+async def stream_stats(current_user: dict = Depends(get_current_user)):
+    """推送閘道統計"""
+    return APIResponse(
+        success=True, message="推送閘道統計", data=event_gateway.get_stats()
+    )
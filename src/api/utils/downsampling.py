@@ -0,0 +1,112 @@
+"""時間序列降採樣
+
+此模組提供圖表用的時間序列降採樣，在保留曲線形狀的前提下將長序列縮減到
+指定點數，避免將多年的逐日權益曲線整段傳給前端。
+
+- ``lttb``：Largest-Triangle-Three-Buckets，保留視覺上最顯著的轉折點
+- ``minmax``：每個區間保留最小值與最大值，適合需要保留極值的序列（如回撤）
+
+兩種方法都返回原序列的索引，多個共用時間軸的序列可套用同一組索引。
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(
+    y: Sequence[float], max_points: int, x: Optional[Sequence[float]] = None
+) -> np.ndarray:
+    """以 LTTB 演算法選取保留的點
+
+    Args:
+        y: 序列值
+        max_points: 保留的最大點數，至少為 3
+        x: 序列的橫軸值，預設為等距
+
+    Returns:
+        np.ndarray: 遞增的保留點索引，包含首尾兩點
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype="float64") if x is None else np.asarray(x, dtype="float64")
+
+    # 首尾兩點固定保留，其餘點平均分到 max_points - 2 個區間
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    counts = np.diff(edges)
+    # 每個區間的平均點，最後一個區間之後以最後一點為準
+    avg_x = np.append(np.add.reduceat(x[:-1], edges[:-1])[1:] / counts[1:], x[-1])
+    avg_y = np.append(np.add.reduceat(y[:-1], edges[:-1])[1:] / counts[1:], y[-1])
+
+    indices = np.empty(max_points, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+    selected = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        # 與上一個選取點、下一區間平均點構成的三角形面積最大者
+        area = np.abs(
+            (x[selected] - avg_x[i]) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y[i] - y[selected])
+        )
+        selected = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        indices[i + 1] = selected
+    return indices
+
+
+def minmax_indices(y: Sequence[float], max_points: int) -> np.ndarray:
+    """每個區間保留最小值與最大值
+
+    Args:
+        y: 序列值
+        max_points: 保留的最大點數，至少為 4
+
+    Returns:
+        np.ndarray: 遞增的保留點索引，包含首尾兩點
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if max_points >= n or max_points < 4:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, (max_points - 2) // 2 + 1).astype(int)
+    selected = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        bucket = y[start:end]
+        if np.all(np.isnan(bucket)):
+            selected.append(start)
+            continue
+        selected.append(start + int(np.nanargmin(bucket)))
+        selected.append(start + int(np.nanargmax(bucket)))
+    return np.unique(selected)
+
+
+def downsample_indices(
+    y: Sequence[float], max_points: int, method: str = "lttb"
+) -> np.ndarray:
+    """依指定方法選取保留的點
+
+    Args:
+        y: 序列值
+        max_points: 保留的最大點數
+        method: 降採樣方法 (lttb, minmax)
+
+    Returns:
+        np.ndarray: 遞增的保留點索引
+
+    Raises:
+        ValueError: 不支持的降採樣方法
+    """
+    if method == "lttb":
+        return lttb_indices(y, max_points)
+    if method == "minmax":
+        return minmax_indices(y, max_points)
+    raise ValueError(
+        f"不支持的降採樣方法: {method}，支持的方法: {', '.join(DOWNSAMPLE_METHODS)}"
+    )
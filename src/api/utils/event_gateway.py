@@ -0,0 +1,516 @@
+"""即時推送閘道
+
+此模組訂閱 ``EventBus``，將行情、訂單狀態與損益事件轉為增量訊息，經由 WebSocket
+或 SSE 推送給已連線的客戶端，取代儀表板對監控與交易端點的輪詢。
+
+- 閘道保存每個 (主題, 鍵) 的最新狀態，只推送與上一次狀態不同的欄位
+- 行情與損益等高頻主題依鍵合併，客戶端來不及接收時只會收到最新值
+- 訂單主題逐筆保留；慢速客戶端的待送訊息超過上限時丟棄佇列，改送一次完整快照
+  後繼續推送增量
+- 每則訊息帶有序號，客戶端斷線重連時以最後序號恢復，序號仍在重播緩衝區內時只
+  補送遺漏的增量，否則送出快照
+
+Example:
+    ```python
+    client = event_gateway.connect(topics=["quotes"], symbols=["2330.TW"])
+    try:
+        async for message in client.messages():
+            await websocket.send_text(dumps(message).decode())
+    finally:
+        event_gateway.disconnect(client)
+    ```
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from src.api.utils.json_response import dumps
+from src.core.events.event import PNL_TAG, Event, EventType
+
+logger = logging.getLogger(__name__)
+
+TOPIC_QUOTES = "quotes"
+TOPIC_ORDERS = "orders"
+TOPIC_PNL = "pnl"
+TOPICS = (TOPIC_QUOTES, TOPIC_ORDERS, TOPIC_PNL)
+
+# 依鍵合併的高頻主題
+COALESCED_TOPICS = frozenset({TOPIC_QUOTES, TOPIC_PNL})
+
+_QUOTE_EVENTS = frozenset({EventType.MARKET_DATA, EventType.PRICE_CHANGE})
+_ORDER_EVENTS = frozenset(
+    {
+        EventType.ORDER_CREATED,
+        EventType.ORDER_SUBMITTED,
+        EventType.ORDER_FILLED,
+        EventType.ORDER_PARTIALLY_FILLED,
+        EventType.ORDER_CANCELLED,
+        EventType.ORDER_REJECTED,
+        EventType.ORDER_EXPIRED,
+    }
+)
+
+DEFAULT_FLUSH_INTERVAL = 0.1
+DEFAULT_MAX_PENDING = 1_000
+DEFAULT_REPLAY_SIZE = 10_000
+DEFAULT_MAX_STATE_KEYS = 100_000
+SEND_TIMEOUT = 10.0
+SSE_HEARTBEAT_SECONDS = 15.0
+
+StateKey = Tuple[str, str]
+
+
+def classify_event(event: Event) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+    """將事件對應到推送主題
+
+    Args:
+        event: 事件總線上的事件
+
+    Returns:
+        Optional[Tuple[str, str, Dict[str, Any]]]: (主題, 鍵, 欄位)，不需推送時返回 None
+    """
+    if event.event_type in _QUOTE_EVENTS:
+        if not event.subject:
+            return None
+        return TOPIC_QUOTES, event.subject, event.data
+
+    if event.event_type in _ORDER_EVENTS:
+        key = event.data.get("order_id") or event.subject
+        if not key:
+            return None
+        return TOPIC_ORDERS, key, {**event.data, "status": event.event_type.name}
+
+    if PNL_TAG in event.tags:
+        return TOPIC_PNL, event.subject or "portfolio", event.data
+
+    return None
+
+
+def _symbol_of(topic: str, key: str, state: Dict[str, Any]) -> Optional[str]:
+    """取得項目對應的股票代號，沒有對應代號（如組合層級損益）時返回 None"""
+    symbol = state.get("stock_id") or state.get("symbol")
+    if symbol is None and topic == TOPIC_QUOTES:
+        return key
+    return symbol
+
+
+class GatewayClient:
+    """單一推送連線的待送狀態"""
+
+    def __init__(
+        self,
+        gateway: "EventGateway",
+        topics: Optional[Iterable[str]] = None,
+        symbols: Optional[Iterable[str]] = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        """初始化連線
+
+        Args:
+            gateway: 所屬的推送閘道
+            topics: 訂閱的主題，預設全部主題
+            symbols: 訂閱的股票代號，預設不限
+            max_pending: 訂單主題最多保留的待送筆數
+        """
+        self.gateway = gateway
+        self.max_pending = max_pending
+        self.topics: Set[str] = set()
+        self.symbols: Optional[Set[str]] = None
+        self.overflows = 0
+        self.closed = False
+        self._coalesced: Dict[StateKey, Dict[str, Any]] = {}
+        self._ordered: deque = deque()
+        self._needs_snapshot = True
+        self._wakeup = asyncio.Event()
+        self.set_filter(topics, symbols)
+
+    def set_filter(
+        self,
+        topics: Optional[Iterable[str]] = None,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> None:
+        """更新訂閱條件，並在下一則訊息送出符合新條件的快照
+
+        Raises:
+            ValueError: 包含不支持的主題時
+        """
+        topics = set(topics) if topics is not None else set()
+        unknown = topics - set(TOPICS)
+        if unknown:
+            raise ValueError(f"不支持的主題: {', '.join(sorted(unknown))}")
+        symbols = set(symbols) if symbols is not None else set()
+
+        self.gateway._unindex(self)
+        self.topics = topics or set(TOPICS)
+        self.symbols = symbols or None
+        if not self.closed:
+            self.gateway._index(self)
+        self.request_snapshot()
+
+    def request_snapshot(self) -> None:
+        """丟棄待送增量，下一則訊息改送完整快照"""
+        self._coalesced.clear()
+        self._ordered.clear()
+        self._needs_snapshot = True
+        self._wakeup.set()
+
+    def matches(self, topic: str, key: str, state: Dict[str, Any]) -> bool:
+        """檢查項目是否符合訂閱條件"""
+        if topic not in self.topics:
+            return False
+        if self.symbols is None:
+            return True
+        symbol = _symbol_of(topic, key, state)
+        return symbol is None or symbol in self.symbols
+
+    def push(self, topic: str, key: str, delta: Dict[str, Any]) -> None:
+        """加入一筆增量"""
+        if self._needs_snapshot:
+            # 快照會包含最新狀態
+            return
+
+        if topic in COALESCED_TOPICS:
+            pending = self._coalesced.get((topic, key))
+            if pending is None:
+                self._coalesced[(topic, key)] = dict(delta)
+            else:
+                pending.update(delta)
+        elif len(self._ordered) >= self.max_pending:
+            # 慢速客戶端：丟棄待送佇列，改送快照
+            self.overflows += 1
+            self.request_snapshot()
+            return
+        else:
+            self._ordered.append({"topic": topic, "key": key, "data": delta})
+        self._wakeup.set()
+
+    def close(self) -> None:
+        """關閉連線，喚醒等待中的 ``next_message``"""
+        self.closed = True
+        self._wakeup.set()
+
+    async def next_message(
+        self, timeout: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """等待下一則訊息
+
+        Args:
+            timeout: 最長等待秒數，預設無限等待
+
+        Returns:
+            Optional[Dict[str, Any]]: 快照或增量訊息，逾時或連線關閉時返回 None
+        """
+        while not self.closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+            self._wakeup.clear()
+            if self.closed:
+                break
+
+            if self._needs_snapshot:
+                self._needs_snapshot = False
+                return self.gateway.snapshot(self)
+
+            if self._ordered or self._coalesced:
+                items = list(self._ordered)
+                items.extend(
+                    {"topic": topic, "key": key, "data": data}
+                    for (topic, key), data in self._coalesced.items()
+                )
+                self._ordered.clear()
+                self._coalesced.clear()
+                return {"type": "delta", "seq": self.gateway.seq, "items": items}
+        return None
+
+    async def messages(self) -> AsyncIterator[Dict[str, Any]]:
+        """依序產生訊息，每則訊息之間間隔 ``flush_interval`` 以合併高頻更新"""
+        while True:
+            message = await self.next_message()
+            if message is None:
+                return
+            yield message
+            await asyncio.sleep(self.gateway.flush_interval)
+
+
+class EventGateway:
+    """事件推送閘道
+
+    狀態只在事件迴圈中修改；事件總線的回調在總線執行緒上執行，經由
+    ``call_soon_threadsafe`` 轉回事件迴圈。
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        replay_size: int = DEFAULT_REPLAY_SIZE,
+        max_state_keys: int = DEFAULT_MAX_STATE_KEYS,
+    ):
+        """初始化閘道
+
+        Args:
+            flush_interval: 同一連線兩則訊息之間的最短間隔（秒）
+            max_pending: 每個連線訂單主題最多保留的待送筆數
+            replay_size: 供斷線恢復使用的重播緩衝區大小
+            max_state_keys: 最多保存的最新狀態筆數，超過時淘汰最久未更新者
+        """
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_state_keys = max_state_keys
+        self.seq = 0
+        self._state: "OrderedDict[StateKey, Dict[str, Any]]" = OrderedDict()
+        self._replay: deque = deque(maxlen=replay_size)
+        self._clients: Set[GatewayClient] = set()
+        # 依股票代號索引連線，發布時只檢查可能符合的連線
+        self._unfiltered: Set[GatewayClient] = set()
+        self._by_symbol: Dict[str, Set[GatewayClient]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bus = None
+        self._subscription = None
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def start(self, bus=None) -> None:
+        """訂閱事件總線，需在事件迴圈中呼叫
+
+        Args:
+            bus: 事件總線，預設使用全域事件總線並在未啟動時啟動
+        """
+        if self._subscription is not None:
+            return
+        if bus is None:
+            # 延遲匯入，避免只使用閘道的模組建立事件總線的執行緒池
+            from src.core.events.event_bus import event_bus as bus
+
+            if not bus.get_stats()["running"]:
+                bus.start()
+        self._loop = asyncio.get_running_loop()
+        self._bus = bus
+        self._subscription = bus.subscribe(None, self._on_event)
+        logger.info("推送閘道已訂閱事件總線")
+
+    def stop(self) -> None:
+        """取消訂閱並關閉所有連線"""
+        if self._subscription is not None:
+            self._bus.unsubscribe(self._subscription)
+            self._subscription = None
+        for client in list(self._clients):
+            self.disconnect(client)
+
+    def connect(
+        self,
+        topics: Optional[Iterable[str]] = None,
+        symbols: Optional[Iterable[str]] = None,
+        resume_from: Optional[int] = None,
+    ) -> GatewayClient:
+        """建立推送連線
+
+        Args:
+            topics: 訂閱的主題
+            symbols: 訂閱的股票代號
+            resume_from: 客戶端最後收到的序號，提供時優先補送遺漏的增量
+
+        Returns:
+            GatewayClient: 推送連線
+        """
+        client = GatewayClient(self, topics, symbols, self.max_pending)
+        if resume_from is not None:
+            self.resume(client, resume_from)
+        return client
+
+    def disconnect(self, client: GatewayClient) -> None:
+        """移除推送連線"""
+        client.close()
+        self._unindex(client)
+
+    def resume(self, client: GatewayClient, last_seq: int) -> None:
+        """從指定序號恢復推送
+
+        序號仍在重播緩衝區內時補送之後的增量，否則維持快照。
+        """
+        oldest = self._replay[0][0] if self._replay else self.seq + 1
+        if last_seq > self.seq or last_seq + 1 < oldest:
+            client.request_snapshot()
+            return
+
+        client._needs_snapshot = False
+        for seq, topic, key, delta in self._replay:
+            if seq > last_seq and client.matches(
+                topic, key, self._state_of(topic, key)
+            ):
+                client.push(topic, key, delta)
+        client._wakeup.set()
+
+    def publish(self, topic: str, key: str, data: Dict[str, Any]) -> None:
+        """發布一筆更新，需在事件迴圈中呼叫
+
+        Args:
+            topic: 主題
+            key: 主題內的鍵，如股票代號或訂單 ID
+            data: 最新欄位值
+        """
+        state_key = (topic, key)
+        state = self._state.get(state_key)
+        if state is None:
+            delta = dict(data)
+            state = dict(data)
+            self._state[state_key] = state
+            if len(self._state) > self.max_state_keys:
+                self._state.popitem(last=False)
+        else:
+            delta = {
+                field: value
+                for field, value in data.items()
+                if field not in state or state[field] != value
+            }
+            if not delta:
+                return
+            state.update(delta)
+            self._state.move_to_end(state_key)
+
+        self.seq += 1
+        self._replay.append((self.seq, topic, key, delta))
+
+        symbol = _symbol_of(topic, key, state)
+        if symbol is None:
+            candidates = self._clients
+        else:
+            candidates = self._by_symbol.get(symbol, set()) | self._unfiltered
+        for client in candidates:
+            if topic in client.topics:
+                client.push(topic, key, delta)
+
+    def snapshot(self, client: GatewayClient) -> Dict[str, Any]:
+        """產生符合連線訂閱條件的完整快照"""
+        items = [
+            {"topic": topic, "key": key, "data": dict(state)}
+            for (topic, key), state in self._state.items()
+            if client.matches(topic, key, state)
+        ]
+        return {"type": "snapshot", "seq": self.seq, "items": items}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """獲取閘道統計資訊"""
+        return {
+            "clients": len(self._clients),
+            "seq": self.seq,
+            "state_keys": len(self._state),
+            "replay_size": len(self._replay),
+            "overflows": sum(client.overflows for client in self._clients),
+        }
+
+    def _index(self, client: GatewayClient) -> None:
+        self._clients.add(client)
+        if client.symbols is None:
+            self._unfiltered.add(client)
+            return
+        for symbol in client.symbols:
+            self._by_symbol.setdefault(symbol, set()).add(client)
+
+    def _unindex(self, client: GatewayClient) -> None:
+        if client not in self._clients:
+            return
+        self._clients.discard(client)
+        self._unfiltered.discard(client)
+        for symbol in client.symbols or ():
+            clients = self._by_symbol.get(symbol)
+            if clients is not None:
+                clients.discard(client)
+                if not clients:
+                    del self._by_symbol[symbol]
+
+    def _state_of(self, topic: str, key: str) -> Dict[str, Any]:
+        return self._state.get((topic, key), {})
+
+    def _on_event(self, event: Event) -> None:
+        """事件總線回調（在總線執行緒上執行）"""
+        classified = classify_event(event)
+        if classified is None or self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self.publish, *classified)
+        except RuntimeError:
+            # 事件迴圈已關閉
+            pass
+
+
+async def serve_websocket(
+    websocket: WebSocket, gateway: "EventGateway", client: GatewayClient
+) -> None:
+    """在已接受的 WebSocket 上推送訊息
+
+    客戶端可以送出 ``{"type": "subscribe", "topics": [...], "symbols": [...]}`` 更新
+    訂閱條件，或 ``{"type": "snapshot"}`` 要求重新同步。送出逾時的連線視為慢速客戶端
+    並關閉。
+    """
+
+    async def receive():
+        while True:
+            message = await websocket.receive_json()
+            message_type = message.get("type")
+            if message_type == "subscribe":
+                try:
+                    client.set_filter(message.get("topics"), message.get("symbols"))
+                except ValueError as e:
+                    logger.warning("推送訂閱條件無效: %s", e)
+            elif message_type == "snapshot":
+                client.request_snapshot()
+
+    async def send():
+        async for message in client.messages():
+            await asyncio.wait_for(
+                websocket.send_text(dumps(message).decode()), SEND_TIMEOUT
+            )
+
+    tasks = [asyncio.create_task(receive()), asyncio.create_task(send())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                logger.warning("推送連線中斷: %s", error)
+    finally:
+        for task in tasks:
+            task.cancel()
+        gateway.disconnect(client)
+
+
+async def iter_sse(
+    gateway: "EventGateway",
+    client: GatewayClient,
+    heartbeat: float = SSE_HEARTBEAT_SECONDS,
+) -> AsyncIterator[bytes]:
+    """將推送訊息轉為 Server-Sent Events
+
+    事件 ID 為訊息序號，瀏覽器重連時以 ``Last-Event-ID`` 帶回即可恢復；閒置時
+    定期送出註解行，避免代理伺服器關閉連線。
+    """
+    try:
+        while True:
+            message = await client.next_message(timeout=heartbeat)
+            if message is None:
+                if client.closed:
+                    return
+                yield b": keepalive\n\n"
+                continue
+            yield (
+                f"id: {message['seq']}\nevent: {message['type']}\n".encode()
+                + b"data: "
+                + dumps(message)
+                + b"\n\n"
+            )
+            await asyncio.sleep(gateway.flush_interval)
+    finally:
+        gateway.disconnect(client)
+
+
+# 全域推送閘道實例
+event_gateway = EventGateway()
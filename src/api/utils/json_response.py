@@ -0,0 +1,118 @@
+"""高效能 JSON 回應
+
+此模組提供以 ``orjson`` 序列化的 JSON 回應類別，並可直接序列化 pandas
+DataFrame / Series 與 numpy 陣列，讓大型資料回應不必先逐列轉為 Python 物件。
+未安裝 ``orjson`` 時退回標準庫 ``json``。
+"""
+
+import datetime
+import decimal
+import json
+import math
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _frame_payload(frame: pd.DataFrame) -> Any:
+    """DataFrame 以欄位為單位輸出，數值欄位保持 numpy 陣列"""
+    frame = frame.reset_index() if not isinstance(frame.index, pd.RangeIndex) else frame
+    columns = {}
+    for name, column in frame.items():
+        if pd.api.types.is_datetime64_any_dtype(column):
+            values = column.dt.strftime("%Y-%m-%dT%H:%M:%S").where(column.notna(), None)
+            columns[str(name)] = values.tolist()
+        elif pd.api.types.is_integer_dtype(column) and not column.hasnans:
+            columns[str(name)] = column.to_numpy(dtype="int64")
+        elif pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(
+            column
+        ):
+            columns[str(name)] = column.to_numpy(dtype="float64", na_value=np.nan)
+        else:
+            columns[str(name)] = (
+                column.astype(object).where(column.notna(), None).tolist()
+            )
+    return columns
+
+
+def _default(value: Any) -> Any:
+    """序列化 orjson / json 不支援的型別"""
+    if isinstance(value, pd.DataFrame):
+        return _frame_payload(value)
+    if isinstance(value, pd.Series):
+        return _frame_payload(value.to_frame())
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if value is pd.NaT:
+        return None
+    raise TypeError(f"無法序列化的型別: {type(value).__name__}")
+
+
+def _json_default(value: Any) -> Any:
+    """標準庫 json 的序列化函數，NaN 轉為 null 以與 orjson 輸出一致"""
+    result = _default(value)
+    if isinstance(result, np.ndarray):
+        return [None if math.isnan(v) else v for v in result.tolist()]
+    if isinstance(result, dict):
+        return {
+            key: (
+                [None if math.isnan(v) else v for v in column.tolist()]
+                if isinstance(column, np.ndarray)
+                else column
+            )
+            for key, column in result.items()
+        }
+    return result
+
+
+def dumps(content: Any) -> bytes:
+    """將內容序列化為 JSON 位元組
+
+    Args:
+        content: 要序列化的內容
+
+    Returns:
+        bytes: JSON 位元組
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        content,
+        default=_json_default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """以 orjson 序列化的 JSON 回應
+
+    可作為應用的 ``default_response_class``，也可在路由中直接返回包含
+    DataFrame 的內容以跳過逐列的 Pydantic 驗證。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,274 @@
+"""同步服務呼叫卸載工具
+
+此模組提供將同步服務呼叫（SQLAlchemy 查詢、pandas 運算、報表生成等）
+移出事件迴圈的工具，避免 ``async def`` 路由直接呼叫同步程式碼而阻塞其他請求。
+
+- I/O 或會釋放 GIL 的呼叫在有界執行緒池執行
+- 純 CPU 運算可指定 ``use_process=True`` 在有界行程池執行（參數與返回值需可序列化）
+- 每個路由鍵有獨立的併發上限，超過上限的請求在事件迴圈上等待，不佔用執行緒
+
+Example:
+    ```python
+    from src.api.utils.offload import offload, run_sync
+
+    results = await run_sync(
+        backtest_service.get_backtest_results, backtest_id, route="backtest"
+    )
+
+    @offload(route="reports.build", max_concurrency=2)
+    def build_report(portfolio_id: str) -> bytes:
+        ...
+    ```
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_THREAD_WORKERS = int(
+    os.getenv("API_OFFLOAD_THREADS", str(min(32, (os.cpu_count() or 1) + 4)))
+)
+DEFAULT_PROCESS_WORKERS = int(
+    os.getenv("API_OFFLOAD_PROCESSES", str(os.cpu_count() or 1))
+)
+DEFAULT_ROUTE_CONCURRENCY = int(os.getenv("API_OFFLOAD_ROUTE_CONCURRENCY", "8"))
+
+# 特別耗資源的路由鍵預設較低的併發上限
+ROUTE_CONCURRENCY_LIMITS: Dict[str, int] = {
+    "backtest.export": 2,
+    "reports.generate": 2,
+}
+
+
+class ServiceExecutor:
+    """同步服務呼叫的有界執行器"""
+
+    def __init__(
+        self,
+        max_threads: int = DEFAULT_THREAD_WORKERS,
+        max_processes: int = DEFAULT_PROCESS_WORKERS,
+        default_route_concurrency: int = DEFAULT_ROUTE_CONCURRENCY,
+        route_limits: Optional[Dict[str, int]] = None,
+    ):
+        """初始化執行器
+
+        Args:
+            max_threads: 執行緒池大小
+            max_processes: 行程池大小
+            default_route_concurrency: 未設定上限的路由鍵的併發上限
+            route_limits: 路由鍵對應的併發上限
+        """
+        self.max_threads = max(1, max_threads)
+        self.max_processes = max(1, max_processes)
+        self.default_route_concurrency = max(1, default_route_concurrency)
+        self.route_limits = dict(ROUTE_CONCURRENCY_LIMITS)
+        self.route_limits.update(route_limits or {})
+
+        self._lock = threading.Lock()
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        # asyncio.Semaphore 會綁定到第一次使用的事件迴圈，因此依迴圈分開保存
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._active: Dict[str, int] = {}
+        self._waiting: Dict[str, int] = {}
+
+    def set_route_limit(self, route: str, limit: int) -> None:
+        """設定路由鍵的併發上限
+
+        只影響之後才建立的信號量，應在應用啟動時設定。
+
+        Args:
+            route: 路由鍵
+            limit: 併發上限
+        """
+        self.route_limits[route] = max(1, limit)
+
+    async def run(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        route: Optional[str] = None,
+        use_process: bool = False,
+        **kwargs: Any,
+    ) -> T:
+        """在執行池中執行同步函數
+
+        Args:
+            func: 同步函數
+            *args: 位置參數
+            route: 路由鍵，用於併發上限；None 表示只受執行池大小限制
+            use_process: 是否在行程池執行
+            **kwargs: 關鍵字參數
+
+        Returns:
+            T: 函數返回值
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_process_pool() if use_process else self._get_thread_pool()
+        call = functools.partial(func, *args, **kwargs)
+
+        if route is None:
+            return await loop.run_in_executor(executor, call)
+
+        semaphore = self._get_semaphore(loop, route)
+        self._add(self._waiting, route, 1)
+        try:
+            await semaphore.acquire()
+        finally:
+            self._add(self._waiting, route, -1)
+        self._add(self._active, route, 1)
+        try:
+            return await loop.run_in_executor(executor, call)
+        finally:
+            self._add(self._active, route, -1)
+            semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """獲取執行器統計
+
+        Returns:
+            Dict[str, Any]: 執行池大小與各路由鍵的執行中、等待中請求數
+        """
+        with self._lock:
+            routes = set(self._active) | set(self._waiting)
+            return {
+                "max_threads": self.max_threads,
+                "max_processes": self.max_processes,
+                "routes": {
+                    route: {
+                        "limit": self.route_limits.get(
+                            route, self.default_route_concurrency
+                        ),
+                        "active": self._active.get(route, 0),
+                        "waiting": self._waiting.get(route, 0),
+                    }
+                    for route in sorted(routes)
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """關閉執行池
+
+        Args:
+            wait: 是否等待執行中的呼叫完成
+        """
+        with self._lock:
+            thread_pool, self._thread_pool = self._thread_pool, None
+            process_pool, self._process_pool = self._process_pool, None
+        if thread_pool is not None:
+            thread_pool.shutdown(wait=wait)
+        if process_pool is not None:
+            process_pool.shutdown(wait=wait)
+
+    def _reset_after_fork(self) -> None:
+        """在 fork 出的子行程中捨棄繼承的執行池
+
+        子行程不會繼承父行程的工作執行緒，沿用舊的執行池會使提交的呼叫永遠等待。
+        """
+        self._lock = threading.Lock()
+        self._thread_pool = None
+        self._process_pool = None
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._active = {}
+        self._waiting = {}
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_threads, thread_name_prefix="api-offload"
+                )
+            return self._thread_pool
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_processes)
+            return self._process_pool
+
+    def _get_semaphore(
+        self, loop: asyncio.AbstractEventLoop, route: str
+    ) -> asyncio.Semaphore:
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            if route not in semaphores:
+                semaphores[route] = asyncio.Semaphore(
+                    self.route_limits.get(route, self.default_route_concurrency)
+                )
+            return semaphores[route]
+
+    def _add(self, counters: Dict[str, int], route: str, delta: int) -> None:
+        with self._lock:
+            counters[route] = counters.get(route, 0) + delta
+
+
+# 全域執行器實例
+service_executor = ServiceExecutor()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=service_executor._reset_after_fork)
+
+
+async def run_sync(
+    func: Callable[..., T],
+    *args: Any,
+    route: Optional[str] = None,
+    use_process: bool = False,
+    **kwargs: Any,
+) -> T:
+    """以全域執行器執行同步函數
+
+    Args:
+        func: 同步函數
+        *args: 位置參數
+        route: 路由鍵，用於併發上限
+        use_process: 是否在行程池執行
+        **kwargs: 關鍵字參數
+
+    Returns:
+        T: 函數返回值
+    """
+    return await service_executor.run(
+        func, *args, route=route, use_process=use_process, **kwargs
+    )
+
+
+def offload(
+    route: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+) -> Callable[[Callable[..., T]], Callable[..., Any]]:
+    """將同步函數包裝為在執行緒池執行的協程函數
+
+    裝飾後模組層級的名稱指向包裝函數，原函數無法被 pickle，因此需要行程池時
+    請改用 ``run_sync(..., use_process=True)``；原函數保留在 ``wrapper.sync``。
+
+    Args:
+        route: 路由鍵，預設為函數的模組與名稱
+        max_concurrency: 路由鍵的併發上限
+
+    Returns:
+        Callable: 裝飾器
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., Any]:
+        route_key = route or f"{func.__module__}.{func.__qualname__}"
+        if max_concurrency is not None:
+            service_executor.set_route_limit(route_key, max_concurrency)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            return await service_executor.run(func, *args, route=route_key, **kwargs)
+
+        wrapper.sync = func
+        return wrapper
+
+    return decorator
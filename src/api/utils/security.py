@@ -10,7 +10,12 @@ from fastapi import HTTPException, Depends, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import logging
 
-from src.api.middleware.auth import TokenManager, TokenBlacklist, PermissionChecker
+from src.api.middleware.auth import (
+    TokenManager,
+    TokenBlacklist,
+    PermissionChecker,
+    verified_token_cache,
+)
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
@@ -47,8 +52,10 @@ async def verify_token(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Token 已失效"
             )
 
-        # 驗證 Token
-        payload = TokenManager.verify_token(token)
+        # 驗證 Token，已由認證中間件驗證過的 Token 直接使用快取的載荷
+        payload = verified_token_cache.get(token)
+        if payload is None:
+            payload = TokenManager.verify_token(token)
 
         return payload
 
@@ -0,0 +1,127 @@
+"""分批串流回應
+
+此模組將分批產生的資料轉為 NDJSON 或 Arrow IPC 串流回應，讓需要完整解析度的
+客戶端逐批接收資料，伺服器不必先組出整個 JSON 回應。
+
+資料來源是同步產生器時，Starlette 會在執行緒池中迭代，不會阻塞事件迴圈。
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List
+
+import pandas as pd
+import pyarrow as pa
+from fastapi.responses import StreamingResponse
+
+from src.api.utils.json_response import dumps
+
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+Batch = List[Dict[str, Any]]
+
+
+def iter_ndjson(batches: Iterable[Batch]) -> Iterator[bytes]:
+    """將記錄批次轉為 NDJSON，每批輸出一個區塊
+
+    Args:
+        batches: 記錄批次
+
+    Yields:
+        bytes: 以換行分隔的 JSON 記錄
+    """
+    for batch in batches:
+        if batch:
+            yield b"".join(dumps(record) + b"\n" for record in batch)
+
+
+def iter_arrow(batches: Iterable[Batch]) -> Iterator[bytes]:
+    """將記錄批次轉為 Arrow IPC 串流格式
+
+    結構以第一批記錄推斷，之後的批次轉為相同結構；沒有任何記錄時輸出空串流。
+
+    Args:
+        batches: 記錄批次
+
+    Yields:
+        bytes: Arrow IPC 串流區塊
+    """
+    sink = _ChunkSink()
+    writer = None
+    schema = None
+    for batch in batches:
+        if not batch:
+            continue
+        frame = pd.DataFrame.from_records(batch)
+        table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+        if writer is None:
+            schema = table.schema
+            writer = pa.ipc.new_stream(sink, schema)
+        writer.write_table(table)
+        yield sink.drain()
+
+    if writer is None:
+        writer = pa.ipc.new_stream(sink, pa.schema([]))
+    writer.close()
+    yield sink.drain()
+
+
+class _ChunkSink:
+    """收集 Arrow 寫入區塊的輸出目標，每批寫入後取出已寫入的位元組"""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_batches(
+    batches: Iterable[Batch], stream_format: str, filename: str
+) -> StreamingResponse:
+    """建立分批串流回應
+
+    Args:
+        batches: 記錄批次
+        stream_format: 串流格式 (ndjson, arrow)
+        filename: 下載檔名（不含副檔名）
+
+    Returns:
+        StreamingResponse: 串流回應
+
+    Raises:
+        ValueError: 不支持的串流格式
+    """
+    if stream_format not in STREAM_FORMATS:
+        raise ValueError(
+            f"不支持的串流格式: {stream_format}，"
+            f"支持的格式: {', '.join(STREAM_FORMATS)}"
+        )
+    content = iter_arrow(batches) if stream_format == "arrow" else iter_ndjson(batches)
+    return StreamingResponse(
+        content,
+        media_type=STREAM_FORMATS[stream_format],
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}.{stream_format}"
+        },
+    )
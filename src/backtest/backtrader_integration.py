@@ -12,7 +12,7 @@ import json
 import logging
 import os
 from datetime import datetime
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 import backtrader as bt
 import backtrader.analyzers as btanalyzers
@@ -32,11 +32,48 @@ class PandasDataFeed(btfeeds.PandasData):
     """Pandas 資料饋送
 
     擴展 Backtrader 的 PandasData 類，支援更多欄位。
+    開始時將各欄位一次轉為列表，逐根載入時以索引取值，
+    不再對每根 K 棒的每個欄位呼叫 DataFrame.iloc，載入的值與原本相同。
     """
 
     lines = ("signal",)
     params = (("signal", -1),)
 
+    def start(self):
+        """開始載入資料，預先取出各欄位的值"""
+        super().start()
+
+        frame = self.p.dataname
+        self._columns = []
+        for datafield in self.getlinealiases():
+            if datafield == "datetime":
+                continue
+            colindex = self._colmapping[datafield]
+            if colindex is None:
+                continue
+            self._columns.append(
+                (getattr(self.lines, datafield), frame.iloc[:, colindex].tolist())
+            )
+
+        coldtime = self._colmapping["datetime"]
+        stamps = frame.index if coldtime is None else frame.iloc[:, coldtime]
+        self._dtnums = [bt.date2num(tstamp.to_pydatetime()) for tstamp in stamps]
+
+    def _load(self):
+        """載入下一根 K 棒
+
+        Returns:
+            bool: 是否還有資料
+        """
+        self._idx += 1
+        if self._idx >= len(self._dtnums):
+            return False
+
+        for line, values in self._columns:
+            line[0] = values[self._idx]
+        self.lines.datetime[0] = self._dtnums[self._idx]
+        return True
+
 
 class ModelSignalStrategy(bt.Strategy):
     """模型訊號策略
@@ -59,6 +96,7 @@ class ModelSignalStrategy(bt.Strategy):
         ("atr_period", 14),  # ATR 週期
         ("max_positions", 5),  # 最大持倉數量
         ("rebalance_freq", 5),  # 再平衡頻率（天）
+        ("precompute", False),  # 是否在第一根 K 棒前批次計算所有特徵與預測
         ("verbose", False),  # 是否輸出詳細資訊
     )
 
@@ -83,6 +121,12 @@ class ModelSignalStrategy(bt.Strategy):
             logger.error("必須提供模型或推論管道")
             raise ValueError("必須提供模型或推論管道")
 
+        # 批次預測結果，依日期查表
+        self.signal_dates = None
+        self.predictions = None
+        if self.p.precompute:
+            self.precompute_signals()
+
     def log(self, txt, dt=None):
         """記錄訊息
 
@@ -176,8 +220,20 @@ class ModelSignalStrategy(bt.Strategy):
         # 獲取當前資料
         features = {}
 
-        # 如果沒有指定特徵欄位，則使用所有可用欄位
-        feature_columns = self.p.feature_columns or [
+        # 收集特徵
+        for data in self.datas:
+            for col in self._get_feature_columns():
+                if hasattr(data.lines, col):
+                    features[f"{data._name}_{col}"] = getattr(data.lines, col)[0]
+
+        # 創建特徵資料框
+        features_df = pd.DataFrame([features])
+
+        return features_df
+
+    def _get_feature_columns(self):
+        """獲取特徵欄位，未指定時使用價量欄位"""
+        return self.p.feature_columns or [
             "open",
             "high",
             "low",
@@ -185,26 +241,64 @@ class ModelSignalStrategy(bt.Strategy):
             "volume",
         ]
 
-        # 收集特徵
-        for data in self.datas:
-            for col in feature_columns:
+    def precompute_signals(self):
+        """批次計算所有 K 棒的特徵與預測
+
+        在資料預先載入後、第一根 K 棒之前執行一次。各資料依日期對齊到所有資料
+        日期的聯集，沒有新 K 棒的日期沿用前一根，與逐根呼叫 prepare_features
+        時各資料 [0] 的值相同；模型只呼叫一次，next() 依日期查表取得預測。
+        next() 在所有資料都有 K 棒後才執行，因此只預測最晚開始的資料第一根
+        K 棒之後的日期，模型不會收到缺值。
+        資料未預先載入時（例如 exactbars=1）改回逐根預測。
+        """
+        if not all(data.buflen() for data in self.datas):
+            logger.warning("資料未預先載入，改為逐根 K 棒預測")
+            return
+
+        times = [
+            np.asarray(data.datetime.array[: data.buflen()]) for data in self.datas
+        ]
+        dates = np.unique(np.concatenate(times))
+        dates = dates[dates >= max(data_times[0] for data_times in times)]
+
+        # 欄位順序與 prepare_features 相同
+        features = {}
+        for data, data_times in zip(self.datas, times):
+            rows = np.searchsorted(data_times, dates, side="right") - 1
+            for col in self._get_feature_columns():
                 if hasattr(data.lines, col):
-                    features[f"{data._name}_{col}"] = getattr(data.lines, col)[0]
+                    values = np.asarray(getattr(data.lines, col).array[: data.buflen()])
+                    features[f"{data._name}_{col}"] = values[rows]
+        self.features_df = pd.DataFrame(features)
+
+        predictor = (
+            self.p.inference_pipeline
+            if self.p.inference_pipeline is not None
+            else self.p.model
+        )
+        self.predictions = np.asarray(predictor.predict(self.features_df))
+        self.signal_dates = dates
 
-        # 創建特徵資料框
-        features_df = pd.DataFrame([features])
+    def _lookup_predictions(self):
+        """查詢目前 K 棒的預測結果
 
-        return features_df
+        Returns:
+            np.ndarray: 與對單列特徵呼叫 predict 相同形狀的預測結果
+        """
+        row = np.searchsorted(self.signal_dates, self.datetime[0], side="right") - 1
+        return self.predictions[row : row + 1]
 
     def _process_predictions(self, predictions):
         """處理預測結果
 
         Args:
-            predictions: 模型預測結果
+            predictions: 模型預測結果，多輸出模型的單列結果視為各資料的訊號
 
         Returns:
             Dict[str, float]: 訊號字典
         """
+        if isinstance(predictions, np.ndarray) and predictions.ndim == 2:
+            predictions = predictions[0]
         signals = {}
         for i, data in enumerate(self.datas):
             if isinstance(predictions, list) and len(predictions) > i:
@@ -237,6 +331,10 @@ class ModelSignalStrategy(bt.Strategy):
         Returns:
             Dict[str, float]: 訊號字典，鍵為資料名稱，值為訊號值
         """
+        if self.predictions is not None:
+            # 使用批次預測結果
+            return self._process_predictions(self._lookup_predictions())
+
         # 準備特徵
         self.features_df = self.prepare_features()
 
@@ -372,9 +470,19 @@ class BacktestEngine:
         slippage: float = 0.001,
         tax: float = 0.003,
         output_dir: Optional[str] = None,
+        preload: bool = True,
+        runonce: bool = True,
+        exactbars: Union[bool, int] = False,
+        stdstats: bool = True,
     ):
         """初始化回測引擎
 
+        大量標的時建議 stdstats=False，省去每個資料一個的買賣點觀察器，
+        記憶體與時間皆明顯下降。策略使用指標時可再將 exactbars 設為 -1 或 -2，
+        不保留指標的完整歷史，資料仍預先載入、可搭配 ModelSignalStrategy 的
+        precompute，但會停用 runonce；exactbars=1 同時停用預先載入，
+        記憶體最少但只能逐根預測。
+
         Args:
             data (Optional[pd.DataFrame]): 資料
             data_path (Optional[str]): 資料路徑
@@ -385,6 +493,10 @@ class BacktestEngine:
             slippage (float): 滑價率
             tax (float): 稅率
             output_dir (Optional[str]): 輸出目錄
+            preload (bool): 是否預先載入資料
+            runonce (bool): 是否以向量化方式計算指標
+            exactbars (Union[bool, int]): Backtrader 的記憶體節省模式
+            stdstats (bool): 是否加入預設觀察器
         """
         self.data = data
         self.data_path = data_path
@@ -402,7 +514,9 @@ class BacktestEngine:
         os.makedirs(self.output_dir, exist_ok=True)
 
         # 初始化 Backtrader
-        self.cerebro = bt.Cerebro()
+        self.cerebro = bt.Cerebro(
+            preload=preload, runonce=runonce, exactbars=exactbars, stdstats=stdstats
+        )
 
         # 設定初始資金
         self.cerebro.broker.setcash(cash)
@@ -485,6 +599,44 @@ class BacktestEngine:
             logger.error("必須提供資料或資料路徑")
             raise ValueError("必須提供資料或資料路徑")
 
+    def add_symbols(
+        self,
+        data: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+        symbol_column: str = "symbol",
+        date_column: str = "date",
+        **kwargs,
+    ) -> List[str]:
+        """批次添加多個標的的資料
+
+        長格式資料只分組一次，每個標的建立一個資料饋送，
+        避免呼叫端逐一篩選整份資料。
+
+        Args:
+            data (Union[pd.DataFrame, Dict[str, pd.DataFrame]]): 含標的欄位的長格式
+                資料，或以標的為鍵、日期為索引的資料字典
+            symbol_column (str): 標的欄位
+            date_column (str): 日期欄位，長格式資料使用
+            **kwargs: 傳給 add_data 的其他參數
+
+        Returns:
+            List[str]: 依添加順序排列的標的
+        """
+        if isinstance(data, pd.DataFrame):
+            frames = {
+                symbol: group.drop(columns=symbol_column)
+                .set_index(pd.to_datetime(group[date_column]))
+                .drop(columns=date_column)
+                .sort_index()
+                for symbol, group in data.groupby(symbol_column, sort=True)
+            }
+        else:
+            frames = data
+
+        for symbol, frame in frames.items():
+            self.add_data(data=frame, name=str(symbol), **kwargs)
+
+        return [str(symbol) for symbol in frames]
+
     def add_strategy(self, strategy: bt.Strategy, **kwargs) -> None:
         """添加策略
 
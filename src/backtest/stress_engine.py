@@ -0,0 +1,686 @@
+# -*- coding: utf-8 -*-
+"""
+批次壓力測試引擎
+
+此模組以同一份基準價格面板一次產生多個壓力情境：
+
+- 基準面板轉為對數報酬率後複製為 (情境數, 日期數, 資產數) 的張量
+- 崩盤、波動率、相關性、流動性與歷史重播等衝擊皆以遮罩與矩陣運算套用，
+  同類型衝擊一次作用於所有情境
+- 投資組合以向量化方式在所有情境下重新評價，輸出情境 × 指標矩陣
+- 需要完整路徑相依回測的情境交給行程池，每個工作行程只接收一次基準面板，
+  之後只傳送情境定義，在工作行程內自行重建情境資料
+
+衝擊依類型以固定順序套用：歷史重播、波動率、相關性、價格、流動性；
+同類型的多個衝擊依情境中列出的順序套用。
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# 設定日誌
+logger = logging.getLogger(__name__)
+
+# 向量化重新評價輸出的指標
+STRESS_METRICS = (
+    "total_return",
+    "annual_volatility",
+    "max_drawdown",
+    "var_95",
+    "cvar_95",
+    "worst_day",
+    "transaction_cost",
+)
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+
+Period = Tuple[str, str]
+
+
+def _period_mask(dates: pd.DatetimeIndex, periods: Sequence[Period]) -> np.ndarray:
+    """各期間的日期遮罩，形狀為 (期間數, 日期數)"""
+    values = dates.values
+    starts = pd.to_datetime([p[0] for p in periods]).values
+    ends = pd.to_datetime([p[1] for p in periods]).values
+    return (values >= starts[:, None]) & (values <= ends[:, None])
+
+
+def _asset_mask(assets: List[str], selections: Sequence[Optional[List[str]]]):
+    """各衝擊作用資產的遮罩，形狀為 (衝擊數, 資產數)"""
+    mask = np.ones((len(selections), len(assets)), dtype=bool)
+    for i, selected in enumerate(selections):
+        if selected is not None:
+            mask[i] = np.isin(assets, selected)
+    return mask
+
+
+def _sqrtm(matrices: np.ndarray, inverse: bool = False) -> np.ndarray:
+    """對稱半正定矩陣的平方根或其反矩陣，可批次計算"""
+    values, vectors = np.linalg.eigh(matrices)
+    values = np.maximum(values, 1e-12)
+    roots = values ** (-0.5 if inverse else 0.5)
+    return (vectors * roots[..., None, :]) @ np.swapaxes(vectors, -1, -2)
+
+
+@dataclass
+class Shock(ABC):
+    """壓力衝擊基類
+
+    子類別需實作 ``apply_batch``，未實作時無法建立實例。
+
+    Attributes:
+        period: 衝擊期間，格式為 (開始日期, 結束日期)
+    """
+
+    period: Period
+
+    # 同一情境中不同類型衝擊的套用順序
+    order = 0
+
+    @classmethod
+    @abstractmethod
+    def apply_batch(cls, paths: "ScenarioPaths", rows: np.ndarray, shocks: List):
+        """將同類型的衝擊一次套用到多個情境，rows 中的情境不重複"""
+
+
+@dataclass
+class PriceShock(Shock):
+    """價格衝擊（崩盤或復甦）
+
+    期間內的報酬率改為固定的日報酬率，使期間累積報酬率等於 total_return。
+
+    Attributes:
+        total_return: 期間累積報酬率，負數表示下跌
+        assets: 作用的資產，None 表示全部資產
+    """
+
+    total_return: float = -0.2
+    assets: Optional[List[str]] = None
+
+    order = 3
+
+    @classmethod
+    def apply_batch(cls, paths, rows, shocks):
+        mask = _period_mask(paths.dates, [s.period for s in shocks])
+        days = np.maximum(mask.sum(axis=1), 1)
+        rates = np.log1p([s.total_return for s in shocks]) / days
+        selected = (
+            mask[:, :, None]
+            & _asset_mask(paths.assets, [s.assets for s in shocks])[:, None, :]
+        )
+        paths.log_returns[rows] = np.where(
+            selected, rates[:, None, None], paths.log_returns[rows]
+        )
+
+
+@dataclass
+class VolatilityShock(Shock):
+    """波動率衝擊
+
+    期間內的報酬率以期間平均為中心放大，平均報酬率不變、波動率乘以倍數，
+    保留原本的路徑形狀。
+
+    Attributes:
+        multiplier: 波動率倍數
+        assets: 作用的資產，None 表示全部資產
+    """
+
+    multiplier: float = 3.0
+    assets: Optional[List[str]] = None
+
+    order = 1
+
+    @classmethod
+    def apply_batch(cls, paths, rows, shocks):
+        mask = _period_mask(paths.dates, [s.period for s in shocks])[:, :, None]
+        returns = paths.log_returns[rows]
+        mean = (returns * mask).sum(axis=1, keepdims=True) / np.maximum(
+            mask.sum(axis=1, keepdims=True), 1
+        )
+        multiplier = np.array([s.multiplier for s in shocks])[:, None, None]
+        selected = (
+            mask & _asset_mask(paths.assets, [s.assets for s in shocks])[:, None, :]
+        )
+        paths.log_returns[rows] = np.where(
+            selected, mean + (returns - mean) * multiplier, returns
+        )
+
+
+@dataclass
+class CorrelationShock(Shock):
+    """相關性衝擊
+
+    期間內的標準化報酬率先以原相關矩陣的 -1/2 次方去相關，再以目標相關矩陣的
+    1/2 次方重新著色，各資產的期間平均與波動率不變，樣本相關係數變為目標值。
+    期間交易日數需多於作用的資產數。
+
+    Attributes:
+        correlation: 目標兩兩相關係數
+        assets: 作用的資產，None 表示全部資產
+    """
+
+    correlation: float = 0.9
+    assets: Optional[List[str]] = None
+
+    order = 2
+
+    @classmethod
+    def apply_batch(cls, paths, rows, shocks):
+        # 作用資產不同的衝擊分開計算
+        groups: Dict[Tuple, List[int]] = {}
+        for i, shock in enumerate(shocks):
+            key = tuple(shock.assets) if shock.assets is not None else None
+            groups.setdefault(key, []).append(i)
+
+        for key, members in groups.items():
+            columns = np.flatnonzero(
+                _asset_mask(paths.assets, [list(key) if key else None])[0]
+            )
+            if len(columns) < 2:
+                raise ValueError("至少需要兩個資產才能模擬相關性變化")
+            group_rows = rows[members]
+            mask = _period_mask(paths.dates, [shocks[i].period for i in members])
+            weight = mask[:, :, None].astype(float)
+            days = np.maximum(mask.sum(axis=1), 2)[:, None]
+
+            returns = paths.log_returns[group_rows][:, :, columns]
+            mean = (returns * weight).sum(axis=1) / days
+            deviation = (returns - mean[:, None, :]) * weight
+            cov = np.einsum("kta,ktb->kab", deviation, deviation) / (
+                days[:, :, None] - 1
+            )
+            std = np.sqrt(np.maximum(np.diagonal(cov, axis1=1, axis2=2), 1e-18))
+            corr = cov / (std[:, :, None] * std[:, None, :])
+
+            n = len(columns)
+            target = np.empty((len(members), n, n))
+            target[:] = np.array([shocks[i].correlation for i in members])[
+                :, None, None
+            ]
+            target[:, np.arange(n), np.arange(n)] = 1.0
+
+            transform = _sqrtm(corr, inverse=True) @ _sqrtm(target)
+            recolored = ((deviation / std[:, None, :]) @ transform) * std[:, None, :]
+            updated = np.where(weight > 0, mean[:, None, :] + recolored, returns)
+            block = paths.log_returns[group_rows]
+            block[:, :, columns] = updated
+            paths.log_returns[group_rows] = block
+
+
+@dataclass
+class LiquidityShock(Shock):
+    """流動性衝擊
+
+    期間內成交量減少、滑價與高低價差放大。滑價倍數作用於重新評價的交易成本，
+    並在重播回測時以 slippage_multiplier 傳給回測函數。作用於全部資產。
+
+    Attributes:
+        volume_reduction: 成交量減少比例，範圍 [0, 1]
+        slippage_increase: 滑價增加倍數
+        spread_increase: 價差增加倍數
+    """
+
+    volume_reduction: float = 0.8
+    slippage_increase: float = 5.0
+    spread_increase: float = 3.0
+
+    order = 4
+
+    @classmethod
+    def apply_batch(cls, paths, rows, shocks):
+        mask = _period_mask(paths.dates, [s.period for s in shocks])
+
+        def scaled(values, factors):
+            factors = np.asarray(factors, dtype=float)[:, None]
+            return np.where(mask, values[rows] * factors, values[rows])
+
+        paths.volume_multiplier[rows] = scaled(
+            paths.volume_multiplier, [1 - s.volume_reduction for s in shocks]
+        )
+        paths.cost_multiplier[rows] = scaled(
+            paths.cost_multiplier, [s.slippage_increase for s in shocks]
+        )
+        paths.spread_multiplier[rows] = scaled(
+            paths.spread_multiplier, [s.spread_increase for s in shocks]
+        )
+
+
+@dataclass
+class HistoricalShock(Shock):
+    """歷史情境重播
+
+    將基準面板中 period 期間的報酬率複製到從 start 開始的位置，
+    超出資料結尾的部分捨去。
+
+    Attributes:
+        start: 重播的開始日期
+        assets: 作用的資產，None 表示全部資產
+    """
+
+    start: str = ""
+    assets: Optional[List[str]] = None
+
+    order = 0
+
+    @classmethod
+    def apply_batch(cls, paths, rows, shocks):
+        dates = paths.dates
+        mask = _period_mask(dates, [s.period for s in shocks])
+        lengths = mask.sum(axis=1)
+        sources = mask.argmax(axis=1)
+        targets = dates.searchsorted(pd.to_datetime([s.start for s in shocks]))
+
+        offsets = np.arange(max(int(lengths.max()), 1))
+        source_index = sources[:, None] + offsets
+        target_index = targets[:, None] + offsets
+        valid = (offsets < lengths[:, None]) & (target_index < len(dates))
+        selected = _asset_mask(paths.assets, [s.assets for s in shocks])
+
+        k, t = np.nonzero(valid)
+        row = rows[k]
+        history = paths.base_log_returns[source_index[k, t]]
+        current = paths.log_returns[row, target_index[k, t]]
+        paths.log_returns[row, target_index[k, t]] = np.where(
+            selected[k], history, current
+        )
+
+
+@dataclass
+class Scenario:
+    """壓力情境
+
+    Attributes:
+        name: 情境名稱，作為輸出矩陣的列索引
+        shocks: 衝擊列表
+        replay: 是否需要以回測函數完整重播路徑
+    """
+
+    name: str
+    shocks: List[Shock] = field(default_factory=list)
+    replay: bool = False
+
+    @property
+    def slippage_multiplier(self) -> Optional[float]:
+        """情境中流動性衝擊的最大滑價倍數，沒有流動性衝擊時為 None"""
+        values = [
+            s.slippage_increase for s in self.shocks if isinstance(s, LiquidityShock)
+        ]
+        return max(values) if values else None
+
+
+@dataclass
+class ScenarioPaths:
+    """情境路徑張量
+
+    Attributes:
+        names: 情境名稱
+        dates: 日期
+        assets: 資產
+        base_prices: 基準收盤價，形狀為 (日期數, 資產數)
+        base_log_returns: 基準對數報酬率，第一列為 0
+        log_returns: 各情境對數報酬率，形狀為 (情境數, 日期數, 資產數)
+        volume_multiplier: 成交量倍數，形狀為 (情境數, 日期數)
+        cost_multiplier: 交易成本倍數，形狀為 (情境數, 日期數)
+        spread_multiplier: 高低價差倍數，形狀為 (情境數, 日期數)
+    """
+
+    names: List[str]
+    dates: pd.DatetimeIndex
+    assets: List[str]
+    base_prices: np.ndarray
+    base_log_returns: np.ndarray
+    log_returns: np.ndarray
+    volume_multiplier: np.ndarray
+    cost_multiplier: np.ndarray
+    spread_multiplier: np.ndarray
+
+    def prices(self) -> np.ndarray:
+        """各情境的收盤價，形狀為 (情境數, 日期數, 資產數)"""
+        return self.base_prices[0] * np.exp(np.cumsum(self.log_returns, axis=1))
+
+
+class StressEngine:
+    """批次壓力測試引擎
+
+    Attributes:
+        prices: 基準收盤價，索引為日期、欄位為資產
+        cost_rate: 每單位週轉率的交易成本
+        chunk_size: 每批產生的情境數，限制張量的記憶體用量
+    """
+
+    def __init__(
+        self,
+        prices: pd.DataFrame,
+        frame: Optional[pd.DataFrame] = None,
+        layout: Optional[List[Tuple[str, str, Optional[int]]]] = None,
+        cost_rate: float = 0.0005,
+        chunk_size: int = 256,
+    ):
+        """初始化批次壓力測試引擎
+
+        Args:
+            prices: 基準收盤價，索引為日期、欄位為資產
+            frame: 原始資料框架，重播時以此為範本重建情境資料
+            layout: 原始資料欄位對應，見 from_frame
+            cost_rate: 每單位週轉率的交易成本
+            chunk_size: 每批產生的情境數
+        """
+        prices = prices.sort_index().ffill().bfill()
+        self.prices = prices
+        self.dates = pd.DatetimeIndex(prices.index)
+        self.assets = [str(a) for a in prices.columns]
+        self.frame = frame
+        self.layout = layout or []
+        self.cost_rate = cost_rate
+        self.chunk_size = chunk_size
+
+        self._base_prices = prices.to_numpy(dtype=float)
+        self._base_log_returns = np.zeros_like(self._base_prices)
+        self._base_log_returns[1:] = np.diff(np.log(self._base_prices), axis=0)
+        self._row_dates: Optional[np.ndarray] = None
+        self._row_assets: Optional[np.ndarray] = None
+        if frame is not None:
+            self._row_dates = self.dates.get_indexer(pd.to_datetime(frame["date"]))
+            if "symbol" in frame.columns:
+                self._row_assets = pd.Index(self.assets).get_indexer(
+                    frame["symbol"].astype(str)
+                )
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, **kwargs) -> "StressEngine":
+        """由 StressTester 使用的資料框架建立引擎
+
+        支援三種格式，皆需要 date 欄位：
+
+        - 長格式：symbol 與 open/high/low/close/volume 欄位
+        - 寬格式：{資產}_close 與選用的 {資產}_open 等欄位
+        - 單一資產：open/high/low/close/volume 欄位
+
+        Args:
+            data: 原始資料
+            **kwargs: 傳給建構子的其他參數
+
+        Returns:
+            StressEngine: 批次壓力測試引擎
+
+        Raises:
+            ValueError: 找不到收盤價欄位
+        """
+        frame = data.copy()
+        frame["date"] = pd.to_datetime(frame["date"])
+        fields = PRICE_FIELDS + ("volume",)
+
+        if "symbol" in frame.columns and "close" in frame.columns:
+            prices = frame.pivot_table(
+                index="date", columns="symbol", values="close", aggfunc="last"
+            )
+            prices.columns = [str(c) for c in prices.columns]
+            layout = [(f, f, None) for f in fields if f in frame.columns]
+        else:
+            wide = [c[: -len("_close")] for c in frame.columns if c.endswith("_close")]
+            if wide:
+                prices = frame.groupby("date")[[f"{a}_close" for a in wide]].last()
+                prices.columns = wide
+                layout = [
+                    (f"{a}_{f}", f, i)
+                    for i, a in enumerate(wide)
+                    for f in fields
+                    if f"{a}_{f}" in frame.columns
+                ]
+            elif "close" in frame.columns:
+                prices = frame.groupby("date")[["close"]].last()
+                layout = [(f, f, 0) for f in fields if f in frame.columns]
+            else:
+                raise ValueError("資料中找不到收盤價欄位")
+
+        return cls(prices, frame=frame, layout=layout, **kwargs)
+
+    def generate(self, scenarios: Sequence[Scenario]) -> ScenarioPaths:
+        """產生情境路徑張量
+
+        Args:
+            scenarios: 情境列表
+
+        Returns:
+            ScenarioPaths: 所有情境的路徑
+        """
+        n_scenarios = len(scenarios)
+        n_dates = len(self.dates)
+        paths = ScenarioPaths(
+            names=[s.name for s in scenarios],
+            dates=self.dates,
+            assets=self.assets,
+            base_prices=self._base_prices,
+            base_log_returns=self._base_log_returns,
+            log_returns=np.broadcast_to(
+                self._base_log_returns, (n_scenarios,) + self._base_log_returns.shape
+            ).copy(),
+            volume_multiplier=np.ones((n_scenarios, n_dates)),
+            cost_multiplier=np.ones((n_scenarios, n_dates)),
+            spread_multiplier=np.ones((n_scenarios, n_dates)),
+        )
+
+        # 依類型與在情境中的序位分批，同一批內每個情境最多一個衝擊
+        batches: Dict[Tuple[int, str, int], Tuple[type, List[int], List[Shock]]] = {}
+        for row, scenario in enumerate(scenarios):
+            seen: Dict[type, int] = {}
+            for shock in scenario.shocks:
+                kind = type(shock)
+                rank = seen.get(kind, 0)
+                seen[kind] = rank + 1
+                key = (kind.order, kind.__name__, rank)
+                batch = batches.setdefault(key, (kind, [], []))
+                batch[1].append(row)
+                batch[2].append(shock)
+
+        for key in sorted(batches):
+            kind, rows, shocks = batches[key]
+            kind.apply_batch(paths, np.array(rows), shocks)
+        return paths
+
+    def revalue(
+        self,
+        paths: ScenarioPaths,
+        weights: Optional[Union[Dict[str, float], np.ndarray]] = None,
+        rebalance: bool = True,
+    ) -> pd.DataFrame:
+        """在所有情境下向量化重新評價投資組合
+
+        Args:
+            paths: 情境路徑
+            weights: 資產權重，預設為等權重
+            rebalance: True 表示每日再平衡回目標權重並計入週轉成本，
+                False 表示買進持有
+
+        Returns:
+            pd.DataFrame: 情境 × 指標矩陣
+        """
+        w = self._weights(weights)
+        simple = np.expm1(paths.log_returns[:, 1:])
+
+        if rebalance:
+            gross = simple @ w
+            drifted = w * (1 + simple) / (1 + gross)[..., None]
+            turnover = np.abs(drifted - w).sum(axis=-1)
+            costs = self.cost_rate * paths.cost_multiplier[:, 1:] * turnover
+            returns = gross - costs
+            value = np.cumprod(1 + returns, axis=1)
+        else:
+            value = np.exp(np.cumsum(paths.log_returns[:, 1:], axis=1)) @ w
+            previous = np.concatenate([np.ones((len(value), 1)), value[:, :-1]], axis=1)
+            returns = value / previous - 1
+            costs = np.zeros_like(returns)
+
+        value = np.concatenate([np.ones((len(value), 1)), value], axis=1)
+        drawdown = value / np.maximum.accumulate(value, axis=1) - 1
+        var = np.quantile(returns, 0.05, axis=1)
+        tail = returns <= var[:, None]
+        cvar = (returns * tail).sum(axis=1) / np.maximum(tail.sum(axis=1), 1)
+
+        metrics = np.column_stack(
+            [
+                value[:, -1] - 1,
+                returns.std(axis=1, ddof=1) * np.sqrt(252),
+                drawdown.min(axis=1),
+                -var,
+                -cvar,
+                returns.min(axis=1),
+                costs.sum(axis=1),
+            ]
+        )
+        return pd.DataFrame(metrics, index=paths.names, columns=list(STRESS_METRICS))
+
+    def scenario_frame(self, paths: ScenarioPaths, index: int) -> pd.DataFrame:
+        """以原始資料為範本重建單一情境的資料框架
+
+        價格欄位依情境收盤價與基準收盤價的比例縮放，高低價依價差倍數以中價為中心
+        放大，成交量乘以成交量倍數。
+
+        Args:
+            paths: 情境路徑
+            index: 情境索引
+
+        Returns:
+            pd.DataFrame: 情境資料
+
+        Raises:
+            ValueError: 引擎不是由 from_frame 建立
+        """
+        if self.frame is None:
+            raise ValueError("需要以 from_frame 建立引擎才能重建情境資料")
+
+        frame = self.frame.copy()
+        ratio = np.exp(
+            np.cumsum(paths.log_returns[index] - paths.base_log_returns, axis=0)
+        )
+        rows = self._row_dates
+
+        def row_values(asset: Optional[int], values: np.ndarray) -> np.ndarray:
+            if asset is not None:
+                return values[rows, asset] if values.ndim == 2 else values[rows]
+            if values.ndim == 2:
+                return values[rows, self._row_assets]
+            return values[rows]
+
+        columns: Dict[Optional[int], Dict[str, str]] = {}
+        for column, field_name, asset in self.layout:
+            columns.setdefault(asset, {})[field_name] = column
+
+        for asset, fields in columns.items():
+            scale = row_values(asset, ratio)
+            for field_name in PRICE_FIELDS:
+                if field_name in fields:
+                    frame[fields[field_name]] = frame[fields[field_name]] * scale
+            if "high" in fields and "low" in fields:
+                spread = row_values(asset, paths.spread_multiplier[index])
+                high, low = frame[fields["high"]], frame[fields["low"]]
+                mid, half = (high + low) / 2, (high - low) / 2 * spread
+                frame[fields["high"]], frame[fields["low"]] = mid + half, mid - half
+            if "volume" in fields:
+                volume = row_values(asset, paths.volume_multiplier[index])
+                frame[fields["volume"]] = frame[fields["volume"]] * volume
+        return frame
+
+    def replay(
+        self,
+        scenarios: Sequence[Scenario],
+        backtest_func: Callable,
+        max_workers: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """以回測函數完整重播情境
+
+        Args:
+            scenarios: 需要重播的情境
+            backtest_func: 回測函數，接受資料框架，返回結果字典；在行程池執行時
+                需可序列化（模組層級函數）
+            max_workers: 行程數，0 或 1 表示在目前行程依序執行
+
+        Returns:
+            pd.DataFrame: 情境 × 回測結果中的數值指標，欄位加上 replay_ 前綴
+        """
+        if not scenarios:
+            return pd.DataFrame()
+
+        if max_workers is not None and max_workers <= 1:
+            _init_replay_worker(self, backtest_func)
+            results = [_replay_scenario(s) for s in scenarios]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_replay_worker,
+                initargs=(self, backtest_func),
+            ) as executor:
+                results = list(executor.map(_replay_scenario, scenarios))
+
+        frame = pd.DataFrame(results, index=[s.name for s in scenarios])
+        return frame.add_prefix("replay_")
+
+    def run(
+        self,
+        scenarios: Sequence[Scenario],
+        weights: Optional[Union[Dict[str, float], np.ndarray]] = None,
+        backtest_func: Optional[Callable] = None,
+        rebalance: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """產生所有情境、重新評價，並重播需要路徑相依回測的情境
+
+        Args:
+            scenarios: 情境列表
+            weights: 資產權重，預設為等權重
+            backtest_func: 回測函數，有 replay 為 True 的情境時需要
+            rebalance: 重新評價時是否每日再平衡
+            max_workers: 重播的行程數
+
+        Returns:
+            pd.DataFrame: 情境 × 指標矩陣，重播情境另有 replay_ 開頭的欄位
+        """
+        chunks = []
+        for start in range(0, len(scenarios), self.chunk_size):
+            paths = self.generate(scenarios[start : start + self.chunk_size])
+            chunks.append(self.revalue(paths, weights, rebalance))
+        matrix = pd.concat(chunks) if chunks else pd.DataFrame(columns=STRESS_METRICS)
+
+        replayed = [s for s in scenarios if s.replay]
+        if replayed:
+            if backtest_func is None:
+                raise ValueError("重播情境需要回測函數")
+            replay = self.replay(replayed, backtest_func, max_workers)
+            matrix = matrix.join(replay)
+        return matrix
+
+    def _weights(self, weights) -> np.ndarray:
+        if weights is None:
+            return np.full(len(self.assets), 1.0 / len(self.assets))
+        if isinstance(weights, dict):
+            return np.array([weights.get(a, 0.0) for a in self.assets], dtype=float)
+        return np.asarray(weights, dtype=float)
+
+
+# 重播工作行程的狀態，由 _init_replay_worker 設定
+_REPLAY_STATE: Dict[str, Any] = {}
+
+
+def _init_replay_worker(engine: StressEngine, backtest_func: Callable) -> None:
+    _REPLAY_STATE["engine"] = engine
+    _REPLAY_STATE["backtest_func"] = backtest_func
+
+
+def _replay_scenario(scenario: Scenario) -> Dict[str, float]:
+    engine: StressEngine = _REPLAY_STATE["engine"]
+    frame = engine.scenario_frame(engine.generate([scenario]), 0)
+    kwargs = {}
+    if scenario.slippage_multiplier is not None:
+        kwargs["slippage_multiplier"] = scenario.slippage_multiplier
+    result = _REPLAY_STATE["backtest_func"](frame, **kwargs) or {}
+    return {
+        key: float(value)
+        for key, value in result.items()
+        if isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+    }
@@ -7,6 +7,7 @@
 - 流動性危機模擬
 - 波動率衝擊模擬
 - 相關性變化模擬
+- 批次情境矩陣（見 stress_engine）
 """
 
 import logging
@@ -19,6 +20,7 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from src.backtest.stress_engine import Scenario, StressEngine
 from src.config import LOG_LEVEL, RESULTS_DIR
 
 # 設定日誌
@@ -500,6 +502,42 @@ class StressTester:
 
         return stress_result
 
+    def run_scenarios(
+        self,
+        scenarios: List[Scenario],
+        weights: Optional[Dict[str, float]] = None,
+        rebalance: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        批次執行多個壓力情境
+
+        所有情境以同一份基準資料產生路徑並向量化重新評價，
+        replay 為 True 的情境另以回測函數在行程池中完整重播。
+
+        Args:
+            scenarios (List[Scenario]): 情境列表
+            weights (Optional[Dict[str, float]]): 資產權重，預設為等權重
+            rebalance (bool): 重新評價時是否每日再平衡
+            max_workers (Optional[int]): 重播的行程數
+
+        Returns:
+            pd.DataFrame: 情境 × 指標矩陣
+        """
+        engine = StressEngine.from_frame(self.data)
+        matrix = engine.run(
+            scenarios,
+            weights=weights,
+            backtest_func=self.backtest_func,
+            rebalance=rebalance,
+            max_workers=max_workers,
+        )
+
+        # 保存情境指標矩陣
+        matrix.to_csv(os.path.join(self.output_dir, "scenario_metrics.csv"))
+
+        return matrix
+
     def _plot_price_comparison(
         self,
         original_data: pd.DataFrame,
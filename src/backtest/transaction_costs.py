@@ -7,12 +7,18 @@
 - 比例手續費
 - 滑價模型
 - 稅費模型
+
+各成本模型在初始化時將階梯門檻與費率編譯為 CostTable，逐筆成交以二分搜尋
+查表，向量化回測可透過 costs(sizes, prices) 一次計算整批成交的成本，
+結果與逐筆計算完全相同。
 """
 
 import logging
-from typing import Optional
+from bisect import bisect_right
+from typing import Dict, Optional, Sequence
 
 import backtrader as bt
+import numpy as np
 
 from src.config import LOG_LEVEL
 
@@ -21,18 +27,192 @@ logger = logging.getLogger(__name__)
 logger.setLevel(getattr(logging, LOG_LEVEL))
 
 
-class FixedCommissionScheme(bt.CommInfoBase):
+class CostTable:
     """
-    固定手續費模型
+    編譯後的交易成本表
 
-    每筆交易收取固定金額的手續費。
+    手續費為 基準 × 費率，基準為成交金額或成交數量，費率依基準以階梯門檻查表，
+    低於最低手續費時以最低手續費計；稅費依買賣方向以成交金額乘以各項費率，
+    依序加總。計算順序與各成本模型原本的逐筆公式相同，因此浮點數結果一致。
     """
 
-    params = (
-        ("commission", 20.0),  # 固定手續費金額
-        ("stocklike", True),  # 是否為股票類資產
-        ("commtype", bt.CommInfoBase.COMM_FIXED),  # 手續費類型
-    )
+    def __init__(
+        self,
+        tiers: Optional[Dict[float, float]] = None,
+        default_rate: float = 0.0,
+        tier_type: str = "amount",
+        min_commission: float = 0.0,
+        fixed_commission: Optional[float] = None,
+        buy_rates: Sequence[float] = (),
+        sell_rates: Sequence[float] = (),
+        slippage_perc: float = 0.0,
+    ):
+        """
+        初始化交易成本表
+
+        Args:
+            tiers (Optional[Dict[float, float]]): 階梯式手續費，格式為 {閾值: 手續費率}
+            default_rate (float): 基準低於所有閾值時的手續費率
+            tier_type (str): 手續費基準，可選 'amount' 或 'size'
+            min_commission (float): 最低手續費
+            fixed_commission (Optional[float]): 固定手續費，設定時忽略其他手續費參數
+            buy_rates (Sequence[float]): 買入時依成交金額收取的費率
+            sell_rates (Sequence[float]): 賣出時依成交金額收取的費率
+            slippage_perc (float): 滑價比例
+        """
+        items = sorted((tiers or {}).items())
+        self.thresholds = np.array([t for t, _ in items], dtype=float)
+        self.rates = np.array([default_rate] + [r for _, r in items], dtype=float)
+        self.tier_type = tier_type
+        self.min_commission = min_commission
+        self.fixed_commission = fixed_commission
+        self.buy_rates = tuple(buy_rates)
+        self.sell_rates = tuple(sell_rates)
+        self.slippage_perc = slippage_perc
+
+        self._flat_rate = float(self.rates[0])
+        self.cost = self._compile_cost()
+
+    def _compile_cost(self):
+        """
+        將成本表編譯為逐筆計算的函數
+
+        參數預先綁定為區域變數，單筆成交不建立陣列也不查詢屬性。
+
+        Returns:
+            Callable[[float, float], float]: 接受 (size, price)，返回成本金額
+        """
+        fixed = self.fixed_commission
+        if fixed is not None:
+            return lambda size, price: fixed
+
+        thresholds = self.thresholds.tolist()
+        rates = self.rates.tolist()
+        flat_rate = self._flat_rate
+        by_amount = self.tier_type == "amount"
+        min_commission = self.min_commission
+        buy_rates, sell_rates = self.buy_rates, self.sell_rates
+
+        def cost(size: float, price: float) -> float:
+            """
+            計算單筆成交的成本
+
+            Args:
+                size (float): 交易數量，正數為買入、負數為賣出
+                price (float): 交易價格
+
+            Returns:
+                float: 成本金額
+            """
+            base = abs(size) * price if by_amount else abs(size)
+            if thresholds:
+                commission = base * rates[bisect_right(thresholds, base)]
+            else:
+                commission = base * flat_rate
+            if commission < min_commission:
+                commission = min_commission
+            for rate in buy_rates if size > 0 else sell_rates:
+                commission = commission + abs(size) * price * rate
+            return commission
+
+        return cost
+
+    def costs(self, sizes, prices) -> np.ndarray:
+        """
+        向量化計算多筆成交的成本
+
+        Args:
+            sizes (array-like): 交易數量，正數為買入、負數為賣出
+            prices (array-like): 交易價格，可與 sizes 廣播
+
+        Returns:
+            np.ndarray: 各筆成交的成本金額
+        """
+        sizes, prices = np.broadcast_arrays(
+            np.asarray(sizes, dtype=float), np.asarray(prices, dtype=float)
+        )
+        if self.fixed_commission is not None:
+            return np.full(sizes.shape, self.fixed_commission, dtype=float)
+
+        amount = np.abs(sizes) * prices
+        base = amount if self.tier_type == "amount" else np.abs(sizes)
+        if len(self.thresholds):
+            cost = base * self.rates[np.searchsorted(self.thresholds, base, "right")]
+        else:
+            cost = base * self._flat_rate
+        cost = np.where(cost < self.min_commission, self.min_commission, cost)
+
+        buy = sizes > 0
+        for rate in self.buy_rates:
+            cost = cost + np.where(buy, amount * rate, 0.0)
+        for rate in self.sell_rates:
+            cost = cost + np.where(buy, 0.0, amount * rate)
+        return cost
+
+    def slipped_price(self, size: float, price: float) -> float:
+        """
+        計算單筆成交滑價後的價格，買入上調、賣出下調
+
+        Args:
+            size (float): 交易數量
+            price (float): 交易價格
+
+        Returns:
+            float: 滑價後的價格
+        """
+        slippage = price * self.slippage_perc
+        return price + slippage if size > 0 else price - slippage
+
+    def slipped_prices(self, sizes, prices) -> np.ndarray:
+        """
+        向量化計算多筆成交滑價後的價格
+
+        Args:
+            sizes (array-like): 交易數量
+            prices (array-like): 交易價格
+
+        Returns:
+            np.ndarray: 滑價後的價格
+        """
+        sizes = np.asarray(sizes, dtype=float)
+        prices = np.asarray(prices, dtype=float)
+        slippage = prices * self.slippage_perc
+        return np.where(sizes > 0, prices + slippage, prices - slippage)
+
+
+class CompiledCostScheme(bt.CommInfoBase):
+    """
+    編譯成本表的成本模型基類
+
+    子類別以 _compile 將參數轉為 CostTable，逐筆成交與向量化計算共用同一張表。
+    """
+
+    def __init__(self):
+        super().__init__()
+        # 需在基類初始化之後編譯，比例手續費的參數可能已被調整
+        self.cost_table = self._compile()
+
+    def _compile(self) -> CostTable:
+        """
+        將參數編譯為交易成本表
+
+        Returns:
+            CostTable: 交易成本表
+        """
+        raise NotImplementedError
+
+    def getcommission(self, size, price):
+        """
+        計算手續費，直接查表以省去一層方法呼叫
+
+        Args:
+            size (float): 交易數量
+            price (float): 交易價格
+
+        Returns:
+            float: 手續費金額
+        """
+        return self.cost_table.cost(size, price)
 
     def _getcommission(self, size, price, pseudoexec):
         """
@@ -46,10 +226,72 @@ class FixedCommissionScheme(bt.CommInfoBase):
         Returns:
             float: 手續費金額
         """
-        return self.p.commission
+        return self.cost_table.cost(size, price)
+
+    def get_slippage(self, size, price):
+        """
+        計算滑價
+
+        Args:
+            size (float): 交易數量
+            price (float): 交易價格
+
+        Returns:
+            float: 滑價後的價格
+        """
+        return self.cost_table.slipped_price(size, price)
+
+    def costs(self, sizes, prices) -> np.ndarray:
+        """
+        向量化計算多筆成交的成本，結果與逐筆呼叫 getcommission 相同
+
+        Args:
+            sizes (array-like): 交易數量，正數為買入、負數為賣出
+            prices (array-like): 交易價格
+
+        Returns:
+            np.ndarray: 各筆成交的成本金額
+        """
+        return self.cost_table.costs(sizes, prices)
+
+    def slipped_prices(self, sizes, prices) -> np.ndarray:
+        """
+        向量化計算多筆成交滑價後的價格
+
+        Args:
+            sizes (array-like): 交易數量
+            prices (array-like): 交易價格
+
+        Returns:
+            np.ndarray: 滑價後的價格
+        """
+        return self.cost_table.slipped_prices(sizes, prices)
+
+
+class FixedCommissionScheme(CompiledCostScheme):
+    """
+    固定手續費模型
+
+    每筆交易收取固定金額的手續費。
+    """
+
+    params = (
+        ("commission", 20.0),  # 固定手續費金額
+        ("stocklike", True),  # 是否為股票類資產
+        ("commtype", bt.CommInfoBase.COMM_FIXED),  # 手續費類型
+    )
+
+    def _compile(self) -> CostTable:
+        """
+        將參數編譯為交易成本表
+
+        Returns:
+            CostTable: 交易成本表
+        """
+        return CostTable(fixed_commission=self.p.commission)
 
 
-class PercentCommissionScheme(bt.CommInfoBase):
+class PercentCommissionScheme(CompiledCostScheme):
     """
     比例手續費模型
 
@@ -63,28 +305,19 @@ class PercentCommissionScheme(bt.CommInfoBase):
         ("min_commission", 0.0),  # 最低手續費
     )
 
-    def _getcommission(self, size, price, pseudoexec):
+    def _compile(self) -> CostTable:
         """
-        計算手續費
-
-        Args:
-            size (float): 交易數量
-            price (float): 交易價格
-            pseudoexec (bool): 是否為虛擬執行
+        將參數編譯為交易成本表
 
         Returns:
-            float: 手續費金額
+            CostTable: 交易成本表
         """
-        commission = abs(size) * price * self.p.commission
-
-        # 檢查是否低於最低手續費
-        if commission < self.p.min_commission:
-            commission = self.p.min_commission
+        return CostTable(
+            default_rate=self.p.commission, min_commission=self.p.min_commission
+        )
 
-        return commission
 
-
-class TieredCommissionScheme(bt.CommInfoBase):
+class TieredCommissionScheme(CompiledCostScheme):
     """
     階梯式手續費模型
 
@@ -99,44 +332,23 @@ class TieredCommissionScheme(bt.CommInfoBase):
         ("min_commission", 0.0),  # 最低手續費
     )
 
-    def _getcommission(self, size, price, pseudoexec):
+    def _compile(self) -> CostTable:
         """
-        計算手續費
-
-        Args:
-            size (float): 交易數量
-            price (float): 交易價格
-            pseudoexec (bool): 是否為虛擬執行
+        將參數編譯為交易成本表
 
         Returns:
-            float: 手續費金額
+            CostTable: 交易成本表
         """
-        # 計算交易金額或數量
-        if self.p.tier_type == "amount":
-            value = abs(size) * price
-        else:
-            value = abs(size)
-
-        # 找到適用的手續費率
-        commission_rate = self.p.tiers.get(0, 0.0)  # 預設手續費率
-
-        for threshold, rate in sorted(self.p.tiers.items()):
-            if value >= threshold:
-                commission_rate = rate
-            else:
-                break
-
-        # 計算手續費
-        commission = value * commission_rate
-
-        # 檢查是否低於最低手續費
-        if commission < self.p.min_commission:
-            commission = self.p.min_commission
-
-        return commission
+        # 基準低於所有閾值時沿用閾值 0 的費率
+        return CostTable(
+            tiers=self.p.tiers,
+            default_rate=self.p.tiers.get(0, 0.0),
+            tier_type=self.p.tier_type,
+            min_commission=self.p.min_commission,
+        )
 
 
-class TaxScheme(bt.CommInfoBase):
+class TaxScheme(CompiledCostScheme):
     """
     稅費模型
 
@@ -150,29 +362,20 @@ class TaxScheme(bt.CommInfoBase):
         ("tax_on_sell_only", True),  # 是否只對賣出收稅
     )
 
-    def _getcommission(self, size, price, pseudoexec):
+    def _compile(self) -> CostTable:
         """
-        計算稅費
-
-        Args:
-            size (float): 交易數量
-            price (float): 交易價格
-            pseudoexec (bool): 是否為虛擬執行
+        將參數編譯為交易成本表
 
         Returns:
-            float: 稅費金額
+            CostTable: 交易成本表
         """
-        # 如果只對賣出收稅，則檢查交易方向
-        if self.p.tax_on_sell_only and size > 0:
-            return 0.0
-
-        # 計算稅費
-        tax = abs(size) * price * self.p.tax_rate
+        return CostTable(
+            buy_rates=() if self.p.tax_on_sell_only else (self.p.tax_rate,),
+            sell_rates=(self.p.tax_rate,),
+        )
 
-        return tax
 
-
-class CombinedCostScheme(bt.CommInfoBase):
+class CombinedCostScheme(CompiledCostScheme):
     """
     組合成本模型
 
@@ -189,62 +392,23 @@ class CombinedCostScheme(bt.CommInfoBase):
         ("commtype", bt.CommInfoBase.COMM_PERC),  # 手續費類型
     )
 
-    def _getcommission(self, size, price, pseudoexec):
-        """
-        計算總成本
-
-        Args:
-            size (float): 交易數量
-            price (float): 交易價格
-            pseudoexec (bool): 是否為虛擬執行
-
-        Returns:
-            float: 總成本金額
+    def _compile(self) -> CostTable:
         """
-        # 計算手續費
-        commission = abs(size) * price * self.p.commission_rate
-
-        # 檢查是否低於最低手續費
-        if commission < self.p.min_commission:
-            commission = self.p.min_commission
-
-        # 計算稅費
-        if self.p.tax_on_sell_only and size > 0:
-            tax = 0.0
-        else:
-            tax = abs(size) * price * self.p.tax_rate
-
-        # 總成本
-        total_cost = commission + tax
-
-        return total_cost
-
-    def get_slippage(self, size, price):
-        """
-        計算滑價
-
-        Args:
-            size (float): 交易數量
-            price (float): 交易價格
+        將參數編譯為交易成本表
 
         Returns:
-            float: 滑價後的價格
+            CostTable: 交易成本表
         """
-        # 計算滑價
-        slippage = price * self.p.slippage_perc
-
-        # 根據交易方向調整價格
-        if size > 0:
-            # 買入，價格上調
-            adjusted_price = price + slippage
-        else:
-            # 賣出，價格下調
-            adjusted_price = price - slippage
-
-        return adjusted_price
+        return CostTable(
+            default_rate=self.p.commission_rate,
+            min_commission=self.p.min_commission,
+            buy_rates=() if self.p.tax_on_sell_only else (self.p.tax_rate,),
+            sell_rates=(self.p.tax_rate,),
+            slippage_perc=self.p.slippage_perc,
+        )
 
 
-class TWStockCostScheme(bt.CommInfoBase):
+class TWStockCostScheme(CompiledCostScheme):
     """
     台股成本模型
 
@@ -260,61 +424,23 @@ class TWStockCostScheme(bt.CommInfoBase):
         ("commtype", bt.CommInfoBase.COMM_PERC),  # 手續費類型
     )
 
-    def _getcommission(self, size, price, pseudoexec):
-        """
-        計算總成本
-
-        Args:
-            size (float): 交易數量
-            price (float): 交易價格
-            pseudoexec (bool): 是否為虛擬執行
-
-        Returns:
-            float: 總成本金額
-        """
-        # 計算手續費
-        commission = abs(size) * price * self.p.commission_rate
-
-        # 檢查是否低於最低手續費
-        if commission < self.p.min_commission:
-            commission = self.p.min_commission
-
-        # 計算證券交易稅（只對賣出收取）
-        tax = 0.0
-        if size < 0:  # 賣出
-            tax = abs(size) * price * self.p.tax_rate
-
-        # 總成本
-        total_cost = commission + tax
-
-        return total_cost
-
-    def get_slippage(self, size, price):
+    def _compile(self) -> CostTable:
         """
-        計算滑價
-
-        Args:
-            size (float): 交易數量
-            price (float): 交易價格
+        將參數編譯為交易成本表
 
         Returns:
-            float: 滑價後的價格
+            CostTable: 交易成本表
         """
-        # 計算滑價
-        slippage = price * self.p.slippage_perc
-
-        # 根據交易方向調整價格
-        if size > 0:
-            # 買入，價格上調
-            adjusted_price = price + slippage
-        else:
-            # 賣出，價格下調
-            adjusted_price = price - slippage
+        # 證券交易稅只對賣出收取
+        return CostTable(
+            default_rate=self.p.commission_rate,
+            min_commission=self.p.min_commission,
+            sell_rates=(self.p.tax_rate,),
+            slippage_perc=self.p.slippage_perc,
+        )
 
-        return adjusted_price
 
-
-class USStockCostScheme(bt.CommInfoBase):
+class USStockCostScheme(CompiledCostScheme):
     """
     美股成本模型
 
@@ -331,63 +457,20 @@ class USStockCostScheme(bt.CommInfoBase):
         ("commtype", bt.CommInfoBase.COMM_PERC),  # 手續費類型
     )
 
-    def _getcommission(self, size, price, pseudoexec):
+    def _compile(self) -> CostTable:
         """
-        計算總成本
-
-        Args:
-            size (float): 交易數量
-            price (float): 交易價格
-            pseudoexec (bool): 是否為虛擬執行
+        將參數編譯為交易成本表
 
         Returns:
-            float: 總成本金額
+            CostTable: 交易成本表
         """
-        # 計算手續費
-        commission = abs(size) * price * self.p.commission_rate
-
-        # 檢查是否低於最低手續費
-        if commission < self.p.min_commission:
-            commission = self.p.min_commission
-
-        # 計算 SEC 費用（只對賣出收取）
-        sec_fee = 0.0
-        if size < 0:  # 賣出
-            sec_fee = abs(size) * price * self.p.sec_fee_rate
-
-        # 計算 FINRA 費用（只對賣出收取）
-        finra_fee = 0.0
-        if size < 0:  # 賣出
-            finra_fee = abs(size) * price * self.p.finra_fee
-
-        # 總成本
-        total_cost = commission + sec_fee + finra_fee
-
-        return total_cost
-
-    def get_slippage(self, size, price):
-        """
-        計算滑價
-
-        Args:
-            size (float): 交易數量
-            price (float): 交易價格
-
-        Returns:
-            float: 滑價後的價格
-        """
-        # 計算滑價
-        slippage = price * self.p.slippage_perc
-
-        # 根據交易方向調整價格
-        if size > 0:
-            # 買入，價格上調
-            adjusted_price = price + slippage
-        else:
-            # 賣出，價格下調
-            adjusted_price = price - slippage
-
-        return adjusted_price
+        # SEC 與 FINRA 費用只對賣出收取
+        return CostTable(
+            default_rate=self.p.commission_rate,
+            min_commission=self.p.min_commission,
+            sell_rates=(self.p.sec_fee_rate, self.p.finra_fee),
+            slippage_perc=self.p.slippage_perc,
+        )
 
 
 def get_cost_scheme(
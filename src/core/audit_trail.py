@@ -3,15 +3,30 @@
 
 此模組實現了審計跟蹤功能，用於記錄系統中的重要操作和變更，
 並確保記錄的不可變性和完整性。
+
+寫入流程：
+- ``log_event`` 只建立事件並放入佇列，不在呼叫端執行緒進行簽名或檔案 I/O
+- 背景寫入執行緒批次取出事件，以 SHA-256 雜湊鏈串接每個事件，
+  每批只對鏈結結果簽名一次，並在事件之後寫入一行批次封存記錄
+- 日誌檔以持續開啟的檔案控制代碼附加寫入，每批 fsync 一次
+- 寫入失敗的批次保留在寫入執行緒中重試，不會丟棄；程序正常結束時
+  以 atexit 寫入剩餘事件
+- 旁路的 SQLite 索引記錄每個事件的時間、用戶、類型與所屬批次的位置，
+  ``get_events`` 依索引直接定位批次，只讀取並驗證需要的批次
 """
 
+import atexit
+import hashlib
 import json
 import os
+import queue
+import sqlite3
 import threading
 import time
+from contextlib import closing, suppress
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # 嘗試導入加密庫
 try:
@@ -105,6 +120,7 @@ class AuditEvent:
         self.ip_address = ip_address
         self.user_agent = user_agent
         self.signature = None
+        self.chain_hash = None
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -122,6 +138,7 @@ class AuditEvent:
             "ip_address": self.ip_address,
             "user_agent": self.user_agent,
             "signature": self.signature,
+            "chain_hash": self.chain_hash,
         }
 
     @classmethod
@@ -146,6 +163,7 @@ class AuditEvent:
         )
 
         event.signature = data.get("signature")
+        event.chain_hash = data.get("chain_hash")
 
         return event
 
@@ -169,6 +187,35 @@ class AuditEvent:
         return json.dumps(data, sort_keys=True)
 
 
+# 雜湊鏈起點
+GENESIS_HASH = "0" * 64
+
+# 批次封存記錄的類型標記
+SEAL_RECORD_TYPE = "seal"
+
+_INDEX_FILE = "audit_index.sqlite"
+
+# 關閉時寫入失敗批次的最多嘗試次數
+_SHUTDOWN_RETRIES = 3
+
+
+def _chain_hash(prev_hash: str, event: AuditEvent) -> str:
+    """計算事件在雜湊鏈中的雜湊值"""
+    data = prev_hash + event.get_data_for_signature()
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _seal_payload(seal: Dict[str, Any]) -> bytes:
+    """取得批次封存記錄中需要簽名的內容"""
+    payload = {
+        "batch_id": seal["batch_id"],
+        "start_hash": seal["start_hash"],
+        "last_hash": seal["last_hash"],
+        "count": seal["count"],
+    }
+    return json.dumps(payload, sort_keys=True).encode("utf-8")
+
+
 class AuditTrail:
     """
     審計跟蹤
@@ -192,6 +239,9 @@ class AuditTrail:
         log_dir: str = "logs/audit",
         key_dir: str = "config/keys",
         rotate_interval: int = 86400,  # 24 小時
+        batch_size: int = 256,
+        flush_interval: float = 0.05,
+        max_queue_size: int = 100000,
     ):
         """
         初始化審計跟蹤
@@ -200,6 +250,9 @@ class AuditTrail:
             log_dir: 日誌目錄
             key_dir: 密鑰目錄
             rotate_interval: 日誌輪換間隔（秒）
+            batch_size: 每批最多簽名的事件數
+            flush_interval: 背景寫入等待新事件的最長時間（秒）
+            max_queue_size: 待寫入佇列上限，佇列滿時 log_event 會等待而不丟棄事件
         """
         # 避免重複初始化
         if self._initialized:
@@ -208,6 +261,9 @@ class AuditTrail:
         self.log_dir = log_dir
         self.key_dir = key_dir
         self.rotate_interval = rotate_interval
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.index_path = os.path.join(log_dir, _INDEX_FILE)
 
         # 創建目錄
         os.makedirs(self.log_dir, exist_ok=True)
@@ -216,6 +272,8 @@ class AuditTrail:
         # 當前日誌文件
         self.current_log_file = None
         self.current_log_start_time = None
+        self._log_handle = None
+        self._log_offset = 0
 
         # 密鑰對
         self.private_key = None
@@ -224,8 +282,19 @@ class AuditTrail:
         # 加載或生成密鑰對
         self._load_or_generate_keys()
 
-        # 初始化日誌文件
-        self._init_log_file()
+        # 初始化索引與雜湊鏈狀態
+        self._init_index()
+        self._chain_head, self._batch_id = self._load_chain_state()
+
+        # 背景寫入（第一次記錄事件時啟動）
+        self._queue: "queue.Queue[Optional[AuditEvent]]" = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+        # 程序結束時寫入佇列中剩餘的事件
+        atexit.register(self.close)
 
         self._initialized = True
 
@@ -295,12 +364,20 @@ class AuditTrail:
         # 獲取當前時間
         now = datetime.now()
 
+        # 關閉目前的日誌文件
+        if self._log_handle is not None:
+            self._log_handle.close()
+
         # 設置日誌文件名
         self.current_log_file = os.path.join(
             self.log_dir,
             f"audit_{now.strftime('%Y%m%d_%H%M%S')}.jsonl",
         )
 
+        # 以持續開啟的控制代碼附加寫入
+        self._log_handle = open(self.current_log_file, "ab")
+        self._log_offset = os.path.getsize(self.current_log_file)
+
         # 記錄開始時間
         self.current_log_start_time = now.timestamp()
 
@@ -318,24 +395,20 @@ class AuditTrail:
         ):
             self._init_log_file()
 
-    def _sign_event(self, event: AuditEvent) -> Optional[str]:
+    def _sign_data(self, data: bytes) -> Optional[str]:
         """
-        簽名事件
+        簽名資料
 
         Args:
-            event: 審計事件
+            data: 資料
 
         Returns:
-            Optional[str]: 簽名
+            Optional[str]: 十六進位簽名
         """
         if not CRYPTOGRAPHY_AVAILABLE or self.private_key is None:
             return None
 
         try:
-            # 獲取數據
-            data = event.get_data_for_signature().encode("utf-8")
-
-            # 計算簽名
             signature = self.private_key.sign(
                 data,
                 padding.PSS(
@@ -344,40 +417,28 @@ class AuditTrail:
                 ),
                 hashes.SHA256(),
             )
-
-            # 返回 Base64 編碼的簽名
             return signature.hex()
         except Exception as e:
-            logger.error(f"簽名審計事件時發生錯誤: {e}")
+            logger.error(f"簽名審計資料時發生錯誤: {e}")
             return None
 
-    def _verify_signature(self, event: AuditEvent) -> bool:
+    def _verify_data(self, data: bytes, signature: Optional[str]) -> bool:
         """
         驗證簽名
 
         Args:
-            event: 審計事件
+            data: 資料
+            signature: 十六進位簽名
 
         Returns:
             bool: 是否有效
         """
-        if (
-            not CRYPTOGRAPHY_AVAILABLE
-            or self.public_key is None
-            or event.signature is None
-        ):
+        if not CRYPTOGRAPHY_AVAILABLE or self.public_key is None or signature is None:
             return False
 
         try:
-            # 獲取數據
-            data = event.get_data_for_signature().encode("utf-8")
-
-            # 解碼簽名
-            signature = bytes.fromhex(event.signature)
-
-            # 驗證簽名
             self.public_key.verify(
-                signature,
+                bytes.fromhex(signature),
                 data,
                 padding.PSS(
                     mgf=padding.MGF1(hashes.SHA256()),
@@ -385,11 +446,36 @@ class AuditTrail:
                 ),
                 hashes.SHA256(),
             )
-
             return True
         except Exception:
             return False
 
+    def _sign_event(self, event: AuditEvent) -> Optional[str]:
+        """
+        簽名單一事件（舊版逐筆簽名格式）
+
+        Args:
+            event: 審計事件
+
+        Returns:
+            Optional[str]: 簽名
+        """
+        return self._sign_data(event.get_data_for_signature().encode("utf-8"))
+
+    def _verify_signature(self, event: AuditEvent) -> bool:
+        """
+        驗證單一事件簽名（舊版逐筆簽名格式）
+
+        Args:
+            event: 審計事件
+
+        Returns:
+            bool: 是否有效
+        """
+        return self._verify_data(
+            event.get_data_for_signature().encode("utf-8"), event.signature
+        )
+
     def log_event(
         self,
         event_type: AuditEventType,
@@ -401,6 +487,9 @@ class AuditTrail:
         """
         記錄事件
 
+        事件放入佇列後立即返回，由背景執行緒批次簽名並寫入；事件的
+        ``chain_hash`` 與 ``signature`` 在寫入後才會設定。
+
         Args:
             event_type: 事件類型
             user_id: 用戶 ID
@@ -411,9 +500,6 @@ class AuditTrail:
         Returns:
             AuditEvent: 審計事件
         """
-        # 檢查是否需要輪換日誌
-        self._check_rotate_log()
-
         # 創建事件
         event = AuditEvent(
             event_id=f"{int(time.time() * 1000)}_{user_id}_{event_type.value}",
@@ -425,17 +511,411 @@ class AuditTrail:
             user_agent=user_agent,
         )
 
-        # 簽名事件
-        event.signature = self._sign_event(event)
+        self._ensure_writer()
+        self._queue.put(event)
+
+        return event
+
+    def flush(self) -> None:
+        """等待佇列中的事件全部寫入"""
+        if self._writer_thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """寫入剩餘事件並停止背景寫入執行緒"""
+        with self._writer_lock:
+            thread = self._writer_thread
+            if thread is None:
+                return
+            self._queue.put(None)
+            thread.join()
+            self._writer_thread = None
+
+        if self._log_handle is not None:
+            self._log_handle.close()
+            self._log_handle = None
+            self.current_log_start_time = None
+
+    def _ensure_writer(self) -> None:
+        """啟動背景寫入執行緒"""
+        if self._writer_thread is not None:
+            return
+        with self._writer_lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name="audit-writer", daemon=True
+                )
+                self._writer_thread.start()
+
+    def _writer_loop(self) -> None:
+        """背景寫入迴圈：批次取出事件並寫入
+
+        寫入失敗的事件保留在 ``pending`` 中重試，寫入成功後才標記佇列工作
+        完成，因此 ``flush`` 會等到事件確實寫入。關閉時最多重試
+        ``_SHUTDOWN_RETRIES`` 次。
+        """
+        with closing(self._connect()) as conn:
+            pending: List[AuditEvent] = []
+            received = 0
+            failures = 0
+            running = True
+            while running or pending:
+                if running and len(pending) < self.batch_size:
+                    running, count = self._collect_events(pending, block=not pending)
+                    received += count
+
+                if pending:
+                    batch = pending[: self.batch_size]
+                    try:
+                        self._write_batch(batch, conn)
+                    except Exception as e:
+                        failures += 1
+                        if running or failures < _SHUTDOWN_RETRIES:
+                            logger.error(f"寫入審計日誌時發生錯誤，稍後重試: {e}")
+                            time.sleep(min(self.flush_interval * 2**failures, 1.0))
+                            continue
+                        logger.error(f"關閉時仍無法寫入 {len(pending)} 筆審計事件: {e}")
+                        pending = []
+                    else:
+                        failures = 0
+                        del pending[: len(batch)]
+
+                if not pending:
+                    for _ in range(received):
+                        self._queue.task_done()
+                    received = 0
+
+    def _collect_events(
+        self, pending: List[AuditEvent], block: bool
+    ) -> Tuple[bool, int]:
+        """從佇列取出事件直到批次已滿
+
+        Args:
+            pending: 待寫入事件列表，取出的事件附加於此
+            block: 佇列為空時是否等待 flush_interval
+
+        Returns:
+            Tuple[bool, int]: (是否繼續執行, 取出的佇列項目數)
+        """
+        received = 0
+        if block:
+            try:
+                event = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                return True, 0
+            received += 1
+            if event is None:
+                return False, received
+            pending.append(event)
+
+        while len(pending) < self.batch_size:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            received += 1
+            if event is None:
+                return False, received
+            pending.append(event)
+        return True, received
+
+    def _write_batch(self, batch: List[AuditEvent], conn: sqlite3.Connection) -> None:
+        """
+        以雜湊鏈串接並簽名一批事件，寫入日誌與索引
+
+        Args:
+            batch: 事件列表
+            conn: 索引連線
+        """
+        self._check_rotate_log()
+
+        start_hash = self._chain_head
+        chain_hash = start_hash
+        lines = []
+        for event in batch:
+            chain_hash = _chain_hash(chain_hash, event)
+            event.chain_hash = chain_hash
+            lines.append(json.dumps(event.to_dict()))
+
+        batch_id = self._batch_id + 1
+        seal = {
+            "record_type": SEAL_RECORD_TYPE,
+            "batch_id": batch_id,
+            "start_hash": start_hash,
+            "last_hash": chain_hash,
+            "count": len(batch),
+        }
+        seal["signature"] = self._sign_data(_seal_payload(seal))
+        lines.append(json.dumps(seal))
 
-        # 寫入日誌
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        offset = self._log_offset
         try:
-            with open(self.current_log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(event.to_dict()) + "\n")
-        except Exception as e:
-            logger.error(f"寫入審計日誌時發生錯誤: {e}")
+            self._log_handle.write(data)
+            self._log_handle.flush()
+            os.fsync(self._log_handle.fileno())
+        except Exception:
+            # 移除寫入一半的資料，整批由寫入執行緒重試
+            with suppress(OSError, ValueError):
+                self._log_handle.truncate(offset)
+            raise
+
+        # 日誌寫入成功後才推進雜湊鏈與批次編號
+        self._batch_id = batch_id
+        self._log_offset += len(data)
+        for event in batch:
+            event.signature = seal["signature"]
+        self._chain_head = chain_hash
+
+        file_name = os.path.basename(self.current_log_file)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO audit_events (file, unit_offset, unit_length, "
+                    "position, timestamp, user_id, event_type) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            file_name,
+                            offset,
+                            len(data),
+                            position,
+                            event.timestamp.timestamp(),
+                            event.user_id,
+                            event.event_type.value,
+                        )
+                        for position, event in enumerate(batch)
+                    ],
+                )
+                conn.execute(
+                    "INSERT INTO audit_batches (batch_id, file, unit_offset, "
+                    "start_hash, last_hash) VALUES (?, ?, ?, ?, ?)",
+                    (batch_id, file_name, offset, start_hash, chain_hash),
+                )
+        except sqlite3.Error as e:
+            # 事件已寫入日誌，重試會重複寫入；索引可由 rebuild_index 重建
+            logger.error(f"更新審計索引時發生錯誤，請執行 rebuild_index: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """開啟索引連線"""
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_index(self) -> None:
+        """建立索引資料表，索引為空但已有日誌文件時重建"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS audit_events ("
+                "file TEXT NOT NULL, unit_offset INTEGER NOT NULL, "
+                "unit_length INTEGER NOT NULL, position INTEGER NOT NULL, "
+                "timestamp REAL NOT NULL, user_id TEXT, event_type TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS audit_batches ("
+                "batch_id INTEGER PRIMARY KEY, file TEXT NOT NULL, "
+                "unit_offset INTEGER NOT NULL, start_hash TEXT NOT NULL, "
+                "last_hash TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_audit_events_time "
+                "ON audit_events (timestamp)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_audit_events_user "
+                "ON audit_events (user_id, timestamp)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_audit_events_type "
+                "ON audit_events (event_type, timestamp)"
+            )
+            empty = conn.execute("SELECT COUNT(*) FROM audit_events").fetchone()[0] == 0
+
+        if empty and self._log_files():
+            self.rebuild_index()
+
+    def _load_chain_state(self) -> Tuple[str, int]:
+        """從索引取得雜湊鏈最新的雜湊值與批次編號"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT batch_id, last_hash FROM audit_batches "
+                "ORDER BY batch_id DESC LIMIT 1"
+            ).fetchone()
+        if row is None:
+            return GENESIS_HASH, 0
+        return row[1], row[0]
+
+    def _log_files(self, reverse: bool = False) -> List[str]:
+        """取得日誌文件名稱列表"""
+        return sorted(
+            [
+                f
+                for f in os.listdir(self.log_dir)
+                if f.startswith("audit_") and f.endswith(".jsonl")
+            ],
+            reverse=reverse,
+        )
 
-        return event
+    def _scan_units(self, file_name: str) -> Iterable[Tuple[int, int, List[Dict]]]:
+        """
+        依序掃描日誌文件中的寫入單位
+
+        新格式的單位為一批事件加上封存記錄；舊版逐筆簽名的事件各自為一個單位。
+
+        Args:
+            file_name: 日誌文件名稱
+
+        Yields:
+            Tuple[int, int, List[Dict]]: (位移, 長度, 記錄列表)
+        """
+        offset = 0
+        unit_offset = 0
+        pending: List[Dict] = []
+        with open(os.path.join(self.log_dir, file_name), "rb") as f:
+            for line in f:
+                line_offset = offset
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.error(f"解析審計事件時發生錯誤: {file_name}@{line_offset}")
+                    pending = []
+                    continue
+
+                if record.get("record_type") == SEAL_RECORD_TYPE:
+                    pending.append(record)
+                    yield unit_offset, offset - unit_offset, pending
+                    pending = []
+                elif record.get("chain_hash") is None:
+                    # 舊版逐筆簽名的事件
+                    yield line_offset, offset - line_offset, [record]
+                else:
+                    if not pending:
+                        unit_offset = line_offset
+                    pending.append(record)
+
+        if pending:
+            logger.warning(f"審計日誌 {file_name} 結尾有未封存的事件")
+
+    def rebuild_index(self) -> int:
+        """
+        從日誌文件重建索引
+
+        Returns:
+            int: 索引的事件數量
+        """
+        count = 0
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM audit_events")
+            conn.execute("DELETE FROM audit_batches")
+            for file_name in self._log_files():
+                for offset, length, records in self._scan_units(file_name):
+                    events = [
+                        r for r in records if r.get("record_type") != SEAL_RECORD_TYPE
+                    ]
+                    conn.executemany(
+                        "INSERT INTO audit_events (file, unit_offset, unit_length, "
+                        "position, timestamp, user_id, event_type) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (
+                                file_name,
+                                offset,
+                                length,
+                                position,
+                                datetime.fromisoformat(r["timestamp"]).timestamp(),
+                                r["user_id"],
+                                r["event_type"],
+                            )
+                            for position, r in enumerate(events)
+                        ],
+                    )
+                    seal = records[-1]
+                    if seal.get("record_type") == SEAL_RECORD_TYPE:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO audit_batches (batch_id, file, "
+                            "unit_offset, start_hash, last_hash) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (
+                                seal["batch_id"],
+                                file_name,
+                                offset,
+                                seal["start_hash"],
+                                seal["last_hash"],
+                            ),
+                        )
+                    count += len(events)
+
+        logger.info(f"審計索引已重建，共 {count} 個事件")
+        return count
+
+    def _verify_unit(self, records: List[Dict]) -> List[Optional[AuditEvent]]:
+        """
+        驗證一個寫入單位並轉換為事件
+
+        Args:
+            records: 單位內的記錄
+
+        Returns:
+            List[Optional[AuditEvent]]: 依位置排列的事件，驗證失敗者為 None
+        """
+        seal = records[-1]
+        if seal.get("record_type") != SEAL_RECORD_TYPE:
+            # 舊版逐筆簽名
+            event = AuditEvent.from_dict(seal)
+            if not self._verify_signature(event):
+                logger.warning(f"審計事件簽名無效: {event.event_id}")
+                return [None]
+            return [event]
+
+        events = [AuditEvent.from_dict(r) for r in records[:-1]]
+
+        # 重新計算雜湊鏈並驗證批次簽名
+        chain_hash = seal["start_hash"]
+        valid = len(events) == seal["count"]
+        for event in events:
+            chain_hash = _chain_hash(chain_hash, event)
+            if chain_hash != event.chain_hash:
+                valid = False
+                break
+        valid = (
+            valid
+            and chain_hash == seal["last_hash"]
+            and self._verify_data(_seal_payload(seal), seal.get("signature"))
+        )
+
+        if not valid:
+            logger.warning(f"審計批次驗證失敗: {seal.get('batch_id')}")
+            return [None] * len(events)
+
+        for event in events:
+            event.signature = seal.get("signature")
+        return events
+
+    def verify_chain(self) -> bool:
+        """
+        驗證完整雜湊鏈
+
+        檢查每一批的起點雜湊值都等於前一批的最後雜湊值，且每一批的鏈結與
+        簽名皆有效。
+
+        Returns:
+            bool: 雜湊鏈是否完整
+        """
+        self.flush()
+        prev_hash = None
+        for file_name in self._log_files():
+            for _, _, records in self._scan_units(file_name):
+                seal = records[-1]
+                if seal.get("record_type") != SEAL_RECORD_TYPE:
+                    continue
+                if prev_hash is not None and seal["start_hash"] != prev_hash:
+                    logger.warning(f"審計雜湊鏈在批次 {seal['batch_id']} 中斷")
+                    return False
+                if None in self._verify_unit(records):
+                    return False
+                prev_hash = seal["last_hash"]
+        return True
 
     def get_events(
         self,
@@ -448,6 +928,8 @@ class AuditTrail:
         """
         獲取事件
 
+        依索引找出符合條件的事件所在的批次，只讀取並驗證這些批次。
+
         Args:
             start_time: 開始時間
             end_time: 結束時間
@@ -458,62 +940,70 @@ class AuditTrail:
         Returns:
             List[AuditEvent]: 事件列表
         """
-        events = []
-
-        # 獲取日誌文件列表
-        log_files = sorted(
-            [
-                f
-                for f in os.listdir(self.log_dir)
-                if f.startswith("audit_") and f.endswith(".jsonl")
-            ],
-            reverse=True,
-        )
-
-        # 讀取日誌文件
-        for log_file in log_files:
-            file_path = os.path.join(self.log_dir, log_file)
+        # 確保已記錄的事件都已寫入
+        self.flush()
+
+        conditions = []
+        params: List[Any] = []
+        if start_time:
+            conditions.append("timestamp >= ?")
+            params.append(start_time.timestamp())
+        if end_time:
+            conditions.append("timestamp <= ?")
+            params.append(end_time.timestamp())
+        if event_types:
+            conditions.append(f"event_type IN ({','.join('?' * len(event_types))})")
+            params.extend(AuditEventType(t).value for t in event_types)
+        if user_id:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+
+        query = "SELECT file, unit_offset, unit_length, position FROM audit_events"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        # 與逐檔掃描相同的順序：較新的文件在前，文件內依寫入順序
+        query += " ORDER BY file DESC, unit_offset, position"
+
+        events: List[AuditEvent] = []
+        units: Dict[Tuple[str, int], List[Optional[AuditEvent]]] = {}
+        handles: Dict[str, Any] = {}
 
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        # 解析事件
-                        try:
-                            event_data = json.loads(line.strip())
-                            event = AuditEvent.from_dict(event_data)
-
-                            # 檢查時間範圍
-                            if start_time and event.timestamp < start_time:
-                                continue
-
-                            if end_time and event.timestamp > end_time:
-                                continue
-
-                            # 檢查事件類型
-                            if event_types and event.event_type not in event_types:
-                                continue
-
-                            # 檢查用戶 ID
-                            if user_id and event.user_id != user_id:
-                                continue
-
-                            # 驗證簽名
-                            if not self._verify_signature(event):
-                                logger.warning(f"審計事件簽名無效: {event.event_id}")
-                                continue
-
-                            events.append(event)
-
-                            # 檢查限制
-                            if len(events) >= limit:
-                                return events
-                        except Exception as e:
-                            logger.error(f"解析審計事件時發生錯誤: {e}")
-            except Exception as e:
-                logger.error(f"讀取審計日誌文件時發生錯誤: {e}")
+        try:
+            with closing(self._connect()) as conn:
+                for file_name, offset, length, position in conn.execute(query, params):
+                    key = (file_name, offset)
+                    if key not in units:
+                        units[key] = self._read_unit(handles, file_name, offset, length)
+                    unit_events = units[key]
+                    if position >= len(unit_events) or unit_events[position] is None:
+                        continue
+
+                    events.append(unit_events[position])
+                    if len(events) >= limit:
+                        break
+        finally:
+            for handle in handles.values():
+                handle.close()
 
         return events
 
+    def _read_unit(
+        self, handles: Dict[str, Any], file_name: str, offset: int, length: int
+    ) -> List[Optional[AuditEvent]]:
+        """讀取並驗證指定位置的寫入單位"""
+        try:
+            handle = handles.get(file_name)
+            if handle is None:
+                handle = open(os.path.join(self.log_dir, file_name), "rb")
+                handles[file_name] = handle
+            handle.seek(offset)
+            data = handle.read(length)
+            records = [json.loads(line) for line in data.splitlines() if line]
+            return self._verify_unit(records)
+        except Exception as e:
+            logger.error(f"讀取審計日誌文件時發生錯誤: {e}")
+            return []
+
 
 # 創建全局審計跟蹤實例
 audit_trail = AuditTrail()
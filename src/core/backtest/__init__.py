@@ -22,6 +22,7 @@ from .service import BacktestService
 from .engine import BacktestEngine
 from .config import BacktestConfig, validate_backtest_config
 from .metrics import BacktestMetrics, calculate_performance_metrics
+from .result_store import BacktestResultStore
 from .specialized import FactorBacktester
 
 # 版本信息
@@ -42,6 +43,9 @@ __all__ = [
     "BacktestMetrics",
     "calculate_performance_metrics",
     
+    # 結果快取
+    "BacktestResultStore",
+    
     # 專門化工具
     "FactorBacktester",
     
@@ -126,6 +130,7 @@ SUPPORTED_FEATURES = [
     "factor_backtesting",
     "concurrent_execution",
     "progress_tracking",
+    "result_cache",
 ]
 
 def get_backtest_info() -> dict:
@@ -137,7 +142,9 @@ def get_backtest_info() -> dict:
     return {
         "version": BACKTEST_VERSION,
         "features": SUPPORTED_FEATURES,
-        "modules": ["service", "engine", "config", "metrics", "specialized"],
+        "modules": [
+            "service", "engine", "config", "metrics", "result_store", "specialized"
+        ],
         "integration_status": "completed",
         "original_modules": [
             "backtest_service.py",
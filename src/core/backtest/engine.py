@@ -47,6 +47,7 @@ class BacktestEngine:
         initial_capital: float = 100000,
         commission: float = 0.001,
         slippage: float = 0.001,
+        resume_from: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """執行回測
@@ -57,6 +58,8 @@ class BacktestEngine:
             initial_capital: 初始資金
             commission: 手續費率
             slippage: 滑點率
+            resume_from: 同一回測較短區間的結果；提供時還原其最後交易日的
+                現金、倉位與每日記錄，只執行之後的交易日
             **kwargs: 其他參數
             
         Returns:
@@ -78,6 +81,13 @@ class BacktestEngine:
             # 對齊數據
             aligned_signals, aligned_prices = self._align_data(signals, market_data)
             
+            # 從先前結果接續時只保留尚未執行的交易日
+            if resume_from is not None:
+                last_date = self._restore_state(resume_from)
+                if last_date is not None:
+                    tail = aligned_signals.index > last_date
+                    aligned_signals = aligned_signals[tail]
+            
             # 執行逐日回測
             for date in aligned_signals.index:
                 self._process_trading_day(
@@ -94,6 +104,30 @@ class BacktestEngine:
             logger.error("回測執行失敗: %s", e, exc_info=True)
             raise RuntimeError(f"回測執行失敗: {e}") from e
 
+    def _restore_state(self, results: Dict[str, Any]) -> Optional[pd.Timestamp]:
+        """從回測結果還原引擎狀態
+        
+        Args:
+            results: run_backtest 產生的回測結果
+            
+        Returns:
+            Optional[pd.Timestamp]: 結果中的最後交易日，沒有每日記錄時為 None
+        """
+        daily_values = results['daily_values']
+        if daily_values.empty:
+            return None
+        
+        self.trades = results['trades'].to_dict('records')
+        self.daily_values = daily_values.to_dict('records')
+        self.daily_returns = results['daily_returns'].to_dict('records')
+        self.daily_positions = results['daily_positions'].to_dict('records')
+        self.positions = dict(results['final_positions'])
+        
+        last_day = self.daily_values[-1]
+        self.cash = last_day['cash']
+        self.portfolio_value = last_day['total_value']
+        return last_day['date']
+
     def _validate_inputs(self, signals: pd.DataFrame, market_data: pd.DataFrame) -> None:
         """驗證輸入數據
         
@@ -90,6 +90,22 @@ class BacktestMetrics:
             }
         }
 
+    @classmethod
+    def from_dict(cls, metrics_dict: Dict[str, Any]) -> 'BacktestMetrics':
+        """從 to_dict 產生的分組字典創建指標
+
+        Args:
+            metrics_dict: 指標字典
+
+        Returns:
+            BacktestMetrics: 指標實例
+        """
+        return cls(**{
+            name: value
+            for group in metrics_dict.values()
+            for name, value in group.items()
+        })
+
 
 def calculate_performance_metrics(
     backtest_results: Dict[str, Any],
@@ -0,0 +1,446 @@
+"""
+回測結果儲存模組
+
+以內容定址的方式持久化回測結果，避免重複計算相同的回測：
+- 以 BacktestConfig 的正規化雜湊、策略程式碼版本與資料快照版本作為鍵
+- 每日記錄與交易記錄以 zstd 壓縮的 Parquet 欄式檔案儲存
+- 以小型 SQLite 索引記錄鍵、回測譜系與結束日期
+- 結束日期延後時可找出同一譜系中最長的已快取前段，只計算缺少的尾段
+
+回測譜系（lineage）為除結束日期外完全相同的配置與策略版本；
+同一譜系中較短區間的結果即為較長區間的前段。
+"""
+
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import shutil
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import pandas as pd
+
+from .config import BacktestConfig
+from .metrics import BacktestMetrics
+
+logger = logging.getLogger(__name__)
+
+# 儲存格式版本，格式變更時遞增以使舊結果失效
+STORE_FORMAT_VERSION = 1
+
+# 回測結果依賴的本套件模組，原始碼變更時使舊結果失效
+RESULT_MODULES = ("config", "engine", "metrics", "result_store", "service")
+
+# 以 Parquet 儲存的結果表
+FRAME_ARTIFACTS = ("trades", "daily_values", "daily_returns", "daily_positions")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backtest_results (
+    key TEXT PRIMARY KEY,
+    lineage TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    strategy_name TEXT NOT NULL,
+    code_version TEXT NOT NULL,
+    data_version TEXT NOT NULL,
+    path TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    accessed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_backtest_results_lineage
+    ON backtest_results (lineage, end_date);
+"""
+
+
+def _json_default(value: Any) -> Any:
+    """將 numpy 純量與日期轉為可序列化的值"""
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def canonical_hash(payload: Any) -> str:
+    """計算正規化 JSON 的 SHA-256 雜湊
+
+    鍵依字母排序且不含多餘空白，因此內容相同的字典不論鍵的順序都得到
+    相同雜湊。
+
+    Args:
+        payload: 可 JSON 序列化的內容
+
+    Returns:
+        str: 十六進位雜湊
+    """
+    text = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), default=_json_default
+    )
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def package_version() -> str:
+    """計算回測套件本身的程式碼版本
+
+    包含套件版本號與 RESULT_MODULES 各模組原始碼的雜湊，修改績效指標、
+    引擎或配置等模組都會使舊結果失效。原始碼在程序執行期間不變，因此
+    只計算一次。
+
+    Returns:
+        str: 套件程式碼版本
+    """
+    package = importlib.import_module(__package__)
+    parts = [getattr(package, "__version__", ""), STORE_FORMAT_VERSION]
+    for name in RESULT_MODULES:
+        module = importlib.import_module(f"{__package__}.{name}")
+        try:
+            parts.append(inspect.getsource(module))
+        except (OSError, TypeError):
+            parts.append(module.__name__)
+    return canonical_hash(parts)
+
+
+def code_version(*components: Any) -> str:
+    """計算產生結果的程式碼版本
+
+    物件有 version 屬性時直接使用，否則以定義其類別的模組原始碼的雜湊
+    作為版本，因此修改策略、引擎或同一模組中的輔助函數會使舊結果失效。
+    回測套件本身的程式碼版本一律計入。
+
+    Args:
+        *components: 參與計算的物件，例如策略與回測引擎
+
+    Returns:
+        str: 程式碼版本
+    """
+    parts = [package_version()]
+    for component in components:
+        version = getattr(component, "version", None)
+        if version is None:
+            cls = type(component)
+            try:
+                version = inspect.getsource(inspect.getmodule(cls))
+            except (OSError, TypeError):
+                try:
+                    version = inspect.getsource(cls)
+                except (OSError, TypeError):
+                    version = f"{cls.__module__}.{cls.__qualname__}"
+        parts.append(str(version))
+    return canonical_hash(parts)[:16]
+
+
+def lineage_key(config: BacktestConfig, code_version: str) -> str:
+    """計算回測譜系鍵，即不含結束日期的配置雜湊
+
+    Args:
+        config: 回測配置
+        code_version: 程式碼版本
+
+    Returns:
+        str: 譜系鍵
+    """
+    config_dict = config.to_dict()
+    config_dict.pop("end_date")
+    return canonical_hash(
+        {
+            "format": STORE_FORMAT_VERSION,
+            "config": config_dict,
+            "code_version": code_version,
+        }
+    )
+
+
+def result_key(config: BacktestConfig, code_version: str, data_version: str) -> str:
+    """計算回測結果的內容位址
+
+    Args:
+        config: 回測配置
+        code_version: 程式碼版本
+        data_version: 回測區間內的資料快照版本
+
+    Returns:
+        str: 結果鍵
+    """
+    return canonical_hash(
+        {
+            "lineage": lineage_key(config, code_version),
+            "end_date": config.end_date.isoformat(),
+            "data_version": data_version,
+        }
+    )
+
+
+class BacktestResultStore:
+    """內容定址的回測結果儲存
+
+    每筆結果存放於 ``root/objects/<鍵前兩碼>/<鍵>/``，包含各結果表的
+    Parquet 檔案與記錄摘要、最終倉位和績效指標的 manifest.json；
+    ``root/index.db`` 為 SQLite 索引。
+
+    Attributes:
+        root: 儲存根目錄
+        compression: Parquet 壓縮方式
+    """
+
+    def __init__(self, root: Union[str, Path], compression: str = "zstd"):
+        """初始化結果儲存
+
+        Args:
+            root: 儲存根目錄
+            compression: Parquet 壓縮方式
+        """
+        self.root = Path(root)
+        self.compression = compression
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.db"
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """建立索引連線，每次操作使用獨立連線以便跨執行緒使用"""
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def contains(self, key: str) -> bool:
+        """檢查結果是否已快取
+
+        Args:
+            key: 結果鍵
+
+        Returns:
+            bool: 是否存在
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM backtest_results WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """讀取快取的回測結果
+
+        Args:
+            key: 結果鍵
+
+        Returns:
+            Optional[Dict[str, Any]]: 包含 results 與 metrics 的字典，不存在或
+            檔案損毀時為 None
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT path FROM backtest_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE backtest_results SET accessed_at = ? WHERE key = ?",
+                (pd.Timestamp.now().isoformat(), key),
+            )
+
+        try:
+            return self._read_artifacts(self.root / row[0])
+        except Exception as e:
+            logger.warning("快取結果無法讀取，將重新計算: %s (%s)", key, e)
+            self.remove(key)
+            return None
+
+    def find_prefix(
+        self,
+        config: BacktestConfig,
+        code_version: str,
+        data_version: Callable[[pd.Timestamp], str],
+    ) -> Optional[Tuple[str, pd.Timestamp]]:
+        """尋找同一譜系中結束日期較早的最長快取結果
+
+        只有當該段區間的資料版本與快取時相同，前段結果才可接續使用。
+
+        Args:
+            config: 回測配置
+            code_version: 程式碼版本
+            data_version: 依結束日期取得資料快照版本的函數
+
+        Returns:
+            Optional[Tuple[str, pd.Timestamp]]: (結果鍵, 快取結果的結束日期)
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key, end_date, data_version FROM backtest_results "
+                "WHERE lineage = ? AND end_date < ? ORDER BY end_date DESC",
+                (lineage_key(config, code_version), config.end_date.isoformat()),
+            ).fetchall()
+
+        for key, end_date, cached_data_version in rows:
+            end_date = pd.Timestamp(end_date)
+            if data_version(end_date) == cached_data_version:
+                return key, end_date
+        return None
+
+    def put(
+        self,
+        config: BacktestConfig,
+        code_version: str,
+        data_version: str,
+        results: Dict[str, Any],
+        metrics: Optional[BacktestMetrics] = None,
+    ) -> str:
+        """保存回測結果
+
+        Args:
+            config: 回測配置
+            code_version: 程式碼版本
+            data_version: 回測區間內的資料快照版本
+            results: BacktestEngine.run_backtest 產生的回測結果
+            metrics: 績效指標
+
+        Returns:
+            str: 結果鍵
+        """
+        key = result_key(config, code_version, data_version)
+        relative = Path("objects") / key[:2] / key
+        target = self.root / relative
+
+        with self._lock:
+            if self.contains(key):
+                return key
+
+            # 先寫入暫存目錄再改名，避免讀到寫入一半的結果
+            staging = self.objects_dir / f".tmp-{uuid.uuid4().hex}"
+            staging.mkdir(parents=True)
+            try:
+                nbytes = self._write_artifacts(staging, results, metrics)
+                if target.exists():
+                    shutil.rmtree(target)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                staging.rename(target)
+            except Exception:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+            now = pd.Timestamp.now().isoformat()
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO backtest_results VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        lineage_key(config, code_version),
+                        config.end_date.isoformat(),
+                        config.strategy_name,
+                        code_version,
+                        data_version,
+                        relative.as_posix(),
+                        nbytes,
+                        now,
+                        now,
+                    ),
+                )
+
+        logger.info("回測結果已快取: %s (%d bytes)", key, nbytes)
+        return key
+
+    def remove(self, key: str) -> bool:
+        """刪除快取結果
+
+        Args:
+            key: 結果鍵
+
+        Returns:
+            bool: 是否有結果被刪除
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT path FROM backtest_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM backtest_results WHERE key = ?", (key,))
+        shutil.rmtree(self.root / row[0], ignore_errors=True)
+        return True
+
+    def clean(self, days: int = 30) -> int:
+        """刪除超過指定天數未被讀取的結果
+
+        Args:
+            days: 保留天數
+
+        Returns:
+            int: 刪除的結果數量
+        """
+        cutoff = (pd.Timestamp.now() - pd.Timedelta(days=days)).isoformat()
+        with self._connect() as conn:
+            keys = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT key FROM backtest_results WHERE accessed_at < ?",
+                    (cutoff,),
+                )
+            ]
+        return sum(self.remove(key) for key in keys)
+
+    def _write_artifacts(
+        self,
+        directory: Path,
+        results: Dict[str, Any],
+        metrics: Optional[BacktestMetrics],
+    ) -> int:
+        """寫入結果檔案並回傳總位元組數"""
+        for name in FRAME_ARTIFACTS:
+            frame = results[name]
+            if name == "daily_positions" and not frame.empty:
+                # 每日倉位為巢狀字典，以 JSON 字串欄位儲存
+                frame = frame.assign(
+                    positions=[
+                        json.dumps(positions, default=_json_default)
+                        for positions in frame["positions"]
+                    ]
+                )
+            frame.to_parquet(
+                directory / f"{name}.parquet",
+                compression=self.compression,
+                index=False,
+            )
+
+        manifest = {
+            "summary": results["summary"],
+            "final_positions": results["final_positions"],
+            "metrics": metrics.to_dict() if metrics is not None else None,
+        }
+        with open(directory / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, default=_json_default)
+
+        return sum(path.stat().st_size for path in directory.iterdir())
+
+    def _read_artifacts(self, directory: Path) -> Dict[str, Any]:
+        """讀取結果檔案"""
+        with open(directory / "manifest.json", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        results = {"summary": manifest["summary"]}
+        for name in FRAME_ARTIFACTS:
+            frame = pd.read_parquet(directory / f"{name}.parquet")
+            if name == "daily_positions" and not frame.empty:
+                frame["positions"] = [json.loads(p) for p in frame["positions"]]
+            results[name] = frame
+        results["final_positions"] = manifest["final_positions"]
+
+        metrics = manifest["metrics"]
+        return {
+            "results": results,
+            "metrics": BacktestMetrics.from_dict(metrics) if metrics else None,
+        }
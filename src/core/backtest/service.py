@@ -18,10 +18,14 @@ from typing import Dict, List, Optional, Any, Tuple, Callable
 import pandas as pd
 import uuid
 import time
+import zlib
+
+from src.core.backtest_module.backtest_query_manager import BacktestQueryManager
 
 from .config import BacktestConfig, validate_backtest_config
 from .engine import BacktestEngine
 from .metrics import calculate_performance_metrics
+from .result_store import BacktestResultStore, code_version, result_key
 # 暫時註釋掉未實現的模組
 # from .data_manager import BacktestDataManager
 # from .status_manager import BacktestStatusManager
@@ -41,15 +45,20 @@ class BacktestService:
         status_manager: 狀態管理器
         results_manager: 結果管理器
         export_manager: 匯出管理器
+        query_manager: 交易記錄查詢管理器
         engine: 回測引擎
+        result_store: 回測結果快取，停用時為 None
     """
 
-    def __init__(self, db_path: str = None, results_dir: str = None):
+    def __init__(
+        self, db_path: str = None, results_dir: str = None, use_cache: bool = True
+    ):
         """初始化回測服務
         
         Args:
             db_path: 資料庫路徑
             results_dir: 結果保存目錄
+            use_cache: 是否重用相同配置、策略程式碼與資料版本的回測結果
         """
         # 設置結果目錄
         self.results_dir = Path(results_dir or "data/backtest_results")
@@ -66,10 +75,18 @@ class BacktestService:
         self.status_manager = self._create_simple_status_manager()
         self.results_manager = self._create_simple_results_manager()
         self.export_manager = self._create_simple_export_manager()
+        self.query_manager = BacktestQueryManager(
+            db_path or "data/backtest.db", self.results_manager
+        )
         
         # 初始化回測引擎
         self.engine = BacktestEngine()
         
+        # 回測結果快取
+        self.result_store = (
+            BacktestResultStore(self.results_dir / "cache") if use_cache else None
+        )
+        
         # 執行狀態管理
         self.running_backtests = {}
         self.backtest_threads = {}
@@ -114,6 +131,10 @@ class BacktestService:
         backtest_id = str(uuid.uuid4())
         self.status_manager.create_backtest_task(backtest_id, config)
         
+        # 已有快取結果時直接完成，不啟動回測線程
+        if self._complete_from_cache(backtest_id, config):
+            return backtest_id
+        
         # 啟動回測線程
         thread = threading.Thread(
             target=self._run_backtest_thread,
@@ -163,9 +184,25 @@ class BacktestService:
             # 生成訊號
             signals = strategy.generate_signals(market_data)
             
+            # 結束日期延後時接續同一回測較短區間的快取結果
+            cache_versions = self._cache_versions(config, strategy)
+            cached_prefix = None
+            if cache_versions is not None:
+                prefix = self.result_store.find_prefix(
+                    config,
+                    cache_versions[0],
+                    lambda end_date: self._data_version(config, end_date),
+                )
+                if prefix is not None:
+                    cached_prefix = self.result_store.get(prefix[0])
+            
             # 更新狀態
+            if cached_prefix is not None:
+                message = f"正在執行回測（接續 {prefix[1].date()} 之前的快取結果）..."
+            else:
+                message = "正在執行回測..."
             self.status_manager.update_backtest_status(
-                backtest_id, "running", 50, "正在執行回測..."
+                backtest_id, "running", 50, message
             )
             
             # 執行回測
@@ -174,7 +211,8 @@ class BacktestService:
                 market_data=market_data,
                 initial_capital=config.initial_capital,
                 commission=config.commission,
-                slippage=config.slippage
+                slippage=config.slippage,
+                resume_from=cached_prefix["results"] if cached_prefix else None
             )
             
             # 計算績效指標
@@ -190,6 +228,13 @@ class BacktestService:
             self.results_manager.save_backtest_results(
                 backtest_id, results, metrics, config
             )
+            if cache_versions is not None:
+                try:
+                    self.result_store.put(
+                        config, *cache_versions, results, metrics
+                    )
+                except Exception as e:
+                    logger.warning("回測結果快取失敗: %s", e, exc_info=True)
             
             # 完成回測
             self.status_manager.update_backtest_status(
@@ -212,6 +257,85 @@ class BacktestService:
                 if backtest_id in self.backtest_threads:
                     del self.backtest_threads[backtest_id]
 
+    def _data_version(self, config: BacktestConfig, end_date: Any = None) -> Optional[str]:
+        """獲取回測區間內的資料快照版本
+        
+        Args:
+            config: 回測配置
+            end_date: 區間結束日期，預設為配置的結束日期
+            
+        Returns:
+            Optional[str]: 資料版本，數據管理器不支援版本時為 None
+        """
+        get_data_version = getattr(self.data_manager, "get_data_version", None)
+        if get_data_version is None:
+            return None
+        return get_data_version(
+            config.symbols,
+            config.start_date,
+            config.end_date if end_date is None else end_date
+        )
+
+    def _cache_versions(
+        self, config: BacktestConfig, strategy: Any
+    ) -> Optional[Tuple[str, str]]:
+        """獲取快取鍵所需的程式碼與資料版本
+        
+        Args:
+            config: 回測配置
+            strategy: 已載入的策略
+            
+        Returns:
+            Optional[Tuple[str, str]]: (程式碼版本, 資料版本)，停用快取或
+            資料無版本時為 None
+        """
+        if self.result_store is None:
+            return None
+        data_version = self._data_version(config)
+        if data_version is None:
+            return None
+        return code_version(strategy, self.engine), data_version
+
+    def _complete_from_cache(self, backtest_id: str, config: BacktestConfig) -> bool:
+        """以快取結果直接完成回測
+        
+        Args:
+            backtest_id: 回測ID
+            config: 回測配置
+            
+        Returns:
+            bool: 是否命中快取
+        """
+        try:
+            strategy = self.data_manager.load_strategy(
+                config.strategy_name, config.strategy_params
+            )
+            cache_versions = self._cache_versions(config, strategy)
+            if cache_versions is None:
+                return False
+            cached = self.result_store.get(result_key(config, *cache_versions))
+        except Exception as e:
+            logger.warning("讀取回測結果快取失敗: %s", e, exc_info=True)
+            return False
+        if cached is None:
+            return False
+        
+        self.results_manager.save_backtest_results(
+            backtest_id, cached["results"], cached["metrics"], config
+        )
+        self.status_manager.update_backtest_status(
+            backtest_id, "completed", 100, "回測完成（使用快取結果）"
+        )
+        with self._lock:
+            self.running_backtests[backtest_id] = {
+                "status": "completed",
+                "progress": 100,
+                "message": "回測完成（使用快取結果）",
+                "config": config
+            }
+        logger.info("回測任務使用快取結果: %s", backtest_id)
+        return True
+
     def get_backtest_status(self, backtest_id: str) -> Dict:
         """獲取回測狀態
         
@@ -249,6 +373,33 @@ class BacktestService:
         # 獲取結果
         return self.results_manager.get_backtest_results(backtest_id)
 
+    def get_transaction_records(
+        self,
+        backtest_id: str,
+        symbol: str = None,
+        action: str = None,
+        after: Optional[Tuple[str, int]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """獲取交易記錄
+        
+        依 (entry_date, id) 排序，以鍵集分頁讀取，參數同
+        ``BacktestQueryManager.get_transaction_records``。
+        
+        Args:
+            backtest_id: 回測ID
+            symbol: 股票代碼篩選 (可選)
+            action: 交易動作篩選 (可選)
+            after: 上一頁最後一筆的 (entry_date, id) (可選)
+            limit: 限制數量 (可選)
+            
+        Returns:
+            List[Dict]: 交易記錄列表
+        """
+        return self.query_manager.get_transaction_records(
+            backtest_id, symbol=symbol, action=action, after=after, limit=limit
+        )
+
     def export_backtest_report(self, backtest_id: str, format: str = "html") -> str:
         """匯出回測報告
         
@@ -317,7 +468,10 @@ class BacktestService:
         Returns:
             int: 清理的記錄數量
         """
-        return self.results_manager.clean_old_results(days)
+        cleaned = self.results_manager.clean_old_results(days)
+        if self.result_store is not None:
+            cleaned += self.result_store.clean(days)
+        return cleaned
 
     # 簡化版管理器實現
     def _create_simple_data_manager(self):
@@ -337,6 +491,10 @@ class BacktestService:
                     {"symbol": "MSFT", "name": "Microsoft Corporation"}
                 ]
 
+            def get_data_version(self, symbols, start_date, end_date):
+                # 模擬數據只由標的與日期決定，版本固定
+                return "simulated-v1"
+
             def load_market_data(self, symbols, start_date, end_date):
                 # 生成模擬數據
                 import pandas as pd
@@ -355,7 +513,7 @@ class BacktestService:
                 data = []
                 for symbol in symbols:
                     # 設置隨機種子以獲得可重複的結果
-                    np.random.seed(hash(symbol) % 10000)
+                    np.random.seed(zlib.crc32(symbol.encode()) % 10000)
 
                     # 生成價格序列
                     price = 100.0
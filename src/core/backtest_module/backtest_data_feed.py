@@ -5,10 +5,15 @@
 
 import logging
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import numpy as np
 import pandas as pd
 
+from src.core.shared_market_data_cache import (
+    SharedMarketDataCache,
+    get_shared_market_data_cache,
+)
+
 # 設定日誌
 logger = logging.getLogger(__name__)
 
@@ -16,9 +21,21 @@ logger = logging.getLogger(__name__)
 class BacktestDataFeed:
     """回測數據饋送器"""
 
-    def __init__(self):
-        """初始化數據饋送器"""
+    def __init__(
+        self,
+        shared_cache: Optional[SharedMarketDataCache] = None,
+        use_shared_cache: bool = True,
+    ):
+        """初始化數據饋送器
+
+        Args:
+            shared_cache: 跨程序共享市場數據快取，預設使用全域實例
+            use_shared_cache: 是否優先從共享快取讀取
+        """
         self.data_cache = {}
+        self.shared_cache = shared_cache
+        if self.shared_cache is None and use_shared_cache:
+            self.shared_cache = get_shared_market_data_cache()
 
     def load_market_data(
         self, symbols: List[str], start_date: datetime, end_date: datetime
@@ -41,6 +58,17 @@ class BacktestDataFeed:
 
         logger.info("載入市場資料: %s, %s - %s", symbols, start_date, end_date)
 
+        # 優先使用共享快取，避免每個程序各自保存一份日線
+        if self.shared_cache is not None:
+            shared = self.shared_cache.get_bars(symbols, start_date, end_date)
+            if not shared.empty:
+                logger.info(
+                    "使用共享快取市場資料 (版本 %s)，共 %d 筆記錄",
+                    self.shared_cache.current_version(),
+                    len(shared),
+                )
+                return shared
+
         # 生成日期範圍
         dates = pd.date_range(start=start_date, end=end_date, freq="D")
         dates = dates[dates.weekday < 5]  # 只保留工作日
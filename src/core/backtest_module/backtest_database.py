@@ -138,6 +138,20 @@ class BacktestDatabaseManager:
                 """
                 )
 
+                # 交易記錄與權益曲線依回測 ID 及日期分頁讀取
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_backtest_trades_keyset
+                    ON backtest_trades (backtest_id, entry_date, id)
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_backtest_equity_date
+                    ON backtest_equity (backtest_id, date)
+                """
+                )
+
                 conn.commit()
                 logger.info("回測數據庫初始化完成")
 
@@ -12,7 +12,7 @@
 import sqlite3
 import json
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
 # 設定日誌
@@ -159,17 +159,28 @@ class BacktestQueryManager:
             return None
 
     def get_transaction_records(
-        self, backtest_id: str, symbol: str = None, action: str = None
+        self,
+        backtest_id: str,
+        symbol: str = None,
+        action: str = None,
+        after: Optional[Tuple[str, int]] = None,
+        limit: Optional[int] = None,
     ) -> List[Dict]:
         """獲取交易記錄
 
+        依 (entry_date, id) 排序，傳入 ``after`` 時以鍵集分頁從該筆之後讀取，
+        不必像 OFFSET 一樣掃過前面的所有記錄。
+
         Args:
             backtest_id: 回測ID
             symbol: 股票代碼篩選 (可選)
             action: 交易動作篩選 (可選)
+            after: 上一頁最後一筆的 (entry_date, id) (可選)
+            limit: 限制數量 (可選)
 
         Returns:
-            List[Dict]: 交易記錄列表
+            List[Dict]: 交易記錄列表，每筆包含資料庫 ``id`` 與原始 ``entry_date``
+                字串，可作為下一頁的 ``after``
         """
         try:
             with sqlite3.connect(self.db_path) as conn:
@@ -187,17 +198,28 @@ class BacktestQueryManager:
                     where_conditions.append("trade_type = ?")
                     params.append(action)
 
+                if after is not None:
+                    where_conditions.append(
+                        "(entry_date > ? OR (entry_date = ? AND id > ?))"
+                    )
+                    params.extend([after[0], after[0], after[1]])
+
                 where_clause = " AND ".join(where_conditions)
+                limit_clause = ""
+                if limit is not None:
+                    limit_clause = "LIMIT ?"
+                    params.append(limit)
 
                 cursor.execute(
                     f"""
                     SELECT symbol, entry_date, trade_type, quantity, entry_price,
                            entry_price * quantity as amount, commission_paid, tax_paid,
                            (entry_price * quantity + commission_paid + tax_paid) as net_amount,
-                           0 as portfolio_value, 0 as cash_balance
+                           0 as portfolio_value, 0 as cash_balance, id
                     FROM backtest_trades
                     WHERE {where_clause}
-                    ORDER BY entry_date
+                    ORDER BY entry_date, id
+                    {limit_clause}
                 """,
                     params,
                 )
@@ -208,6 +230,8 @@ class BacktestQueryManager:
                 for row in rows:
                     transactions.append(
                         {
+                            "id": row[11],
+                            "entry_date": row[1],
                             "date": (
                                 datetime.fromisoformat(row[1])
                                 if row[1]
@@ -59,6 +59,7 @@ from src.core.rate_limiter import AdaptiveRateLimiter
 from src.core.websocket_client import WebSocketClient
 from src.core.data_source_failover import DataSourceFailoverManager
 from src.data_sources.broker_adapter import SimulatedBrokerAdapter
+from src.monitoring.latency_tracing import latency_tracer
 
 # 資料來源適配器
 from src.data_sources.twse_crawler import twse_crawler
@@ -568,8 +569,11 @@ class DataIngestionManager:
                             self.data_queue.maxsize,
                         )
 
-                    # 將消息放入隊列
-                    self.data_queue.put((message, on_message), block=False)
+                    # 將消息放入隊列，回調在取出時恢復延遲追蹤並記錄排隊時間
+                    self.data_queue.put(
+                        (message, latency_tracer.bind(on_message, "ingest_queue")),
+                        block=False,
+                    )
 
                 except queue.Full:
                     logger.error("消息隊列已滿，丟棄消息")
@@ -34,6 +34,7 @@ from pathlib import Path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from src.core.real_data_integration import RealDataIntegrationService
+from src.core.shared_market_data_cache import get_shared_market_data_cache
 
 # 設置日誌
 logging.basicConfig(
@@ -98,6 +99,11 @@ class DataScheduler:
                 "enabled": True,
                 "email": None,
                 "webhook": None
+            },
+            "shared_cache": {
+                "enabled": True,
+                "base_dir": None,  # 預設 cache/shared_market_data
+                "lookback_days": 1095  # 發佈最近3年日線
             }
         }
         
@@ -171,6 +177,7 @@ class DataScheduler:
             if result['success']:
                 status = "success"
                 logger.info(f"✅ 每日更新完成: {result['message']}")
+                self._publish_shared_market_data()
             else:
                 status = "failed"
                 logger.error(f"❌ 每日更新失敗: {result['message']}")
@@ -202,6 +209,28 @@ class DataScheduler:
                 'error_message': str(e)
             })
     
+    def _publish_shared_market_data(self):
+        """將最新日線發佈至跨程序共享快取（單一寫入端）"""
+        cache_config = self.config.get('shared_cache', {})
+        if not cache_config.get('enabled', True):
+            return
+
+        try:
+            lookback_days = cache_config.get('lookback_days', 1095)
+            start_date = date.today() - timedelta(days=lookback_days)
+            bars = self.data_service.get_bulk_stock_data(start_date=start_date)
+            if bars.empty:
+                logger.warning("⚠️ 無日線數據可發佈至共享快取")
+                return
+
+            version = bars['date'].max().strftime('%Y-%m-%d')
+            cache = get_shared_market_data_cache(cache_config.get('base_dir'))
+            cache.publish_bars(bars, version)
+            logger.info(f"✅ 共享市場數據快取已更新至 {version}")
+
+        except Exception as e:
+            logger.error(f"❌ 發佈共享市場數據快取失敗: {e}")
+
     def weekly_full_update_task(self):
         """週度完整數據更新任務"""
         task_name = "weekly_full_update"
@@ -5,10 +5,10 @@
 """
 
 import logging
-import statistics
+import math
 import time
 from collections import defaultdict, deque
-from typing import List, Optional, Tuple
+from typing import Deque, List, Optional, Tuple
 
 from .event import Event, EventSeverity, EventSource, EventType
 from .event_processor import EventProcessor
@@ -17,6 +17,49 @@ from .event_processor import EventProcessor
 logger = logging.getLogger("events.anomaly_detector")
 
 
+class _RollingMoments:
+    """固定長度滑動窗口的平均值與標準差
+
+    以 Welford 法在加入與移出數值時增量更新，查詢為常數時間。
+    """
+
+    __slots__ = ("values", "mean", "_m2")
+
+    def __init__(self, maxlen: int):
+        self.values: Deque[float] = deque(maxlen=maxlen)
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def push(self, value: float):
+        """加入數值，窗口已滿時移出最舊的數值"""
+        values = self.values
+        if len(values) == values.maxlen:
+            oldest = values[0]
+            remaining = len(values) - 1
+            if remaining:
+                delta = oldest - self.mean
+                self.mean -= delta / remaining
+                self._m2 -= delta * (oldest - self.mean)
+            else:
+                self.mean = 0.0
+                self._m2 = 0.0
+
+        values.append(value)
+        delta = value - self.mean
+        self.mean += delta / len(values)
+        self._m2 += delta * (value - self.mean)
+
+    def stdev(self) -> float:
+        """樣本標準差"""
+        count = len(self.values)
+        if count < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (count - 1))
+
+
 class AnomalyDetector(EventProcessor):
     """
     異常檢測器基類
@@ -75,6 +118,7 @@ class FrequencyAnomalyDetector(AnomalyDetector):
         event_types: List[EventType],
         window_size: int = 300,
         threshold: float = 3.0,
+        history_size: int = 10,
     ):
         """
         初始化頻率異常檢測器
@@ -84,10 +128,14 @@ class FrequencyAnomalyDetector(AnomalyDetector):
             event_types: 要處理的事件類型列表
             window_size: 時間窗口大小（秒）
             threshold: 異常閾值（標準差倍數）
+            history_size: 保留的歷史窗口數
         """
         super().__init__(name, event_types, window_size)
         self.threshold = threshold
-        self.event_counts = defaultdict(list)  # 事件計數歷史
+        self.history_size = history_size
+        self.event_counts = defaultdict(
+            lambda: _RollingMoments(history_size)
+        )  # 事件計數歷史
         self.last_window_time = time.time()  # 上一個窗口時間
         self.current_window_counts = defaultdict(int)  # 當前窗口事件計數
         logger.info(f"頻率異常檢測器 '{name}' 已初始化，閾值: {threshold}")
@@ -102,27 +150,20 @@ class FrequencyAnomalyDetector(AnomalyDetector):
         Returns:
             Optional[Event]: 異常事件或None
         """
-        # 更新當前窗口計數
-        event_key = (event.event_type, event.source)
-        self.current_window_counts[event_key] += 1
-
-        # 檢查是否需要結束當前窗口
+        # 檢查是否需要結束當前窗口；當前事件計入新窗口
         current_time = time.time()
         if current_time - self.last_window_time >= self.window_size:
             # 結束當前窗口
             for key, count in self.current_window_counts.items():
-                self.event_counts[key].append(count)
-
-                # 限制歷史記錄長度
-                if len(self.event_counts[key]) > 10:
-                    self.event_counts[key] = self.event_counts[key][-10:]
+                self.event_counts[key].push(count)
 
             # 重置當前窗口
             self.current_window_counts = defaultdict(int)
             self.last_window_time = current_time
 
-            # 更新當前事件計數
-            self.current_window_counts[event_key] = 1
+        # 更新當前窗口計數
+        event_key = (event.event_type, event.source)
+        self.current_window_counts[event_key] += 1
 
         # 檢測異常
         return self._check_anomaly(event_key, event)
@@ -141,13 +182,13 @@ class FrequencyAnomalyDetector(AnomalyDetector):
             Optional[Event]: 異常事件或None
         """
         # 如果歷史記錄不足，則無法檢測異常
-        if len(self.event_counts[event_key]) < 3:
+        history = self.event_counts.get(event_key)
+        if history is None or len(history) < 3:
             return None
 
-        # 計算歷史平均值和標準差
-        history = self.event_counts[event_key]
-        mean = statistics.mean(history)
-        stdev = statistics.stdev(history) if len(history) > 1 else 1.0
+        # 歷史平均值和標準差已增量維護
+        mean = history.mean
+        stdev = history.stdev()
 
         # 獲取當前計數
         current_count = self.current_window_counts[event_key]
@@ -204,7 +245,7 @@ class PatternAnomalyDetector(AnomalyDetector):
         """
         super().__init__(name, event_types, window_size)
         self.pattern_size = pattern_size
-        self.event_buffer = deque(maxlen=1000)  # 事件緩衝區
+        self.recent_types = deque(maxlen=pattern_size)  # 最近事件的類型
         self.pattern_counts = defaultdict(int)  # 模式計數
         self.total_patterns = 0  # 總模式數
         logger.info(f"模式異常檢測器 '{name}' 已初始化，模式大小: {pattern_size}")
@@ -219,17 +260,15 @@ class PatternAnomalyDetector(AnomalyDetector):
         Returns:
             Optional[Event]: 異常事件或None
         """
-        # 添加事件到緩衝區
-        self.event_buffer.append(event)
+        # 添加事件類型到最近事件
+        self.recent_types.append(event.event_type)
 
-        # 如果緩衝區不足以形成模式，則返回
-        if len(self.event_buffer) < self.pattern_size:
+        # 如果最近事件不足以形成模式，則返回
+        if len(self.recent_types) < self.pattern_size:
             return None
 
         # 獲取當前模式
-        current_pattern = tuple(
-            e.event_type for e in list(self.event_buffer)[-self.pattern_size :]
-        )
+        current_pattern = tuple(self.recent_types)
 
         # 更新模式計數
         self.pattern_counts[current_pattern] += 1
@@ -292,6 +331,7 @@ class ValueAnomalyDetector(AnomalyDetector):
         data_field: str,
         window_size: int = 300,
         threshold: float = 3.0,
+        history_size: int = 100,
     ):
         """
         初始化數值異常檢測器
@@ -302,11 +342,13 @@ class ValueAnomalyDetector(AnomalyDetector):
             data_field: 要檢測的數據字段
             window_size: 時間窗口大小（秒）
             threshold: 異常閾值（標準差倍數）
+            history_size: 每個主題保留的歷史數值數
         """
         super().__init__(name, event_types, window_size)
         self.data_field = data_field
         self.threshold = threshold
-        self.values = defaultdict(list)  # 數值歷史
+        self.history_size = history_size
+        self.values = defaultdict(lambda: _RollingMoments(history_size))  # 數值歷史
         logger.info(
             f"數值異常檢測器 '{name}' 已初始化，數據字段: {data_field}，閾值: {threshold}"
         )
@@ -335,15 +377,11 @@ class ValueAnomalyDetector(AnomalyDetector):
         # 獲取事件主題
         subject = event.subject or "unknown"
 
-        # 更新數值歷史
-        self.values[subject].append(value)
-
-        # 限制歷史記錄長度
-        if len(self.values[subject]) > 100:
-            self.values[subject] = self.values[subject][-100:]
+        # 以加入當前值之前的歷史檢測異常，再更新數值歷史
+        anomaly = self._check_anomaly(subject, value, event)
+        self.values[subject].push(value)
 
-        # 檢測異常
-        return self._check_anomaly(subject, value, event)
+        return anomaly
 
     def _check_anomaly(
         self, subject: str, value: float, event: Event
@@ -359,14 +397,14 @@ class ValueAnomalyDetector(AnomalyDetector):
         Returns:
             Optional[Event]: 異常事件或None
         """
-        # 如果歷史記錄不足，則無法檢測異常
-        if len(self.values[subject]) < 10:
+        # 如果歷史記錄不足，則無法檢測異常（不包括當前值）
+        history = self.values.get(subject)
+        if history is None or len(history) < 9:
             return None
 
-        # 計算歷史平均值和標準差
-        history = self.values[subject][:-1]  # 不包括當前值
-        mean = statistics.mean(history)
-        stdev = statistics.stdev(history) if len(history) > 1 else 1.0
+        # 歷史平均值和標準差已增量維護
+        mean = history.mean
+        stdev = history.stdev()
 
         # 計算Z分數
         z_score = (value - mean) / max(stdev, 1e-10)
@@ -101,6 +101,9 @@ class Event:
     tags: List[str] = field(default_factory=list)  # 事件標籤
     related_events: List[str] = field(default_factory=list)  # 相關事件ID列表
     processed: bool = False  # 事件是否已處理
+    trace: Optional[Any] = field(
+        default=None, repr=False, compare=False
+    )  # 延遲追蹤交接點，不序列化
 
     def to_dict(self) -> Dict[str, Any]:
         """將事件轉換為字典"""
@@ -268,6 +271,55 @@ def create_order_event(
     )
 
 
+# 帶有此標籤的事件視為損益更新
+PNL_TAG = "pnl"
+
+
+def create_pnl_event(
+    subject: str,
+    unrealized_pnl: Optional[float] = None,
+    realized_pnl: Optional[float] = None,
+    market_value: Optional[float] = None,
+    severity: EventSeverity = EventSeverity.INFO,
+    message: Optional[str] = None,
+    **kwargs,
+) -> Event:
+    """
+    創建損益更新事件的便捷函數
+
+    Args:
+        subject: 損益所屬的持倉或帳戶
+        unrealized_pnl: 未實現損益
+        realized_pnl: 已實現損益
+        market_value: 市值
+        severity: 事件嚴重程度
+        message: 事件消息
+        **kwargs: 其他事件數據
+
+    Returns:
+        Event: 帶有損益標籤的事件
+    """
+    data = {
+        "unrealized_pnl": unrealized_pnl,
+        "realized_pnl": realized_pnl,
+        "market_value": market_value,
+        **kwargs,
+    }
+
+    # 過濾掉None值
+    data = {k: v for k, v in data.items() if v is not None}
+
+    return Event(
+        event_type=EventType.SYSTEM_INFO,
+        source=EventSource.TRADING_SYSTEM,
+        subject=subject,
+        severity=severity,
+        message=message,
+        data=data,
+        tags=[PNL_TAG],
+    )
+
+
 def create_system_event(
     event_type: EventType,
     message: str,
@@ -13,6 +13,8 @@ from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+from src.monitoring.latency_tracing import latency_tracer
+
 from .event import Event, EventType
 
 # 設定日誌
@@ -202,6 +204,11 @@ class EventBus:
             return False
 
         try:
+            # 在事件上保留延遲追蹤交接點，分發時恢復
+            handoff = latency_tracer.handoff()
+            if handoff is not None:
+                event.trace = handoff
+
             # 將事件放入隊列，使用優先級和時間戳作為排序依據
             timestamp = time.time()
             self._event_queue.put((priority, timestamp, event), block=False)
@@ -235,8 +242,9 @@ class EventBus:
                 if len(self._processed_events) > 10000:
                     self._processed_events = set(list(self._processed_events)[-5000:])
 
-                # 處理事件
-                self._dispatch_event(event)
+                # 處理事件，並記錄排隊時間
+                with latency_tracer.resume(event.trace, "event_queue"):
+                    self._dispatch_event(event)
 
                 # 標記任務完成
                 self._event_queue.task_done()
@@ -264,7 +272,7 @@ class EventBus:
                     callback(event)
                 elif subscription_type == SubscriptionType.ASYNC:
                     # 異步處理
-                    self._executor.submit(callback, event)
+                    self._executor.submit(latency_tracer.bind(callback), event)
                 elif subscription_type == SubscriptionType.QUEUE:
                     # 隊列處理 - 這裡假設回調是一個隊列的put方法
                     callback(event)
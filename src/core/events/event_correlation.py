@@ -6,8 +6,8 @@
 
 import logging
 import time
-from collections import Counter, defaultdict, deque
-from typing import Callable, List, Optional
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, List, Optional
 
 from .event import Event, EventSeverity, EventSource, EventType
 from .event_processor import EventProcessor
@@ -24,9 +24,18 @@ class EventCorrelator(EventProcessor):
     1. 分析事件之間的關聯
     2. 發現事件模式
     3. 生成複合事件
+
+    事件依到達順序存放在 deque 中，並依主題與類型建立索引；過期事件從左端
+    移出並同步移出索引，每個事件的維護成本為常數。
     """
 
-    def __init__(self, name: str, event_types: List[EventType], window_size: int = 300):
+    def __init__(
+        self,
+        name: str,
+        event_types: List[EventType],
+        window_size: int = 300,
+        max_events: int = 1000,
+    ):
         """
         初始化事件關聯分析器
 
@@ -34,10 +43,15 @@ class EventCorrelator(EventProcessor):
             name: 分析器名稱
             event_types: 要處理的事件類型列表
             window_size: 時間窗口大小（秒）
+            max_events: 緩衝區最多保留的事件數
         """
         super().__init__(name, event_types)
         self.window_size = window_size
-        self.event_buffer = deque(maxlen=1000)  # 事件緩衝區
+        self.max_events = max_events
+        self.event_buffer: Deque[Event] = deque()  # 事件緩衝區，依到達順序排列
+        self.event_times: Deque[float] = deque()  # 緩衝區事件的時間戳
+        self.events_by_subject: Dict[str, Deque[Event]] = {}  # 主題索引
+        self.events_by_type: Dict[EventType, Deque[Event]] = {}  # 類型索引
         logger.info(f"事件關聯分析器 '{name}' 已初始化，時間窗口: {window_size}秒")
 
     def process_event(self, event: Event) -> Optional[Event]:
@@ -50,8 +64,8 @@ class EventCorrelator(EventProcessor):
         Returns:
             Optional[Event]: 關聯事件或None
         """
-        # 添加事件到緩衝區
-        self.event_buffer.append(event)
+        # 添加事件到緩衝區與索引
+        self._add_event(event)
 
         # 清理過期事件
         self._clean_expired_events()
@@ -59,23 +73,54 @@ class EventCorrelator(EventProcessor):
         # 進行關聯分析
         return self.correlate(event)
 
-    def _clean_expired_events(self):
-        """清理過期事件"""
-        current_time = time.time()
-        cutoff_time = current_time - self.window_size
+    def _add_event(self, event: Event):
+        """將事件加入緩衝區與索引，超過容量時移出最舊的事件"""
+        if len(self.event_buffer) >= self.max_events:
+            self._evict_oldest()
 
-        # 將事件緩衝區轉換為列表
-        events = list(self.event_buffer)
+        self.event_buffer.append(event)
+        self.event_times.append(event.timestamp.timestamp())
+
+        if event.subject:
+            subject_events = self.events_by_subject.get(event.subject)
+            if subject_events is None:
+                subject_events = self.events_by_subject[event.subject] = deque()
+            subject_events.append(event)
+
+        type_events = self.events_by_type.get(event.event_type)
+        if type_events is None:
+            type_events = self.events_by_type[event.event_type] = deque()
+        type_events.append(event)
+
+    def _evict_oldest(self):
+        """移出緩衝區最舊的事件"""
+        event = self.event_buffer.popleft()
+        self.event_times.popleft()
+
+        # 索引可能已被子類清空，只在最舊事件仍在索引左端時移出
+        if event.subject:
+            subject_events = self.events_by_subject.get(event.subject)
+            if subject_events and subject_events[0] is event:
+                subject_events.popleft()
+            if not subject_events:
+                self.events_by_subject.pop(event.subject, None)
+
+        type_events = self.events_by_type.get(event.event_type)
+        if type_events and type_events[0] is event:
+            type_events.popleft()
+        if not type_events:
+            self.events_by_type.pop(event.event_type, None)
 
-        # 過濾出未過期的事件
-        valid_events = [
-            event for event in events if event.timestamp.timestamp() >= cutoff_time
-        ]
+    def _clean_expired_events(self):
+        """清理過期事件
 
-        # 清空緩衝區並添加有效事件
-        self.event_buffer.clear()
-        for event in valid_events:
-            self.event_buffer.append(event)
+        事件依到達順序排列，從左端移出早於窗口起點的事件，遇到第一個未過期的
+        事件即停止。
+        """
+        cutoff_time = time.time() - self.window_size
+        event_times = self.event_times
+        while event_times and event_times[0] < cutoff_time:
+            self._evict_oldest()
 
     def correlate(self, event: Event) -> Optional[Event]:
         """
@@ -218,7 +263,6 @@ class SubjectCorrelator(EventCorrelator):
         """
         super().__init__(name, event_types, window_size)
         self.threshold = threshold
-        self.subject_events = defaultdict(list)  # 按主題分組的事件
         self.last_correlation_time = {}  # 上次關聯時間
         logger.info(f"主題關聯分析器 '{name}' 已初始化，閾值: {threshold}")
 
@@ -226,6 +270,8 @@ class SubjectCorrelator(EventCorrelator):
         """
         關聯相同主題的事件
 
+        主題索引只包含窗口內尚未關聯過的事件，判斷是否達到閾值只需讀取長度。
+
         Args:
             event: 觸發關聯分析的事件
 
@@ -235,31 +281,29 @@ class SubjectCorrelator(EventCorrelator):
         if not event.subject:
             return None
 
-        # 添加事件到主題分組
-        self.subject_events[event.subject].append(event)
+        # 獲取窗口內相同主題的事件；事件本身已過期時索引可能不存在
+        subject_events = self.events_by_subject.get(event.subject)
+        if not subject_events:
+            return None
 
         # 獲取當前時間
         current_time = time.time()
 
         # 檢查是否需要關聯
-        if len(self.subject_events[event.subject]) >= self.threshold and (
-            event.subject not in self.last_correlation_time
-            or current_time - self.last_correlation_time[event.subject]
-            >= self.window_size
+        last_time = self.last_correlation_time.get(event.subject)
+        if len(subject_events) >= self.threshold and (
+            last_time is None or current_time - last_time >= self.window_size
         ):
-            # 獲取相同主題的事件
-            subject_events = self.subject_events[event.subject]
-
             # 生成關聯事件
             correlated_event = self._create_correlated_event(
-                event.subject, subject_events
+                event.subject, list(subject_events)
             )
 
             # 更新上次關聯時間
             self.last_correlation_time[event.subject] = current_time
 
-            # 清空主題事件
-            self.subject_events[event.subject] = []
+            # 已關聯的事件不再計入下一次關聯
+            subject_events.clear()
 
             return correlated_event
 
@@ -321,7 +365,7 @@ class RuleBasedCorrelator(EventCorrelator):
         self,
         name: str,
         event_types: List[EventType],
-        rules: List[Callable[[Event, List[Event]], bool]],
+        rules: List[Callable[[Event, Deque[Event]], bool]],
         window_size: int = 300,
     ):
         """
@@ -330,7 +374,8 @@ class RuleBasedCorrelator(EventCorrelator):
         Args:
             name: 分析器名稱
             event_types: 要處理的事件類型列表
-            rules: 關聯規則列表，每個規則是一個函數，接收當前事件和事件緩衝區，返回是否匹配
+            rules: 關聯規則列表，每個規則是一個函數，接收當前事件和依到達順序排列的
+                事件緩衝區（唯讀 deque），返回是否匹配
             window_size: 時間窗口大小（秒）
         """
         super().__init__(name, event_types, window_size)
@@ -347,25 +392,25 @@ class RuleBasedCorrelator(EventCorrelator):
         Returns:
             Optional[List[Event]]: 關聯事件列表或None
         """
-        # 獲取事件緩衝區
-        buffer_events = list(self.event_buffer)
+        # 事件緩衝區直接交給規則，不複製
+        buffer_events = self.event_buffer
 
         # 應用規則
         correlated_events = []
 
-        for rule in self.rules:
+        for rule_index, rule in enumerate(self.rules):
             # 檢查規則是否匹配
             if rule(event, buffer_events):
                 # 創建關聯事件
                 correlated_event = self._create_rule_event(
-                    event, buffer_events, self.rules.index(rule)
+                    event, buffer_events, rule_index
                 )
                 correlated_events.append(correlated_event)
 
         return correlated_events if correlated_events else None
 
     def _create_rule_event(
-        self, event: Event, buffer_events: List[Event], rule_index: int
+        self, event: Event, buffer_events: Deque[Event], rule_index: int
     ) -> Event:
         """
         創建規則關聯事件
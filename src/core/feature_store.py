@@ -9,6 +9,15 @@
 - 特徵版本控制
 - 特徵元數據管理
 - MLflow 整合（可選）
+
+儲存格式：
+- 含日期索引的特徵以 Parquet 分區資料集保存，依日期期間（預設為月）與
+  股票代碼雜湊桶分區，檔案內依 (股票, 日期) 排序並寫入 row group 統計，
+  載入時的欄位、日期與股票篩選在掃描階段套用
+- 每日增量可用 ``append_features`` 追加新檔案，不重寫歷史資料
+- 所有版本記錄於 SQLite 目錄索引（catalog.sqlite），列表與搜尋不需開啟
+  每個 metadata.json
+- 無日期索引的特徵與舊版單檔 features.parquet 仍可保存與載入
 """
 
 import datetime
@@ -16,10 +25,18 @@ import hashlib
 import json
 import logging
 import os
+import shutil
+import sqlite3
+import uuid
 import warnings
-from typing import Dict, List, Optional, Tuple
+import zlib
+from contextlib import closing
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 
 # 嘗試導入 MLflow
 try:
@@ -33,6 +50,22 @@ except ImportError:
 # 設定日誌
 logger = logging.getLogger(__name__)
 
+# 分區與內部欄位名稱
+# 注意：分區目錄名稱不可以底線開頭，否則會被 pyarrow 掃描時忽略
+PERIOD_COLUMN = "feature_period"
+BUCKET_COLUMN = "symbol_bucket"
+ROW_COLUMN = "__row"
+SYMBOL_LEVEL_NAMES = ("stock_id", "symbol")
+
+_CATALOG_FILE = "catalog.sqlite"
+_DATASET_DIR = "data"
+_LEGACY_FILE = "features.parquet"
+
+
+def _symbol_bucket(symbol, num_buckets: int) -> int:
+    """以穩定雜湊計算股票代碼所屬的分區桶"""
+    return zlib.crc32(str(symbol).encode("utf-8")) % num_buckets
+
 
 class FeatureStore:
     """
@@ -42,7 +75,13 @@ class FeatureStore:
     """
 
     def __init__(
-        self, base_dir="data/features", use_mlflow=False, mlflow_tracking_uri=None
+        self,
+        base_dir="data/features",
+        use_mlflow=False,
+        mlflow_tracking_uri=None,
+        partition_period: str = "M",
+        symbol_buckets: int = 16,
+        row_group_size: int = 128 * 1024,
     ):
         """
         初始化特徵存儲
@@ -51,13 +90,23 @@ class FeatureStore:
             base_dir (str): 特徵存儲的基礎目錄
             use_mlflow (bool): 是否使用 MLflow 進行特徵追蹤
             mlflow_tracking_uri (str, optional): MLflow 追蹤伺服器 URI
+            partition_period (str): 日期分區期間（pandas 期間代碼，如 "M"、"Y"）
+            symbol_buckets (int): 股票代碼分區桶數量
+            row_group_size (int): Parquet row group 最大列數
         """
         self.base_dir = base_dir
         self.use_mlflow = use_mlflow and MLFLOW_AVAILABLE
+        self.partition_period = partition_period
+        self.symbol_buckets = max(1, symbol_buckets)
+        self.row_group_size = row_group_size
+        self.catalog_path = os.path.join(base_dir, _CATALOG_FILE)
 
         # 確保基礎目錄存在
         os.makedirs(base_dir, exist_ok=True)
 
+        # 初始化目錄索引
+        self._init_catalog()
+
         # 初始化 MLflow
         if self.use_mlflow:
             if mlflow_tracking_uri:
@@ -97,6 +146,7 @@ class FeatureStore:
         if metadata is None:
             metadata = {}
 
+        layout = self._detect_layout(features_df)
         metadata.update(
             {
                 "name": name,
@@ -109,6 +159,7 @@ class FeatureStore:
                     col: str(dtype) for col, dtype in features_df.dtypes.items()
                 },
                 "tags": tags or [],
+                **layout,
             }
         )
 
@@ -116,14 +167,22 @@ class FeatureStore:
         feature_dir = os.path.join(self.base_dir, name, version)
         os.makedirs(feature_dir, exist_ok=True)
 
+        # 重新保存同一版本時先移除舊資料，避免分區中殘留舊檔案
+        shutil.rmtree(os.path.join(feature_dir, _DATASET_DIR), ignore_errors=True)
+        legacy_path = os.path.join(feature_dir, _LEGACY_FILE)
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+
         # 保存特徵資料
-        features_path = os.path.join(feature_dir, "features.parquet")
-        features_df.to_parquet(features_path)
+        if layout["storage"] == "partitioned":
+            self._write_partitions(features_df, feature_dir, metadata, row_offset=0)
+        else:
+            features_path = os.path.join(feature_dir, _LEGACY_FILE)
+            features_df.to_parquet(features_path)
 
         # 保存元數據
-        metadata_path = os.path.join(feature_dir, "metadata.json")
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        self._write_metadata(feature_dir, metadata)
+        self._upsert_catalog(metadata)
 
         logger.info(f"特徵 '{name}' 版本 '{version}' 已保存到 {feature_dir}")
 
@@ -133,15 +192,86 @@ class FeatureStore:
 
         return version
 
+    def append_features(
+        self,
+        features_df: pd.DataFrame,
+        name: str,
+        version: str = "latest",
+        tags: List[str] = None,
+    ) -> str:
+        """
+        以追加模式寫入每日增量特徵
+
+        新資料寫入新的分區檔案，不重寫既有歷史資料。特徵或版本不存在時
+        等同於 ``save_features``。
+
+        Args:
+            features_df (pd.DataFrame): 增量特徵資料框架（欄位須與既有版本相同）
+            name (str): 特徵名稱
+            version (str, optional): 要追加的版本，"latest" 表示最新版本
+            tags (List[str], optional): 建立新版本時使用的標籤
+
+        Returns:
+            str: 特徵版本
+        """
+        if features_df.empty:
+            logger.warning("嘗試追加空的特徵資料框架")
+            return None
+
+        target = self._get_latest_version(name) if version == "latest" else version
+        metadata = self.get_metadata(name, target) if target else {}
+        if not metadata:
+            return self.save_features(
+                features_df,
+                name,
+                version=None if version == "latest" else version,
+                tags=tags,
+            )
+
+        if metadata.get("storage") != "partitioned":
+            raise ValueError(f"特徵 '{name}' 版本 '{target}' 不是分區格式，無法追加")
+        if features_df.columns.tolist() != metadata["columns"]:
+            raise ValueError(
+                f"追加的欄位與特徵 '{name}' 版本 '{target}' 不一致: "
+                f"{features_df.columns.tolist()} != {metadata['columns']}"
+            )
+        layout = self._detect_layout(features_df)
+        if layout["index_names"] != metadata["index_names"]:
+            raise ValueError(f"追加的索引與特徵 '{name}' 版本 '{target}' 不一致")
+
+        feature_dir = os.path.join(self.base_dir, name, target)
+        row_count = metadata.get("row_count", metadata["shape"][0])
+        self._write_partitions(features_df, feature_dir, metadata, row_offset=row_count)
+
+        metadata["shape"] = [row_count + len(features_df), len(metadata["columns"])]
+        metadata["updated_at"] = datetime.datetime.now().isoformat()
+        self._write_metadata(feature_dir, metadata)
+        self._upsert_catalog(metadata)
+
+        logger.info(f"已追加 {len(features_df)} 筆特徵至 '{name}' 版本 '{target}'")
+        return target
+
     def load_features(
-        self, name: str, version: str = "latest"
+        self,
+        name: str,
+        version: str = "latest",
+        columns: Optional[Sequence[str]] = None,
+        start_date=None,
+        end_date=None,
+        symbols: Optional[Sequence[str]] = None,
     ) -> Tuple[pd.DataFrame, Dict]:
         """
         載入特徵
 
+        分區格式的篩選條件會在掃描時套用，只讀取符合的分區與 row group。
+
         Args:
             name (str): 特徵名稱
             version (str, optional): 特徵版本，如果為 "latest" 則載入最新版本
+            columns (Sequence[str], optional): 要載入的特徵欄位，None 表示全部
+            start_date (optional): 開始日期（包含）
+            end_date (optional): 結束日期（包含）
+            symbols (Sequence[str], optional): 股票代碼篩選
 
         Returns:
             Tuple[pd.DataFrame, Dict]: 特徵資料框架和元數據
@@ -155,21 +285,31 @@ class FeatureStore:
 
         # 構建特徵路徑
         feature_dir = os.path.join(self.base_dir, name, version)
-        features_path = os.path.join(feature_dir, "features.parquet")
         metadata_path = os.path.join(feature_dir, "metadata.json")
 
         # 檢查文件是否存在
-        if not os.path.exists(features_path) or not os.path.exists(metadata_path):
+        if not os.path.exists(metadata_path):
             logger.warning(f"找不到特徵 '{name}' 版本 '{version}' 的文件")
             return pd.DataFrame(), {}
 
-        # 載入特徵資料
-        features_df = pd.read_parquet(features_path)
-
         # 載入元數據
         with open(metadata_path, "r", encoding="utf-8") as f:
             metadata = json.load(f)
 
+        # 載入特徵資料
+        if metadata.get("storage") == "partitioned":
+            features_df = self._scan_partitions(
+                feature_dir, metadata, columns, start_date, end_date, symbols
+            )
+        else:
+            features_path = os.path.join(feature_dir, _LEGACY_FILE)
+            if not os.path.exists(features_path):
+                logger.warning(f"找不到特徵 '{name}' 版本 '{version}' 的文件")
+                return pd.DataFrame(), {}
+            features_df = self._load_legacy(
+                features_path, columns, start_date, end_date, symbols
+            )
+
         logger.info(f"已載入特徵 '{name}' 版本 '{version}'")
 
         return features_df, metadata
@@ -181,14 +321,11 @@ class FeatureStore:
         Returns:
             List[str]: 特徵名稱列表
         """
-        if not os.path.exists(self.base_dir):
-            return []
-
-        return [
-            d
-            for d in os.listdir(self.base_dir)
-            if os.path.isdir(os.path.join(self.base_dir, d))
-        ]
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT name FROM feature_versions ORDER BY name"
+            ).fetchall()
+        return [row[0] for row in rows]
 
     def list_versions(self, name: str) -> List[str]:
         """
@@ -200,15 +337,12 @@ class FeatureStore:
         Returns:
             List[str]: 版本列表
         """
-        feature_dir = os.path.join(self.base_dir, name)
-        if not os.path.exists(feature_dir):
-            return []
-
-        return [
-            d
-            for d in os.listdir(feature_dir)
-            if os.path.isdir(os.path.join(feature_dir, d))
-        ]
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT version FROM feature_versions WHERE name = ? ORDER BY version",
+                (name,),
+            ).fetchall()
+        return [row[0] for row in rows]
 
     def get_metadata(self, name: str, version: str = "latest") -> Dict:
         """
@@ -248,6 +382,8 @@ class FeatureStore:
         """
         搜索特徵
 
+        直接查詢目錄索引，不需開啟各版本的 metadata.json。
+
         Args:
             tags (List[str], optional): 標籤列表，如果提供則只返回包含所有這些標籤的特徵
             name_pattern (str, optional): 名稱模式，如果提供則只返回名稱匹配此模式的特徵
@@ -255,33 +391,68 @@ class FeatureStore:
         Returns:
             List[Dict]: 符合條件的特徵元數據列表
         """
-        results = []
+        query = (
+            "SELECT f.metadata FROM feature_versions f "
+            "JOIN (SELECT name, MAX(version) AS version FROM feature_versions "
+            "GROUP BY name) latest "
+            "ON f.name = latest.name AND f.version = latest.version"
+        )
+        conditions = []
+        params: List = []
 
-        # 遍歷所有特徵
-        for name in self.list_features():
-            # 檢查名稱模式
-            if name_pattern and name_pattern not in name:
-                continue
+        if name_pattern:
+            conditions.append("instr(f.name, ?) > 0")
+            params.append(name_pattern)
 
-            # 獲取最新版本
-            version = self._get_latest_version(name)
-            if version is None:
-                continue
+        for tag in tags or []:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM feature_tags t WHERE t.name = f.name "
+                "AND t.version = f.version AND t.tag = ?)"
+            )
+            params.append(tag)
 
-            # 獲取元數據
-            metadata = self.get_metadata(name, version)
-            if not metadata:
-                continue
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY f.name"
 
-            # 檢查標籤
-            if tags:
-                metadata_tags = set(metadata.get("tags", []))
-                if not all(tag in metadata_tags for tag in tags):
-                    continue
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
 
-            results.append(metadata)
+        return [json.loads(row[0]) for row in rows]
 
-        return results
+    def rebuild_catalog(self) -> int:
+        """
+        從各版本的 metadata.json 重建目錄索引
+
+        Returns:
+            int: 索引的版本數量
+        """
+        count = 0
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM feature_versions")
+            conn.execute("DELETE FROM feature_tags")
+
+        for name in sorted(os.listdir(self.base_dir)):
+            feature_root = os.path.join(self.base_dir, name)
+            if not os.path.isdir(feature_root):
+                continue
+            for version in sorted(os.listdir(feature_root)):
+                metadata_path = os.path.join(feature_root, version, "metadata.json")
+                if not os.path.exists(metadata_path):
+                    continue
+                try:
+                    with open(metadata_path, "r", encoding="utf-8") as f:
+                        metadata = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"讀取元數據 {metadata_path} 失敗: {e}")
+                    continue
+                metadata.setdefault("name", name)
+                metadata.setdefault("version", version)
+                self._upsert_catalog(metadata)
+                count += 1
+
+        logger.info(f"特徵目錄索引已重建，共 {count} 個版本")
+        return count
 
     def _generate_version(self, features_df: pd.DataFrame) -> str:
         """
@@ -391,3 +562,321 @@ class FeatureStore:
                     logger.warning(f"保存特徵樣本時發生錯誤: {e}")
         except Exception as e:
             logger.error(f"記錄到 MLflow 時發生錯誤: {e}")
+
+    def _init_catalog(self) -> None:
+        """建立目錄索引資料表，索引為空時從既有目錄重建"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS feature_versions ("
+                "name TEXT NOT NULL, version TEXT NOT NULL, "
+                "created_at TEXT, updated_at TEXT, row_count INTEGER, "
+                "start_date TEXT, end_date TEXT, metadata TEXT NOT NULL, "
+                "PRIMARY KEY (name, version))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS feature_tags ("
+                "name TEXT NOT NULL, version TEXT NOT NULL, tag TEXT NOT NULL, "
+                "PRIMARY KEY (name, version, tag))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_feature_tags_tag ON feature_tags (tag)"
+            )
+            empty = (
+                conn.execute("SELECT COUNT(*) FROM feature_versions").fetchone()[0] == 0
+            )
+
+        if empty and any(
+            os.path.isdir(os.path.join(self.base_dir, d))
+            for d in os.listdir(self.base_dir)
+        ):
+            self.rebuild_catalog()
+
+    def _connect(self) -> sqlite3.Connection:
+        """開啟目錄索引連線"""
+        return sqlite3.connect(self.catalog_path, timeout=30)
+
+    def _upsert_catalog(self, metadata: Dict) -> None:
+        """寫入或更新單一版本的目錄索引"""
+        name = metadata["name"]
+        version = metadata["version"]
+        shape = metadata.get("shape") or [None]
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO feature_versions "
+                "(name, version, created_at, updated_at, row_count, "
+                "start_date, end_date, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    name,
+                    version,
+                    metadata.get("created_at"),
+                    metadata.get("updated_at", metadata.get("created_at")),
+                    metadata.get("row_count", shape[0]),
+                    metadata.get("start_date"),
+                    metadata.get("end_date"),
+                    json.dumps(metadata, ensure_ascii=False),
+                ),
+            )
+            conn.execute(
+                "DELETE FROM feature_tags WHERE name = ? AND version = ?",
+                (name, version),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO feature_tags (name, version, tag) "
+                "VALUES (?, ?, ?)",
+                [(name, version, tag) for tag in metadata.get("tags") or []],
+            )
+
+    @staticmethod
+    def _write_metadata(feature_dir: str, metadata: Dict) -> None:
+        """保存元數據檔案"""
+        metadata_path = os.path.join(feature_dir, "metadata.json")
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _detect_layout(features_df: pd.DataFrame) -> Dict:
+        """
+        判斷特徵的儲存格式
+
+        索引中含有日期層級時使用分區格式，否則使用單檔格式。
+
+        Args:
+            features_df (pd.DataFrame): 特徵資料框架
+
+        Returns:
+            Dict: 儲存格式資訊
+        """
+        index = features_df.index
+        index_names = list(index.names)
+        index_columns = [
+            level_name if level_name is not None else f"__index_level_{i}__"
+            for i, level_name in enumerate(index_names)
+        ]
+
+        date_column = None
+        symbol_column = None
+        for i, column in enumerate(index_columns):
+            level = index.get_level_values(i)
+            if date_column is None and isinstance(level, pd.DatetimeIndex):
+                date_column = column
+            elif symbol_column is None and index_names[i] in SYMBOL_LEVEL_NAMES:
+                symbol_column = column
+
+        if symbol_column is None:
+            symbol_column = next(
+                (c for c in SYMBOL_LEVEL_NAMES if c in features_df.columns), None
+            )
+
+        return {
+            "storage": "partitioned" if date_column is not None else "single_file",
+            "index_names": index_names,
+            "index_columns": index_columns,
+            "date_column": date_column,
+            "symbol_column": symbol_column,
+        }
+
+    def _write_partitions(
+        self,
+        features_df: pd.DataFrame,
+        feature_dir: str,
+        metadata: Dict,
+        row_offset: int,
+    ) -> None:
+        """
+        將特徵寫入分區資料集
+
+        依日期期間與股票代碼雜湊桶分區，檔案內依 (股票, 日期) 排序，
+        並以唯一檔名寫入，因此追加時不會覆蓋既有檔案。
+
+        Args:
+            features_df (pd.DataFrame): 特徵資料框架
+            feature_dir (str): 特徵版本目錄
+            metadata (Dict): 元數據，會更新分區設定、列數與日期範圍
+            row_offset (int): 原始列順序的起始編號
+        """
+        period = metadata.setdefault("partition_period", self.partition_period)
+        num_buckets = metadata.setdefault("symbol_buckets", self.symbol_buckets)
+        date_column = metadata["date_column"]
+        symbol_column = metadata["symbol_column"]
+
+        table_df = features_df.copy(deep=False)
+        table_df.index = table_df.index.set_names(metadata["index_columns"])
+        table_df = table_df.reset_index()
+        table_df[ROW_COLUMN] = range(row_offset, row_offset + len(table_df))
+
+        dates = table_df[date_column]
+        table_df[PERIOD_COLUMN] = (
+            (dates.dt.tz_localize(None) if dates.dt.tz is not None else dates)
+            .dt.to_period(period)
+            .astype(str)
+        )
+        if symbol_column is not None:
+            symbols = table_df[symbol_column]
+            table_df[BUCKET_COLUMN] = symbols.map(
+                lambda s: _symbol_bucket(s, num_buckets)
+            ).astype("int32")
+            table_df = table_df.sort_values([symbol_column, date_column], kind="stable")
+        else:
+            table_df[BUCKET_COLUMN] = pd.Series(0, index=table_df.index, dtype="int32")
+            table_df = table_df.sort_values(date_column, kind="stable")
+
+        table = pa.Table.from_pandas(table_df, preserve_index=False)
+        ds.write_dataset(
+            table,
+            os.path.join(feature_dir, _DATASET_DIR),
+            format="parquet",
+            partitioning=self._partitioning(),
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            max_rows_per_group=self.row_group_size,
+            min_rows_per_group=min(self.row_group_size, len(table_df)),
+        )
+
+        start_date = dates.min().isoformat()
+        end_date = dates.max().isoformat()
+        if row_offset:
+            start_date = min(start_date, metadata.get("start_date") or start_date)
+            end_date = max(end_date, metadata.get("end_date") or end_date)
+        metadata["row_count"] = row_offset + len(table_df)
+        metadata["start_date"] = start_date
+        metadata["end_date"] = end_date
+
+    @staticmethod
+    def _partitioning() -> ds.Partitioning:
+        """分區資料集的 hive 分區定義"""
+        return ds.partitioning(
+            pa.schema([(PERIOD_COLUMN, pa.string()), (BUCKET_COLUMN, pa.int32())]),
+            flavor="hive",
+        )
+
+    def _scan_partitions(
+        self,
+        feature_dir: str,
+        metadata: Dict,
+        columns: Optional[Sequence[str]],
+        start_date,
+        end_date,
+        symbols: Optional[Sequence[str]],
+    ) -> pd.DataFrame:
+        """
+        掃描分區資料集
+
+        日期與股票篩選轉為分區與欄位條件下推至 pyarrow，只讀取需要的
+        分區、row group 與欄位。
+
+        Returns:
+            pd.DataFrame: 依原始列順序排列的特徵資料框架
+        """
+        dataset = ds.dataset(
+            os.path.join(feature_dir, _DATASET_DIR),
+            format="parquet",
+            partitioning=self._partitioning(),
+        )
+
+        feature_columns = (
+            list(metadata["columns"]) if columns is None else list(columns)
+        )
+        missing = [c for c in feature_columns if c not in metadata["columns"]]
+        if missing:
+            raise KeyError(f"特徵欄位不存在: {missing}")
+
+        index_columns = metadata["index_columns"]
+        date_column = metadata["date_column"]
+        symbol_column = metadata["symbol_column"]
+        period = metadata.get("partition_period", self.partition_period)
+        num_buckets = metadata.get("symbol_buckets", self.symbol_buckets)
+
+        expression = None
+
+        def _and(condition):
+            return condition if expression is None else expression & condition
+
+        date_type = dataset.schema.field(date_column).type
+        if start_date is not None:
+            start = self._to_timestamp(start_date, date_type)
+            expression = _and(
+                ds.field(PERIOD_COLUMN) >= self._period_key(start, period)
+            )
+            expression = _and(ds.field(date_column) >= pa.scalar(start, type=date_type))
+        if end_date is not None:
+            end = self._to_timestamp(end_date, date_type)
+            expression = _and(ds.field(PERIOD_COLUMN) <= self._period_key(end, period))
+            expression = _and(ds.field(date_column) <= pa.scalar(end, type=date_type))
+
+        if symbols is not None:
+            if symbol_column is None:
+                logger.warning("特徵沒有股票代碼欄位，忽略股票篩選")
+            else:
+                symbols = list(symbols)
+                buckets = sorted({_symbol_bucket(s, num_buckets) for s in symbols})
+                expression = _and(ds.field(BUCKET_COLUMN).isin(buckets))
+                expression = _and(ds.field(symbol_column).isin(symbols))
+
+        read_columns = list(
+            dict.fromkeys(index_columns + [ROW_COLUMN] + feature_columns)
+        )
+        table = dataset.to_table(columns=read_columns, filter=expression)
+
+        features_df = table.to_pandas()
+        features_df = features_df.sort_values(ROW_COLUMN, kind="stable")
+        features_df = features_df.set_index(index_columns)
+        features_df.index = features_df.index.set_names(metadata["index_names"])
+
+        return features_df[feature_columns]
+
+    @staticmethod
+    def _to_timestamp(value, date_type: pa.DataType) -> pd.Timestamp:
+        """將日期參數轉為與日期欄位相同時區的時間戳"""
+        timestamp = pd.Timestamp(value)
+        tz = getattr(date_type, "tz", None)
+        if tz and timestamp.tz is None:
+            timestamp = timestamp.tz_localize(tz)
+        elif not tz and timestamp.tz is not None:
+            timestamp = timestamp.tz_localize(None)
+        return timestamp
+
+    @staticmethod
+    def _period_key(timestamp: pd.Timestamp, period: str) -> str:
+        """計算時間戳所屬的分區期間字串"""
+        if timestamp.tz is not None:
+            timestamp = timestamp.tz_localize(None)
+        return str(timestamp.to_period(period))
+
+    @staticmethod
+    def _load_legacy(
+        features_path: str,
+        columns: Optional[Sequence[str]],
+        start_date,
+        end_date,
+        symbols: Optional[Sequence[str]],
+    ) -> pd.DataFrame:
+        """
+        載入單檔格式的特徵
+
+        單檔格式沒有分區，只能讀取後在 pandas 中篩選。
+
+        Returns:
+            pd.DataFrame: 特徵資料框架
+        """
+        features_df = pd.read_parquet(
+            features_path, columns=list(columns) if columns is not None else None
+        )
+
+        mask = None
+        index = features_df.index
+        for i, level_name in enumerate(index.names):
+            level = index.get_level_values(i)
+            if isinstance(level, pd.DatetimeIndex) and (
+                start_date is not None or end_date is not None
+            ):
+                level_mask = np.ones(len(level), dtype=bool)
+                if start_date is not None:
+                    level_mask &= level >= pd.Timestamp(start_date)
+                if end_date is not None:
+                    level_mask &= level <= pd.Timestamp(end_date)
+                mask = level_mask if mask is None else mask & level_mask
+            elif symbols is not None and level_name in SYMBOL_LEVEL_NAMES:
+                level_mask = level.isin(list(symbols))
+                mask = level_mask if mask is None else mask & level_mask
+
+        return features_df if mask is None else features_df[mask]
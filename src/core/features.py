@@ -12,7 +12,9 @@
 
 import copy
 import logging
+import os
 import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -78,6 +80,18 @@ except ImportError:
     if not any("pytest" in arg for arg in sys.argv):
         warnings.warn("無法匯入 Ray，分散式處理功能將無法使用")
 
+# 分塊處理時邊界重疊的預設暖身 K 棒數（涵蓋 2 倍參數的 TRIX、MACD 等長週期指標）
+DEFAULT_WARMUP_BARS = 250
+
+# 特徵列相對於價格列的記憶體放大倍數，用於估算分塊大小
+FEATURE_MEMORY_EXPANSION = 20
+
+# load_data 中價格以外的資料類型
+NON_PRICE_DATA_TYPES = ["bargin", "pe", "monthly_report", "benchmark"]
+
+# 分塊處理程序共用的非價格資料，由程序初始化函數設定
+_WORKER_DATA_DICT = {}
+
 
 class RollingWindowFeatureGenerator:
     """滾動視窗特徵生成器
@@ -758,6 +772,14 @@ class FeatureCalculator:
 
         if "收盤價" not in price_df.columns:
             return pd.DataFrame()
+
+        # 長格式（stock_id 層級）資料逐檔計算，避免位移與滾動視窗跨越不同股票
+        if (
+            isinstance(price_df.index, pd.MultiIndex)
+            and "stock_id" in price_df.index.names
+        ):
+            return self._calculate_custom_features_by_stock(price_df)
+
         收盤價 = pd.to_numeric(price_df["收盤價"], errors="coerce").fillna(
             method="ffill"
         )
@@ -824,6 +846,30 @@ class FeatureCalculator:
             f.columns = [name]
         return pd.concat(features, axis=1)
 
+    def _calculate_custom_features_by_stock(self, price_df):
+        """逐檔計算自定義特徵
+
+        Args:
+            price_df (pandas.DataFrame): 含 stock_id 層級的長格式價格資料
+
+        Returns:
+            pandas.DataFrame: 與價格資料索引對齊的自定義特徵
+        """
+        收盤價 = pd.to_numeric(price_df["收盤價"], errors="coerce")
+        grouped = 收盤價.groupby(level="stock_id", sort=False)
+        收盤價 = grouped.ffill()
+        grouped = 收盤價.groupby(level="stock_id", sort=False)
+
+        features = {}
+        for n in (5, 10, 20):
+            features[f"momentum_{n}"] = 收盤價 / grouped.shift(n) - 1
+        for n in (5, 10, 20):
+            features[f"volatility_{n}"] = (
+                grouped.transform(lambda s, n=n: s.rolling(n).std()) / 收盤價
+            )
+
+        return pd.DataFrame(features, index=price_df.index)
+
     def combine_features(self, technical=True, fundamental=True, custom=True):
         """組合各種特徵
 
@@ -906,6 +952,20 @@ class FeatureCalculator:
         Returns:
             pandas.DataFrame: 刪除極端值後的資料框架
         """
+        return features_df[~self.extreme_value_mask(features_df, threshold)]
+
+    def extreme_value_mask(self, features_df, threshold=0.01):
+        """標記任一列落在兩端分位數之外的資料列
+
+        各列的分位數獨立計算，因此可以逐列計算後再以 OR 合併。
+
+        Args:
+            features_df (pandas.DataFrame): 特徵資料框架
+            threshold (float): 閾值，預設為 0.01（1%）
+
+        Returns:
+            pandas.Series: 極端值標記，True 表示該列應刪除
+        """
         extreme_cases = pd.Series(False, index=features_df.index)
 
         for col in features_df.columns:
@@ -916,7 +976,7 @@ class FeatureCalculator:
                 | (col_data > col_data.quantile(1 - threshold))
             )
 
-        return features_df[~extreme_cases]
+        return extreme_cases
 
     def select_features(self, features_df, target_df=None, method="f_regression", k=10):
         """特徵選擇
@@ -1225,6 +1285,434 @@ def process_chunk(
     return features
 
 
+def _date_level_name(index):
+    """找出 stock_id 以外的日期層級名稱
+
+    Args:
+        index (pandas.MultiIndex): 長格式資料的索引
+
+    Returns:
+        str: 日期層級名稱，找不到時為 None
+    """
+    fallback = None
+    for i, name in enumerate(index.names):
+        if name == "stock_id":
+            continue
+        if pd.api.types.is_datetime64_any_dtype(index.levels[i]):
+            return name
+        if fallback is None:
+            fallback = name
+    return fallback
+
+
+def _plan_feature_chunks(price_df, chunk_rows, warmup_bars):
+    """規劃分塊處理的任務
+
+    以股票為單位分組，每組列數不超過 chunk_rows；單一股票歷史超過 chunk_rows
+    時再依時間切分，每段向前重疊 warmup_bars 根 K 棒作為指標暖身。
+
+    Args:
+        price_df (pandas.DataFrame): 含 stock_id 層級的長格式價格資料
+        chunk_rows (int): 每個分塊的列數上限
+        warmup_bars (int): 時間切分時重疊的暖身 K 棒數
+
+    Returns:
+        list: [(列位置陣列, 保留起始日期或 None), ...]
+    """
+    date_level = _date_level_name(price_df.index)
+    date_values = price_df.index.get_level_values(date_level)
+    groups = price_df.groupby(level="stock_id", sort=False).indices
+
+    tasks = []
+    current = []
+    current_rows = 0
+
+    def flush():
+        nonlocal current, current_rows
+        if current:
+            tasks.append((np.concatenate(current), None))
+        current = []
+        current_rows = 0
+
+    for positions in groups.values():
+        n_rows = len(positions)
+        if n_rows > chunk_rows:
+            flush()
+            ordered = positions[np.argsort(date_values[positions], kind="stable")]
+            step = max(chunk_rows - warmup_bars, warmup_bars, 1)
+            for start in range(0, n_rows, step):
+                lower = max(0, start - warmup_bars)
+                keep_from = date_values[ordered[start]] if start else None
+                tasks.append((ordered[lower : start + step], keep_from))
+            continue
+
+        if current_rows + n_rows > chunk_rows:
+            flush()
+        current.append(positions)
+        current_rows += n_rows
+
+    flush()
+    return tasks
+
+
+def _price_parquet_path():
+    """取得價格 Parquet 檔案路徑
+
+    Returns:
+        str: 檔案路徑，不存在時為 None
+    """
+    from src.core.data_ingest import TABLES_DIR
+
+    path = os.path.join(TABLES_DIR, "price.parquet")
+    return path if os.path.exists(path) else None
+
+
+def _init_feature_worker(data_dict):
+    """分塊處理程序的初始化函數
+
+    Args:
+        data_dict (dict): 價格以外的資料，每個程序只傳送一次
+    """
+    global _WORKER_DATA_DICT
+    _WORKER_DATA_DICT = data_dict
+
+
+def _price_chunk_source(price_df, positions, price_path):
+    """建立分塊的價格資料來源
+
+    價格資料已在記憶體中時直接切片；提供 Parquet 檔案時只回傳股票清單與
+    日期範圍，由子程序自行載入，主程序不需持有全部價格資料。
+
+    Args:
+        price_df (pandas.DataFrame): 長格式價格資料，price_path 不為 None 時只含索引
+        positions (numpy.ndarray): 分塊的列位置
+        price_path (str, optional): 價格 Parquet 檔案路徑
+
+    Returns:
+        pandas.DataFrame or tuple: 價格切片，或 (檔案路徑, 篩選條件, 日期層級)
+    """
+    if price_path is None:
+        return price_df.iloc[positions]
+
+    index = price_df.index[positions]
+    date_level = _date_level_name(index)
+    dates = index.get_level_values(date_level)
+    symbols = list(pd.unique(index.get_level_values("stock_id")))
+    filters = [
+        ("stock_id", "in", symbols),
+        (date_level, ">=", dates.min()),
+        (date_level, "<=", dates.max()),
+    ]
+    # 依時間切分的單一股票分塊按日期排序，與記憶體切片的順序一致
+    time_sorted = len(symbols) == 1 and np.any(np.diff(positions) < 0)
+    sort_level = date_level if time_sorted else None
+    return price_path, filters, sort_level
+
+
+def _load_price_chunk(source):
+    """在子程序中取得分塊的價格資料
+
+    Args:
+        source (pandas.DataFrame or tuple): _price_chunk_source 建立的資料來源
+
+    Returns:
+        pandas.DataFrame: 分塊的價格資料
+    """
+    if isinstance(source, pd.DataFrame):
+        return source
+
+    price_path, filters, sort_level = source
+    price_chunk = pd.read_parquet(price_path, filters=filters)
+    if sort_level is not None:
+        price_chunk = price_chunk.sort_index(level=sort_level, sort_remaining=False)
+    return price_chunk
+
+
+def _process_feature_chunk(price_source, keep_from, spill_path):
+    """在子程序中計算單一分塊的原始特徵
+
+    逐檔計算特徵並移除暖身區間後寫入暫存 Parquet 檔案。清理、標準化與
+    極端值處理需要全域統計量，由主程序在所有分塊完成後統一進行。
+
+    Args:
+        price_source (pandas.DataFrame or tuple): 分塊的價格資料來源
+        keep_from (pandas.Timestamp, optional): 保留的起始日期，None 表示全部保留
+        spill_path (str): 暫存檔案路徑
+
+    Returns:
+        int: 特徵列數，沒有特徵時為 0 且不寫入檔案
+    """
+    price_chunk = _load_price_chunk(price_source)
+    frames = []
+    for _, stock_df in price_chunk.groupby(level="stock_id", sort=False):
+        temp_dict = dict(_WORKER_DATA_DICT)
+        temp_dict["price"] = stock_df
+        stock_features = FeatureCalculator(temp_dict).combine_features()
+        if not stock_features.empty:
+            frames.append(stock_features)
+
+    if not frames:
+        return 0
+
+    features = pd.concat(frames)
+
+    # 移除暖身區間
+    if keep_from is not None and isinstance(features.index, pd.MultiIndex):
+        date_level = _date_level_name(features.index)
+        features = features[features.index.get_level_values(date_level) >= keep_from]
+
+    if features.empty:
+        return 0
+
+    features.to_parquet(spill_path)
+    return len(features)
+
+
+def _fit_feature_postprocessing(
+    spill_paths, work_dir, normalize, remove_extremes, clean_data
+):
+    """以全域統計量逐列清理與標準化分塊特徵
+
+    每次只讀取所有分塊中的一個特徵列，依與單程序相同的順序進行清理、
+    標準化並計算極端值分位數。這些步驟在各列之間彼此獨立，因此結果與
+    對完整特徵表處理相同，而記憶體只需容納單一列。處理後的列存為 .npy
+    檔案供寫出時依列位置切片。
+
+    Args:
+        spill_paths (list): 依列順序排列的分塊暫存檔案
+        work_dir (str): 處理後特徵列的暫存目錄
+        normalize (bool): 是否標準化特徵
+        remove_extremes (bool): 是否刪除極端值
+        clean_data (bool): 是否清理資料
+
+    Returns:
+        tuple: (list, numpy.ndarray) 各特徵列的 .npy 路徑（未處理時為 None）
+            與要刪除的極端值列標記（不刪除時為 None）
+    """
+    # 只使用計算器的清理、標準化與極端值方法
+    calculator = FeatureCalculator({"price": pd.DataFrame()})
+    columns = pd.read_parquet(spill_paths[0]).columns
+    column_paths = []
+    extreme_cases = None
+
+    for j, name in enumerate(columns):
+        column = pd.concat(
+            [pd.read_parquet(path, columns=[name])[name] for path in spill_paths],
+            ignore_index=True,
+        ).to_frame()
+
+        if clean_data:
+            column, _ = calculator.data_cleaner.clean_data(column)
+        if normalize:
+            _, column = calculator.normalize_features(column)
+        if remove_extremes:
+            mask = calculator.extreme_value_mask(column).to_numpy()
+            extreme_cases = mask if extreme_cases is None else extreme_cases | mask
+
+        column_path = os.path.join(work_dir, f"column_{j}.npy")
+        np.save(column_path, column[name].to_numpy())
+        column_paths.append(column_path)
+
+    return column_paths, extreme_cases
+
+
+def _compute_features_chunked(
+    data_dict,
+    normalize,
+    remove_extremes,
+    clean_data,
+    max_workers=None,
+    max_memory_mb=None,
+    warmup_bars=DEFAULT_WARMUP_BARS,
+    feature_store=None,
+    feature_name="combined_features",
+    feature_tags=None,
+    metadata=None,
+    return_features=True,
+    price_path=None,
+    start_date=None,
+    end_date=None,
+):
+    """使用內建的分塊多程序處理計算特徵
+
+    價格資料依股票分組後交給 ProcessPoolExecutor 計算原始特徵，分塊大小由
+    ChunkProcessor 依每個程序的記憶體預算決定，同時送出的分塊數量有上限。
+    各分塊的原始特徵先寫入暫存檔案，再以全域統計量逐列清理、標準化並
+    刪除極端值，因此結果與單程序處理相同，不受分塊數量影響。最後依序
+    寫出各分塊，可直接追加至特徵存儲。
+
+    提供 price_path 時主程序只讀取價格檔案的索引來規劃分塊，各程序自行
+    載入所需股票與日期範圍的價格，峰值記憶體不隨股票數量成長。
+
+    Args:
+        data_dict (dict): 包含價格（stock_id 長格式）與其他資料的字典；
+            提供 price_path 時不使用其中的價格資料
+        normalize (bool): 是否標準化特徵
+        remove_extremes (bool): 是否刪除極端值
+        clean_data (bool): 是否清理資料
+        max_workers (int, optional): 程序數，None 表示 CPU 數量
+        max_memory_mb (float, optional): 每個程序的記憶體預算（MB），None 表示依可用記憶體決定
+        warmup_bars (int): 時間切分時重疊的暖身 K 棒數
+        feature_store (FeatureStore, optional): 特徵存儲，提供時逐塊寫入
+        feature_name (str): 特徵名稱
+        feature_tags (List[str], optional): 特徵標籤
+        metadata (dict, optional): 特徵元數據
+        return_features (bool): 是否合併並回傳全部特徵
+        price_path (str, optional): 價格 Parquet 檔案路徑，由各程序自行載入
+        start_date (datetime.date, optional): 價格檔案的開始日期
+        end_date (datetime.date, optional): 價格檔案的結束日期
+
+    Returns:
+        tuple: (pandas.DataFrame, str) 特徵資料框架（return_features 為 False 時為空）
+            與特徵存儲版本（未寫入時為 None）
+    """
+    import tempfile
+
+    from src.core.memory_management import ChunkProcessor, MemoryMonitor
+
+    if price_path is None:
+        price_df = data_dict["price"]
+        sample_df = price_df.head(1000)
+    else:
+        import pyarrow.parquet as pq
+
+        # 只讀取索引規劃分塊，並以第一批資料估計每列大小
+        price_df = pd.read_parquet(price_path, columns=[])
+        sample_df = next(
+            pq.ParquetFile(price_path).iter_batches(batch_size=1000)
+        ).to_pandas()
+    if (
+        not isinstance(price_df.index, pd.MultiIndex)
+        or "stock_id" not in price_df.index.names
+    ):
+        raise ValueError(
+            "價格資料必須為 MultiIndex 且包含 'stock_id' 層級，請確認資料格式。"
+        )
+    if price_path is not None and (start_date is not None or end_date is not None):
+        dates = price_df.index.get_level_values(_date_level_name(price_df.index))
+        mask = np.ones(len(price_df), dtype=bool)
+        if start_date is not None:
+            mask &= dates >= pd.to_datetime(start_date)
+        if end_date is not None:
+            mask &= dates <= pd.to_datetime(end_date)
+        price_df = price_df[mask]
+    # 只含索引時沒有欄位，以列數判斷是否有資料
+    if len(price_df) == 0:
+        return pd.DataFrame(), None
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_memory_mb is None:
+        available_mb = MemoryMonitor().get_memory_usage()["system_available"]
+        max_memory_mb = available_mb * 0.5 / max_workers
+
+    # 依每個程序的記憶體預算計算分塊列數
+    chunk_processor = ChunkProcessor(max_memory_mb=max_memory_mb)
+    row_bytes = (
+        chunk_processor.estimate_dataframe_memory(sample_df)
+        * 1024
+        * 1024
+        / len(sample_df)
+        * FEATURE_MEMORY_EXPANSION
+    )
+    chunk_rows = chunk_processor.calculate_optimal_chunk_size(
+        len(price_df), estimated_row_size_bytes=row_bytes
+    )
+    tasks = _plan_feature_chunks(price_df, chunk_rows, warmup_bars)
+    logging.info(f"分塊處理特徵: {len(tasks)} 個分塊，{max_workers} 個程序")
+
+    other_data = {k: v for k, v in data_dict.items() if k != "price"}
+    chunk_rows_done = {}
+
+    with tempfile.TemporaryDirectory(prefix="features_") as work_dir:
+        spill_paths = [
+            os.path.join(work_dir, f"chunk_{i}.parquet") for i in range(len(tasks))
+        ]
+        next_task = 0
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_feature_worker,
+            initargs=(other_data,),
+        ) as executor:
+            pending = {}
+
+            def submit_until_full():
+                nonlocal next_task
+                # 限制同時送出的分塊數量，避免所有分塊同時序列化到佇列中
+                while next_task < len(tasks) and len(pending) < max_workers * 2:
+                    positions, keep_from = tasks[next_task]
+                    future = executor.submit(
+                        _process_feature_chunk,
+                        _price_chunk_source(price_df, positions, price_path),
+                        keep_from,
+                        spill_paths[next_task],
+                    )
+                    pending[future] = next_task
+                    next_task += 1
+
+            submit_until_full()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_index = pending.pop(future)
+                    n_rows = future.result()
+                    if n_rows:
+                        chunk_rows_done[task_index] = n_rows
+                submit_until_full()
+
+        if not chunk_rows_done:
+            return pd.DataFrame(), None
+
+        order = sorted(chunk_rows_done)
+        column_paths, extreme_cases = None, None
+        if normalize or remove_extremes or clean_data:
+            column_paths, extreme_cases = _fit_feature_postprocessing(
+                [spill_paths[i] for i in order],
+                work_dir,
+                normalize,
+                remove_extremes,
+                clean_data,
+            )
+
+        # 依序寫出各分塊
+        results = []
+        version = None
+        offset = 0
+        for task_index in order:
+            chunk_features = pd.read_parquet(spill_paths[task_index])
+            rows = slice(offset, offset + len(chunk_features))
+            offset = rows.stop
+            if column_paths is not None:
+                for name, column_path in zip(chunk_features.columns, column_paths):
+                    values = np.load(column_path, mmap_mode="r")[rows]
+                    chunk_features[name] = np.array(values)
+            if extreme_cases is not None:
+                chunk_features = chunk_features[~extreme_cases[rows]]
+            if chunk_features.empty:
+                continue
+
+            if feature_store is not None:
+                if version is None:
+                    version = feature_store.save_features(
+                        chunk_features,
+                        feature_name,
+                        metadata=dict(metadata or {}),
+                        tags=feature_tags,
+                    )
+                else:
+                    feature_store.append_features(
+                        chunk_features, feature_name, version=version
+                    )
+
+            if return_features:
+                results.append(chunk_features)
+
+    if not results:
+        return pd.DataFrame(), version
+
+    return pd.concat(results), version
+
+
 def compute_features(
     start_date=None,
     end_date=None,
@@ -1243,6 +1731,11 @@ def compute_features(
     save_to_feature_store=False,
     feature_name="combined_features",
     feature_tags=None,
+    chunked=False,
+    max_workers=None,
+    max_memory_mb=None,
+    warmup_bars=DEFAULT_WARMUP_BARS,
+    return_features=True,
 ):
     """計算特徵的主函數
 
@@ -1264,43 +1757,99 @@ def compute_features(
         save_to_feature_store (bool): 是否保存到特徵存儲
         feature_name (str): 特徵名稱，只在 save_to_feature_store 為 True 時使用
         feature_tags (List[str], optional): 特徵標籤，只在 save_to_feature_store 為 True 時使用
+        chunked (bool): 是否使用內建的分塊多程序處理；要求分散式處理但 Dask、Ray
+            皆不可用時也會使用
+        max_workers (int, optional): 分塊處理的程序數，None 表示 CPU 數量
+        max_memory_mb (float, optional): 每個程序的記憶體預算（MB），None 表示依可用記憶體決定
+        warmup_bars (int): 分塊邊界重疊的暖身 K 棒數
+        return_features (bool): 是否回傳完整特徵；分塊處理且直接寫入特徵存儲時可設為 False，
+            以避免在記憶體中合併全部結果
 
     Returns:
         pandas.DataFrame: 計算好的特徵資料框架
-    """  # 載入資料
-    data_dict = load_data(start_date, end_date)
+    """  # 沒有 Dask、Ray 時以內建分塊處理取代單程序處理
+    if use_distributed and not DASK_AVAILABLE and not RAY_AVAILABLE:
+        logging.warning("無法使用 Dask 或 Ray，將使用內建分塊處理")
+        chunked = True
+
+    # 分塊處理且不需以價格計算特徵選擇目標時，價格由各程序自行載入
+    price_path = _price_parquet_path() if chunked and not feature_selection else None
+
+    # 載入資料
+    if price_path is not None:
+        data_dict = load_data(start_date, end_date, data_types=NON_PRICE_DATA_TYPES)
+        # 主程序不持有價格資料，僅保留空表供計算器初始化
+        data_dict["price"] = pd.DataFrame()
+    else:
+        data_dict = load_data(start_date, end_date)
 
     # 創建特徵計算器
     calculator = FeatureCalculator(
         data_dict, use_distributed=use_distributed, chunk_size=chunk_size
     )
 
-    # 檢查是否使用分散式處理
-    if use_distributed:
+    # 特徵存儲元數據
+    metadata = {
+        "start_date": start_date.isoformat() if start_date else None,
+        "end_date": end_date.isoformat() if end_date else None,
+        "normalize": normalize,
+        "remove_extremes": remove_extremes,
+        "clean_data": clean_data,
+        "feature_selection": feature_selection,
+        "feature_selection_method": (
+            feature_selection_method if feature_selection else None
+        ),
+        "dimensionality_reduction": dimensionality_reduction,
+        "dimensionality_reduction_method": (
+            dimensionality_reduction_method if dimensionality_reduction else None
+        ),
+        "n_components": n_components,
+        "variance_ratio": variance_ratio,
+    }
+
+    # 檢查是否使用分塊或分散式處理
+    if chunked:
+        # 沒有後續的全域特徵選擇或降維時，分塊結果直接寫入特徵存儲
+        stream_to_store = (
+            save_to_feature_store
+            and not feature_selection
+            and not dimensionality_reduction
+        )
+        feature_store = None
+        if stream_to_store:
+            from src.core.feature_store import FeatureStore
+
+            feature_store = FeatureStore()
+            save_to_feature_store = False
+
+        features, version = _compute_features_chunked(
+            calculator.data_dict,
+            normalize,
+            remove_extremes,
+            clean_data,
+            max_workers=max_workers,
+            max_memory_mb=max_memory_mb,
+            warmup_bars=warmup_bars,
+            feature_store=feature_store,
+            feature_name=feature_name,
+            feature_tags=feature_tags,
+            metadata=metadata,
+            return_features=return_features or not stream_to_store,
+            price_path=price_path,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        if version is not None:
+            logging.info(f"特徵已分塊寫入特徵存儲，版本: {version}")
+    elif use_distributed:
         if DASK_AVAILABLE:
             features = _compute_features_with_dask(
                 calculator, normalize, remove_extremes, clean_data, chunk_size
             )
-        elif RAY_AVAILABLE:
+        else:
             features = _compute_features_with_ray(
                 calculator, normalize, remove_extremes, clean_data, chunk_size
             )
-        else:
-            logging.warning("無法使用分散式處理，將使用標準處理方式")
-            # 使用標準處理方式
-            features = calculator.combine_features()
-
-            # 清理資料
-            if clean_data and not features.empty:
-                features, _ = calculator.data_cleaner.clean_data(features)
-
-            # 標準化特徵
-            if normalize and not features.empty:
-                _, features = calculator.normalize_features(features)
-
-            # 刪除極端值
-            if remove_extremes and not features.empty:
-                features = calculator.drop_extreme_values(features)
     else:
         # 使用標準處理方式
         features = calculator.combine_features()
@@ -1351,25 +1900,6 @@ def compute_features(
             from src.core.feature_store import FeatureStore
 
             feature_store = FeatureStore()
-            metadata = {
-                "start_date": start_date.isoformat() if start_date else None,
-                "end_date": end_date.isoformat() if end_date else None,
-                "normalize": normalize,
-                "remove_extremes": remove_extremes,
-                "clean_data": clean_data,
-                "feature_selection": feature_selection,
-                "feature_selection_method": (
-                    feature_selection_method if feature_selection else None
-                ),
-                "dimensionality_reduction": dimensionality_reduction,
-                "dimensionality_reduction_method": (
-                    dimensionality_reduction_method
-                    if dimensionality_reduction
-                    else None
-                ),
-                "n_components": n_components,
-                "variance_ratio": variance_ratio,
-            }
             version = feature_store.save_features(
                 features, feature_name, metadata=metadata, tags=feature_tags
             )
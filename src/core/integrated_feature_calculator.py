@@ -16,6 +16,8 @@ from datetime import datetime, timedelta
 import hashlib
 import json
 
+from src.core.shared_market_data_cache import get_shared_market_data_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,8 +76,11 @@ class IntegratedFeatureCalculator:
 
             # 載入價格數據
             if 'price' not in self.data_dict:
-                # 使用模擬數據作為fallback
-                pricedf = self._generate_sample_data(stock_id)
+                # 優先使用跨程序共享快取，不在本地保存副本
+                pricedf = self._load_shared_price_data(stock_id, date_range)
+                if pricedf.empty:
+                    # 使用模擬數據作為fallback
+                    pricedf = self._generate_sample_data(stock_id)
             else:
                 pricedf = self._load_price_data(stock_id, date_range)
             
@@ -152,6 +157,28 @@ class IntegratedFeatureCalculator:
         
         return pricedf
     
+    def _load_shared_price_data(
+        self,
+        stock_id: str,
+        date_range: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        從跨程序共享快取載入價格數據
+
+        Args:
+            stock_id: 股票代號
+            date_range: 日期範圍
+
+        Returns:
+            價格數據DataFrame，快取中無此股票時為空
+        """
+        start_date, end_date = (
+            date_range if date_range and len(date_range) == 2 else (None, None)
+        )
+        return get_shared_market_data_cache().get_symbol_bars(
+            stock_id, start_date, end_date
+        )
+
     def _calculate_indicator(
         self, 
         pricedf: pd.DataFrame, 
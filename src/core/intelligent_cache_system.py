@@ -10,49 +10,60 @@
 5. 分散式快取支援
 
 主要功能：
-- LRU/LFU/TTL等多種淘汰策略
+- LRU/LFU/TTL等多種淘汰策略（皆為 O(1) 或 O(log n) 操作）
 - 自動快取預熱和更新
 - 快取命中率優化
-- 記憶體使用監控
+- 記憶體使用監控（DataFrame/ndarray 精確計算大小）
 - 快取一致性保證
+- 分片鎖模式，降低多執行緒競爭
 
 Example:
     基本使用：
     ```python
     from src.core.intelligent_cache_system import IntelligentCacheSystem
-    
+
     # 創建快取系統
     cache = IntelligentCacheSystem()
-    
+
     # 設定快取
     cache.set('key', 'value', ttl=3600)
-    
+
     # 獲取快取
     value = cache.get('key')
     ```
 
+    分片鎖模式（Streamlit UI 與 API worker 多執行緒存取）：
+    ```python
+    cache = IntelligentCacheSystem(CacheConfig(shard_count=16))
+    ```
+
 Note:
     此模組整合了多種快取策略和優化技術，
     提供高效能的資料快取服務。
 """
 
+import heapq
+import itertools
 import logging
+import sys
 import threading
 import time
-import hashlib
-import pickle
-import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any, Callable, Union
+from typing import Dict, List, Optional, Tuple, Any, Callable
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import defaultdict, deque, OrderedDict
-import statistics
-import weakref
+from collections import deque, OrderedDict
+
+import numpy as np
+import pandas as pd
 
 # 設定日誌
 logger = logging.getLogger(__name__)
 
+# 容器大小估算時的最大遞迴深度與抽樣數量
+_SIZE_MAX_DEPTH = 3
+_SIZE_SAMPLE_ITEMS = 64
+
 
 class CacheStrategy(Enum):
     """快取策略"""
@@ -91,13 +102,24 @@ class CacheEntry:
     ttl: Optional[int] = None  # 秒
     size: int = 0
     tags: set = field(default_factory=set)
-    
-    def is_expired(self) -> bool:
-        """檢查是否過期"""
-        if self.ttl is None:
+    expire_at: Optional[float] = None  # time.monotonic() 基準的到期時間
+
+    def __post_init__(self):
+        if self.expire_at is None and self.ttl is not None:
+            self.expire_at = time.monotonic() + self.ttl
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """檢查是否過期
+
+        Args:
+            now: time.monotonic() 時間，未提供時自動取得
+        """
+        if self.expire_at is None:
             return False
-        return (datetime.now() - self.created_at).total_seconds() > self.ttl
-    
+        if now is None:
+            now = time.monotonic()
+        return now > self.expire_at
+
     def touch(self):
         """更新訪問時間和次數"""
         self.last_accessed = datetime.now()
@@ -117,7 +139,7 @@ class CacheStats:
     entry_count: int = 0
     hit_rate: float = 0.0
     miss_rate: float = 0.0
-    
+
     def update_rates(self):
         """更新命中率和失誤率"""
         total_requests = self.hits + self.misses
@@ -128,6 +150,17 @@ class CacheStats:
             self.hit_rate = 0.0
             self.miss_rate = 0.0
 
+    def merge(self, other: "CacheStats"):
+        """累加另一份統計（用於彙總分片統計）"""
+        self.hits += other.hits
+        self.misses += other.misses
+        self.sets += other.sets
+        self.deletes += other.deletes
+        self.expires += other.expires
+        self.evictions += other.evictions
+        self.total_size += other.total_size
+        self.entry_count += other.entry_count
+
 
 @dataclass
 class CacheConfig:
@@ -142,263 +175,556 @@ class CacheConfig:
     cleanup_interval: int = 300  # 清理間隔（秒）
     preload_enabled: bool = True
     distributed_enabled: bool = False
+    shard_count: int = 1  # 分片數量，>1 時啟用分片鎖模式
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """估算值佔用的記憶體大小（位元組）
+
+    DataFrame/Series 使用 ``memory_usage(deep=True)``，ndarray 使用
+    ``nbytes``；容器類型遞迴估算（大型容器以抽樣外推），避免序列化成本。
+
+    Args:
+        value: 要估算的值
+
+    Returns:
+        int: 估算大小（位元組）
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (bool, int, float)) or value is None:
+        return 8
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        if value.dtype != object or value.size == 0:
+            return int(value.nbytes)
+        sample_count = min(value.size, _SIZE_SAMPLE_ITEMS)
+        sampled = sum(
+            estimate_size(item, _depth + 1) for item in value.flat[:sample_count]
+        )
+        return int(value.nbytes) + sampled * value.size // sample_count
+    if isinstance(value, (list, tuple, set, frozenset, dict)):
+        shallow = sys.getsizeof(value)
+        if not value or _depth >= _SIZE_MAX_DEPTH:
+            return shallow
+        if isinstance(value, dict):
+            items = itertools.islice(value.items(), _SIZE_SAMPLE_ITEMS)
+            sampled = sum(
+                estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+                for k, v in items
+            )
+        else:
+            items = itertools.islice(value, _SIZE_SAMPLE_ITEMS)
+            sampled = sum(estimate_size(item, _depth + 1) for item in items)
+        sample_count = min(len(value), _SIZE_SAMPLE_ITEMS)
+        return shallow + sampled * len(value) // sample_count
+    try:
+        return sys.getsizeof(value)
+    except TypeError:
+        return 100  # 預設大小
+
+
+class _FrequencyNode:
+    """LFU 頻率桶節點（雙向串列）"""
+
+    __slots__ = ("freq", "keys", "prev", "next")
+
+    def __init__(self, freq: int):
+        self.freq = freq
+        self.keys: OrderedDict = OrderedDict()
+        self.prev: "_FrequencyNode" = self
+        self.next: "_FrequencyNode" = self
+
+
+class _LFUIndex:
+    """O(1) LFU 索引
+
+    以頻率遞增排列的頻率桶雙向串列；同一頻率內依插入順序淘汰，
+    增加頻率、移除與淘汰皆為 O(1)。
+    """
+
+    def __init__(self):
+        self._head = _FrequencyNode(0)  # 哨兵節點
+        self._nodes: Dict[str, _FrequencyNode] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._nodes
+
+    def frequency(self, key: str) -> int:
+        node = self._nodes.get(key)
+        return node.freq if node is not None else 0
+
+    def add(self, key: str):
+        """新增鍵（頻率為 1）"""
+        if key in self._nodes:
+            self.touch(key)
+            return
+        first = self._head.next
+        if first.freq != 1:
+            first = self._insert_after(self._head, 1)
+        first.keys[key] = None
+        self._nodes[key] = first
+
+    def touch(self, key: str):
+        """增加鍵的存取頻率"""
+        node = self._nodes.get(key)
+        if node is None:
+            self.add(key)
+            return
+        target = node.next
+        if target.freq != node.freq + 1:
+            target = self._insert_after(node, node.freq + 1)
+        del node.keys[key]
+        target.keys[key] = None
+        self._nodes[key] = target
+        if not node.keys:
+            self._unlink(node)
+
+    def remove(self, key: str):
+        """移除鍵"""
+        node = self._nodes.pop(key, None)
+        if node is None:
+            return
+        del node.keys[key]
+        if not node.keys:
+            self._unlink(node)
+
+    def peek_least(self) -> Optional[str]:
+        """取得頻率最低的鍵（不移除）"""
+        node = self._head.next
+        if node is self._head:
+            return None
+        return next(iter(node.keys))
+
+    def clear(self):
+        self._head.next = self._head.prev = self._head
+        self._nodes.clear()
+
+    def _insert_after(self, node: _FrequencyNode, freq: int) -> _FrequencyNode:
+        new_node = _FrequencyNode(freq)
+        new_node.prev = node
+        new_node.next = node.next
+        node.next.prev = new_node
+        node.next = new_node
+        return new_node
+
+    @staticmethod
+    def _unlink(node: _FrequencyNode):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+
+class _CacheShard:
+    """快取分片
+
+    每個分片擁有獨立的鎖與淘汰索引：
+    - LRU：OrderedDict（move_to_end / 取首項）
+    - LFU：頻率桶串列
+    - FIFO：條目字典的插入順序
+    - TTL：以到期時間排序的最小堆積（延遲刪除）
+    """
+
+    def __init__(self, owner: "IntelligentCacheSystem", index: int = 0):
+        self._owner = owner
+        self._index = index
+        self.lock = threading.RLock()
+        self.entries: Dict[str, CacheEntry] = {}
+        self.access_order: OrderedDict = OrderedDict()
+        self.lfu = _LFUIndex()
+        self.ttl_heap: List[Tuple[float, int, str]] = []
+        self._heap_seq = itertools.count()
+        self.stats = CacheStats()
+
+    @property
+    def max_size(self) -> int:
+        # 餘數分配給前幾個分片，使各分片上限總和等於 max_size
+        quota, remainder = divmod(self._owner.config.max_size, self._owner.shard_count)
+        return max(1, quota + (1 if self._index < remainder else 0))
+
+    @property
+    def max_memory(self) -> int:
+        config = self._owner.config
+        return max(1, config.max_memory // self._owner.shard_count)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        track = self._owner.config.enable_stats
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry.is_expired():
+                if entry is not None:
+                    self.remove(key, CacheEvent.EXPIRE)
+                if track:
+                    self.stats.misses += 1
+                return False, None
+            if track:
+                self.stats.hits += 1
+            entry.touch()
+            self.access_order.move_to_end(key)
+            self.lfu.touch(key)
+            return True, entry.value
+
+    def put(self, entry: CacheEntry):
+        with self.lock:
+            if entry.key in self.entries:
+                self.remove(entry.key, CacheEvent.SET)
+
+            # 淘汰至符合條目數與記憶體限制
+            while self.entries and (
+                len(self.entries) >= self.max_size
+                or self.stats.total_size + entry.size > self.max_memory
+            ):
+                if not self.evict_one():
+                    break
+
+            self.entries[entry.key] = entry
+            self.access_order[entry.key] = None
+            self.lfu.add(entry.key)
+            if entry.expire_at is not None:
+                heapq.heappush(
+                    self.ttl_heap, (entry.expire_at, next(self._heap_seq), entry.key)
+                )
+                self._maybe_compact_heap()
+
+            self.stats.sets += 1
+            self.stats.entry_count += 1
+            self.stats.total_size += entry.size
+
+    def remove(self, key: str, event: CacheEvent) -> bool:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+
+        self.stats.entry_count -= 1
+        self.stats.total_size -= entry.size
+        if event == CacheEvent.DELETE:
+            self.stats.deletes += 1
+        elif event == CacheEvent.EXPIRE:
+            self.stats.expires += 1
+        elif event == CacheEvent.EVICT:
+            self.stats.evictions += 1
+
+        self.access_order.pop(key, None)
+        self.lfu.remove(key)
+        # TTL 堆積採延遲刪除，於彈出時檢查條目是否仍有效
+        return True
+
+    def evict_one(self) -> bool:
+        """依目前策略淘汰一個條目"""
+        if not self.entries:
+            return False
+
+        strategy = self._owner.config.strategy
+        victim: Optional[str] = None
+
+        if strategy == CacheStrategy.LFU:
+            victim = self.lfu.peek_least()
+        elif strategy == CacheStrategy.FIFO:
+            victim = next(iter(self.entries))
+        elif strategy == CacheStrategy.TTL:
+            victim = self._pop_earliest_expiring()
+            if victim is None:
+                # 沒有設定 TTL 的條目時退回 FIFO
+                victim = next(iter(self.entries))
+        else:
+            victim = next(iter(self.access_order))
+
+        if victim is None:
+            return False
+        return self.remove(victim, CacheEvent.EVICT)
+
+    def cleanup_expired(self, now: Optional[float] = None) -> int:
+        """從 TTL 堆積頂端彈出所有已過期條目"""
+        if now is None:
+            now = time.monotonic()
+        removed = 0
+        with self.lock:
+            heap = self.ttl_heap
+            while heap and heap[0][0] < now:
+                expire_at, _, key = heapq.heappop(heap)
+                entry = self.entries.get(key)
+                if entry is not None and entry.expire_at == expire_at:
+                    self.remove(key, CacheEvent.EXPIRE)
+                    removed += 1
+        return removed
+
+    def reschedule(self, entry: CacheEntry):
+        """條目 TTL 變更後重新排入堆積"""
+        if entry.expire_at is not None:
+            heapq.heappush(
+                self.ttl_heap, (entry.expire_at, next(self._heap_seq), entry.key)
+            )
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.access_order.clear()
+            self.lfu.clear()
+            self.ttl_heap.clear()
+            self.stats.entry_count = 0
+            self.stats.total_size = 0
+
+    def _pop_earliest_expiring(self) -> Optional[str]:
+        heap = self.ttl_heap
+        while heap:
+            expire_at, _, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            if entry is not None and entry.expire_at == expire_at:
+                return key
+        return None
+
+    def _maybe_compact_heap(self):
+        # 重複設定同一鍵會留下過期的堆積項目，超過兩倍時重建
+        if len(self.ttl_heap) > 2 * len(self.entries) + 64:
+            self.ttl_heap = [
+                item for item in self.ttl_heap
+                if (entry := self.entries.get(item[2])) is not None
+                and entry.expire_at == item[0]
+            ]
+            heapq.heapify(self.ttl_heap)
 
 
 class IntelligentCacheSystem:
     """智能快取系統
-    
+
     提供多層次、多策略的智能快取服務，支援自動優化
     和效能監控。
-    
+
     Attributes:
         config: 快取配置
-        cache_data: 快取資料存儲
-        stats: 快取統計資訊
-        
+        shard_count: 分片數量
+        stats: 快取統計資訊（彙總所有分片）
+
     Example:
         >>> cache = IntelligentCacheSystem()
         >>> cache.set('key', 'value', ttl=3600)
         >>> value = cache.get('key')
     """
-    
+
     def __init__(self, config: Optional[CacheConfig] = None):
         """初始化智能快取系統
-        
+
         Args:
             config: 快取配置
         """
         self.config = config or CacheConfig()
-        
-        # 快取存儲
-        self.cache_data: Dict[str, CacheEntry] = {}
-        self.access_order: OrderedDict = OrderedDict()  # LRU順序
-        self.frequency_counter: Dict[str, int] = defaultdict(int)  # LFU計數
-        
-        # 統計資訊
-        self.stats = CacheStats()
+        self.shard_count = max(1, int(self.config.shard_count))
+
+        # 快取分片
+        self._shards: List[_CacheShard] = [
+            _CacheShard(self, index) for index in range(self.shard_count)
+        ]
+
+        # 事件歷史
         self.event_history: deque = deque(maxlen=1000)
-        
-        # 執行緒安全鎖
+
+        # 全域鎖，僅用於預熱設定等非熱路徑操作
         self.lock = threading.RLock()
-        
+
         # 背景服務
         self.cleanup_active = True
         self.preload_active = True
-        
+
         # 快取預熱配置
         self.preload_functions: Dict[str, Callable] = {}
         self.preload_schedule: Dict[str, datetime] = {}
-        
+
         # 啟動背景服務
         self._start_background_services()
-        
-        logger.info("智能快取系統初始化完成 (策略: %s, 最大大小: %d)", 
-                   self.config.strategy.value, self.config.max_size)
-    
+
+        logger.info("智能快取系統初始化完成 (策略: %s, 最大大小: %d, 分片: %d)",
+                   self.config.strategy.value, self.config.max_size,
+                   self.shard_count)
+
+    @property
+    def cache_data(self) -> Dict[str, CacheEntry]:
+        """所有分片的條目快照"""
+        if self.shard_count == 1:
+            return self._shards[0].entries
+        merged: Dict[str, CacheEntry] = {}
+        for shard in self._shards:
+            with shard.lock:
+                merged.update(shard.entries)
+        return merged
+
+    @property
+    def stats(self) -> CacheStats:
+        """彙總所有分片的統計"""
+        if self.shard_count == 1:
+            return self._shards[0].stats
+        total = CacheStats()
+        for shard in self._shards:
+            total.merge(shard.stats)
+        total.update_rates()
+        return total
+
     def get(self, key: str, default: Any = None) -> Any:
         """獲取快取值
-        
+
         Args:
             key: 快取鍵
             default: 預設值
-            
+
         Returns:
             Any: 快取值或預設值
         """
-        with self.lock:
-            if key in self.cache_data:
-                entry = self.cache_data[key]
-                
-                # 檢查是否過期
-                if entry.is_expired():
-                    self._remove_entry(key, CacheEvent.EXPIRE)
-                    self._record_event(CacheEvent.MISS, key)
-                    return default
-                
-                # 更新訪問資訊
-                entry.touch()
-                self._update_access_order(key)
-                
-                self._record_event(CacheEvent.HIT, key)
-                return entry.value
-            else:
-                self._record_event(CacheEvent.MISS, key)
-                return default
-    
+        shard = self._shard_for(key)
+        found, value = shard.get(key)
+        self._record_event(CacheEvent.HIT if found else CacheEvent.MISS, key)
+        return value if found else default
+
     def set(
-        self, 
-        key: str, 
-        value: Any, 
+        self,
+        key: str,
+        value: Any,
         ttl: Optional[int] = None,
         tags: Optional[set] = None
     ) -> bool:
         """設定快取值
-        
+
         Args:
             key: 快取鍵
             value: 快取值
             ttl: 生存時間（秒）
             tags: 標籤集合
-            
+
         Returns:
             bool: 是否設定成功
         """
         try:
-            with self.lock:
-                # 計算值的大小
-                value_size = self._calculate_size(value)
-                
-                # 檢查記憶體限制
-                if not self._check_memory_limit(value_size):
-                    self._evict_entries()
-                
-                # 如果鍵已存在，先移除舊條目
-                if key in self.cache_data:
-                    self._remove_entry(key, CacheEvent.SET)
-                
-                # 創建新條目
-                entry = CacheEntry(
-                    key=key,
-                    value=value,
-                    ttl=ttl or self.config.default_ttl,
-                    size=value_size,
-                    tags=tags or set()
-                )
-                
-                # 檢查是否需要淘汰
-                if len(self.cache_data) >= self.config.max_size:
-                    self._evict_entries()
-                
-                # 添加到快取
-                self.cache_data[key] = entry
-                self._update_access_order(key)
-                
-                # 更新統計
-                self.stats.sets += 1
-                self.stats.entry_count += 1
-                self.stats.total_size += value_size
-                
-                self._record_event(CacheEvent.SET, key)
-                return True
-                
+            # 大小計算在鎖外進行，避免阻塞其他執行緒
+            entry = CacheEntry(
+                key=key,
+                value=value,
+                ttl=ttl or self.config.default_ttl,
+                size=self._calculate_size(value),
+                tags=tags or set()
+            )
+            shard = self._shard_for(key)
+            shard.put(entry)
+            self._record_event(CacheEvent.SET, key)
+            return True
+
         except Exception as e:
             logger.error("設定快取失敗 %s: %s", key, e)
             return False
-    
+
     def delete(self, key: str) -> bool:
         """刪除快取條目
-        
+
         Args:
             key: 快取鍵
-            
+
         Returns:
             bool: 是否刪除成功
         """
-        with self.lock:
-            if key in self.cache_data:
-                self._remove_entry(key, CacheEvent.DELETE)
-                return True
-            return False
-    
+        shard = self._shard_for(key)
+        with shard.lock:
+            return shard.remove(key, CacheEvent.DELETE)
+
     def clear(self):
         """清空所有快取"""
-        with self.lock:
-            self.cache_data.clear()
-            self.access_order.clear()
-            self.frequency_counter.clear()
+        # 重置條目統計資料（但保留歷史統計）
+        for shard in self._shards:
+            shard.clear()
 
-            # 重置統計資料（但保留歷史統計）
-            self.stats.entry_count = 0
-            self.stats.total_size = 0
+        logger.info("快取已清空")
 
-            logger.info("快取已清空")
-    
     def exists(self, key: str) -> bool:
         """檢查鍵是否存在
-        
+
         Args:
             key: 快取鍵
-            
+
         Returns:
             bool: 是否存在
         """
-        with self.lock:
-            if key in self.cache_data:
-                entry = self.cache_data[key]
-                if entry.is_expired():
-                    self._remove_entry(key, CacheEvent.EXPIRE)
-                    return False
-                return True
-            return False
-    
+        shard = self._shard_for(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                return False
+            if entry.is_expired():
+                shard.remove(key, CacheEvent.EXPIRE)
+                return False
+            return True
+
     def get_stats(self) -> CacheStats:
         """獲取快取統計
-        
+
         Returns:
             CacheStats: 快取統計資訊
         """
-        with self.lock:
-            self.stats.update_rates()
-            return self.stats
-    
+        stats = self.stats
+        stats.update_rates()
+        return stats
+
     def get_keys(self, pattern: Optional[str] = None) -> List[str]:
         """獲取所有鍵
-        
+
         Args:
             pattern: 鍵模式（簡單的字串匹配）
-            
+
         Returns:
             List[str]: 鍵列表
         """
-        with self.lock:
-            keys = list(self.cache_data.keys())
-            
-            if pattern:
-                keys = [k for k in keys if pattern in k]
-            
-            return keys
-    
+        keys: List[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                keys.extend(shard.entries.keys())
+
+        if pattern:
+            keys = [k for k in keys if pattern in k]
+
+        return keys
+
     def get_by_tags(self, tags: set) -> Dict[str, Any]:
         """根據標籤獲取快取條目
-        
+
         Args:
             tags: 標籤集合
-            
+
         Returns:
             Dict[str, Any]: 匹配的快取條目
         """
         result = {}
-        
-        with self.lock:
-            for key, entry in self.cache_data.items():
-                if not entry.is_expired() and tags.intersection(entry.tags):
-                    entry.touch()
-                    result[key] = entry.value
-        
+        now = time.monotonic()
+
+        for shard in self._shards:
+            with shard.lock:
+                for key, entry in shard.entries.items():
+                    if not entry.is_expired(now) and tags.intersection(entry.tags):
+                        entry.touch()
+                        result[key] = entry.value
+
         return result
-    
+
     def invalidate_by_tags(self, tags: set) -> int:
         """根據標籤失效快取條目
-        
+
         Args:
             tags: 標籤集合
-            
+
         Returns:
             int: 失效的條目數量
         """
         invalidated = 0
-        
-        with self.lock:
-            keys_to_remove = []
-            
-            for key, entry in self.cache_data.items():
-                if tags.intersection(entry.tags):
-                    keys_to_remove.append(key)
-            
-            for key in keys_to_remove:
-                self._remove_entry(key, CacheEvent.DELETE)
-                invalidated += 1
-        
+
+        for shard in self._shards:
+            with shard.lock:
+                keys_to_remove = [
+                    key for key, entry in shard.entries.items()
+                    if tags.intersection(entry.tags)
+                ]
+                for key in keys_to_remove:
+                    shard.remove(key, CacheEvent.DELETE)
+                invalidated += len(keys_to_remove)
+
         logger.info("根據標籤失效 %d 個快取條目", invalidated)
         return invalidated
 
@@ -427,35 +753,34 @@ class IntelligentCacheSystem:
         Returns:
             Dict[str, Any]: 記憶體使用資訊
         """
-        with self.lock:
-            return {
-                'total_size_bytes': self.stats.total_size,
-                'total_size_mb': self.stats.total_size / (1024 * 1024),
-                'entry_count': self.stats.entry_count,
-                'average_entry_size': (
-                    self.stats.total_size / self.stats.entry_count
-                    if self.stats.entry_count > 0 else 0
-                ),
-                'memory_limit_mb': self.config.max_memory / (1024 * 1024),
-                'memory_usage_percent': (
-                    (self.stats.total_size / self.config.max_memory) * 100
-                    if self.config.max_memory > 0 else 0
-                )
-            }
+        stats = self.stats
+        return {
+            'total_size_bytes': stats.total_size,
+            'total_size_mb': stats.total_size / (1024 * 1024),
+            'entry_count': stats.entry_count,
+            'average_entry_size': (
+                stats.total_size / stats.entry_count
+                if stats.entry_count > 0 else 0
+            ),
+            'memory_limit_mb': self.config.max_memory / (1024 * 1024),
+            'memory_usage_percent': (
+                (stats.total_size / self.config.max_memory) * 100
+                if self.config.max_memory > 0 else 0
+            )
+        }
 
     def optimize_cache(self):
         """優化快取效能"""
-        with self.lock:
-            # 清理過期條目
-            self._cleanup_expired_entries()
+        # 清理過期條目
+        self._cleanup_expired_entries()
 
-            # 根據統計資訊調整策略
-            self._adaptive_strategy_adjustment()
+        # 根據統計資訊調整策略
+        self._adaptive_strategy_adjustment()
 
-            # 預熱熱門資料
-            self._preload_hot_data()
+        # 預熱熱門資料
+        self._preload_hot_data()
 
-            logger.info("快取優化完成")
+        logger.info("快取優化完成")
 
     def shutdown(self):
         """關閉快取系統"""
@@ -466,116 +791,29 @@ class IntelligentCacheSystem:
         self.preload_active = False
 
         # 清理資源
-        with self.lock:
-            self.cache_data.clear()
-            self.access_order.clear()
-            self.frequency_counter.clear()
+        for shard in self._shards:
+            shard.clear()
 
         logger.info("快取系統已關閉")
 
     # ==================== 私有輔助方法 ====================
 
+    def _shard_for(self, key: str) -> _CacheShard:
+        """取得鍵所屬的分片"""
+        if self.shard_count == 1:
+            return self._shards[0]
+        return self._shards[hash(key) % self.shard_count]
+
     def _calculate_size(self, value: Any) -> int:
         """計算值的大小"""
         try:
-            if isinstance(value, (str, bytes)):
-                return len(value)
-            elif isinstance(value, (int, float)):
-                return 8  # 估算
-            elif isinstance(value, (list, tuple, dict)):
-                return len(pickle.dumps(value))
-            else:
-                return len(str(value))
+            return estimate_size(value)
         except Exception:
             return 100  # 預設大小
 
-    def _check_memory_limit(self, new_size: int) -> bool:
-        """檢查記憶體限制"""
-        return (self.stats.total_size + new_size) <= self.config.max_memory
-
-    def _update_access_order(self, key: str):
-        """更新訪問順序"""
-        if self.config.strategy == CacheStrategy.LRU:
-            # 移動到最後（最近使用）
-            if key in self.access_order:
-                del self.access_order[key]
-            self.access_order[key] = True
-        elif self.config.strategy == CacheStrategy.LFU:
-            # 更新頻率計數
-            self.frequency_counter[key] += 1
-
-    def _remove_entry(self, key: str, event: CacheEvent):
-        """移除快取條目"""
-        if key in self.cache_data:
-            entry = self.cache_data[key]
-
-            # 更新統計
-            self.stats.entry_count -= 1
-            self.stats.total_size -= entry.size
-
-            if event == CacheEvent.DELETE:
-                self.stats.deletes += 1
-            elif event == CacheEvent.EXPIRE:
-                self.stats.expires += 1
-            elif event == CacheEvent.EVICT:
-                self.stats.evictions += 1
-
-            # 從存儲中移除
-            del self.cache_data[key]
-
-            # 從訪問順序中移除
-            if key in self.access_order:
-                del self.access_order[key]
-
-            # 從頻率計數中移除
-            if key in self.frequency_counter:
-                del self.frequency_counter[key]
-
-    def _evict_entries(self):
-        """淘汰快取條目"""
-        if not self.cache_data:
-            return
-
-        if self.config.strategy == CacheStrategy.LRU:
-            # 移除最久未使用的條目
-            oldest_key = next(iter(self.access_order))
-            self._remove_entry(oldest_key, CacheEvent.EVICT)
-
-        elif self.config.strategy == CacheStrategy.LFU:
-            # 移除使用頻率最低的條目
-            min_freq = min(self.frequency_counter.values())
-            lfu_key = next(k for k, v in self.frequency_counter.items() if v == min_freq)
-            self._remove_entry(lfu_key, CacheEvent.EVICT)
-
-        elif self.config.strategy == CacheStrategy.FIFO:
-            # 移除最早添加的條目
-            oldest_key = next(iter(self.cache_data))
-            self._remove_entry(oldest_key, CacheEvent.EVICT)
-
-        elif self.config.strategy == CacheStrategy.TTL:
-            # 移除最快過期的條目
-            now = datetime.now()
-            earliest_expire = None
-            earliest_key = None
-
-            for key, entry in self.cache_data.items():
-                if entry.ttl:
-                    expire_time = entry.created_at + timedelta(seconds=entry.ttl)
-                    if earliest_expire is None or expire_time < earliest_expire:
-                        earliest_expire = expire_time
-                        earliest_key = key
-
-            if earliest_key:
-                self._remove_entry(earliest_key, CacheEvent.EVICT)
-
     def _record_event(self, event: CacheEvent, key: str):
-        """記錄快取事件"""
+        """記錄快取事件（命中/失誤計數由分片在鎖內累加）"""
         if self.config.enable_stats:
-            if event == CacheEvent.HIT:
-                self.stats.hits += 1
-            elif event == CacheEvent.MISS:
-                self.stats.misses += 1
-
             # 記錄事件歷史
             self.event_history.append({
                 'timestamp': datetime.now(),
@@ -626,25 +864,20 @@ class IntelligentCacheSystem:
 
     def _cleanup_expired_entries(self):
         """清理過期條目"""
-        expired_keys = []
+        now = time.monotonic()
+        expired_count = sum(shard.cleanup_expired(now) for shard in self._shards)
 
-        with self.lock:
-            for key, entry in self.cache_data.items():
-                if entry.is_expired():
-                    expired_keys.append(key)
-
-        for key in expired_keys:
-            with self.lock:
-                self._remove_entry(key, CacheEvent.EXPIRE)
-
-        if expired_keys:
-            logger.debug("清理 %d 個過期快取條目", len(expired_keys))
+        if expired_count:
+            logger.debug("清理 %d 個過期快取條目", expired_count)
 
     def _execute_preload_functions(self):
         """執行預熱函數"""
         now = datetime.now()
 
-        for name, func in self.preload_functions.items():
+        with self.lock:
+            scheduled = list(self.preload_functions.items())
+
+        for name, func in scheduled:
             if name in self.preload_schedule and now >= self.preload_schedule[name]:
                 try:
                     # 執行預熱函數
@@ -664,7 +897,7 @@ class IntelligentCacheSystem:
             return
 
         # 根據命中率調整策略
-        hit_rate = self.stats.hit_rate
+        hit_rate = self.get_stats().hit_rate
 
         if hit_rate < 0.5:
             # 命中率低，使用LFU策略
@@ -678,21 +911,27 @@ class IntelligentCacheSystem:
     def _preload_hot_data(self):
         """預熱熱門資料"""
         # 簡化實現：基於訪問頻率預熱
-        if not self.frequency_counter:
-            return
+        hot_count = 0
+
+        for shard in self._shards:
+            with shard.lock:
+                if not shard.entries:
+                    continue
+
+                # 找出訪問頻率最高的鍵
+                hot_entries = heapq.nlargest(
+                    10, shard.entries.values(), key=lambda e: e.access_count
+                )
 
-        # 找出訪問頻率最高的鍵
-        hot_keys = sorted(
-            self.frequency_counter.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]  # 前10個熱門鍵
-
-        for key, freq in hot_keys:
-            if key in self.cache_data:
-                entry = self.cache_data[key]
-                # 延長熱門資料的TTL
-                if entry.ttl and entry.ttl < 7200:  # 小於2小時
-                    entry.ttl = 7200  # 延長到2小時
-
-        logger.debug("預熱 %d 個熱門快取條目", len(hot_keys))
+                for entry in hot_entries:
+                    # 延長熱門資料的TTL
+                    if entry.ttl and entry.ttl < 7200:  # 小於2小時
+                        entry.ttl = 7200  # 延長到2小時
+                        entry.expire_at = (
+                            entry.created_at.timestamp() + entry.ttl
+                            - time.time() + time.monotonic()
+                        )
+                        shard.reschedule(entry)
+                hot_count += len(hot_entries)
+
+        logger.debug("預熱 %d 個熱門快取條目", hot_count)
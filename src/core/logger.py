@@ -33,6 +33,8 @@ import plotly.graph_objects as go
 from dotenv import load_dotenv
 from plotly.subplots import make_subplots
 
+from src.core.trade_journal import TradeJournal
+
 # 載入環境變數
 load_dotenv()
 
@@ -566,60 +568,48 @@ log_analyzer = LogAnalyzer(
 class TradeLogger:
     """交易記錄類，用於記錄交易活動"""
 
-    def __init__(self, log_dir="logs"):
+    # 記錄種類，對應舊版的 CSV 檔名
+    RECORD_TYPES = ("trades", "orders", "portfolio_values")
+
+    def __init__(self, log_dir="logs", fsync_batch_size=64, fsync_interval=1.0):
         """
         初始化交易記錄器
 
+        記錄以僅附加日誌保存，每筆事件只附加一行，歷史資料在查詢時才依時間
+        範圍延遲載入；舊版的 CSV 記錄會在首次啟動時匯入。
+
         Args:
             log_dir (str): 日誌目錄
+            fsync_batch_size (int): 累積多少筆記錄後執行 fsync
+            fsync_interval (float): 距上次 fsync 超過多少秒後執行 fsync
         """
         self.log_dir = log_dir
 
         # 確保日誌目錄存在
         os.makedirs(log_dir, exist_ok=True)
 
-        # 初始化交易記錄
-        self.trades = []
-        self.orders = []
-        self.portfolio_values = []
-
-        # 載入現有記錄
-        self._load_records()
-
-    def _load_records(self):
-        """載入現有記錄"""
-        # 載入交易記錄
-        trades_file = os.path.join(self.log_dir, "trades.csv")
-        if os.path.exists(trades_file):
-            self.trades = pd.read_csv(trades_file).to_dict("records")
-
-        # 載入訂單記錄
-        orders_file = os.path.join(self.log_dir, "orders.csv")
-        if os.path.exists(orders_file):
-            self.orders = pd.read_csv(orders_file).to_dict("records")
-
-        # 載入投資組合價值記錄
-        portfolio_values_file = os.path.join(self.log_dir, "portfolio_values.csv")
-        if os.path.exists(portfolio_values_file):
-            self.portfolio_values = pd.read_csv(portfolio_values_file).to_dict(
-                "records"
+        # 初始化各類記錄的日誌
+        journal_dir = os.path.join(log_dir, "journal")
+        self.journals = {
+            record_type: TradeJournal(
+                journal_dir,
+                record_type,
+                fsync_batch_size=fsync_batch_size,
+                fsync_interval=fsync_interval,
+                legacy_csv=os.path.join(log_dir, f"{record_type}.csv"),
             )
+            for record_type in self.RECORD_TYPES
+        }
 
-    def _save_records(self):
-        """儲存記錄"""
-        # 儲存交易記錄
-        trades_df = pd.DataFrame(self.trades)
-        trades_df.to_csv(os.path.join(self.log_dir, "trades.csv"), index=False)
-
-        # 儲存訂單記錄
-        orders_df = pd.DataFrame(self.orders)
-        orders_df.to_csv(os.path.join(self.log_dir, "orders.csv"), index=False)
+    def flush(self):
+        """將所有日誌尚未 fsync 的記錄寫入磁碟"""
+        for journal in self.journals.values():
+            journal.flush()
 
-        # 儲存投資組合價值記錄
-        portfolio_values_df = pd.DataFrame(self.portfolio_values)
-        portfolio_values_df.to_csv(
-            os.path.join(self.log_dir, "portfolio_values.csv"), index=False
-        )
+    def close(self):
+        """關閉所有日誌"""
+        for journal in self.journals.values():
+            journal.close()
 
     def log_trade(self, trade):
         """
@@ -641,10 +631,7 @@ class TradeLogger:
             trade["timestamp"] = trade["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
 
         # 添加交易記錄
-        self.trades.append(trade)
-
-        # 儲存記錄
-        self._save_records()
+        self.journals["trades"].append(trade)
 
         # 記錄到日誌
         logger.info("交易記錄: %s", trade)
@@ -670,10 +657,7 @@ class TradeLogger:
             order["timestamp"] = order["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
 
         # 添加訂單記錄
-        self.orders.append(order)
-
-        # 儲存記錄
-        self._save_records()
+        self.journals["orders"].append(order)
 
         # 記錄到日誌
         logger.info("訂單記錄: %s", order)
@@ -696,10 +680,7 @@ class TradeLogger:
             )
 
         # 添加投資組合價值記錄
-        self.portfolio_values.append(portfolio_value)
-
-        # 儲存記錄
-        self._save_records()
+        self.journals["portfolio_values"].append(portfolio_value)
 
         # 記錄到日誌
         logger.info("投資組合價值記錄: %s", portfolio_value)
@@ -717,8 +698,8 @@ class TradeLogger:
         Returns:
             pandas.DataFrame: 交易記錄
         """
-        # 轉換為 DataFrame
-        trades_df = pd.DataFrame(self.trades)
+        # 只載入與時間範圍重疊的區段
+        trades_df = self.journals["trades"].read(start_time, end_time)
 
         if trades_df.empty:
             return trades_df
@@ -759,8 +740,8 @@ class TradeLogger:
         Returns:
             pandas.DataFrame: 訂單記錄
         """
-        # 轉換為 DataFrame
-        orders_df = pd.DataFrame(self.orders)
+        # 只載入與時間範圍重疊的區段
+        orders_df = self.journals["orders"].read(start_time, end_time)
 
         if orders_df.empty:
             return orders_df
@@ -800,8 +781,10 @@ class TradeLogger:
         Returns:
             pandas.DataFrame: 投資組合價值記錄
         """
-        # 轉換為 DataFrame
-        portfolio_values_df = pd.DataFrame(self.portfolio_values)
+        # 只載入與時間範圍重疊的區段
+        portfolio_values_df = self.journals["portfolio_values"].read(
+            start_time, end_time
+        )
 
         if portfolio_values_df.empty:
             return portfolio_values_df
@@ -51,6 +51,8 @@ except ImportError:
     expected_returns = None
     risk_models = None
 
+from src.portfolio.kernel import portfolio_optimizer
+
 from .data_ingest import load_data
 
 # 設定日誌
@@ -843,32 +845,13 @@ class MeanVariancePortfolio(Portfolio):
 
         n = len(expected_returns)
 
-        # 定義目標函數
-        def objective(weights):
-            """計算目標函數值
-
-            Args:
-                weights: 投資組合權重
-            """
-            portfolio_return = np.sum(expected_returns * weights)
-            portfolio_variance = np.dot(weights.T, np.dot(cov_matrix, weights))
-            return -portfolio_return + self.risk_aversion * portfolio_variance
-
-        # 定義約束條件
-        constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}  # 權重和為 1
-        bounds = tuple((0, 1) for _ in range(n))  # 權重介於 0 和 1 之間
-
-        # 初始猜測
-        initial_weights = np.ones(n) / n
-
         try:
-            # 最佳化
-            result = sco.minimize(
-                objective,
-                initial_weights,
-                method="SLSQP",
-                bounds=bounds,
-                constraints=constraints,
+            # 由最佳化核心以解析梯度求解，權重介於 0 和 1 之間且總和為 1
+            result = portfolio_optimizer.optimize(
+                "mean_variance",
+                cov_matrix,
+                expected_returns,
+                risk_aversion=self.risk_aversion,
             )
 
             if not result.success:
@@ -876,7 +859,7 @@ class MeanVariancePortfolio(Portfolio):
                 # 返回等權重作為備選方案
                 return np.ones(n) / n
 
-            return result["x"]
+            return result.weights
         except Exception as e:
             logger.error(f"最佳化過程中發生錯誤: {e}")
             # 返回等權重作為備選方案
@@ -1107,44 +1090,10 @@ class RiskParityPortfolio(Portfolio):
         Returns:
             numpy.ndarray: 最佳化權重
         """
-        n = cov_matrix.shape[0]
-
-        # 定義目標函數
-        def objective(weights):
-            """
-            計算每個資產的風險貢獻
-
-            Args:
-                weights: 投資組合權重
-            """
-            portfolio_variance = np.dot(weights.T, np.dot(cov_matrix, weights))
-            risk_contribution = (
-                weights * np.dot(cov_matrix, weights) / portfolio_variance
-            )
-
-            # 計算風險貢獻的標準差
-            target_risk = 1.0 / n
-            risk_deviation = np.sum((risk_contribution - target_risk) ** 2)
-
-            return risk_deviation
+        # 由最佳化核心以解析梯度求解，權重介於 0 和 1 之間且總和為 1
+        result = portfolio_optimizer.optimize("risk_parity", cov_matrix)
 
-        # 定義約束條件
-        constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}  # 權重和為 1
-        bounds = tuple((0, 1) for _ in range(n))  # 權重介於 0 和 1 之間
-
-        # 初始猜測
-        initial_weights = np.ones(n) / n
-
-        # 最佳化
-        result = sco.minimize(
-            objective,
-            initial_weights,
-            method="SLSQP",
-            bounds=bounds,
-            constraints=constraints,
-        )
-
-        return result["x"]
+        return result.weights
 
     def evaluate(
         self, weights: Dict[str, float], price_df: pd.DataFrame
@@ -1457,47 +1406,15 @@ class MaxSharpePortfolio(Portfolio):
         Returns:
             numpy.ndarray: 最佳化權重
         """
-        n = len(expected_returns)
-
-        # 定義目標函數 (負的夏普比率，因為我們要最大化)
-        def objective(weights):
-            """
-            計算負的夏普比率
-
-            Args:
-                weights: 投資組合權重
-            """
-            portfolio_return = np.sum(expected_returns * weights)
-            portfolio_volatility = np.sqrt(
-                np.dot(weights.T, np.dot(cov_matrix, weights))
-            )
-
-            # 避免除以零
-            if portfolio_volatility == 0:
-                return -999999  # 一個非常小的數，表示這不是一個好的解
-
-            sharpe_ratio = (
-                portfolio_return - self.risk_free_rate
-            ) / portfolio_volatility
-            return -sharpe_ratio  # 負號是因為我們要最大化夏普比率
-
-        # 定義約束條件
-        constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}  # 權重和為 1
-        bounds = tuple((0, 1) for _ in range(n))  # 權重介於 0 和 1 之間
-
-        # 初始猜測
-        initial_weights = np.ones(n) / n
-
-        # 最佳化
-        result = sco.minimize(
-            objective,
-            initial_weights,
-            method="SLSQP",
-            bounds=bounds,
-            constraints=constraints,
+        # 由最佳化核心以解析梯度求解，權重介於 0 和 1 之間且總和為 1
+        result = portfolio_optimizer.optimize(
+            "max_sharpe",
+            cov_matrix,
+            expected_returns,
+            risk_free_rate=self.risk_free_rate,
         )
 
-        return result["x"]
+        return result.weights
 
     def evaluate(self, weights, price_df):
         """
@@ -1726,35 +1643,10 @@ class MinVariancePortfolio(Portfolio):
         Returns:
             numpy.ndarray: 最佳化權重
         """
-        n = cov_matrix.shape[0]
-
-        # 定義目標函數 (投資組合方差)
-        def objective(weights):
-            """
-            計算投資組合方差
-
-            Args:
-                weights: 投資組合權重
-            """
-            return np.dot(weights.T, np.dot(cov_matrix, weights))
-
-        # 定義約束條件
-        constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}  # 權重和為 1
-        bounds = tuple((0, 1) for _ in range(n))  # 權重介於 0 和 1 之間
-
-        # 初始猜測
-        initial_weights = np.ones(n) / n
-
-        # 最佳化
-        result = sco.minimize(
-            objective,
-            initial_weights,
-            method="SLSQP",
-            bounds=bounds,
-            constraints=constraints,
-        )
+        # 由最佳化核心以解析梯度求解，權重介於 0 和 1 之間且總和為 1
+        result = portfolio_optimizer.optimize("min_variance", cov_matrix)
 
-        return result["x"]
+        return result.weights
 
     def evaluate(self, weights, price_df):
         """
@@ -213,6 +213,52 @@ class RealDataIntegrationService:
             logger.error(f"❌ 獲取 {symbol} 數據失敗: {e}")
             return pd.DataFrame()
     
+    def get_bulk_stock_data(self, symbols: Optional[List[str]] = None,
+                            start_date: Optional[date] = None,
+                            end_date: Optional[date] = None) -> pd.DataFrame:
+        """
+        以單一查詢獲取多檔股票的日線數據（供共享快取發佈使用）
+
+        Args:
+            symbols: 股票代碼列表，None 表示全部
+            start_date: 開始日期
+            end_date: 結束日期
+
+        Returns:
+            長格式股票數據DataFrame（symbol, date, OHLCV）
+        """
+        try:
+            db_path_clean = self.db_path.replace('sqlite:///', '')
+            conn = sqlite3.connect(db_path_clean)
+
+            query = "SELECT symbol, date, open, high, low, close, volume FROM real_stock_data WHERE 1 = 1"
+            params: List[Any] = []
+
+            if symbols:
+                query += f" AND symbol IN ({', '.join('?' for _ in symbols)})"
+                params.extend(symbols)
+
+            if start_date:
+                query += " AND date >= ?"
+                params.append(start_date.strftime('%Y-%m-%d'))
+
+            if end_date:
+                query += " AND date <= ?"
+                params.append(end_date.strftime('%Y-%m-%d'))
+
+            query += " ORDER BY date, symbol"
+
+            df = pd.read_sql_query(query, conn, params=params)
+            conn.close()
+
+            if not df.empty:
+                df['date'] = pd.to_datetime(df['date'])
+            return df
+
+        except Exception as e:
+            logger.error(f"❌ 批次獲取股票數據失敗: {e}")
+            return pd.DataFrame()
+
     def _fetch_missing_data(self, symbol: str, start_date: Optional[date], 
                            end_date: Optional[date]) -> pd.DataFrame:
         """獲取缺失的數據"""
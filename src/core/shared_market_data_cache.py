@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""跨程序共享市場數據快取
+
+此模組提供本機共享的日線價格面板快取，讓多個 Streamlit 工作階段、
+API worker 與回測程序共用同一份資料，而不是各自保存副本。
+
+儲存格式：
+- 每個資料版本（資料日期）一個目錄，內含每個欄位（open/high/low/close/volume）
+  一個未壓縮的 Arrow IPC 檔案，資料以 日期×股票 的列優先順序攤平為單一
+  float64 欄位
+- ``CURRENT`` 指標檔記錄目前版本，寫入端以原子替換方式切換版本
+- 讀取端以記憶體映射開啟 Arrow 檔案，取得的 DataFrame 直接引用映射頁面，
+  不複製資料；作業系統頁面快取在所有程序間共享
+
+單一寫入端（``DataScheduler.daily_update_task``）在每日更新後發佈新版本，
+讀取端在下次存取時自動切換至新版本。
+
+Example:
+    寫入端：
+    ```python
+    cache = get_shared_market_data_cache()
+    cache.publish_bars(bars_df, version="2025-01-28")
+    ```
+
+    讀取端（任意程序）：
+    ```python
+    cache = get_shared_market_data_cache()
+    close = cache.get_panel("close")            # 日期 × 股票
+    bars = cache.get_symbol_bars("2330.TW", start_date="2024-01-01")
+    ```
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_DIR = "cache/shared_market_data"
+PANEL_FIELDS = ("open", "high", "low", "close", "volume")
+
+_CURRENT_FILE = "CURRENT"
+_MANIFEST_FILE = "manifest.json"
+_LOCK_FILE = ".writer.lock"
+
+DateLike = Union[str, pd.Timestamp, date, None]
+
+
+class SharedCacheError(Exception):
+    """共享快取錯誤"""
+
+
+@dataclass
+class _PanelVersion:
+    """已開啟的面板版本（持有記憶體映射）"""
+
+    version: str
+    directory: Path
+    dates: pd.DatetimeIndex
+    symbols: pd.Index
+    fields: List[str]
+    panels: Dict[str, pd.DataFrame]
+
+    def panel(self, field: str) -> pd.DataFrame:
+        """取得欄位面板（延遲映射）"""
+        frame = self.panels.get(field)
+        if frame is None:
+            if field not in self.fields:
+                raise KeyError(f"共享快取版本 {self.version} 不包含欄位: {field}")
+            frame = _map_panel(
+                self.directory / f"{field}.arrow", self.dates, self.symbols
+            )
+            self.panels[field] = frame
+        return frame
+
+
+def _map_panel(path: Path, dates: pd.DatetimeIndex, symbols: pd.Index) -> pd.DataFrame:
+    """以記憶體映射方式開啟面板檔案並包裝為零複製 DataFrame"""
+    source = pa.memory_map(str(path), "r")
+    table = pa.ipc.open_file(source).read_all()
+    column = table.column(0)
+    if column.num_chunks != 1:
+        column = pa.chunked_array([pa.concat_arrays(column.chunks)])
+    values = column.chunk(0).to_numpy(zero_copy_only=True)
+    matrix = values.reshape(len(dates), len(symbols))
+    return pd.DataFrame(matrix, index=dates, columns=symbols, copy=False)
+
+
+class SharedMarketDataCache:
+    """共享市場數據快取
+
+    Attributes:
+        base_dir: 快取根目錄
+        keep_versions: 保留的歷史版本數量
+    """
+
+    def __init__(
+        self,
+        base_dir: str = DEFAULT_BASE_DIR,
+        keep_versions: int = 3,
+        check_interval: float = 5.0,
+        lock_timeout: float = 3600.0,
+    ):
+        """初始化共享快取
+
+        Args:
+            base_dir: 快取根目錄
+            keep_versions: 保留的歷史版本數量
+            check_interval: 讀取端檢查新版本的最短間隔（秒）
+            lock_timeout: 寫入鎖逾時秒數，超過視為殘留鎖
+        """
+        self.base_dir = Path(base_dir)
+        self.keep_versions = max(1, keep_versions)
+        self.check_interval = check_interval
+        self.lock_timeout = lock_timeout
+
+        self._lock = threading.RLock()
+        self._current: Optional[_PanelVersion] = None
+        self._current_mtime_ns: Optional[int] = None
+        self._last_check = 0.0
+
+    # ==================== 讀取端 ====================
+
+    def current_version(self) -> Optional[str]:
+        """取得目前資料版本（資料日期）"""
+        opened = self._open_current()
+        return opened.version if opened is not None else None
+
+    def is_available(self) -> bool:
+        """是否已有可讀取的版本"""
+        return self._open_current() is not None
+
+    def symbols(self) -> List[str]:
+        """取得目前版本涵蓋的股票代碼"""
+        opened = self._open_current()
+        return list(opened.symbols) if opened is not None else []
+
+    def get_panel(
+        self,
+        field: str = "close",
+        symbols: Optional[Sequence[str]] = None,
+        start_date: DateLike = None,
+        end_date: DateLike = None,
+    ) -> pd.DataFrame:
+        """取得 日期×股票 面板
+
+        未指定股票時回傳的 DataFrame 為記憶體映射的唯讀視圖。
+
+        Args:
+            field: 欄位名稱
+            symbols: 股票代碼篩選
+            start_date: 開始日期
+            end_date: 結束日期
+
+        Returns:
+            pd.DataFrame: 價格面板，無可用版本時為空 DataFrame
+        """
+        opened = self._open_current()
+        if opened is None:
+            return pd.DataFrame()
+
+        panel = opened.panel(field)
+        rows = _date_slice(opened.dates, start_date, end_date)
+        panel = panel.iloc[rows]
+        if symbols is not None:
+            panel = panel.reindex(columns=list(symbols))
+        return panel
+
+    def get_symbol_bars(
+        self,
+        symbol: str,
+        start_date: DateLike = None,
+        end_date: DateLike = None,
+    ) -> pd.DataFrame:
+        """取得單一股票的 OHLCV（日期索引）
+
+        Args:
+            symbol: 股票代碼
+            start_date: 開始日期
+            end_date: 結束日期
+
+        Returns:
+            pd.DataFrame: OHLCV 資料，股票不存在時為空 DataFrame
+        """
+        opened = self._open_current()
+        if opened is None or symbol not in opened.symbols:
+            return pd.DataFrame()
+
+        col = opened.symbols.get_loc(symbol)
+        rows = _date_slice(opened.dates, start_date, end_date)
+        frame = pd.DataFrame(
+            {
+                field: opened.panel(field).iloc[rows, col]
+                for field in PANEL_FIELDS
+                if field in opened.fields
+            }
+        )
+        frame.index.name = "date"
+        return frame.dropna(how="all")
+
+    def get_bars(
+        self,
+        symbols: Sequence[str],
+        start_date: DateLike = None,
+        end_date: DateLike = None,
+    ) -> pd.DataFrame:
+        """取得多檔股票的長格式 OHLCV（symbol, date, open, ...）
+
+        Args:
+            symbols: 股票代碼列表
+            start_date: 開始日期
+            end_date: 結束日期
+
+        Returns:
+            pd.DataFrame: 長格式資料，任一股票缺少時為空 DataFrame
+        """
+        opened = self._open_current()
+        if opened is None or any(s not in opened.symbols for s in symbols):
+            return pd.DataFrame()
+
+        rows = _date_slice(opened.dates, start_date, end_date)
+        cols = opened.symbols.get_indexer(list(symbols))
+        dates = opened.dates[rows]
+        data = {
+            "symbol": np.repeat(np.asarray(symbols, dtype=object), len(dates)),
+            "date": np.tile(dates.to_numpy(), len(symbols)),
+        }
+        for field in PANEL_FIELDS:
+            if field in opened.fields:
+                block = opened.panel(field).to_numpy()[rows][:, cols]
+                data[field] = block.T.reshape(-1)
+
+        frame = pd.DataFrame(data)
+        value_fields = [f for f in PANEL_FIELDS if f in frame.columns]
+        return frame.dropna(subset=value_fields, how="all").reset_index(drop=True)
+
+    # ==================== 寫入端 ====================
+
+    def publish_bars(self, bars: pd.DataFrame, version: str) -> Path:
+        """將長格式日線資料發佈為新版本
+
+        Args:
+            bars: 包含 symbol、date 與 OHLCV 欄位的長格式資料
+            version: 資料版本（通常為資料日期 YYYY-MM-DD）
+
+        Returns:
+            Path: 新版本目錄
+        """
+        missing = {"symbol", "date"} - set(bars.columns)
+        if missing:
+            raise SharedCacheError(f"日線資料缺少必要欄位: {sorted(missing)}")
+
+        frame = bars.copy()
+        frame["date"] = pd.to_datetime(frame["date"])
+        frame = frame.drop_duplicates(subset=["date", "symbol"], keep="last")
+        fields = [f for f in PANEL_FIELDS if f in frame.columns]
+        panels = {
+            field: frame.pivot(index="date", columns="symbol", values=field)
+            for field in fields
+        }
+        return self.publish_panels(panels, version)
+
+    def publish_panels(self, panels: Dict[str, pd.DataFrame], version: str) -> Path:
+        """發佈 日期×股票 面板為新版本
+
+        所有面板會對齊至相同的日期與股票軸。
+
+        Args:
+            panels: 欄位名稱 -> 面板
+            version: 資料版本
+
+        Returns:
+            Path: 新版本目錄
+        """
+        if not panels:
+            raise SharedCacheError("沒有可發佈的面板資料")
+
+        dates = pd.DatetimeIndex([])
+        symbols = pd.Index([])
+        for panel in panels.values():
+            dates = dates.union(pd.DatetimeIndex(panel.index))
+            symbols = symbols.union(panel.columns)
+        symbols = pd.Index([str(s) for s in symbols]).unique().sort_values()
+
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        with self._writer_lock():
+            directory = self.base_dir / f"{version}_{time.time_ns()}"
+            staging = directory.with_name(directory.name + ".tmp")
+            staging.mkdir(parents=True)
+            try:
+                for field, panel in panels.items():
+                    aligned = panel.copy()
+                    aligned.columns = [str(c) for c in aligned.columns]
+                    aligned = aligned.reindex(index=dates, columns=symbols)
+                    values = np.ascontiguousarray(
+                        aligned.to_numpy(dtype=np.float64)
+                    ).reshape(-1)
+                    _write_panel(staging / f"{field}.arrow", field, values)
+
+                manifest = {
+                    "version": version,
+                    "fields": list(panels),
+                    "dates": [d.strftime("%Y-%m-%d") for d in dates],
+                    "symbols": list(symbols),
+                    "created_at": pd.Timestamp.now().isoformat(),
+                }
+                with open(staging / _MANIFEST_FILE, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f, ensure_ascii=False)
+
+                os.replace(staging, directory)
+            except Exception:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+            _atomic_write_json(
+                self.base_dir / _CURRENT_FILE,
+                {"version": version, "directory": directory.name},
+            )
+            self._prune_versions(keep=directory.name)
+
+        logger.info(
+            "共享市場數據快取已發佈版本 %s (%d 日 × %d 檔)",
+            version,
+            len(dates),
+            len(symbols),
+        )
+        return directory
+
+    # ==================== 私有輔助方法 ====================
+
+    def _open_current(self) -> Optional[_PanelVersion]:
+        """開啟目前版本（必要時切換至新版本）"""
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._current is not None
+                and now - self._last_check < self.check_interval
+            ):
+                return self._current
+            self._last_check = now
+
+            pointer_file = self.base_dir / _CURRENT_FILE
+            try:
+                mtime_ns = pointer_file.stat().st_mtime_ns
+            except FileNotFoundError:
+                return self._current
+
+            if self._current is not None and mtime_ns == self._current_mtime_ns:
+                return self._current
+
+            try:
+                with open(pointer_file, "r", encoding="utf-8") as f:
+                    pointer = json.load(f)
+                directory = self.base_dir / pointer["directory"]
+                with open(directory / _MANIFEST_FILE, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("讀取共享快取版本失敗: %s", e)
+                return self._current
+
+            self._current = _PanelVersion(
+                version=manifest["version"],
+                directory=directory,
+                dates=pd.DatetimeIndex(pd.to_datetime(manifest["dates"]), name="date"),
+                symbols=pd.Index(manifest["symbols"], name="symbol"),
+                fields=list(manifest["fields"]),
+                panels={},
+            )
+            self._current_mtime_ns = mtime_ns
+            logger.debug("已開啟共享市場數據版本 %s", self._current.version)
+            return self._current
+
+    def _writer_lock(self) -> "_WriterLock":
+        return _WriterLock(self.base_dir / _LOCK_FILE, self.lock_timeout)
+
+    def _prune_versions(self, keep: str):
+        """刪除超出保留數量的舊版本
+
+        已開啟舊版本的讀取端在 POSIX 系統上仍可繼續使用既有映射。
+        """
+        versions = sorted(
+            (
+                p
+                for p in self.base_dir.iterdir()
+                if p.is_dir() and not p.name.endswith(".tmp")
+            ),
+            key=lambda p: p.name.rsplit("_", 1)[-1],
+        )
+        others = [p for p in versions if p.name != keep]
+        stale = others[: max(0, len(others) - (self.keep_versions - 1))]
+        for path in stale:
+            try:
+                shutil.rmtree(path)
+            except OSError as e:  # Windows 上仍被映射的檔案無法刪除
+                logger.debug("暫不刪除舊版本 %s: %s", path.name, e)
+
+
+class _WriterLock:
+    """以排他建立檔案實作的跨程序寫入鎖"""
+
+    def __init__(self, path: Path, timeout: float):
+        self.path = path
+        self.timeout = timeout
+
+    def __enter__(self):
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                age = time.time() - self.path.stat().st_mtime
+            except FileNotFoundError:
+                age = self.timeout + 1
+            if age <= self.timeout:
+                raise SharedCacheError("另一個寫入程序正在更新共享快取")
+            logger.warning("移除殘留的共享快取寫入鎖: %s", self.path)
+            self.path.unlink(missing_ok=True)
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.path.unlink(missing_ok=True)
+        return False
+
+
+def _write_panel(path: Path, field: str, values: np.ndarray):
+    """以未壓縮 Arrow IPC 檔案寫入攤平的面板資料"""
+    table = pa.table({field: pa.array(values, type=pa.float64())})
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _atomic_write_json(path: Path, payload: Dict):
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _date_slice(
+    dates: pd.DatetimeIndex, start_date: DateLike, end_date: DateLike
+) -> slice:
+    """以二分搜尋將日期範圍轉為列切片"""
+    start = 0
+    stop = len(dates)
+    if start_date is not None:
+        start = dates.searchsorted(pd.Timestamp(start_date), side="left")
+    if end_date is not None:
+        stop = dates.searchsorted(pd.Timestamp(end_date), side="right")
+    return slice(start, stop)
+
+
+_shared_caches: Dict[str, SharedMarketDataCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_shared_market_data_cache(
+    base_dir: Optional[str] = None,
+) -> SharedMarketDataCache:
+    """獲取程序內共用的共享快取實例
+
+    Args:
+        base_dir: 快取根目錄，預設讀取 ``SHARED_MARKET_DATA_DIR`` 環境變數
+
+    Returns:
+        SharedMarketDataCache: 共享快取實例
+    """
+    base_dir = base_dir or os.environ.get("SHARED_MARKET_DATA_DIR", DEFAULT_BASE_DIR)
+    key = str(Path(base_dir).resolve())
+    with _shared_caches_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = SharedMarketDataCache(base_dir)
+            _shared_caches[key] = cache
+        return cache
@@ -1,20 +1,102 @@
 """快取管理器
 
 此模組實現了訊號產生器的快取機制，提升計算效能。
+
+快取鍵值以內容定址：DataFrame、Series 與 ndarray 參數依形狀、
+資料型別與底層緩衝區的雜湊產生指紋，相同資料必定命中、
+不同資料不會因截斷的 repr 而碰撞。
+
+快取分為兩層：
+- 記憶體層：以項目數與位元組數限制的 LRU 快取
+- 磁碟層：背景執行緒非同步寫入；表格資料使用 Arrow IPC 格式，
+  讀取後轉為 pandas，其他資料使用 pickle
 """
 
 import hashlib
 import logging
 import pickle
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+
+from src.core.intelligent_cache_system import estimate_size
 
 logger = logging.getLogger(__name__)
 
+# Arrow 檔案 schema metadata 鍵值
+_META_TIMESTAMP = b"signal_cache.timestamp"
+_META_KIND = b"signal_cache.kind"
+_META_SERIES_NAME = b"signal_cache.series_name"
+
+
+def _update_fingerprint(hasher: "hashlib._Hash", value: Any):
+    """將參數的內容指紋寫入雜湊器
+
+    Args:
+        hasher: hashlib 雜湊器
+        value: 參數值
+    """
+    if isinstance(value, pd.DataFrame):
+        hasher.update(b"df")
+        hasher.update(repr(value.shape).encode())
+        hasher.update(repr(list(value.columns)).encode())
+        hasher.update(repr([str(dtype) for dtype in value.dtypes]).encode())
+        _update_fingerprint(hasher, value.index)
+        for _, column in value.items():
+            _update_array_fingerprint(hasher, column.to_numpy())
+    elif isinstance(value, pd.Series):
+        hasher.update(b"series")
+        hasher.update(repr((value.name, len(value), str(value.dtype))).encode())
+        _update_fingerprint(hasher, value.index)
+        _update_array_fingerprint(hasher, value.to_numpy())
+    elif isinstance(value, pd.Index):
+        hasher.update(b"index")
+        hasher.update(repr((type(value).__name__, len(value), value.names)).encode())
+        hasher.update(pd.util.hash_pandas_object(value, index=False).to_numpy().data)
+    elif isinstance(value, np.ndarray):
+        hasher.update(b"ndarray")
+        hasher.update(repr((value.shape, str(value.dtype))).encode())
+        _update_array_fingerprint(hasher, value)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f"{type(value).__name__}[{len(value)}]".encode())
+        for item in value:
+            _update_fingerprint(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(f"dict[{len(value)}]".encode())
+        for key in sorted(value, key=repr):
+            hasher.update(repr(key).encode())
+            _update_fingerprint(hasher, value[key])
+    else:
+        hasher.update(repr(value).encode())
+    hasher.update(b"|")
+
+
+def _update_array_fingerprint(hasher: "hashlib._Hash", array: np.ndarray):
+    """以底層緩衝區雜湊陣列內容；object 陣列使用 pandas 向量化雜湊"""
+    if array.dtype == object:
+        try:
+            hashed = pd.util.hash_array(np.asarray(array).ravel())
+        except TypeError:
+            # 含 list、dict 等不可雜湊的元素時改以序列化內容雜湊
+            try:
+                hasher.update(pickle.dumps(array, protocol=pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                hasher.update(repr(array.tolist()).encode())
+            return
+        hasher.update(hashed.data)
+    else:
+        # 0 維陣列無法改變元素型別檢視，先轉為一維
+        contiguous = np.ascontiguousarray(array).reshape(-1)
+        hasher.update(contiguous.view(np.uint8).data)
+
 
 class SignalCacheManager:
     """快取管理器
@@ -22,20 +104,35 @@ class SignalCacheManager:
     提供 LRU 快取、時間戳快取和持久化快取功能。
     """
 
-    def __init__(self, cache_dir: str = "cache", max_memory_items: int = 100):
+    def __init__(
+        self,
+        cache_dir: str = "cache",
+        max_memory_items: int = 100,
+        max_memory_bytes: Optional[int] = 256 * 1024 * 1024,
+    ):
         """初始化快取管理器
 
         Args:
             cache_dir (str): 快取目錄
             max_memory_items (int): 記憶體快取最大項目數
+            max_memory_bytes (int, optional): 記憶體快取最大位元組數，None 表示不限制
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
 
         # 記憶體快取 (LRU)
-        self.memory_cache: Dict[str, Tuple[Any, float]] = {}
-        self.access_times: Dict[str, float] = {}
+        self.memory_cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.item_sizes: Dict[str, int] = {}
+        self.memory_bytes = 0
         self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+
+        # 非同步磁碟寫入
+        self._lock = threading.RLock()
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="SignalCacheWriter"
+        )
+        self._pending_writes: Dict[str, Future] = {}
 
         # 快取統計
         self.stats = {
@@ -44,11 +141,18 @@ class SignalCacheManager:
             "evictions": 0,
             "disk_reads": 0,
             "disk_writes": 0,
+            "memory_hits": 0,
+            "memory_misses": 0,
+            "disk_hits": 0,
+            "disk_misses": 0,
+            "disk_write_errors": 0,
         }
 
     def _generate_cache_key(self, func_name: str, *args, **kwargs) -> str:
         """生成快取鍵值
 
+        DataFrame、Series 與 ndarray 依形狀、型別與內容雜湊產生指紋。
+
         Args:
             func_name (str): 函數名稱
             *args: 位置參數
@@ -57,36 +161,29 @@ class SignalCacheManager:
         Returns:
             str: 快取鍵值
         """
-        # 創建參數的雜湊值
-        key_data = {
-            "func": func_name,
-            "args": str(args),
-            "kwargs": sorted(kwargs.items()),
-        }
-
-        key_str = str(key_data)
-        return hashlib.md5(key_str.encode(), usedforsecurity=False).hexdigest()
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(func_name.encode())
+        _update_fingerprint(hasher, args)
+        _update_fingerprint(hasher, kwargs)
+        return hasher.hexdigest()
 
     def _evict_lru_item(self):
         """移除最久未使用的項目"""
-        if not self.access_times:
+        if not self.memory_cache:
             return
 
-        # 找到最久未使用的項目
-        lru_key = min(self.access_times.keys(), key=lambda k: self.access_times[k])
-
-        # 移除項目
-        del self.memory_cache[lru_key]
-        del self.access_times[lru_key]
+        lru_key, _ = self.memory_cache.popitem(last=False)
+        self.memory_bytes -= self.item_sizes.pop(lru_key, 0)
         self.stats["evictions"] += 1
 
         logger.debug("移除 LRU 快取項目: %s", lru_key)
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: str, max_age_seconds: Optional[float] = None) -> Optional[Any]:
         """獲取快取項目
 
         Args:
             key (str): 快取鍵值
+            max_age_seconds (float, optional): 最大快取時間，超過視為未命中
 
         Returns:
             Optional[Any]: 快取的值，如果不存在則返回 None
@@ -94,39 +191,50 @@ class SignalCacheManager:
         current_time = time.time()
 
         # 檢查記憶體快取
-        if key in self.memory_cache:
-            value, timestamp = self.memory_cache[key]
-            self.access_times[key] = current_time
-            self.stats["hits"] += 1
-            logger.debug("記憶體快取命中: %s", key)
-            return value
-
-        # 檢查磁碟快取
-        cache_file = self.cache_dir / f"{key}.pkl"
-        if cache_file.exists():
-            try:
-                with open(cache_file, "rb") as f:
-                    cached_data = pickle.load(f)
-                    value, timestamp = cached_data["value"], cached_data["timestamp"]
-
-                # 將項目載入記憶體快取
-                self._put_memory_cache(key, value, timestamp)
-                self.stats["hits"] += 1
-                self.stats["disk_reads"] += 1
-                logger.debug("磁碟快取命中: %s", key)
-                return value
-
-            except Exception as e:
-                logger.warning("讀取磁碟快取失敗: %s", e)
-                # 刪除損壞的快取檔案
-                cache_file.unlink(missing_ok=True)
-
-        self.stats["misses"] += 1
+        with self._lock:
+            cached_item = self.memory_cache.get(key)
+            if cached_item is not None:
+                value, timestamp = cached_item
+                if (
+                    max_age_seconds is None
+                    or current_time - timestamp <= max_age_seconds
+                ):
+                    self.memory_cache.move_to_end(key)
+                    self.stats["hits"] += 1
+                    self.stats["memory_hits"] += 1
+                    logger.debug("記憶體快取命中: %s", key)
+                    return value
+            self.stats["memory_misses"] += 1
+            pending = key in self._pending_writes
+
+        # 檢查磁碟快取（尚在寫入中的項目已存在於記憶體層）
+        if not pending:
+            loaded = self._read_disk(key)
+            if loaded is not None:
+                value, timestamp = loaded
+                if (
+                    max_age_seconds is None
+                    or current_time - timestamp <= max_age_seconds
+                ):
+                    # 將項目載入記憶體快取
+                    with self._lock:
+                        self._put_memory_cache(key, value, timestamp)
+                        self.stats["hits"] += 1
+                        self.stats["disk_hits"] += 1
+                        self.stats["disk_reads"] += 1
+                    logger.debug("磁碟快取命中: %s", key)
+                    return value
+
+        with self._lock:
+            self.stats["misses"] += 1
+            self.stats["disk_misses"] += 1
         return None
 
     def put(self, key: str, value: Any, persist: bool = True):
         """存儲快取項目
 
+        磁碟持久化在背景執行緒進行，不阻塞呼叫端。
+
         Args:
             key (str): 快取鍵值
             value (Any): 要快取的值
@@ -134,32 +242,147 @@ class SignalCacheManager:
         """
         current_time = time.time()
 
-        # 存儲到記憶體快取
-        self._put_memory_cache(key, value, current_time)
+        with self._lock:
+            # 存儲到記憶體快取
+            self._put_memory_cache(key, value, current_time)
 
-        # 持久化到磁碟
-        if persist:
-            try:
-                cache_file = self.cache_dir / f"{key}.pkl"
-                cached_data = {"value": value, "timestamp": current_time}
+            # 持久化到磁碟
+            if persist:
+                future = self._writer.submit(self._write_disk, key, value, current_time)
+                self._pending_writes[key] = future
+                future.add_done_callback(lambda f, k=key: self._on_write_done(k, f))
 
-                with open(cache_file, "wb") as f:
-                    pickle.dump(cached_data, f)
+    def flush(self, timeout: Optional[float] = None):
+        """等待所有背景磁碟寫入完成
 
-                self.stats["disk_writes"] += 1
-                logger.debug("快取已持久化: %s", key)
-
-            except Exception as e:
-                logger.warning("持久化快取失敗: %s", e)
+        Args:
+            timeout (float, optional): 最長等待秒數
+        """
+        with self._lock:
+            futures = list(self._pending_writes.values())
+        for future in futures:
+            try:
+                future.result(timeout=timeout)
+            except Exception:  # 錯誤已於寫入回呼中記錄
+                pass
 
     def _put_memory_cache(self, key: str, value: Any, timestamp: float):
         """存儲到記憶體快取"""
+        size = estimate_size(value)
+
+        if key in self.memory_cache:
+            del self.memory_cache[key]
+            self.memory_bytes -= self.item_sizes.pop(key, 0)
+
         # 檢查是否需要清理空間
-        if len(self.memory_cache) >= self.max_memory_items:
+        while self.memory_cache and (
+            len(self.memory_cache) >= self.max_memory_items
+            or (
+                self.max_memory_bytes is not None
+                and self.memory_bytes + size > self.max_memory_bytes
+            )
+        ):
             self._evict_lru_item()
 
         self.memory_cache[key] = (value, timestamp)
-        self.access_times[key] = timestamp
+        self.item_sizes[key] = size
+        self.memory_bytes += size
+
+    def _write_disk(self, key: str, value: Any, timestamp: float):
+        """將項目寫入磁碟（於背景執行緒執行）"""
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            try:
+                self._write_arrow(key, value, timestamp)
+                (self.cache_dir / f"{key}.pkl").unlink(missing_ok=True)
+                return
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                logger.debug("Arrow 序列化失敗，改用 pickle: %s", e)
+
+        cache_file = self.cache_dir / f"{key}.pkl"
+        tmp_file = cache_file.with_suffix(".pkl.tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump({"value": value, "timestamp": timestamp}, f)
+        tmp_file.replace(cache_file)
+
+    def _write_arrow(self, key: str, value: Any, timestamp: float):
+        """以 Arrow IPC 檔案格式寫入表格資料"""
+        if isinstance(value, pd.Series):
+            kind = b"series"
+            series_name = value.name
+            frame = value.to_frame(name="__value__")
+        else:
+            kind = b"frame"
+            series_name = None
+            frame = value
+
+        table = pa.Table.from_pandas(frame, preserve_index=True)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_META_TIMESTAMP] = repr(timestamp).encode()
+        metadata[_META_KIND] = kind
+        metadata[_META_SERIES_NAME] = pickle.dumps(series_name)
+        table = table.replace_schema_metadata(metadata)
+
+        cache_file = self.cache_dir / f"{key}.arrow"
+        tmp_file = cache_file.with_suffix(".arrow.tmp")
+        with pa.OSFile(str(tmp_file), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        tmp_file.replace(cache_file)
+
+    def _read_disk(self, key: str) -> Optional[Tuple[Any, float]]:
+        """從磁碟讀取項目"""
+        arrow_file = self.cache_dir / f"{key}.arrow"
+        if arrow_file.exists():
+            try:
+                with pa.OSFile(str(arrow_file), "rb") as source:
+                    table = pa.ipc.open_file(source).read_all()
+                metadata = table.schema.metadata or {}
+                timestamp = float(metadata[_META_TIMESTAMP])
+                frame = table.to_pandas()
+                if metadata.get(_META_KIND) == b"series":
+                    value = frame["__value__"]
+                    value.name = pickle.loads(metadata[_META_SERIES_NAME])
+                else:
+                    value = frame
+                return value, timestamp
+            except Exception as e:
+                logger.warning("讀取磁碟快取失敗: %s", e)
+                # 刪除損壞的快取檔案
+                arrow_file.unlink(missing_ok=True)
+
+        cache_file = self.cache_dir / f"{key}.pkl"
+        if cache_file.exists():
+            try:
+                with open(cache_file, "rb") as f:
+                    cached_data = pickle.load(f)
+                return cached_data["value"], cached_data["timestamp"]
+            except Exception as e:
+                logger.warning("讀取磁碟快取失敗: %s", e)
+                # 刪除損壞的快取檔案
+                cache_file.unlink(missing_ok=True)
+
+        return None
+
+    def _on_write_done(self, key: str, future: Future):
+        """背景寫入完成回呼"""
+        with self._lock:
+            if self._pending_writes.get(key) is future:
+                del self._pending_writes[key]
+            error = future.exception()
+            if error is None:
+                self.stats["disk_writes"] += 1
+            else:
+                self.stats["disk_write_errors"] += 1
+
+        if error is None:
+            logger.debug("快取已持久化: %s", key)
+        else:
+            logger.warning("持久化快取失敗: %s", error)
+
+    def _disk_files(self):
+        """列出磁碟快取檔案"""
+        yield from self.cache_dir.glob("*.pkl")
+        yield from self.cache_dir.glob("*.arrow")
 
     def invalidate(self, pattern: Optional[str] = None):
         """使快取失效
@@ -167,46 +390,61 @@ class SignalCacheManager:
         Args:
             pattern (str, optional): 鍵值模式，如果為 None 則清除所有快取
         """
-        if pattern is None:
-            # 清除所有快取
-            self.memory_cache.clear()
-            self.access_times.clear()
+        self.flush()
 
-            # 清除磁碟快取
-            for cache_file in self.cache_dir.glob("*.pkl"):
-                cache_file.unlink()
+        with self._lock:
+            if pattern is None:
+                # 清除所有快取
+                self.memory_cache.clear()
+                self.item_sizes.clear()
+                self.memory_bytes = 0
 
-            logger.info("已清除所有快取")
-        else:
-            # 清除匹配模式的快取
-            keys_to_remove = [key for key in self.memory_cache.keys() if pattern in key]
+                # 清除磁碟快取
+                for cache_file in list(self._disk_files()):
+                    cache_file.unlink(missing_ok=True)
 
-            for key in keys_to_remove:
-                del self.memory_cache[key]
-                del self.access_times[key]
+                logger.info("已清除所有快取")
+            else:
+                # 清除匹配模式的快取
+                keys_to_remove = [key for key in self.memory_cache if pattern in key]
 
-                # 刪除磁碟快取檔案
-                cache_file = self.cache_dir / f"{key}.pkl"
-                cache_file.unlink(missing_ok=True)
+                for key in keys_to_remove:
+                    del self.memory_cache[key]
+                    self.memory_bytes -= self.item_sizes.pop(key, 0)
 
-            logger.info(
-                "已清除匹配模式 '%s' 的快取，共 %d 項", pattern, len(keys_to_remove)
-            )
+                    # 刪除磁碟快取檔案
+                    (self.cache_dir / f"{key}.pkl").unlink(missing_ok=True)
+                    (self.cache_dir / f"{key}.arrow").unlink(missing_ok=True)
+
+                logger.info(
+                    "已清除匹配模式 '%s' 的快取，共 %d 項", pattern, len(keys_to_remove)
+                )
 
     def get_stats(self) -> Dict[str, Any]:
         """獲取快取統計資訊
 
         Returns:
-            Dict[str, Any]: 快取統計資訊
+            Dict[str, Any]: 快取統計資訊，包含記憶體層與磁碟層各自的命中率
         """
-        total_requests = self.stats["hits"] + self.stats["misses"]
-        hit_rate = self.stats["hits"] / total_requests if total_requests > 0 else 0
+        with self._lock:
+            stats = dict(self.stats)
+            memory_items = len(self.memory_cache)
+            memory_bytes = self.memory_bytes
+            pending_writes = len(self._pending_writes)
+
+        def _rate(hits: int, misses: int) -> float:
+            total = hits + misses
+            return hits / total if total > 0 else 0
 
         return {
-            **self.stats,
-            "hit_rate": hit_rate,
-            "memory_items": len(self.memory_cache),
-            "disk_items": len(list(self.cache_dir.glob("*.pkl"))),
+            **stats,
+            "hit_rate": _rate(stats["hits"], stats["misses"]),
+            "memory_hit_rate": _rate(stats["memory_hits"], stats["memory_misses"]),
+            "disk_hit_rate": _rate(stats["disk_hits"], stats["disk_misses"]),
+            "memory_items": memory_items,
+            "memory_bytes": memory_bytes,
+            "pending_writes": pending_writes,
+            "disk_items": sum(1 for _ in self._disk_files()),
         }
 
     def cleanup_expired(self, max_age_hours: float = 24):
@@ -219,18 +457,20 @@ class SignalCacheManager:
         max_age_seconds = max_age_hours * 3600
 
         # 清理記憶體快取
-        expired_keys = []
-        for key, (value, timestamp) in self.memory_cache.items():
-            if current_time - timestamp > max_age_seconds:
-                expired_keys.append(key)
-
-        for key in expired_keys:
-            del self.memory_cache[key]
-            del self.access_times[key]
+        with self._lock:
+            expired_keys = [
+                key
+                for key, (_, timestamp) in self.memory_cache.items()
+                if current_time - timestamp > max_age_seconds
+            ]
+
+            for key in expired_keys:
+                del self.memory_cache[key]
+                self.memory_bytes -= self.item_sizes.pop(key, 0)
 
         # 清理磁碟快取
         disk_expired = 0
-        for cache_file in self.cache_dir.glob("*.pkl"):
+        for cache_file in list(self._disk_files()):
             try:
                 if current_time - cache_file.stat().st_mtime > max_age_seconds:
                     cache_file.unlink()
@@ -244,46 +484,64 @@ class SignalCacheManager:
             disk_expired,
         )
 
+    def shutdown(self, wait: bool = True):
+        """關閉背景寫入執行緒
+
+        Args:
+            wait (bool): 是否等待尚未完成的寫入
+        """
+        self._writer.shutdown(wait=wait)
+
 
 # 全域快取管理器實例
 _cache_manager = SignalCacheManager()
 
 
-def cached(expire_hours: float = 24, persist: bool = True):
+def cached(
+    expire_hours: float = 24,
+    persist: bool = True,
+    manager: Optional[SignalCacheManager] = None,
+):
     """快取裝飾器
 
     Args:
         expire_hours (float): 快取過期時間（小時）
         persist (bool): 是否持久化到磁碟
+        manager (SignalCacheManager, optional): 使用的快取管理器，預設為全域實例
 
     Returns:
         function: 裝飾後的函數
     """
+    max_age_seconds = expire_hours * 3600
 
     def decorator(func):
+        cache_manager = manager or _cache_manager
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # 生成快取鍵值
-            cache_key = _cache_manager._generate_cache_key(
-                func.__name__, *args, **kwargs
+            cache_key = cache_manager._generate_cache_key(
+                func.__qualname__, *args, **kwargs
             )
 
             # 嘗試從快取獲取
-            cached_result = _cache_manager.get(cache_key)
+            cached_result = cache_manager.get(
+                cache_key, max_age_seconds=max_age_seconds
+            )
             if cached_result is not None:
                 return cached_result
 
             # 執行函數並快取結果
             result = func(*args, **kwargs)
-            _cache_manager.put(cache_key, result, persist=persist)
+            cache_manager.put(cache_key, result, persist=persist)
 
             return result
 
         # 添加快取管理方法
-        wrapper.invalidate_cache = lambda pattern=None: _cache_manager.invalidate(
+        wrapper.invalidate_cache = lambda pattern=None: cache_manager.invalidate(
             pattern
         )
-        wrapper.get_cache_stats = lambda: _cache_manager.get_stats()
+        wrapper.get_cache_stats = lambda: cache_manager.get_stats()
 
         return wrapper
 
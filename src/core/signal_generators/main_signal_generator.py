@@ -8,6 +8,8 @@ from typing import Dict, Optional
 
 import pandas as pd
 
+from src.monitoring.latency_tracing import traced
+
 from .base_signal_generator import BaseSignalGenerator
 from .fundamental_signals import FundamentalSignalGenerator
 from .technical_signals import TechnicalSignalGenerator
@@ -65,6 +67,7 @@ class SignalGenerator(BaseSignalGenerator):
         # 初始化訊號合併器
         self.signal_combiner = SignalCombiner()
 
+    @traced("signal")
     def generate_signals(self, strategy_type: str = "all", **kwargs) -> pd.DataFrame:
         """生成指定類型的訊號
 
@@ -25,6 +25,7 @@ from .signal_processor import SignalProcessor
 from .position_manager import PositionManager
 from .execution_tracker import ExecutionTracker
 from .execution_optimizer import ExecutionOptimizer
+from src.monitoring.latency_tracing import traced
 
 # 嘗試導入相關模組
 try:
@@ -91,6 +92,7 @@ class StrategyExecutionEngine:
         
         logger.info("策略執行引擎初始化完成")
     
+    @traced("execution")
     def execute_strategy_signal(
         self,
         signal_data: SignalData,
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""交易記錄的僅附加日誌儲存
+
+此模組提供 ``TradeLogger`` 使用的僅附加（append-only）日誌，取代每次事件
+都整份重寫 CSV 的做法，讓每筆記錄的寫入成本與歷史資料量無關。
+
+儲存格式（``{base_dir}/{name}/``）：
+- ``journal-YYYYMMDD.jsonl``：當日的行分隔 JSON 記錄，每筆記錄附加一行，
+  fsync 依筆數或時間批次進行
+- ``segments/YYYYMMDD.parquet``：跨日後由日誌檔滾動而成的每日 Parquet 區段
+- ``index.json``：區段索引，記錄每個區段的列數與記錄時間範圍
+
+讀取時依區段索引只開啟與查詢時間範圍重疊的區段，歷史資料延遲載入。
+
+Example:
+    ```python
+    journal = TradeJournal("logs/journal", "trades")
+    journal.append({"stock_id": "2330", "timestamp": "2025-01-02 09:00:00"})
+    df = journal.read(start_time=datetime(2025, 1, 1))
+    ```
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FIELD = "timestamp"
+
+_JOURNAL_PREFIX = "journal-"
+_JOURNAL_SUFFIX = ".jsonl"
+_SEGMENT_DIR = "segments"
+_INDEX_FILE = "index.json"
+_LEGACY_SEGMENT = "legacy"
+
+
+def _json_default(value: Any) -> Any:
+    """將 JSON 無法直接序列化的值轉為基本型別"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    return str(value)
+
+
+class TradeJournal:
+    """僅附加的交易記錄日誌
+
+    寫入只附加一行 JSON，fsync 以批次進行；跨日時將前一日的日誌檔滾動為
+    Parquet 區段並更新區段索引。
+    """
+
+    def __init__(
+        self,
+        base_dir: str,
+        name: str,
+        fsync_batch_size: int = 64,
+        fsync_interval: float = 1.0,
+        legacy_csv: Optional[str] = None,
+    ):
+        """初始化日誌
+
+        Args:
+            base_dir: 日誌根目錄
+            name: 日誌名稱（如 trades、orders）
+            fsync_batch_size: 累積多少筆記錄後執行 fsync
+            fsync_interval: 距上次 fsync 超過多少秒後執行 fsync
+            legacy_csv: 舊版 CSV 檔案路徑，首次啟動時匯入為區段
+        """
+        self.name = name
+        self.directory = os.path.join(base_dir, name)
+        self.segment_dir = os.path.join(self.directory, _SEGMENT_DIR)
+        self.index_path = os.path.join(self.directory, _INDEX_FILE)
+        self.fsync_batch_size = max(1, fsync_batch_size)
+        self.fsync_interval = fsync_interval
+
+        os.makedirs(self.segment_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._journal_day: Optional[str] = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+
+        if legacy_csv and _LEGACY_SEGMENT not in self._index:
+            self._import_legacy_csv(legacy_csv)
+
+        # 啟動時將先前日期遺留的日誌檔滾動為區段
+        self._roll_stale_journals(self._today())
+
+        atexit.register(self.close)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """附加一筆記錄
+
+        Args:
+            record: 記錄內容
+        """
+        line = (
+            json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
+        ).encode("utf-8")
+
+        with self._lock:
+            today = self._today()
+            if today != self._journal_day:
+                self._open_journal(today)
+
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+
+            if (
+                self._unsynced >= self.fsync_batch_size
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync()
+
+    def read(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """讀取時間範圍內的記錄
+
+        只開啟與時間範圍重疊的區段；當日日誌檔一併讀取。時間欄位保留原始格式，
+        範圍篩選由呼叫端依需要進行。
+
+        Args:
+            start_time: 開始時間
+            end_time: 結束時間
+
+        Returns:
+            pd.DataFrame: 依寫入順序排列的記錄
+        """
+        start = pd.Timestamp(start_time) if start_time is not None else None
+        end = pd.Timestamp(end_time) if end_time is not None else None
+
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            segments = [
+                entry
+                for _, entry in sorted(self._index.items(), key=self._segment_order)
+                if self._overlaps(entry, start, end)
+            ]
+            journals = self._journal_files()
+
+        frames = [
+            pd.read_parquet(os.path.join(self.segment_dir, entry["file"]))
+            for entry in segments
+        ]
+        for path in journals:
+            records = self._read_journal(path)
+            if records:
+                frames.append(pd.DataFrame(records))
+
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def roll(self) -> None:
+        """將當日以前的日誌檔滾動為區段"""
+        with self._lock:
+            self._roll_stale_journals(self._today())
+
+    def flush(self) -> None:
+        """將尚未 fsync 的記錄寫入磁碟"""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """fsync 並關閉日誌檔"""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+                self._journal_day = None
+
+    def segment_index(self) -> Dict[str, Dict[str, Any]]:
+        """取得區段索引
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 區段名稱對應的檔案、列數與時間範圍
+        """
+        with self._lock:
+            return {key: dict(value) for key, value in self._index.items()}
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now().strftime("%Y%m%d")
+
+    def _journal_path(self, day: str) -> str:
+        return os.path.join(self.directory, f"{_JOURNAL_PREFIX}{day}{_JOURNAL_SUFFIX}")
+
+    def _journal_files(self) -> List[str]:
+        return sorted(
+            os.path.join(self.directory, filename)
+            for filename in os.listdir(self.directory)
+            if filename.startswith(_JOURNAL_PREFIX)
+            and filename.endswith(_JOURNAL_SUFFIX)
+        )
+
+    def _open_journal(self, day: str) -> None:
+        """切換至指定日期的日誌檔，並滾動先前的日誌檔"""
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+        self._roll_stale_journals(day)
+        self._file = open(self._journal_path(day), "ab")
+        self._journal_day = day
+
+    def _sync(self) -> None:
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _roll_stale_journals(self, today: str) -> None:
+        """將日期早於 today 的日誌檔轉為 Parquet 區段"""
+        for path in self._journal_files():
+            day = os.path.basename(path)[len(_JOURNAL_PREFIX) : -len(_JOURNAL_SUFFIX)]
+            if day >= today:
+                continue
+            records = self._read_journal(path)
+            if records:
+                self._write_segment(day, pd.DataFrame(records))
+            os.remove(path)
+
+    def _write_segment(self, key: str, df: pd.DataFrame) -> None:
+        """寫入區段並更新索引"""
+        segment_file = f"{key}.parquet"
+        segment_path = os.path.join(self.segment_dir, segment_file)
+
+        # 同一日期已有區段時合併（例如程序在跨日前後重啟）
+        if key in self._index and os.path.exists(segment_path):
+            df = pd.concat([pd.read_parquet(segment_path), df], ignore_index=True)
+
+        tmp_path = segment_path + ".tmp"
+        try:
+            df.to_parquet(tmp_path, index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # 同一欄位混合多種型別時以字串保存
+            mixed = df.select_dtypes(include=["object"]).columns
+            df = df.astype({column: "string" for column in mixed})
+            df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, segment_path)
+
+        timestamps = (
+            pd.to_datetime(df[TIMESTAMP_FIELD], errors="coerce")
+            if TIMESTAMP_FIELD in df.columns
+            else pd.Series(dtype="datetime64[ns]")
+        )
+        self._index[key] = self._index_entry(segment_file, len(df), timestamps)
+        self._save_index()
+        logger.debug("日誌 %s 已滾動區段 %s（%s 筆）", self.name, key, len(df))
+
+    def _import_legacy_csv(self, csv_path: str) -> None:
+        """將舊版 CSV 記錄匯入為區段"""
+        if not os.path.exists(csv_path):
+            return
+        try:
+            df = pd.read_csv(csv_path)
+        except (OSError, ValueError, pd.errors.EmptyDataError) as e:
+            logger.warning("無法匯入舊版記錄 %s: %s", csv_path, e)
+            return
+        if not df.empty:
+            self._write_segment(_LEGACY_SEGMENT, df)
+            logger.info("已匯入舊版記錄 %s（%s 筆）", csv_path, len(df))
+
+    @staticmethod
+    def _read_journal(path: str) -> List[Dict[str, Any]]:
+        """讀取日誌檔，略過寫入中斷的最後一行"""
+        records = []
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning("略過損壞的日誌記錄: %s", path)
+        return records
+
+    @staticmethod
+    def _segment_order(item):
+        # 舊版匯入的區段排在最前面，其餘依日期排序
+        key = item[0]
+        return (key != _LEGACY_SEGMENT, key)
+
+    @staticmethod
+    def _overlaps(
+        entry: Dict[str, Any],
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp],
+    ) -> bool:
+        # 沒有時間範圍資訊的區段一律讀取
+        if entry.get("min_time") is None or entry.get("max_time") is None:
+            return True
+        if start is not None and pd.Timestamp(entry["max_time"]) < start:
+            return False
+        if end is not None and pd.Timestamp(entry["min_time"]) > end:
+            return False
+        return True
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("區段索引損壞，將重新建立: %s", e)
+        return self._rebuild_index()
+
+    def _rebuild_index(self) -> Dict[str, Dict[str, Any]]:
+        """掃描區段檔案重建索引"""
+        index = {}
+        for filename in sorted(os.listdir(self.segment_dir)):
+            if not filename.endswith(".parquet"):
+                continue
+            df = pd.read_parquet(os.path.join(self.segment_dir, filename))
+            timestamps = (
+                pd.to_datetime(df[TIMESTAMP_FIELD], errors="coerce")
+                if TIMESTAMP_FIELD in df.columns
+                else pd.Series(dtype="datetime64[ns]")
+            )
+            index[filename[: -len(".parquet")]] = self._index_entry(
+                filename, len(df), timestamps
+            )
+        return index
+
+    @staticmethod
+    def _index_entry(
+        segment_file: str, rows: int, timestamps: pd.Series
+    ) -> Dict[str, Any]:
+        has_time = bool(timestamps.notna().any())
+        return {
+            "file": segment_file,
+            "rows": rows,
+            "min_time": timestamps.min().isoformat() if has_time else None,
+            "max_time": timestamps.max().isoformat() if has_time else None,
+        }
+
+    def _save_index(self) -> None:
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
@@ -22,6 +22,8 @@ from typing import Any, Callable, Dict, List, Optional, Union
 
 import websocket
 
+from src.monitoring.latency_tracing import latency_tracer
+
 # 設定日誌
 logger = logging.getLogger(__name__)
 
@@ -322,8 +324,8 @@ class WebSocketClient:
                         current_queue_size / self.max_queue_size * 100,
                     )
 
-            # 將消息放入隊列
-            self.message_queue.put(message, block=False)
+            # 將消息連同延遲追蹤交接點放入隊列
+            self.message_queue.put((message, latency_tracer.start_trace()), block=False)
 
             # 更新隊列高水位標記
             queue_size = self.message_queue.qsize()
@@ -427,11 +429,12 @@ class WebSocketClient:
 
                 # 從隊列中獲取消息，設置超時以便定期檢查 is_processing 標誌
                 try:
-                    message = self.message_queue.get(timeout=current_interval)
+                    message, handoff = self.message_queue.get(timeout=current_interval)
 
-                    # 處理消息
-                    if self.on_message_callback:
-                        self.on_message_callback(message)
+                    # 處理消息，並記錄排隊時間
+                    with latency_tracer.resume(handoff, "ws_queue"):
+                        if self.on_message_callback:
+                            self.on_message_callback(message)
 
                     # 更新統計信息
                     self.stats["messages_processed"] += 1
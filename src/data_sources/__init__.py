@@ -29,68 +29,44 @@
 - 支持多數據源並行獲取
 """
 
-# 現有數據源組件
-from .data_collector import DataCollector
-from .yahoo_adapter import YahooAdapter
-from .broker_adapter import BrokerAdapter, MockBrokerAdapter
-from .twse_crawler import TWSECrawler
-from .mcp_crawler import MCPCrawler
-from .news_sentiment_collector import NewsSentimentCollector
-from .market_data_collector import MarketDataCollector
-from .realtime_quote_collector import RealtimeQuoteCollector
-from .financial_statement_collector import FinancialStatementCollector
-from .data_collection_system import DataCollectionSystem
-
-# 新建的模組化組件
-from .collection_config import CollectionConfigManager
-from .collector_manager import CollectorManager
-from .collection_executor import CollectionExecutor
-from .base_collector import BaseDataCollector
-from .scheduler_mixin import SchedulerMixin
-from .twse_base_crawler import TwseBaseCrawler
-from .twse_price_crawler import TwsePriceCrawler
-from .twse_financial_crawler import TwseFinancialCrawler
-
-# 整合自原始項目的數據源（將逐步實現）
-# from .legacy_sources import TushareSource, WindSource, BaoStockSource
-
-# 增強功能
-from .unified_data_manager import UnifiedDataManager
-
-__all__ = [
-    # 現有組件
-    'DataCollector',
-    'YahooAdapter',
-    'BrokerAdapter',
-    'MockBrokerAdapter',
-    'TWSECrawler',
-    'MCPCrawler',
-    'NewsSentimentCollector',
-    'MarketDataCollector',
-    'RealtimeQuoteCollector',
-    'FinancialStatementCollector',
-    'DataCollectionSystem',
+from src.utils.lazy_import import lazy_exports
 
+# 各數據源在第一次存取時才匯入，避免載入整個套件時一併載入所有採集器及其相依套件
+_EXPORTS = {
+    # 現有數據源組件
+    "DataCollector": ".data_collector",
+    "YahooAdapter": ".yahoo_adapter",
+    "BrokerAdapter": ".broker_adapter",
+    "MockBrokerAdapter": ".broker_adapter",
+    "TWSECrawler": ".twse_crawler",
+    "MCPCrawler": ".mcp_crawler",
+    "NewsSentimentCollector": ".news_sentiment_collector",
+    "MarketDataCollector": ".market_data_collector",
+    "RealtimeQuoteCollector": ".realtime_quote_collector",
+    "FinancialStatementCollector": ".financial_statement_collector",
+    "DataCollectionSystem": ".data_collection_system",
     # 新建的模組化組件
-    'CollectionConfigManager',
-    'CollectorManager',
-    'CollectionExecutor',
-    'BaseDataCollector',
-    'SchedulerMixin',
-    'TwseBaseCrawler',
-    'TwsePriceCrawler',
-    'TwseFinancialCrawler',
+    "CollectionConfigManager": ".collection_config",
+    "CollectorManager": ".collector_manager",
+    "CollectionExecutor": ".collection_executor",
+    "BaseDataCollector": ".base_collector",
+    "SchedulerMixin": ".scheduler_mixin",
+    "TwseBaseCrawler": ".twse_base_crawler",
+    "TwsePriceCrawler": ".twse_price_crawler",
+    "TwseFinancialCrawler": ".twse_financial_crawler",
+    # 整合自原始項目的數據源（將逐步實現）
+    # 'TushareSource': '.legacy_sources',
+    # 'WindSource': '.legacy_sources',
+    # 'BaoStockSource': '.legacy_sources',
+    # 增強功能
+    "UnifiedDataManager": ".unified_data_manager",
+}
 
-    # 整合組件（將逐步添加）
-    # 'TushareSource',
-    # 'WindSource',
-    # 'BaoStockSource',
+__all__ = list(_EXPORTS)
 
-    # 增強組件
-    'UnifiedDataManager'
-]
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 # 版本信息
 __version__ = "2.0.0"  # 整合版本
 __integration_date__ = "2025-01-14"
-__legacy_support__ = True
\ No newline at end of file
+__legacy_support__ = True
@@ -31,6 +31,11 @@ except ImportError:
     YahooFinanceAdapter = None
     MarketDataAdapter = None
 
+try:
+    from ..core.shared_market_data_cache import get_shared_market_data_cache
+except ImportError:
+    get_shared_market_data_cache = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,6 +56,11 @@ class MarketDataProvider:
         self.source = source
         self.use_cache = use_cache
         self.adapter = None
+
+        # 跨程序共享的日線快取（由 DataScheduler 每日發佈）
+        self.shared_cache = None
+        if use_cache and get_shared_market_data_cache is not None:
+            self.shared_cache = get_shared_market_data_cache()
         
         # 初始化數據適配器
         self._initialize_adapter()
@@ -89,6 +99,11 @@ class MarketDataProvider:
             pd.DataFrame: 歷史數據，包含 OHLCV 欄位
         """
         try:
+            if self.shared_cache is not None and interval == "1d":
+                shared = self.shared_cache.get_symbol_bars(symbol, start_date, end_date)
+                if not shared.empty:
+                    return shared
+
             if self.adapter and hasattr(self.adapter, 'get_historical_data'):
                 return self.adapter.get_historical_data(
                     symbol=symbol,
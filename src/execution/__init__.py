@@ -16,30 +16,23 @@
 - Interactive Brokers (IB)
 """
 
-from .broker_base import BrokerBase, OrderStatus, OrderType
-from .config import BrokerConfig
-from .futu_adapter import FutuAdapter
-# 更新導入：使用推薦的重構版本
-try:
-    from .ib_adapter_refactored import IBAdapterRefactored as IBAdapter
-except ImportError:
-    # 向後相容：如果重構版本不存在，使用原版本
-    from .ib_adapter import IBAdapter
-from .order_manager import OrderManager
-from .security import decrypt_api_key, encrypt_api_key
-from .shioaji_adapter import ShioajiAdapter
-from .simulator_adapter import SimulatorAdapter
+from src.utils.lazy_import import lazy_exports
 
-__all__ = [
-    "BrokerBase",
-    "OrderStatus",
-    "OrderType",
-    "OrderManager",
-    "encrypt_api_key",
-    "decrypt_api_key",
-    "SimulatorAdapter",
-    "ShioajiAdapter",
-    "FutuAdapter",
-    "IBAdapter",
-    "BrokerConfig",
-]
+# 子模組在第一次存取對應名稱時才匯入
+_EXPORTS = {
+    "BrokerBase": ".broker_base",
+    "OrderStatus": ".broker_base",
+    "OrderType": ".broker_base",
+    "OrderManager": ".order_manager",
+    "encrypt_api_key": ".security",
+    "decrypt_api_key": ".security",
+    "SimulatorAdapter": ".simulator_adapter",
+    "ShioajiAdapter": ".shioaji_adapter",
+    "FutuAdapter": ".futu_adapter",
+    # 使用推薦的重構版本
+    "IBAdapter": (".ib_adapter_refactored", "IBAdapterRefactored"),
+    "BrokerConfig": ".config",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
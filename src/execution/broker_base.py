@@ -80,6 +80,7 @@ class Order:
         self.error_message = None
         self.exchange_order_id = None  # 券商系統中的訂單 ID
         self.transactions = []  # 成交記錄
+        self.trace = None  # 延遲追蹤交接點，由 OrderManager 設定
 
     def __str__(self):
         """訂單的字串表示"""
@@ -18,6 +18,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Union
 
+from src.monitoring.latency_tracing import latency_tracer, traced
 from src.utils.utils import retry
 
 from .broker_base import BrokerBase, Order, OrderStatus, OrderType
@@ -138,7 +139,8 @@ class OrderManager:
                 time_in_force=order.get("time_in_force", "day"),
             )
 
-        # 將訂單加入隊列
+        # 將訂單連同延遲追蹤交接點加入隊列
+        order.trace = latency_tracer.handoff()
         self.order_queue.put(order)
         logger.info("訂單已加入隊列: %s", order)
 
@@ -274,7 +276,10 @@ class OrderManager:
 
                 # 提交訂單
                 logger.info("正在提交訂單: %s", order)
-                order_id = self._submit_order_with_retry(order)
+                with latency_tracer.resume(order.trace, "order_queue"):
+                    order_id = self._submit_order_with_retry(order)
+                    if order_id:
+                        latency_tracer.finish()
 
                 if order_id:
                     # 訂單提交成功
@@ -298,6 +303,7 @@ class OrderManager:
             except Exception as e:
                 logger.exception("處理訂單時發生錯誤: %s", e)
 
+    @traced("broker")
     @retry(max_retries=3)
     def _submit_order_with_retry(self, order: Order) -> Optional[str]:
         """
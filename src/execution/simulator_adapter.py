@@ -19,6 +19,7 @@ from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
+from src.core.shared_market_data_cache import get_shared_market_data_cache
 from src.utils.utils import retry
 
 from .broker_base import BrokerBase, Order, OrderStatus, OrderType
@@ -43,6 +44,7 @@ class SimulatorAdapter(BrokerBase):
         market_data_dir: str = "data/market",
         state_file: str = "data/simulator_state.json",
         realistic_simulation: bool = True,
+        use_shared_cache: bool = True,
         **kwargs,
     ):
         """
@@ -60,6 +62,7 @@ class SimulatorAdapter(BrokerBase):
             market_data_dir (str): 市場資料目錄
             state_file (str): 狀態檔案路徑
             realistic_simulation (bool): 是否進行真實模擬
+            use_shared_cache (bool): 是否從跨程序共享快取讀取日線
             **kwargs: 其他參數
         """
         super().__init__(**kwargs)
@@ -85,8 +88,9 @@ class SimulatorAdapter(BrokerBase):
         self.connected = False  # 連接狀態
 
         # 市場資料
-        self.market_data = {}  # 市場資料字典，key 為股票代號
+        self.market_data = {}  # 市場資料字典，key 為股票代號（本地 CSV）
         self.latest_prices = {}  # 最新價格字典，key 為股票代號
+        self.shared_cache = get_shared_market_data_cache() if use_shared_cache else None
 
         # 訂單處理線程
         self.order_queue = queue.Queue()  # 訂單隊列
@@ -562,6 +566,16 @@ class SimulatorAdapter(BrokerBase):
                 self.latest_prices[stock_id] = latest_price
                 return latest_price
 
+        # 從跨程序共享快取獲取（不複製整段歷史到本地）
+        if self.shared_cache is not None:
+            close = self.shared_cache.get_panel("close", symbols=[stock_id])
+            if not close.empty:
+                series = close[stock_id].dropna()
+                if not series.empty:
+                    latest_price = float(series.iloc[-1])
+                    self.latest_prices[stock_id] = latest_price
+                    return latest_price
+
         # 模擬價格
         if self.realistic_simulation:
             # 生成隨機價格 (50-200)
@@ -4,65 +4,39 @@
 此模組提供日誌系統的功能。
 """
 
-from src.log_system.analyzer import LogAnalyzer
-from src.log_system.config import (
-    LogCategory,
-    api_logger,
-    audit_logger,
-    data_logger,
-    database_logger,
-    error_logger,
-    get_logger,
-    log_with_context,
-    logger,
-    model_logger,
-    network_logger,
-    performance_logger,
-    security_logger,
-    system_logger,
-    trade_logger,
-    user_logger,
-)
-from src.log_system.formatters import (
-    EnhancedJsonFormatter,
-    LogstashFormatter,
-    LokiFormatter,
-)
-from src.log_system.handlers import (
-    ElasticsearchHandler,
-    EnhancedRotatingFileHandler,
-    EnhancedTimedRotatingFileHandler,
-    LogstashHandler,
-    LokiHandler,
-)
-from src.log_system.utils import log_function_call, log_method_call
+from src.utils.lazy_import import lazy_exports
 
-__all__ = [
-    "get_logger",
-    "log_with_context",
-    "logger",
-    "system_logger",
-    "data_logger",
-    "model_logger",
-    "trade_logger",
-    "error_logger",
-    "security_logger",
-    "performance_logger",
-    "api_logger",
-    "database_logger",
-    "network_logger",
-    "user_logger",
-    "audit_logger",
-    "LogCategory",
-    "EnhancedJsonFormatter",
-    "LogstashFormatter",
-    "LokiFormatter",
-    "ElasticsearchHandler",
-    "LogstashHandler",
-    "LokiHandler",
-    "EnhancedRotatingFileHandler",
-    "EnhancedTimedRotatingFileHandler",
-    "log_function_call",
-    "log_method_call",
-    "LogAnalyzer",
-]
+# 子模組在第一次存取對應名稱時才匯入
+_EXPORTS = {
+    "get_logger": ".config",
+    "log_with_context": ".config",
+    "logger": ".config",
+    "system_logger": ".config",
+    "data_logger": ".config",
+    "model_logger": ".config",
+    "trade_logger": ".config",
+    "error_logger": ".config",
+    "security_logger": ".config",
+    "performance_logger": ".config",
+    "api_logger": ".config",
+    "database_logger": ".config",
+    "network_logger": ".config",
+    "user_logger": ".config",
+    "audit_logger": ".config",
+    "LogCategory": ".config",
+    "EnhancedJsonFormatter": ".formatters",
+    "LogstashFormatter": ".formatters",
+    "LokiFormatter": ".formatters",
+    "ElasticsearchHandler": ".handlers",
+    "LogstashHandler": ".handlers",
+    "LokiHandler": ".handlers",
+    "EnhancedRotatingFileHandler": ".handlers",
+    "EnhancedTimedRotatingFileHandler": ".handlers",
+    "log_function_call": ".utils",
+    "log_method_call": ".utils",
+    "LogAnalyzer": ".analyzer",
+    "LogIndexer": ".indexer",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
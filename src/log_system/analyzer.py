@@ -28,19 +28,40 @@ except ImportError:
 
 
 from src.log_system.config import LOG_DIRS
+from src.log_system.indexer import RECORD_COLUMN, LogIndexer
 
 
 class LogAnalyzer:
-    """日誌分析器"""
+    """日誌分析器
 
-    def __init__(self, log_dirs: Optional[Dict[str, str]] = None):
+    預設透過 ``LogIndexer`` 將日誌增量轉為 Parquet 分區後查詢；
+    ``use_index=False`` 時逐行解析日誌文件。
+    """
+
+    def __init__(
+        self,
+        log_dirs: Optional[Dict[str, str]] = None,
+        index_dir: Optional[str] = None,
+        use_index: bool = True,
+    ):
         """
         初始化分析器
 
         Args:
             log_dirs: 日誌目錄
+            index_dir: 日誌索引目錄，預設為日誌根目錄下的 index
+            use_index: 是否使用日誌索引
         """
         self.log_dirs = log_dirs or LOG_DIRS
+        self.indexer = None
+        if use_index:
+            self.indexer = LogIndexer(
+                self.log_dirs,
+                index_dir
+                or os.path.join(
+                    os.path.dirname(list(self.log_dirs.values())[0]), "index"
+                ),
+            )
 
     def load_logs(
         self,
@@ -63,6 +84,13 @@ class LogAnalyzer:
         Returns:
             pd.DataFrame: 日誌數據
         """
+        if self._use_index(category):
+            df = self._load_columns(
+                ["timestamp", RECORD_COLUMN], category, start_time, end_time, level
+            )
+            df = df.sort_values("timestamp", ascending=False, kind="stable")
+            return self._expand_records(df.head(limit))
+
         # 確定日誌目錄
         if category:
             log_dirs = [
@@ -174,6 +202,71 @@ class LogAnalyzer:
 
         return logs
 
+    def _use_index(self, category: Optional[str]) -> bool:
+        """索引只涵蓋 log_dirs 中的類別"""
+        return self.indexer is not None and (
+            category is None or category in self.log_dirs
+        )
+
+    def _load_columns(
+        self,
+        columns: List[str],
+        category: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        level: Optional[str] = None,
+        min_execution_time: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        載入指定欄位
+
+        使用索引時先增量更新索引，再只讀取需要的欄位；否則退回逐行解析，
+        返回完整的日誌數據。
+
+        Args:
+            columns: 需要的欄位
+            category: 日誌類別
+            start_time: 開始時間
+            end_time: 結束時間
+            level: 日誌級別
+            min_execution_time: 最小執行時間（秒），僅索引查詢使用
+
+        Returns:
+            pd.DataFrame: 日誌數據
+        """
+        if not self._use_index(category):
+            return self.load_logs(category, start_time, end_time, level, limit=10000)
+
+        self.indexer.update()
+        return self.indexer.query(
+            columns=columns,
+            categories=[category] if category else None,
+            start_time=start_time,
+            end_time=end_time,
+            levels=[level] if level else None,
+            min_execution_time=min_execution_time,
+        )
+
+    @staticmethod
+    def _expand_records(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        將索引中的原始記錄展開為日誌數據
+
+        Args:
+            df: 含 record 欄位的索引查詢結果
+
+        Returns:
+            pd.DataFrame: 日誌數據，時間戳與執行時間使用索引中解析過的值
+        """
+        if df.empty:
+            return pd.DataFrame()
+
+        logs = pd.DataFrame([json.loads(record) for record in df[RECORD_COLUMN]])
+        for column in ("timestamp", "execution_time"):
+            if column in df.columns:
+                logs[column] = df[column].to_numpy()
+        return logs
+
     def count_logs_by_level(
         self,
         category: Optional[str] = None,
@@ -192,7 +285,7 @@ class LogAnalyzer:
             Dict[str, int]: 日誌統計
         """
         # 載入日誌
-        df = self.load_logs(category, start_time, end_time, limit=10000)
+        df = self._load_columns(["level"], category, start_time, end_time)
 
         # 統計日誌
         if not df.empty and "level" in df.columns:
@@ -216,7 +309,7 @@ class LogAnalyzer:
             Dict[str, int]: 日誌統計
         """
         # 載入日誌
-        df = self.load_logs(start_time=start_time, end_time=end_time, limit=10000)
+        df = self._load_columns(["category"], start_time=start_time, end_time=end_time)
 
         # 統計日誌
         if not df.empty and "category" in df.columns:
@@ -246,7 +339,7 @@ class LogAnalyzer:
             Dict[str, int]: 日誌統計
         """
         # 載入日誌
-        df = self.load_logs(category, start_time, end_time, level, limit=10000)
+        df = self._load_columns(["timestamp"], category, start_time, end_time, level)
 
         # 統計日誌
         if not df.empty and "timestamp" in df.columns:
@@ -302,6 +395,17 @@ class LogAnalyzer:
         Returns:
             pd.DataFrame: 慢操作日誌
         """
+        if self._use_index(category):
+            df = self._load_columns(
+                ["timestamp", "execution_time", RECORD_COLUMN],
+                category,
+                start_time,
+                end_time,
+                min_execution_time=threshold,
+            )
+            df = df.sort_values("execution_time", ascending=False, kind="stable")
+            return self._expand_records(df.head(limit))
+
         # 載入日誌
         df = self.load_logs(category, start_time, end_time, limit=10000)
 
@@ -452,7 +556,9 @@ class LogAnalyzer:
             Dict[str, Any]: 異常檢測結果
         """
         # 載入日誌
-        df = self.load_logs(category, start_time, end_time, limit=10000)
+        df = self._load_columns(
+            ["timestamp", "level", "message"], category, start_time, end_time
+        )
 
         anomalies = {
             "error_spikes": [],
@@ -493,8 +599,20 @@ class LogAnalyzer:
         # 檢測異常模式
         anomalies["unusual_patterns"] = self._detect_unusual_patterns(df)
 
-        # 檢測效能問題
-        anomalies["performance_issues"] = self._detect_performance_issues(df)
+        # 檢測效能問題（使用索引時只展開超過門檻的記錄）
+        if self._use_index(category):
+            slow_df = self._expand_records(
+                self._load_columns(
+                    ["timestamp", RECORD_COLUMN],
+                    category,
+                    start_time,
+                    end_time,
+                    min_execution_time=5.0,
+                )
+            )
+        else:
+            slow_df = df
+        anomalies["performance_issues"] = self._detect_performance_issues(slow_df)
 
         # 檢測安全問題
         anomalies["security_concerns"] = self._detect_security_concerns(df)
@@ -612,7 +730,7 @@ class LogAnalyzer:
             Dict[str, Any]: 分析報告
         """
         # 載入日誌
-        df = self.load_logs(category, start_time, end_time, limit=10000)
+        df = self._load_columns(["level"], category, start_time, end_time)
 
         report = {
             "report_id": f"log_analysis_{int(time.time())}",
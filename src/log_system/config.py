@@ -60,6 +60,9 @@ ELK_CONFIG = {
     "elasticsearch_auth": None,  # 格式為(username, password)
     "logstash_url": os.getenv("LOGSTASH_URL", "http://localhost:5044"),
     "kibana_url": os.getenv("KIBANA_URL", "http://localhost:5601"),
+    "batch_size": int(os.getenv("ELK_BATCH_SIZE", "500")),
+    "batch_interval": float(os.getenv("ELK_BATCH_INTERVAL", "1.0")),
+    "overflow_policy": os.getenv("ELK_OVERFLOW_POLICY", "drop_debug_first"),
 }
 
 # Loki配置
@@ -183,6 +186,9 @@ def get_logger(
         logstash_handler = LogstashHandler(
             host=ELK_CONFIG["logstash_url"],
             level=level,
+            batch_size=ELK_CONFIG["batch_size"],
+            batch_interval=ELK_CONFIG["batch_interval"],
+            overflow_policy=ELK_CONFIG["overflow_policy"],
         )
         logstash_formatter = LogstashFormatter(
             include_stack_info=include_stack_info,
@@ -198,6 +204,9 @@ def get_logger(
             index_name=ELK_CONFIG["elasticsearch_index"],
             level=level,
             auth=ELK_CONFIG["elasticsearch_auth"],
+            batch_size=ELK_CONFIG["batch_size"],
+            batch_interval=ELK_CONFIG["batch_interval"],
+            overflow_policy=ELK_CONFIG["overflow_policy"],
         )
         elasticsearch_handler.setFormatter(formatter)
         logger.addHandler(elasticsearch_handler)
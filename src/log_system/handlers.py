@@ -7,9 +7,10 @@
 import json
 import logging
 import os
-import queue
+import random
 import threading
 import time
+from collections import deque
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 
 import requests
@@ -19,23 +20,113 @@ DEFAULT_ELASTICSEARCH_URL = "http://localhost:9200"
 DEFAULT_LOGSTASH_URL = "http://localhost:5044"
 DEFAULT_LOKI_URL = "http://localhost:3100/loki/api/v1/push"
 
+# 隊列滿載時的處理策略
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_DEBUG_FIRST = "drop_debug_first"
+OVERFLOW_SAMPLE = "sample"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_DEBUG_FIRST, OVERFLOW_SAMPLE)
+
+# 傳輸層視為可重試的 HTTP 狀態碼
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+def _post_with_retry(
+    session, url, data, headers, timeout, max_retries=3, retry_backoff=0.5
+):
+    """
+    發送 HTTP POST 請求，連線錯誤或可重試狀態碼時以指數退避重試
+
+    Args:
+        session: requests.Session
+        url: 目標URL
+        data: 請求內容
+        headers: 請求標頭
+        timeout: 超時時間（秒）
+        max_retries: 最大重試次數
+        retry_backoff: 第一次重試前的等待時間（秒），之後每次加倍
+
+    Returns:
+        requests.Response: 成功的回應
+
+    Raises:
+        requests.RequestException: 重試用盡後仍失敗
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            response = session.post(url, data=data, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= max_retries:
+                raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or (
+                attempt >= max_retries
+            ):
+                response.raise_for_status()
+                return response
+        time.sleep(retry_backoff * (2**attempt))
+
 
 class AsyncHandler(logging.Handler):
-    """異步處理器基類"""
+    """異步處理器基類
+
+    記錄先放入有界緩衝區，由背景線程依批次大小或批次間隔（先到者為準）
+    取出整批交給 ``_process_batch``。緩衝區滿載時依 ``overflow_policy``
+    處理：
 
-    def __init__(self, level=logging.NOTSET, max_queue_size=1000):
+    - ``block``：最多等待 ``block_timeout`` 秒，逾時則丟棄新記錄
+    - ``drop_debug_first``：先淘汰最舊的 DEBUG 記錄，沒有可淘汰的才丟棄新記錄
+    - ``sample``：深度超過高水位後，WARNING 以下的記錄只保留 ``sample_rate``
+      比例；滿載時丟棄新記錄
+    """
+
+    def __init__(
+        self,
+        level=logging.NOTSET,
+        max_queue_size=1000,
+        batch_size=100,
+        batch_interval=0.1,
+        overflow_policy=OVERFLOW_DROP_DEBUG_FIRST,
+        block_timeout=1.0,
+        sample_rate=0.1,
+        high_watermark=0.8,
+    ):
         """
         初始化處理器
 
         Args:
             level: 日誌級別
             max_queue_size: 最大隊列大小
+            batch_size: 每批最多處理的記錄數
+            batch_interval: 批次最長等待時間（秒）
+            overflow_policy: 隊列滿載策略，block、drop_debug_first 或 sample
+            block_timeout: block 策略的最長等待時間（秒）
+            sample_rate: sample 策略下低級別記錄的保留比例
+            high_watermark: sample 策略開始取樣的隊列深度比例
         """
         super().__init__(level)
-        self.queue = queue.Queue(maxsize=max_queue_size)
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"不支持的隊列滿載策略: {overflow_policy}")
+
+        self.max_queue_size = max(1, max_queue_size)
+        self.batch_size = max(1, batch_size)
+        self.batch_interval = batch_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.sample_rate = sample_rate
+        self.high_watermark = high_watermark
+        self.flush_interval = batch_interval  # 相容舊屬性
+
+        # DEBUG 記錄與其他記錄分開存放，以便優先淘汰；序號用於合併時保持順序
+        self._debug_records = deque()
+        self._records = deque()
+        self._sequence = 0
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._condition = threading.Condition()
+        self._stats = {"dropped": 0, "processed": 0, "batches": 0, "failed": 0}
+
         self.thread = None
         self.running = False
-        self.flush_interval = 0.1  # 刷新間隔（秒）
 
     def emit(self, record):
         """
@@ -44,14 +135,60 @@ class AsyncHandler(logging.Handler):
         Args:
             record: 日誌記錄
         """
-        try:
-            self.queue.put_nowait(record)
-        except queue.Full:
-            self.handleError(record)
-
-        # 確保處理線程正在運行
+        # 確保處理線程正在運行（block 策略需要線程消化隊列）
         self._ensure_thread_running()
 
+        with self._condition:
+            if self._accept(record):
+                self._sequence += 1
+                entry = (self._sequence, record)
+                if record.levelno < logging.INFO:
+                    self._debug_records.append(entry)
+                else:
+                    self._records.append(entry)
+                self._condition.notify_all()
+            else:
+                self._stats["dropped"] += 1
+
+    def _accept(self, record):
+        """
+        依滿載策略決定是否接收記錄（呼叫端須持有鎖）
+
+        Args:
+            record: 日誌記錄
+
+        Returns:
+            bool: 是否放入隊列
+        """
+        if self.overflow_policy == OVERFLOW_SAMPLE:
+            if (
+                record.levelno < logging.WARNING
+                and self._depth() >= self.max_queue_size * self.high_watermark
+                and random.random() >= self.sample_rate
+            ):
+                return False
+
+        if self._depth() < self.max_queue_size:
+            return True
+
+        if self.overflow_policy == OVERFLOW_DROP_DEBUG_FIRST and self._debug_records:
+            self._debug_records.popleft()
+            self._stats["dropped"] += 1
+            return True
+
+        if (
+            self.overflow_policy == OVERFLOW_BLOCK
+            and threading.current_thread() is not self.thread
+        ):
+            return self._condition.wait_for(
+                lambda: self._depth() < self.max_queue_size, self.block_timeout
+            )
+
+        return False
+
+    def _depth(self):
+        return len(self._debug_records) + len(self._records)
+
     def _ensure_thread_running(self):
         """確保處理線程正在運行"""
         if self.thread is None or not self.thread.is_alive():
@@ -62,18 +199,84 @@ class AsyncHandler(logging.Handler):
 
     def _process_queue(self):
         """處理隊列"""
-        while self.running:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            if not batch:
+                continue
             try:
-                # 獲取記錄
-                record = self.queue.get(block=True, timeout=self.flush_interval)
-                self._process_record(record)
-                self.queue.task_done()
-            except queue.Empty:
-                # 隊列為空，繼續等待
-                pass
+                self._process_batch(batch)
             except Exception:
                 # 處理異常
-                self.handleError(record if "record" in locals() else None)
+                self.handleError(batch[0])
+            finally:
+                with self._condition:
+                    self._in_flight = 0
+                    self._stats["processed"] += len(batch)
+                    self._stats["batches"] += 1
+                    self._condition.notify_all()
+
+    def _next_batch(self):
+        """
+        等待並取出下一批記錄
+
+        達到批次大小、自第一筆記錄起超過批次間隔、有人呼叫 flush 或處理器
+        關閉時返回目前累積的記錄。
+
+        Returns:
+            Optional[List[logging.LogRecord]]: 一批記錄；處理器已關閉且隊列為空時返回 None
+        """
+        with self._condition:
+            deadline = None
+            while True:
+                depth = self._depth()
+                if depth >= self.batch_size or not self.running:
+                    break
+                if depth and self._flush_waiters:
+                    break
+                if depth and deadline is None:
+                    deadline = time.monotonic() + self.batch_interval
+                timeout = (
+                    self.batch_interval
+                    if deadline is None
+                    else deadline - time.monotonic()
+                )
+                if timeout <= 0:
+                    break
+                self._condition.wait(timeout)
+
+            if not self._depth():
+                return None if not self.running else []
+
+            batch = self._take(self.batch_size)
+            self._in_flight = len(batch)
+            self._condition.notify_all()
+            return batch
+
+    def _take(self, count):
+        """依寫入順序從兩個隊列取出最多 count 筆記錄（呼叫端須持有鎖）"""
+        batch = []
+        debug_records, records = self._debug_records, self._records
+        while len(batch) < count and (debug_records or records):
+            if not records or (debug_records and debug_records[0][0] < records[0][0]):
+                batch.append(debug_records.popleft()[1])
+            else:
+                batch.append(records.popleft()[1])
+        return batch
+
+    def _process_batch(self, records):
+        """
+        處理一批記錄，預設逐筆呼叫 ``_process_record``
+
+        Args:
+            records: 日誌記錄列表
+        """
+        for record in records:
+            try:
+                self._process_record(record)
+            except Exception:
+                self.handleError(record)
 
     def _process_record(self, record):
         """
@@ -84,17 +287,59 @@ class AsyncHandler(logging.Handler):
         """
         raise NotImplementedError("子類必須實現此方法")
 
+    def _record_failure(self, records):
+        """記錄發送失敗的批次（須在 except 區塊內呼叫）"""
+        with self._condition:
+            self._stats["failed"] += len(records)
+        self.handleError(records[0])
+
+    def get_stats(self):
+        """
+        獲取處理器統計
+
+        Returns:
+            dict: 隊列深度、已丟棄、已處理、發送失敗的記錄數與批次數
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats["queue_depth"] = self._depth()
+            stats["max_queue_size"] = self.max_queue_size
+            return stats
+
+    def flush(self, timeout=5.0):
+        """
+        等待隊列中的記錄處理完畢
+
+        Args:
+            timeout: 最長等待時間（秒）
+
+        Returns:
+            bool: 是否在時限內處理完畢
+        """
+        if self.thread is None or not self.thread.is_alive():
+            return self._depth() == 0
+        with self._condition:
+            self._flush_waiters += 1
+            self._condition.notify_all()
+            try:
+                return self._condition.wait_for(
+                    lambda: self._depth() == 0 and self._in_flight == 0, timeout
+                )
+            finally:
+                self._flush_waiters -= 1
+
     def close(self):
-        """關閉處理器"""
-        self.running = False
+        """關閉處理器，處理完剩餘的記錄"""
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=5)
-        self.queue = None
         super().close()
 
 
 class ElasticsearchHandler(AsyncHandler):
-    """Elasticsearch處理器"""
+    """Elasticsearch處理器，以 ``_bulk`` API 批次寫入"""
 
     def __init__(
         self,
@@ -104,6 +349,11 @@ class ElasticsearchHandler(AsyncHandler):
         max_queue_size=1000,
         auth=None,
         timeout=5,
+        batch_size=500,
+        batch_interval=1.0,
+        overflow_policy=OVERFLOW_DROP_DEBUG_FIRST,
+        max_retries=3,
+        retry_backoff=0.5,
     ):
         """
         初始化處理器
@@ -115,44 +365,83 @@ class ElasticsearchHandler(AsyncHandler):
             max_queue_size: 最大隊列大小
             auth: 認證信息，格式為(username, password)
             timeout: 超時時間（秒）
+            batch_size: 每個 _bulk 請求的最大記錄數
+            batch_interval: 批次間隔（秒）
+            overflow_policy: 隊列滿載策略
+            max_retries: 最大重試次數
+            retry_backoff: 重試退避時間（秒）
         """
-        super().__init__(level, max_queue_size)
+        super().__init__(
+            level,
+            max_queue_size,
+            batch_size=batch_size,
+            batch_interval=batch_interval,
+            overflow_policy=overflow_policy,
+        )
         self.host = host
         self.index_name = index_name
         self.auth = auth
         self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self.session = requests.Session()
         if auth:
             self.session.auth = auth
+        self._action_line = json.dumps({"index": {"_index": index_name}})
 
-    def _process_record(self, record):
+    def _process_batch(self, records):
         """
-        處理記錄
+        以單一 _bulk 請求發送一批記錄
 
         Args:
-            record: 日誌記錄
+            records: 日誌記錄列表
         """
-        # 格式化記錄
-        message = self.format(record)
-
-        # 構建URL
-        url = f"{self.host}/{self.index_name}/_doc"
+        lines = []
+        for record in records:
+            lines.append(self._action_line)
+            lines.append(_as_json_line(self.format(record)))
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
 
-        # 發送記錄
         try:
-            response = self.session.post(
-                url,
-                data=message,
-                headers={"Content-Type": "application/json"},
-                timeout=self.timeout,
+            response = _post_with_retry(
+                self.session,
+                f"{self.host}/_bulk",
+                payload,
+                {"Content-Type": "application/x-ndjson"},
+                self.timeout,
+                self.max_retries,
+                self.retry_backoff,
             )
-            response.raise_for_status()
         except Exception:
-            self.handleError(record)
+            self._record_failure(records)
+            return
+
+        # _bulk 整體成功時仍可能有個別文件失敗
+        try:
+            result = response.json()
+        except ValueError:
+            return
+        if result.get("errors"):
+            failed = sum(
+                1
+                for item in result.get("items", [])
+                if item.get("index", {}).get("error")
+            )
+            with self._condition:
+                self._stats["failed"] += failed
+
+    def _process_record(self, record):
+        """
+        處理記錄
+
+        Args:
+            record: 日誌記錄
+        """
+        self._process_batch([record])
 
 
 class LogstashHandler(AsyncHandler):
-    """Logstash處理器"""
+    """Logstash處理器，每批以 JSON 陣列發送"""
 
     def __init__(
         self,
@@ -160,6 +449,11 @@ class LogstashHandler(AsyncHandler):
         level=logging.INFO,
         max_queue_size=1000,
         timeout=5,
+        batch_size=500,
+        batch_interval=1.0,
+        overflow_policy=OVERFLOW_DROP_DEBUG_FIRST,
+        max_retries=3,
+        retry_backoff=0.5,
     ):
         """
         初始化處理器
@@ -169,33 +463,58 @@ class LogstashHandler(AsyncHandler):
             level: 日誌級別
             max_queue_size: 最大隊列大小
             timeout: 超時時間（秒）
+            batch_size: 每個請求的最大記錄數
+            batch_interval: 批次間隔（秒）
+            overflow_policy: 隊列滿載策略
+            max_retries: 最大重試次數
+            retry_backoff: 重試退避時間（秒）
         """
-        super().__init__(level, max_queue_size)
+        super().__init__(
+            level,
+            max_queue_size,
+            batch_size=batch_size,
+            batch_interval=batch_interval,
+            overflow_policy=overflow_policy,
+        )
         self.host = host
         self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self.session = requests.Session()
 
-    def _process_record(self, record):
+    def _process_batch(self, records):
         """
-        處理記錄
+        以單一請求發送一批記錄
+
+        Logstash http input 的 json codec 會將陣列拆成個別事件。
 
         Args:
-            record: 日誌記錄
+            records: 日誌記錄列表
         """
-        # 格式化記錄
-        message = self.format(record)
+        messages = [_as_json_line(self.format(record)) for record in records]
+        payload = ("[" + ",".join(messages) + "]").encode("utf-8")
 
-        # 發送記錄
         try:
-            response = self.session.post(
+            _post_with_retry(
+                self.session,
                 self.host,
-                data=message,
-                headers={"Content-Type": "application/json"},
-                timeout=self.timeout,
+                payload,
+                {"Content-Type": "application/json"},
+                self.timeout,
+                self.max_retries,
+                self.retry_backoff,
             )
-            response.raise_for_status()
         except Exception:
-            self.handleError(record)
+            self._record_failure(records)
+
+    def _process_record(self, record):
+        """
+        處理記錄
+
+        Args:
+            record: 日誌記錄
+        """
+        self._process_batch([record])
 
 
 class LokiHandler(AsyncHandler):
@@ -209,6 +528,9 @@ class LokiHandler(AsyncHandler):
         timeout=5,
         batch_size=100,
         batch_interval=1.0,
+        overflow_policy=OVERFLOW_DROP_DEBUG_FIRST,
+        max_retries=3,
+        retry_backoff=0.5,
     ):
         """
         初始化處理器
@@ -220,71 +542,67 @@ class LokiHandler(AsyncHandler):
             timeout: 超時時間（秒）
             batch_size: 批次大小
             batch_interval: 批次間隔（秒）
+            overflow_policy: 隊列滿載策略
+            max_retries: 最大重試次數
+            retry_backoff: 重試退避時間（秒）
         """
-        super().__init__(level, max_queue_size)
+        super().__init__(
+            level,
+            max_queue_size,
+            batch_size=batch_size,
+            batch_interval=batch_interval,
+            overflow_policy=overflow_policy,
+        )
         self.host = host
         self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self.session = requests.Session()
-        self.batch_size = batch_size
-        self.batch_interval = batch_interval
-        self.batch = []
-        self.last_batch_time = time.time()
 
-    def _process_record(self, record):
+    def _process_batch(self, records):
         """
-        處理記錄
+        合併串流後以單一請求發送一批記錄
 
         Args:
-            record: 日誌記錄
+            records: 日誌記錄列表
         """
-        # 格式化記錄
-        message = self.format(record)
-
-        # 添加到批次
-        self.batch.append(message)
-
-        # 檢查是否需要發送批次
-        if (
-            len(self.batch) >= self.batch_size
-            or time.time() - self.last_batch_time >= self.batch_interval
-        ):
-            self._send_batch()
+        batch_data = self._merge_batch([self.format(record) for record in records])
 
-    def _send_batch(self):
-        """發送批次"""
-        if not self.batch:
-            return
-
-        # 合併批次
-        batch_data = self._merge_batch()
-
-        # 發送批次
         try:
-            response = self.session.post(
+            _post_with_retry(
+                self.session,
                 self.host,
-                data=batch_data,
-                headers={"Content-Type": "application/json"},
-                timeout=self.timeout,
+                batch_data,
+                {"Content-Type": "application/json"},
+                self.timeout,
+                self.max_retries,
+                self.retry_backoff,
             )
-            response.raise_for_status()
         except Exception:
-            # 處理異常
-            self.handleError(None)
+            self._record_failure(records)
 
-        # 清空批次
-        self.batch = []
-        self.last_batch_time = time.time()
+    def _process_record(self, record):
+        """
+        處理記錄
 
-    def _merge_batch(self):
+        Args:
+            record: 日誌記錄
+        """
+        self._process_batch([record])
+
+    def _merge_batch(self, messages):
         """
         合併批次
 
+        Args:
+            messages: 格式化後的 Loki 推送訊息
+
         Returns:
             str: 合併後的批次數據
         """
         # 解析批次
         streams = {}
-        for message in self.batch:
+        for message in messages:
             try:
                 data = json.loads(message)
                 for stream in data.get("streams", []):
@@ -303,12 +621,12 @@ class LokiHandler(AsyncHandler):
         merged_data = {"streams": list(streams.values())}
         return json.dumps(merged_data)
 
-    def close(self):
-        """關閉處理器"""
-        # 發送剩餘的批次
-        if self.batch:
-            self._send_batch()
-        super().close()
+
+def _as_json_line(message):
+    """確保訊息為單行 JSON；非 JSON 格式化器的輸出包裝為 message 欄位"""
+    if message.startswith("{") and "\n" not in message:
+        return message
+    return json.dumps({"message": message}, ensure_ascii=False)
 
 
 class EnhancedRotatingFileHandler(RotatingFileHandler):
@@ -0,0 +1,340 @@
+"""
+日誌索引模組
+
+此模組提供增量日誌索引器，將輪換中的 JSON 日誌文件轉為依類別與小時分區的
+Parquet 資料集，讓日誌分析以分區裁剪與欄位條件下推查詢，不必每次重新解析
+所有日誌文件。
+
+索引格式（``{index_dir}/``）：
+- ``log_category=<類別>/log_hour=<YYYYMMDDHH>/part-*.parquet``：日誌記錄
+- ``checkpoints.json``：每個日誌文件已索引的位元組位移
+
+檢查點以文件第一行的雜湊值識別文件，因此 ``app.log`` 輪換為 ``app.log.1``
+或壓縮為 ``app.log.1.gzip`` 後，仍會從上次的位移接續讀取。寫入分區後才更新
+檢查點，程序中斷時最多重複索引一次更新的記錄。
+"""
+
+import bz2
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_COLUMN = "log_category"
+HOUR_COLUMN = "log_hour"
+RECORD_COLUMN = "record"
+INDEX_COLUMNS = (
+    "timestamp",
+    "level",
+    "category",
+    "logger",
+    "message",
+    "execution_time",
+    RECORD_COLUMN,
+)
+
+_CHECKPOINT_FILE = "checkpoints.json"
+_HOUR_FORMAT = "%Y%m%d%H"
+_LOG_FILE_PATTERN = re.compile(r"\.log(\.\d+)?(\.(gz|gzip|bz2))?$")
+_OPENERS = {"gz": gzip.open, "gzip": gzip.open, "bz2": bz2.open}
+
+_SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.timestamp("us")),
+        ("level", pa.string()),
+        ("category", pa.string()),
+        ("logger", pa.string()),
+        ("message", pa.string()),
+        ("execution_time", pa.float64()),
+        (RECORD_COLUMN, pa.string()),
+        (CATEGORY_COLUMN, pa.string()),
+        (HOUR_COLUMN, pa.string()),
+    ]
+)
+
+
+def _open_log(path: str):
+    """以二進位模式開啟日誌文件，壓縮文件自動解壓"""
+    suffix = path.rsplit(".", 1)[-1]
+    return _OPENERS.get(suffix, open)(path, "rb")
+
+
+def _parse_timestamps(records: List[Dict[str, Any]]) -> pd.Series:
+    """
+    解析記錄時間
+
+    ``EnhancedJsonFormatter`` 的時間字串帶有 Z 後綴，統一轉為不含時區的時間；
+    缺少時間字串時改用 ``timestamp_ms``。
+    """
+    timestamps = pd.to_datetime(
+        pd.Series([record.get("timestamp") for record in records], dtype="object"),
+        errors="coerce",
+        utc=True,
+        format="ISO8601",
+    ).dt.tz_localize(None)
+    fallback = pd.to_datetime(
+        pd.Series([record.get("timestamp_ms") for record in records], dtype="float"),
+        unit="ms",
+        errors="coerce",
+    )
+    return timestamps.fillna(fallback).astype("datetime64[us]")
+
+
+class LogIndexer:
+    """增量日誌索引器"""
+
+    def __init__(self, log_dirs: Dict[str, str], index_dir: str):
+        """
+        初始化索引器
+
+        Args:
+            log_dirs: 日誌類別對應的日誌目錄
+            index_dir: 索引目錄
+        """
+        self.log_dirs = log_dirs
+        self.index_dir = index_dir
+        self.checkpoint_path = os.path.join(index_dir, _CHECKPOINT_FILE)
+        os.makedirs(index_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._checkpoints: Dict[str, Dict[str, Any]] = self._load_checkpoints()
+
+    def update(self) -> int:
+        """
+        索引各日誌文件自上次檢查點以後新增的完整行
+
+        Returns:
+            int: 本次新增的記錄數
+        """
+        with self._lock:
+            seen = set()
+            frames = []
+            for category, log_dir in self.log_dirs.items():
+                if not os.path.isdir(log_dir):
+                    continue
+                for file_name in sorted(os.listdir(log_dir)):
+                    if not _LOG_FILE_PATTERN.search(file_name):
+                        continue
+                    path = os.path.join(log_dir, file_name)
+                    try:
+                        frame = self._index_file(path, category, seen)
+                    except (OSError, EOFError) as e:
+                        logger.warning("無法索引日誌文件 %s: %s", path, e)
+                        continue
+                    if frame is not None:
+                        frames.append(frame)
+
+            added = 0
+            if frames:
+                table = pa.concat_tables(frames)
+                self._write(table)
+                added = table.num_rows
+
+            # 已刪除的日誌文件不再需要檢查點
+            self._checkpoints = {
+                key: value for key, value in self._checkpoints.items() if key in seen
+            }
+            self._save_checkpoints()
+            return added
+
+    def query(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        categories: Optional[Sequence[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        levels: Optional[Sequence[str]] = None,
+        min_execution_time: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        查詢索引
+
+        類別與時間條件轉為分區裁剪，時間、級別與執行時間條件下推至 row group
+        統計資料，只讀取需要的欄位。
+
+        Args:
+            columns: 要讀取的欄位，預設為全部索引欄位
+            categories: 日誌類別（日誌目錄）
+            start_time: 開始時間
+            end_time: 結束時間
+            levels: 日誌級別
+            min_execution_time: 最小執行時間（秒）
+
+        Returns:
+            pd.DataFrame: 符合條件的記錄，未排序
+        """
+        columns = list(INDEX_COLUMNS if columns is None else columns)
+        if not self._has_data():
+            return pd.DataFrame(columns=columns)
+
+        dataset = ds.dataset(
+            self.index_dir,
+            schema=_SCHEMA,
+            format="parquet",
+            partitioning=self._partitioning(),
+            exclude_invalid_files=True,
+        )
+
+        conditions = []
+        if categories is not None:
+            conditions.append(ds.field(CATEGORY_COLUMN).isin(list(categories)))
+        if start_time is not None:
+            start = pd.Timestamp(start_time)
+            conditions.append(ds.field(HOUR_COLUMN) >= start.strftime(_HOUR_FORMAT))
+            conditions.append(ds.field("timestamp") >= start.to_pydatetime())
+        if end_time is not None:
+            end = pd.Timestamp(end_time)
+            conditions.append(ds.field(HOUR_COLUMN) <= end.strftime(_HOUR_FORMAT))
+            conditions.append(ds.field("timestamp") <= end.to_pydatetime())
+        if levels is not None:
+            conditions.append(ds.field("level").isin(list(levels)))
+        if min_execution_time is not None:
+            conditions.append(ds.field("execution_time") >= min_execution_time)
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        table = dataset.to_table(columns=columns, filter=expression)
+        return table.to_pandas()
+
+    def _index_file(self, path: str, category: str, seen: set) -> Optional[pa.Table]:
+        """
+        讀取單一日誌文件自檢查點以後的完整行
+
+        Returns:
+            Optional[pa.Table]: 新增的記錄；沒有新記錄時返回 None
+        """
+        with _open_log(path) as f:
+            first_line = f.readline()
+            if not first_line.endswith(b"\n"):
+                return None
+            key = hashlib.sha1(first_line).hexdigest()
+            seen.add(key)
+
+            checkpoint = self._checkpoints.get(key, {})
+            offset = checkpoint.get("offset", 0)
+            stat = os.stat(path)
+            if (
+                checkpoint.get("path") == path
+                and checkpoint.get("size") == stat.st_size
+            ):
+                return None
+
+            f.seek(offset)
+            data = f.read()
+
+        # 最後一行可能仍在寫入，留待下次索引
+        end = data.rfind(b"\n") + 1
+        self._checkpoints[key] = {
+            "path": path,
+            "offset": offset + end,
+            "size": stat.st_size,
+        }
+        if end == 0:
+            return None
+        return self._to_table(data[:end].splitlines(), category)
+
+    @staticmethod
+    def _to_table(lines: List[bytes], category: str) -> Optional[pa.Table]:
+        """將日誌行轉為索引表"""
+        records = []
+        raw_lines = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+                raw_lines.append(line.decode("utf-8", errors="replace"))
+        if not records:
+            return None
+
+        timestamps = _parse_timestamps(records)
+        execution_times = []
+        for record in records:
+            data = record.get("data")
+            value = data.get("execution_time") if isinstance(data, dict) else None
+            execution_times.append(
+                float(value) if isinstance(value, (int, float)) else None
+            )
+
+        df = pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "level": [record.get("level") for record in records],
+                "category": [record.get("category") for record in records],
+                "logger": [record.get("logger") for record in records],
+                "message": [record.get("message") for record in records],
+                "execution_time": pd.Series(execution_times, dtype="float64"),
+                RECORD_COLUMN: raw_lines,
+                CATEGORY_COLUMN: category,
+                HOUR_COLUMN: timestamps.dt.strftime(_HOUR_FORMAT).fillna("unknown"),
+            }
+        )
+        for column in ("level", "category", "logger", "message"):
+            df[column] = df[column].map(
+                lambda value: (
+                    value if value is None or isinstance(value, str) else str(value)
+                )
+            )
+        return pa.Table.from_pandas(df, schema=_SCHEMA, preserve_index=False)
+
+    def _write(self, table: pa.Table) -> None:
+        """以唯一檔名寫入分區，檔案內依時間排序以利 row group 裁剪"""
+        ds.write_dataset(
+            table.sort_by("timestamp"),
+            self.index_dir,
+            format="parquet",
+            partitioning=self._partitioning(),
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    def _has_data(self) -> bool:
+        return any(
+            entry.is_dir() and entry.name.startswith(f"{CATEGORY_COLUMN}=")
+            for entry in os.scandir(self.index_dir)
+        )
+
+    @staticmethod
+    def _partitioning() -> ds.Partitioning:
+        """索引資料集的 hive 分區定義"""
+        return ds.partitioning(
+            pa.schema([(CATEGORY_COLUMN, pa.string()), (HOUR_COLUMN, pa.string())]),
+            flavor="hive",
+        )
+
+    def _load_checkpoints(self) -> Dict[str, Dict[str, Any]]:
+        if os.path.exists(self.checkpoint_path):
+            try:
+                with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("日誌索引檢查點損壞，將重新建立索引: %s", e)
+
+        # 沒有檢查點時無法得知哪些記錄已索引，清除分區後從頭建立
+        for entry in os.scandir(self.index_dir):
+            if entry.is_dir() and entry.name.startswith(f"{CATEGORY_COLUMN}="):
+                shutil.rmtree(entry.path)
+        return {}
+
+    def _save_checkpoints(self) -> None:
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._checkpoints, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -11,25 +11,22 @@
 遵循 Phase 5.3 開發標準，提供企業級監控解決方案。
 """
 
-from .prometheus_collector import PrometheusCollector
-from .grafana_config import GrafanaConfigManager
-from .alert_manager import AlertManager
-from .notification_services import NotificationServices
-from .health_checker import HealthChecker
-from .health_checker_base import HealthCheckResult, HealthStatus
-from .system_resource_checker import SystemResourceChecker
-from .service_checker import ServiceChecker
+from src.utils.lazy_import import lazy_exports
 
-__all__ = [
-    "PrometheusCollector",
-    "GrafanaConfigManager",
-    "AlertManager",
-    "NotificationServices",
-    "HealthChecker",
-    "HealthCheckResult",
-    "HealthStatus",
-    "SystemResourceChecker",
-    "ServiceChecker",
-]
+# 子模組在第一次存取對應名稱時才匯入
+_EXPORTS = {
+    "PrometheusCollector": ".prometheus_collector",
+    "GrafanaConfigManager": ".grafana_config",
+    "AlertManager": ".alert_manager",
+    "NotificationServices": ".notification_services",
+    "HealthChecker": ".health_checker",
+    "HealthCheckResult": ".health_checker_base",
+    "HealthStatus": ".health_checker_base",
+    "SystemResourceChecker": ".system_resource_checker",
+    "ServiceChecker": ".service_checker",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __version__ = "1.0.0"
@@ -10,6 +10,7 @@
 """
 
 import logging
+import re
 import threading
 import time
 import uuid
@@ -20,11 +21,17 @@ from enum import Enum
 import yaml
 from pathlib import Path
 
+from src.monitoring.metrics_store import MetricsStore, metrics_store
 from src.monitoring.notification_services import NotificationServices
 
 # 設置模組日誌
 module_logger = logging.getLogger(__name__)
 
+# 告警表達式結尾的比較運算子與閾值
+_COMPARISON = re.compile(
+    r"^(?P<lhs>.*?)\s*(?P<op>>=|<=|==|!=|>|<)\s*(?P<value>-?[\d.]+)\s*$", re.S
+)
+
 
 class AlertSeverity(Enum):
     """告警嚴重程度枚舉"""
@@ -137,16 +144,22 @@ class IntelligentAlertManager:
         rules: 告警規則字典
         active_alerts: 活躍告警字典
         notification_service: 通知服務
+        metrics_store: 本地時間序列指標儲存，告警規則以其窗口聚合值評估
         is_running: 是否正在運行
         evaluation_thread: 評估線程
         escalation_thread: 升級線程
     """
 
-    def __init__(self, config_file: str = "config/alert_rules.yaml"):
+    def __init__(
+        self,
+        config_file: str = "config/alert_rules.yaml",
+        store: Optional[MetricsStore] = None,
+    ):
         """初始化告警管理器
 
         Args:
             config_file: 告警規則配置檔案路徑
+            store: 指標儲存，預設為全域的 metrics_store
 
         Raises:
             Exception: 初始化失敗時拋出異常
@@ -162,10 +175,12 @@ class IntelligentAlertManager:
 
             # 初始化通知服務
             self.notification_service = NotificationServices()
+            self.metrics_store = store if store is not None else metrics_store
 
             # 初始化運行狀態
             self.is_running = False
-            self.evaluation_interval = 30  # 評估間隔（秒）
+            # 評估間隔（秒）；指標取自本地儲存，評估成本低，可在一秒內發現延遲尖峰
+            self.evaluation_interval = 1
             self.escalation_interval = 60  # 升級檢查間隔（秒）
 
             # 初始化線程
@@ -279,17 +294,13 @@ class IntelligentAlertManager:
             Tuple[str, str, float]: (指標名稱, 運算符, 閾值)
         """
         try:
-            # 簡化的表達式解析，實際應用中需要更複雜的解析邏輯
-            if ">" in expr:
-                parts = expr.split(">")
-                metric_name = parts[0].strip()
-                threshold_value = float(parts[1].strip())
-                return metric_name, ">", threshold_value
-            if "<" in expr:
-                parts = expr.split("<")
-                metric_name = parts[0].strip()
-                threshold_value = float(parts[1].strip())
-                return metric_name, "<", threshold_value
+            match = _COMPARISON.match(expr)
+            if match:
+                return (
+                    match.group("lhs").strip(),
+                    match.group("op"),
+                    float(match.group("value")),
+                )
             # 預設值
             return expr.strip(), ">", 0.0
 
@@ -415,8 +426,6 @@ class IntelligentAlertManager:
                 continue
 
             try:
-                # 這裡應該從 Prometheus 或其他數據源獲取實際指標值
-                # 目前使用模擬數據進行演示
                 metric_value = self._get_metric_value(rule.metric_name)
 
                 if metric_value is not None:
@@ -435,26 +444,16 @@ class IntelligentAlertManager:
     def _get_metric_value(self, metric_name: str) -> Optional[float]:
         """獲取指標值
 
+        以本地指標儲存評估規則表達式的左側，例如 ``system_cpu_usage_percent``
+        或 ``max_over_time(trading_order_latency_milliseconds[5s])``。
+
         Args:
-            metric_name: 指標名稱
+            metric_name: 指標名稱或查詢表達式
 
         Returns:
-            Optional[float]: 指標值，獲取失敗返回 None
+            Optional[float]: 指標值，表達式不支援或窗口內沒有資料時返回 None
         """
-        # 這裡應該實現從 Prometheus 或其他數據源獲取指標值的邏輯
-        # 目前返回模擬數據
-        import random
-
-        if "cpu" in metric_name.lower():
-            return random.uniform(60, 95)
-        elif "memory" in metric_name.lower():
-            return random.uniform(70, 90)
-        elif "disk" in metric_name.lower():
-            return random.uniform(80, 95)
-        elif "success_rate" in metric_name.lower():
-            return random.uniform(85, 98)
-        else:
-            return random.uniform(0, 100)
+        return self.metrics_store.evaluate(metric_name)
 
     def _evaluate_condition(
         self, value: float, operator: str, threshold: float
@@ -540,7 +539,10 @@ class IntelligentAlertManager:
 
     def _find_existing_alert(self, rule_id: str) -> Optional[Alert]:
         """
-        查找現有的活躍告警
+        查找現有的活躍或抑制中告警
+
+        抑制中的告警同樣視為已存在，規則在抑制期間持續觸發時只更新該告警，
+        不會在每次評估時建立新的告警。
 
         Args:
             rule_id: 規則ID
@@ -549,7 +551,10 @@ class IntelligentAlertManager:
             Optional[Alert]: 找到的告警，否則返回 None
         """
         for alert in self.active_alerts.values():
-            if alert.rule_id == rule_id and alert.status == AlertStatus.ACTIVE:
+            if alert.rule_id == rule_id and alert.status in (
+                AlertStatus.ACTIVE,
+                AlertStatus.SUPPRESSED,
+            ):
                 return alert
         return None
 
@@ -646,7 +651,10 @@ class IntelligentAlertManager:
             rule_id: 規則ID
         """
         for alert_id, alert in list(self.active_alerts.items()):
-            if alert.rule_id == rule_id and alert.status == AlertStatus.ACTIVE:
+            if alert.rule_id == rule_id and alert.status in (
+                AlertStatus.ACTIVE,
+                AlertStatus.SUPPRESSED,
+            ):
                 alert.status = AlertStatus.RESOLVED
                 alert.resolved_at = datetime.now()
 
@@ -0,0 +1,652 @@
+"""交易管線延遲追蹤
+
+此模組追蹤一筆行情從 WebSocket 收到到訂單送達券商的各階段耗時：
+
+- 行情進入 ``WebSocketClient._on_message`` 時以 ``start_trace`` 建立追蹤
+- 同一執行緒內以 contextvars 傳遞追蹤上下文，``traced`` 裝飾器記錄訊號、
+  風控、執行等階段
+- 跨越佇列（WebSocket 訊息佇列、資料佇列、事件總線、訂單佇列）時以
+  ``handoff`` 取得交接點隨資料傳遞，取出後以 ``resume`` 記錄排隊時間並恢復上下文
+- 訂單送達券商後以 ``finish`` 記錄端到端耗時
+
+跨度以 ``perf_counter_ns`` 計時，寫入預先配置的環形陣列；背景執行緒定期將新跨度
+寫入磁碟環形檔案，並更新各階段的 Prometheus 直方圖與本地指標儲存。
+
+追蹤預設停用，設定 ``TRADING_TRACE_ENABLED=true`` 後啟用；環形檔案在第一次
+匯出時才建立。
+
+報表：
+    python -m src.monitoring.latency_tracing logs/latency_traces.bin --start 2024-01-02T09:00
+"""
+
+import argparse
+import contextvars
+import functools
+import itertools
+import logging
+import os
+import threading
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import numpy as np
+
+try:
+    from prometheus_client import CollectorRegistry, Histogram
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+# 設置模組日誌
+module_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 管線階段，索引即跨度記錄中的階段代碼
+STAGES = (
+    "ws_queue",
+    "ingest_queue",
+    "event_queue",
+    "signal",
+    "risk",
+    "execution",
+    "order_queue",
+    "broker",
+    "tick_to_order",
+)
+STAGE_INDEX = {name: index for index, name in enumerate(STAGES)}
+
+# 跨度記錄格式：開始時間為 Unix epoch 奈秒
+SPAN_DTYPE = np.dtype(
+    [
+        ("trace_id", "<u8"),
+        ("stage", "u1"),
+        ("start_ns", "<i8"),
+        ("duration_ns", "<i8"),
+    ]
+)
+
+# 各階段延遲直方圖分桶（秒）
+LATENCY_BUCKETS = (
+    0.00001,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+# 預設設定，可由環境變數覆寫；追蹤需明確啟用
+DEFAULT_TRACE_FILE = os.getenv("TRADING_TRACE_FILE", "logs/latency_traces.bin")
+DEFAULT_SAMPLE_EVERY = int(os.getenv("TRADING_TRACE_SAMPLE_EVERY", "100"))
+TRACING_ENABLED = os.getenv("TRADING_TRACE_ENABLED", "false").lower() == "true"
+
+if PROMETHEUS_AVAILABLE:
+    TRACING_REGISTRY = CollectorRegistry()
+    STAGE_LATENCY = Histogram(
+        "trading_pipeline_stage_seconds",
+        "交易管線各階段耗時（秒）",
+        ["stage"],
+        buckets=LATENCY_BUCKETS,
+        registry=TRACING_REGISTRY,
+    )
+else:
+    TRACING_REGISTRY = None
+    STAGE_LATENCY = None
+
+
+class TraceContext:
+    """追蹤上下文
+
+    Attributes:
+        trace_id: 追蹤 ID
+        start_ns: 追蹤開始的 perf_counter_ns
+    """
+
+    __slots__ = ("trace_id", "start_ns")
+
+    def __init__(self, trace_id: int, start_ns: int):
+        self.trace_id = trace_id
+        self.start_ns = start_ns
+
+
+class Handoff:
+    """跨佇列交接點
+
+    Attributes:
+        trace: 追蹤上下文
+        mark_ns: 放入佇列時的 perf_counter_ns
+    """
+
+    __slots__ = ("trace", "mark_ns")
+
+    def __init__(self, trace: TraceContext, mark_ns: int):
+        self.trace = trace
+        self.mark_ns = mark_ns
+
+
+_current_trace: contextvars.ContextVar[Optional[TraceContext]] = contextvars.ContextVar(
+    "trading_trace", default=None
+)
+
+
+class _Span:
+    """記錄目前追蹤中一個階段的上下文管理器"""
+
+    __slots__ = ("tracer", "stage", "trace", "start_ns")
+
+    def __init__(self, tracer: "LatencyTracer", stage: int):
+        self.tracer = tracer
+        self.stage = stage
+        self.trace = None
+        self.start_ns = 0
+
+    def __enter__(self) -> "_Span":
+        self.trace = _current_trace.get()
+        if self.trace is not None:
+            self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.trace is not None:
+            self.tracer._record(
+                self.stage, self.trace.trace_id, self.start_ns, time.perf_counter_ns()
+            )
+
+
+class _Resume:
+    """記錄排隊時間並在區塊內恢復追蹤上下文"""
+
+    __slots__ = ("tracer", "handoff", "stage", "token")
+
+    def __init__(
+        self, tracer: "LatencyTracer", handoff: Optional[Handoff], stage: Optional[int]
+    ):
+        self.tracer = tracer
+        self.handoff = handoff
+        self.stage = stage
+        self.token = None
+
+    def __enter__(self) -> Optional[TraceContext]:
+        if self.handoff is None:
+            return None
+        trace = self.handoff.trace
+        if self.stage is not None:
+            self.tracer._record(
+                self.stage,
+                trace.trace_id,
+                self.handoff.mark_ns,
+                time.perf_counter_ns(),
+            )
+        self.token = _current_trace.set(trace)
+        return trace
+
+    def __exit__(self, *exc_info) -> None:
+        if self.token is not None:
+            _current_trace.reset(self.token)
+            self.token = None
+
+
+class SpanRingFile:
+    """磁碟上的跨度環形檔案
+
+    檔案開頭為固定長度的標頭（魔術字、容量、累計寫入筆數），之後為
+    ``capacity`` 筆 SPAN_DTYPE 記錄，寫滿後從頭覆寫。
+    """
+
+    MAGIC = b"TRSPAN01"
+    HEADER_DTYPE = np.dtype([("magic", "S8"), ("capacity", "<u8"), ("written", "<u8")])
+    HEADER_SIZE = 64
+
+    def __init__(self, path: str, capacity: int = 1_000_000):
+        """開啟或建立環形檔案
+
+        Args:
+            path: 檔案路徑
+            capacity: 新建檔案時的記錄容量；既有檔案沿用其容量
+
+        Raises:
+            ValueError: 既有檔案不是跨度環形檔案時
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists():
+            with open(self.path, "wb") as f:
+                f.truncate(self.HEADER_SIZE + capacity * SPAN_DTYPE.itemsize)
+            header = np.memmap(self.path, self.HEADER_DTYPE, "r+", offset=0, shape=(1,))
+            header[0] = (self.MAGIC, capacity, 0)
+            header.flush()
+        self._header = np.memmap(
+            self.path, self.HEADER_DTYPE, "r+", offset=0, shape=(1,)
+        )
+        if self._header[0]["magic"] != self.MAGIC:
+            raise ValueError(f"不是跨度環形檔案: {self.path}")
+        self.capacity = int(self._header[0]["capacity"])
+        self._records = np.memmap(
+            self.path,
+            SPAN_DTYPE,
+            "r+",
+            offset=self.HEADER_SIZE,
+            shape=(self.capacity,),
+        )
+
+    @property
+    def written(self) -> int:
+        """累計寫入筆數"""
+        return int(self._header[0]["written"])
+
+    def append(self, records: np.ndarray) -> None:
+        """附加跨度記錄
+
+        Args:
+            records: SPAN_DTYPE 陣列
+        """
+        count = len(records)
+        if count == 0:
+            return
+        written = self.written
+        kept = records[-self.capacity :]
+        position = (written + count - len(kept)) % self.capacity
+        first = min(len(kept), self.capacity - position)
+        self._records[position : position + first] = kept[:first]
+        self._records[: len(kept) - first] = kept[first:]
+        self._records.flush()
+        self._header[0]["written"] = written + count
+        self._header.flush()
+
+    def read(self) -> np.ndarray:
+        """依寫入順序讀取檔案中保留的記錄
+
+        Returns:
+            np.ndarray: SPAN_DTYPE 陣列
+        """
+        written = self.written
+        if written <= self.capacity:
+            return np.array(self._records[:written])
+        position = written % self.capacity
+        return np.concatenate([self._records[position:], self._records[:position]])
+
+
+class LatencyTracer:
+    """交易管線延遲追蹤器
+
+    跨度寫入預先配置的環形陣列；匯出執行緒定期取出新跨度寫入環形檔案與
+    直方圖。未建立追蹤時各記錄函數只讀取一次 ContextVar。
+
+    Attributes:
+        capacity: 記憶體環形陣列容量
+        sample_every: 每幾筆行情建立一次追蹤
+        dropped: 匯出前被覆寫的跨度數
+    """
+
+    def __init__(
+        self,
+        capacity: int = 65536,
+        sample_every: int = DEFAULT_SAMPLE_EVERY,
+        trace_file: Optional[str] = DEFAULT_TRACE_FILE,
+        enabled: bool = TRACING_ENABLED,
+        export_interval: float = 1.0,
+    ):
+        """初始化追蹤器
+
+        Args:
+            capacity: 記憶體環形陣列容量
+            sample_every: 每幾筆行情建立一次追蹤
+            trace_file: 環形檔案路徑，None 表示不寫入檔案；第一次匯出時才建立
+            enabled: 是否啟用追蹤，預設由 TRADING_TRACE_ENABLED 決定
+            export_interval: 匯出間隔（秒）
+        """
+        self.capacity = capacity
+        self.sample_every = max(1, sample_every)
+        self.trace_file = trace_file
+        self.enabled = enabled
+        self.export_interval = export_interval
+        self.dropped = 0
+
+        self._trace_ids = array("Q", bytes(8 * capacity))
+        self._stages = array("B", bytes(capacity))
+        self._starts = array("q", bytes(8 * capacity))
+        self._ends = array("q", bytes(8 * capacity))
+        self._written = 0
+        self._exported = 0
+        self._lock = threading.Lock()
+        self._ticks = itertools.count()
+        self._trace_seq = itertools.count(1)
+        # perf_counter_ns 與 Unix epoch 奈秒的差
+        self._epoch_offset = time.time_ns() - time.perf_counter_ns()
+
+        self._ring_file: Optional[SpanRingFile] = None
+        self._export_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    # ---- 追蹤上下文 ----
+
+    def start_trace(self) -> Optional[Handoff]:
+        """為一筆行情建立追蹤
+
+        Returns:
+            Optional[Handoff]: 隨行情傳遞的交接點；未啟用或未抽中時返回 None
+        """
+        if not self.enabled or next(self._ticks) % self.sample_every:
+            return None
+        if self._export_thread is None:
+            self.start_exporter()
+        now = time.perf_counter_ns()
+        return Handoff(TraceContext(next(self._trace_seq), now), now)
+
+    @staticmethod
+    def current() -> Optional[TraceContext]:
+        """取得目前的追蹤上下文"""
+        return _current_trace.get()
+
+    def handoff(self) -> Optional[Handoff]:
+        """在放入佇列前取得目前追蹤的交接點
+
+        Returns:
+            Optional[Handoff]: 交接點，沒有進行中的追蹤時返回 None
+        """
+        trace = _current_trace.get()
+        if trace is None:
+            return None
+        return Handoff(trace, time.perf_counter_ns())
+
+    def resume(
+        self, handoff: Optional[Handoff], stage: Optional[str] = None
+    ) -> _Resume:
+        """從佇列取出後恢復追蹤上下文
+
+        Args:
+            handoff: handoff 或 start_trace 返回的交接點
+            stage: 排隊時間記錄的階段名稱，None 表示不記錄
+
+        Returns:
+            上下文管理器，區塊內 current() 返回交接點的追蹤上下文
+        """
+        return _Resume(self, handoff, None if stage is None else STAGE_INDEX[stage])
+
+    def bind(
+        self, func: Callable[..., T], stage: Optional[str] = None
+    ) -> Callable[..., T]:
+        """將函數綁定到目前的追蹤，供放入佇列或交給其他執行緒執行
+
+        Args:
+            func: 要綁定的函數
+            stage: 從綁定到執行之間的排隊時間記錄的階段名稱
+
+        Returns:
+            Callable: 沒有進行中的追蹤時為原函數，否則為執行時恢復追蹤的包裝函數
+        """
+        handoff = self.handoff()
+        if handoff is None:
+            return func
+
+        def bound(*args, **kwargs):
+            with self.resume(handoff, stage):
+                return func(*args, **kwargs)
+
+        return bound
+
+    def span(self, stage: str) -> _Span:
+        """記錄目前追蹤中的一個階段
+
+        Args:
+            stage: 階段名稱
+
+        Returns:
+            上下文管理器；沒有進行中的追蹤時不記錄
+        """
+        return _Span(self, STAGE_INDEX[stage])
+
+    def finish(self) -> None:
+        """記錄目前追蹤從行情到達至今的端到端耗時"""
+        trace = _current_trace.get()
+        if trace is not None:
+            self._record(
+                STAGE_INDEX["tick_to_order"],
+                trace.trace_id,
+                trace.start_ns,
+                time.perf_counter_ns(),
+            )
+
+    # ---- 跨度記錄 ----
+
+    def record(self, stage: str, trace_id: int, start_ns: int, end_ns: int) -> None:
+        """直接記錄一個跨度
+
+        Args:
+            stage: 階段名稱
+            trace_id: 追蹤 ID
+            start_ns: 開始的 perf_counter_ns
+            end_ns: 結束的 perf_counter_ns
+        """
+        self._record(STAGE_INDEX[stage], trace_id, start_ns, end_ns)
+
+    def _record(self, stage: int, trace_id: int, start_ns: int, end_ns: int) -> None:
+        with self._lock:
+            slot = self._written % self.capacity
+            self._trace_ids[slot] = trace_id
+            self._stages[slot] = stage
+            self._starts[slot] = start_ns
+            self._ends[slot] = end_ns
+            self._written += 1
+
+    def drain(self) -> np.ndarray:
+        """取出上次取出後新增的跨度
+
+        Returns:
+            np.ndarray: SPAN_DTYPE 陣列，開始時間已換算為 Unix epoch 奈秒
+        """
+        with self._lock:
+            written = self._written
+            start = self._exported
+            if written - start > self.capacity:
+                self.dropped += written - start - self.capacity
+                start = written - self.capacity
+            slots = np.arange(start, written) % self.capacity
+            trace_ids = np.frombuffer(self._trace_ids, dtype="<u8")[slots]
+            stages = np.frombuffer(self._stages, dtype="u1")[slots]
+            starts = np.frombuffer(self._starts, dtype="<i8")[slots]
+            ends = np.frombuffer(self._ends, dtype="<i8")[slots]
+            self._exported = written
+
+        records = np.empty(len(slots), dtype=SPAN_DTYPE)
+        records["trace_id"] = trace_ids
+        records["stage"] = stages
+        records["start_ns"] = starts + self._epoch_offset
+        records["duration_ns"] = ends - starts
+        return records
+
+    # ---- 匯出 ----
+
+    def start_exporter(self) -> None:
+        """啟動背景匯出執行緒"""
+        if self._export_thread is not None:
+            return
+        self._stop_event.clear()
+        self._export_thread = threading.Thread(
+            target=self._export_loop, daemon=True, name="LatencyTraceExporter"
+        )
+        self._export_thread.start()
+
+    def stop_exporter(self) -> None:
+        """停止背景匯出執行緒並匯出剩餘跨度"""
+        thread = self._export_thread
+        if thread is None:
+            return
+        self._stop_event.set()
+        thread.join(timeout=5.0)
+        self._export_thread = None
+        self.export()
+
+    def _export_loop(self) -> None:
+        while not self._stop_event.wait(self.export_interval):
+            try:
+                self.export()
+            except Exception as e:
+                module_logger.error("匯出延遲追蹤失敗: %s", e)
+
+    def export(self) -> int:
+        """將新跨度寫入環形檔案、Prometheus 直方圖與本地指標儲存
+
+        Returns:
+            int: 匯出的跨度數
+        """
+        records = self.drain()
+        if len(records) == 0:
+            return 0
+
+        if self.trace_file:
+            if self._ring_file is None:
+                self._ring_file = SpanRingFile(self.trace_file)
+            self._ring_file.append(records)
+
+        from src.monitoring.metrics_store import metrics_store
+
+        for stage, duration in zip(records["stage"], records["duration_ns"]):
+            name = STAGES[stage]
+            if STAGE_LATENCY is not None:
+                STAGE_LATENCY.labels(stage=name).observe(duration / 1e9)
+            metrics_store.observe(
+                "trading_pipeline_stage_milliseconds",
+                duration / 1e6,
+                {"stage": name},
+            )
+        return len(records)
+
+    def reset(self) -> None:
+        """清除尚未匯出的跨度"""
+        with self._lock:
+            self._exported = self._written
+            self.dropped = 0
+
+
+def traced(stage: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """將函數的執行記錄為目前追蹤中的一個階段
+
+    Args:
+        stage: 階段名稱
+
+    Returns:
+        Callable: 裝飾器；沒有進行中的追蹤時直接呼叫原函數
+    """
+    index = STAGE_INDEX[stage]
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            start_ns = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                latency_tracer._record(
+                    index, trace.trace_id, start_ns, time.perf_counter_ns()
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def summarize(
+    records: np.ndarray,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """計算各階段的延遲分布
+
+    Args:
+        records: SPAN_DTYPE 陣列
+        start: 只統計此時間之後開始的跨度
+        end: 只統計此時間之前開始的跨度
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 各階段的筆數與 p50/p99/平均/最大耗時（微秒）
+    """
+    mask = np.ones(len(records), dtype=bool)
+    if start is not None:
+        mask &= records["start_ns"] >= int(start.timestamp() * 1e9)
+    if end is not None:
+        mask &= records["start_ns"] < int(end.timestamp() * 1e9)
+    records = records[mask]
+
+    summary = {}
+    for index, name in enumerate(STAGES):
+        durations = records["duration_ns"][records["stage"] == index] / 1e3
+        if len(durations) == 0:
+            continue
+        p50, p99 = np.percentile(durations, [50, 99])
+        summary[name] = {
+            "count": int(len(durations)),
+            "p50_us": float(p50),
+            "p99_us": float(p99),
+            "mean_us": float(durations.mean()),
+            "max_us": float(durations.max()),
+        }
+    return summary
+
+
+def format_report(summary: Dict[str, Dict[str, Any]]) -> str:
+    """將延遲分布格式化為表格
+
+    Args:
+        summary: summarize 的結果
+
+    Returns:
+        str: 報表文字
+    """
+    lines = [
+        f"{'階段':<14}{'筆數':>10}{'p50(µs)':>12}{'p99(µs)':>12}"
+        f"{'平均(µs)':>12}{'最大(µs)':>12}"
+    ]
+    for name, stats in summary.items():
+        lines.append(
+            f"{name:<16}{stats['count']:>10}{stats['p50_us']:>12.1f}"
+            f"{stats['p99_us']:>12.1f}{stats['mean_us']:>12.1f}{stats['max_us']:>12.1f}"
+        )
+    return "\n".join(lines)
+
+
+# 全域追蹤器
+latency_tracer = LatencyTracer()
+
+
+def main() -> None:
+    """延遲追蹤報表命令列入口"""
+    parser = argparse.ArgumentParser(description="交易管線延遲報表")
+    parser.add_argument(
+        "trace_file", nargs="?", default=DEFAULT_TRACE_FILE, help="跨度環形檔案"
+    )
+    parser.add_argument("--start", type=datetime.fromisoformat, help="交易時段開始")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="交易時段結束")
+    args = parser.parse_args()
+
+    if not Path(args.trace_file).exists():
+        parser.error(f"找不到跨度檔案: {args.trace_file}")
+
+    records = SpanRingFile(args.trace_file).read()
+    summary = summarize(records, args.start, args.end)
+    if not summary:
+        print("指定時段內沒有跨度記錄")
+        return
+    print(format_report(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,581 @@
+"""本地時間序列指標儲存
+
+此模組提供程序內的時間序列儲存，供告警規則以時間窗口評估指標，不必等待
+Prometheus 抓取。每個指標與標籤組合對應一個固定大小的環形緩衝區，依時間切成
+固定寬度的時間桶，每個時間桶保存筆數、總和、最大值、最小值與（直方圖指標的）
+分桶計數：
+
+- 寫入只更新目前的時間桶，為 O(1)
+- 窗口查詢只合併窗口涵蓋的時間桶，成本與寫入頻率無關
+
+支援的查詢表達式為 PromQL 的子集，例如 ``system_cpu_usage_percent``、
+``rate(trading_orders_total{status="rejected"}[1m])``、
+``max_over_time(trading_order_latency_milliseconds[5s])`` 與
+``histogram_quantile(0.95, rate(trading_order_latency_milliseconds_bucket[1m]))``。
+"""
+
+import bisect
+import logging
+import math
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# 設置模組日誌
+module_logger = logging.getLogger(__name__)
+
+# 指標類型
+METRIC_KINDS = ("counter", "gauge", "histogram")
+
+# 窗口聚合函數
+AGGREGATIONS = ("rate", "increase", "avg", "sum", "count", "max", "min", "last")
+
+# 未指定分桶的直方圖使用的預設分桶上界（與 prometheus_client 相同）
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+# 查詢未指定時間範圍時使用的窗口（秒）
+DEFAULT_WINDOW = 60.0
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    """將標籤字典轉為可雜湊的排序元組"""
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Series:
+    """單一指標與標籤組合的時間桶環形緩衝區"""
+
+    __slots__ = (
+        "epochs",
+        "counts",
+        "sums",
+        "maxs",
+        "mins",
+        "hists",
+        "last",
+        "last_time",
+    )
+
+    def __init__(self, slots: int, histogram: bool):
+        self.epochs = [-1] * slots
+        self.counts = [0] * slots
+        self.sums = [0.0] * slots
+        self.maxs = [-math.inf] * slots
+        self.mins = [math.inf] * slots
+        self.hists: Optional[List[Optional[Dict[int, int]]]] = (
+            [None] * slots if histogram else None
+        )
+        self.last: Optional[float] = None
+        self.last_time = 0.0
+
+    def add(self, epoch: int, value: float, now: float, bucket: int = -1) -> None:
+        i = epoch % len(self.epochs)
+        if self.epochs[i] != epoch:
+            # 時間桶已輪替，覆寫舊資料
+            self.epochs[i] = epoch
+            self.counts[i] = 0
+            self.sums[i] = 0.0
+            self.maxs[i] = -math.inf
+            self.mins[i] = math.inf
+            if self.hists is not None:
+                self.hists[i] = None
+        self.counts[i] += 1
+        self.sums[i] += value
+        if value > self.maxs[i]:
+            self.maxs[i] = value
+        if value < self.mins[i]:
+            self.mins[i] = value
+        if bucket >= 0:
+            hist = self.hists[i]
+            if hist is None:
+                hist = self.hists[i] = {}
+            hist[bucket] = hist.get(bucket, 0) + 1
+        self.last = value
+        self.last_time = now
+
+    def slots_in_window(self, first_epoch: int, last_epoch: int) -> Iterable[int]:
+        size = len(self.epochs)
+        for epoch in range(max(first_epoch, last_epoch - size + 1), last_epoch + 1):
+            i = epoch % size
+            if self.epochs[i] == epoch:
+                yield i
+
+
+class MetricQuery(NamedTuple):
+    """解析後的指標查詢
+
+    Attributes:
+        func: 聚合函數，``quantile`` 或 AGGREGATIONS 之一
+        name: 指標名稱
+        labels: 標籤等值條件
+        window: 時間窗口（秒），None 表示使用預設窗口
+        q: 分位數（僅 quantile 使用）
+    """
+
+    func: str
+    name: str
+    labels: Dict[str, str]
+    window: Optional[float]
+    q: Optional[float] = None
+
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)(ms|s|m|h|d)$")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
+_SELECTOR = re.compile(
+    r"^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)\s*"
+    r"(?:\{(?P<labels>[^}]*)\})?\s*"
+    r"(?:\[(?P<window>[^\]]+)\])?$"
+)
+_LABEL_MATCHER = re.compile(r'^\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"([^"]*)"\s*$')
+_FUNCTION = re.compile(r"^(?P<func>[a-z_]+)\s*\((?P<args>.*)\)$", re.S)
+_OVER_TIME = {
+    "rate": "rate",
+    "increase": "increase",
+    "avg_over_time": "avg",
+    "sum_over_time": "sum",
+    "count_over_time": "count",
+    "max_over_time": "max",
+    "min_over_time": "min",
+    "last_over_time": "last",
+}
+
+
+def _parse_duration(text: str) -> Optional[float]:
+    match = _DURATION.match(text.strip())
+    if not match:
+        return None
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+def _parse_selector(text: str) -> Optional[Tuple[str, Dict[str, str], Optional[float]]]:
+    match = _SELECTOR.match(text.strip())
+    if not match:
+        return None
+    labels: Dict[str, str] = {}
+    if match.group("labels"):
+        for part in match.group("labels").split(","):
+            if not part.strip():
+                continue
+            # 只支援等值比對，正規表示式與不等比對無法在本地評估
+            matcher = _LABEL_MATCHER.match(part)
+            if not matcher:
+                return None
+            labels[matcher.group(1)] = matcher.group(2)
+    window = None
+    if match.group("window"):
+        window = _parse_duration(match.group("window"))
+        if window is None:
+            return None
+    return match.group("name"), labels, window
+
+
+@lru_cache(maxsize=1024)
+def parse_query(expr: str) -> Optional[MetricQuery]:
+    """解析指標查詢表達式
+
+    Args:
+        expr: PromQL 子集表達式（不含比較運算子與閾值）
+
+    Returns:
+        Optional[MetricQuery]: 解析結果，不支援的表達式返回 None
+    """
+    expr = expr.strip()
+    function = _FUNCTION.match(expr)
+    if function is None:
+        selector = _parse_selector(expr)
+        if selector is None:
+            return None
+        name, labels, window = selector
+        return MetricQuery("last", name, labels, window)
+
+    func, args = function.group("func"), function.group("args").strip()
+    if func in ("histogram_quantile", "quantile_over_time"):
+        q_text, _, inner = args.partition(",")
+        try:
+            q = float(q_text)
+        except ValueError:
+            return None
+        inner = inner.strip()
+        if func == "histogram_quantile":
+            # 接受 histogram_quantile(q, x_bucket) 與 histogram_quantile(q, rate(x_bucket[w]))
+            nested = _FUNCTION.match(inner)
+            if nested is not None:
+                if nested.group("func") != "rate":
+                    return None
+                inner = nested.group("args")
+        selector = _parse_selector(inner)
+        if selector is None:
+            return None
+        name, labels, window = selector
+        if func == "histogram_quantile" and name.endswith("_bucket"):
+            name = name[: -len("_bucket")]
+        return MetricQuery("quantile", name, labels, window, q)
+
+    if func in _OVER_TIME:
+        selector = _parse_selector(args)
+        if selector is None:
+            return None
+        name, labels, window = selector
+        return MetricQuery(_OVER_TIME[func], name, labels, window)
+
+    return None
+
+
+class MetricsStore:
+    """程序內時間序列指標儲存
+
+    Attributes:
+        resolution: 時間桶寬度（秒）
+        slots: 每個序列的時間桶數量，保留時間為 resolution * slots
+        max_series: 序列數量上限，超過時不再建立新序列
+    """
+
+    def __init__(
+        self, resolution: float = 1.0, slots: int = 600, max_series: int = 10000
+    ):
+        """初始化指標儲存
+
+        Args:
+            resolution: 時間桶寬度（秒）
+            slots: 每個序列的時間桶數量
+            max_series: 序列數量上限
+        """
+        self.resolution = resolution
+        self.slots = slots
+        self.max_series = max_series
+        self._kinds: Dict[str, str] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._series: Dict[str, Dict[LabelKey, _Series]] = {}
+        self._series_count = 0
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    @property
+    def retention(self) -> float:
+        """資料保留時間（秒）"""
+        return self.resolution * self.slots
+
+    def register(
+        self,
+        name: str,
+        kind: str = "gauge",
+        buckets: Optional[Sequence[float]] = None,
+    ) -> None:
+        """註冊指標
+
+        未註冊的指標在第一次寫入時依寫入方法自動註冊。
+
+        Args:
+            name: 指標名稱
+            kind: 指標類型（counter、gauge 或 histogram）
+            buckets: 直方圖分桶上界，預設為 DEFAULT_BUCKETS
+
+        Raises:
+            ValueError: 指標類型不支援時
+        """
+        if kind not in METRIC_KINDS:
+            raise ValueError(f"不支援的指標類型: {kind}")
+        with self._lock:
+            self._kinds[name] = kind
+            if kind == "histogram":
+                self._buckets[name] = tuple(sorted(buckets or DEFAULT_BUCKETS))
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict[str, str]] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """記錄一筆直方圖觀測值（例如延遲）
+
+        Args:
+            name: 指標名稱
+            value: 觀測值
+            labels: 標籤
+            timestamp: 時間戳，預設為目前時間
+        """
+        self._record(name, "histogram", value, labels, timestamp)
+
+    def inc(
+        self,
+        name: str,
+        amount: float = 1.0,
+        labels: Optional[Dict[str, str]] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """增加計數器
+
+        Args:
+            name: 指標名稱
+            amount: 增加量
+            labels: 標籤
+            timestamp: 時間戳，預設為目前時間
+        """
+        self._record(name, "counter", amount, labels, timestamp)
+
+    def set(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict[str, str]] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """設定量測值
+
+        Args:
+            name: 指標名稱
+            value: 目前值
+            labels: 標籤
+            timestamp: 時間戳，預設為目前時間
+        """
+        self._record(name, "gauge", value, labels, timestamp)
+
+    def _record(
+        self,
+        name: str,
+        kind: str,
+        value: float,
+        labels: Optional[Dict[str, str]],
+        timestamp: Optional[float],
+    ) -> None:
+        now = time.time() if timestamp is None else timestamp
+        epoch = int(now // self.resolution)
+        key = _label_key(labels)
+        value = float(value)
+        with self._lock:
+            by_labels = self._series.get(name)
+            if by_labels is None:
+                self._kinds.setdefault(name, kind)
+                if self._kinds[name] == "histogram":
+                    self._buckets.setdefault(name, DEFAULT_BUCKETS)
+                by_labels = self._series[name] = {}
+            series = by_labels.get(key)
+            if series is None:
+                if self._series_count >= self.max_series:
+                    self._dropped += 1
+                    if self._dropped == 1:
+                        module_logger.warning(
+                            "指標序列數量已達上限 %d，新序列將被捨棄", self.max_series
+                        )
+                    return
+                series = by_labels[key] = _Series(
+                    self.slots, self._kinds[name] == "histogram"
+                )
+                self._series_count += 1
+            bucket = -1
+            if series.hists is not None:
+                bucket = bisect.bisect_left(self._buckets[name], value)
+            series.add(epoch, value, now, bucket)
+
+    def _matching(self, name: str, labels: Optional[Dict[str, str]]) -> List[_Series]:
+        by_labels = self._series.get(name)
+        if not by_labels:
+            return []
+        if not labels:
+            return list(by_labels.values())
+        wanted = set(_label_key(labels))
+        return [s for key, s in by_labels.items() if wanted.issubset(key)]
+
+    def aggregate(
+        self,
+        name: str,
+        func: str,
+        window: Optional[float] = None,
+        labels: Optional[Dict[str, str]] = None,
+        q: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> Optional[float]:
+        """計算時間窗口內的聚合值
+
+        符合標籤條件的所有序列合併計算；``last`` 在多個序列時取最大值，
+        與「任一序列超過閾值即告警」的語意一致。
+
+        Args:
+            name: 指標名稱
+            func: 聚合函數，``quantile`` 或 AGGREGATIONS 之一
+            window: 時間窗口（秒），預設為 DEFAULT_WINDOW
+            labels: 標籤等值條件
+            q: 分位數（0~1），僅 ``quantile`` 使用
+            now: 目前時間，預設為 time.time()
+
+        Returns:
+            Optional[float]: 聚合值，窗口內沒有資料時返回 None
+
+        Raises:
+            ValueError: 聚合函數不支援時
+        """
+        if func != "quantile" and func not in AGGREGATIONS:
+            raise ValueError(f"不支援的聚合函數: {func}")
+        now = time.time() if now is None else now
+        window = DEFAULT_WINDOW if window is None else window
+        # 窗口涵蓋與 [now - window, now] 重疊的所有時間桶
+        last_epoch = int(now // self.resolution)
+        first_epoch = int((now - window) // self.resolution)
+
+        with self._lock:
+            matching = self._matching(name, labels)
+            if func == "last":
+                values = [
+                    s.last
+                    for s in matching
+                    if s.last is not None and now - s.last_time <= max(window, 0)
+                ]
+                return max(values) if values else None
+
+            count = 0
+            total = 0.0
+            high = -math.inf
+            low = math.inf
+            merged: Dict[int, int] = {}
+            for series in matching:
+                for i in series.slots_in_window(first_epoch, last_epoch):
+                    count += series.counts[i]
+                    total += series.sums[i]
+                    high = max(high, series.maxs[i])
+                    low = min(low, series.mins[i])
+                    if func == "quantile" and series.hists is not None:
+                        hist = series.hists[i]
+                        if hist:
+                            for bucket, n in hist.items():
+                                merged[bucket] = merged.get(bucket, 0) + n
+            kind = self._kinds.get(name)
+            buckets = self._buckets.get(name, ())
+
+        if func == "rate":
+            # 計數器為每秒增加量，其他指標為每秒事件數
+            return (total if kind == "counter" else count) / window
+        if func == "increase":
+            return total if kind == "counter" else float(count)
+        if func == "count":
+            return float(count)
+        if count == 0:
+            return None
+        if func == "sum":
+            return total
+        if func == "avg":
+            return total / count
+        if func == "max":
+            return high
+        if func == "min":
+            return low
+        return self._quantile(q if q is not None else 0.5, merged, buckets, high)
+
+    @staticmethod
+    def _quantile(
+        q: float, merged: Dict[int, int], buckets: Tuple[float, ...], high: float
+    ) -> Optional[float]:
+        """依分桶計數以線性內插估計分位數（同 histogram_quantile）"""
+        total = sum(merged.values())
+        if total == 0:
+            return None
+        rank = q * total
+        cumulative = 0
+        for bucket in sorted(merged):
+            n = merged[bucket]
+            if cumulative + n >= rank:
+                if bucket >= len(buckets):
+                    # 超過最大分桶時以窗口最大值為上界
+                    return high
+                upper = buckets[bucket]
+                lower = buckets[bucket - 1] if bucket > 0 else min(0.0, upper)
+                return lower + (upper - lower) * (rank - cumulative) / n
+            cumulative += n
+        return high
+
+    def evaluate(self, expr: str, now: Optional[float] = None) -> Optional[float]:
+        """評估查詢表達式
+
+        Args:
+            expr: 查詢表達式，語法見 parse_query
+            now: 目前時間，預設為 time.time()
+
+        Returns:
+            Optional[float]: 查詢結果，表達式不支援或沒有資料時返回 None
+        """
+        query = parse_query(expr)
+        if query is None:
+            return None
+        window = query.window
+        if query.func == "last" and window is None:
+            window = self.retention
+        return self.aggregate(
+            query.name, query.func, window, query.labels, query.q, now
+        )
+
+    def last_values(
+        self, name: str, labels: Optional[Dict[str, str]] = None
+    ) -> Dict[LabelKey, float]:
+        """取得各序列的最新值
+
+        Args:
+            name: 指標名稱
+            labels: 標籤等值條件
+
+        Returns:
+            Dict[LabelKey, float]: 標籤元組與最新值的對照
+        """
+        wanted = set(_label_key(labels))
+        with self._lock:
+            return {
+                key: series.last
+                for key, series in self._series.get(name, {}).items()
+                if series.last is not None and wanted.issubset(key)
+            }
+
+    def label_sets(self, name: str) -> List[Dict[str, str]]:
+        """列出指標的所有標籤組合
+
+        Args:
+            name: 指標名稱
+
+        Returns:
+            List[Dict[str, str]]: 標籤字典列表
+        """
+        with self._lock:
+            return [dict(key) for key in self._series.get(name, {})]
+
+    def get_stats(self) -> Dict[str, int]:
+        """取得儲存統計
+
+        Returns:
+            Dict[str, int]: 指標數、序列數與因超過上限而捨棄的寫入數
+        """
+        with self._lock:
+            return {
+                "metrics": len(self._series),
+                "series": self._series_count,
+                "dropped": self._dropped,
+            }
+
+    def clear(self) -> None:
+        """清除所有序列"""
+        with self._lock:
+            self._series.clear()
+            self._series_count = 0
+            self._dropped = 0
+
+
+# 全域指標儲存
+metrics_store = MetricsStore()
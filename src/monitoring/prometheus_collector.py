@@ -286,6 +286,30 @@ class PrometheusCollector:
         """
         return self.collectors.get(name)
 
+    def record_trading_order(
+        self,
+        order_type: str,
+        status: str,
+        latency: Optional[float] = None,
+        symbol: str = "unknown",
+    ) -> None:
+        """記錄交易訂單
+
+        Args:
+            order_type: 訂單類型
+            status: 訂單狀態
+            latency: 訂單延遲（毫秒）
+            symbol: 交易標的
+        """
+        collector = self.collectors.get("trading")
+        if collector is None:
+            module_logger.warning("交易指標收集器不可用")
+            return
+
+        collector.record_order(order_type, symbol, status)
+        if latency is not None:
+            collector.record_order_latency(latency, order_type, symbol)
+
     def get_metric_names(self) -> List[str]:
         """獲取所有已註冊的指標名稱
 
@@ -1,11 +1,12 @@
 """系統資源指標收集器
 
 此模組實現系統資源指標的收集，包括 CPU、記憶體、磁碟、網路等。
+使用率與負載同時寫入本地指標儲存（metrics_store），供告警規則即時評估。
 """
 
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 try:
     import psutil
@@ -18,6 +19,8 @@ except ImportError:
     Gauge = None
     Counter = None
 
+from src.monitoring.metrics_store import MetricsStore, metrics_store
+
 from .base import PrometheusCollectorBase
 
 # 設置模組日誌
@@ -34,13 +37,17 @@ class SystemMetricsCollector(PrometheusCollectorBase):
         memory_usage: 記憶體使用率指標
         disk_usage: 磁碟使用率指標
         network_bytes: 網路流量指標
+        store: 本地指標儲存
     """
 
-    def __init__(self, collection_interval: int = 15):
+    def __init__(
+        self, collection_interval: int = 15, store: Optional[MetricsStore] = None
+    ):
         """初始化系統資源指標收集器
 
         Args:
             collection_interval: 指標收集間隔，預設 15 秒
+            store: 本地指標儲存，預設為全域的 metrics_store
 
         Raises:
             ImportError: 當必要套件未安裝時
@@ -51,6 +58,7 @@ class SystemMetricsCollector(PrometheusCollectorBase):
             raise ImportError("prometheus_client 套件未安裝")
 
         super().__init__(collection_interval)
+        self.store = store if store is not None else metrics_store
         self._init_metrics()
 
     def _init_metrics(self) -> None:
@@ -173,6 +181,7 @@ class SystemMetricsCollector(PrometheusCollectorBase):
         try:
             cpu_percent = psutil.cpu_percent(interval=1)
             self.metrics["cpu_usage"].set(cpu_percent)
+            self.store.set("system_cpu_usage_percent", cpu_percent)
         except Exception as e:
             module_logger.error("收集 CPU 指標失敗: %s", e)
 
@@ -181,6 +190,7 @@ class SystemMetricsCollector(PrometheusCollectorBase):
         try:
             memory = psutil.virtual_memory()
             self.metrics["memory_usage"].set(memory.percent)
+            self.store.set("system_memory_usage_percent", memory.percent)
             self.metrics["memory_used_bytes"].set(memory.used)
             self.metrics["memory_total_bytes"].set(memory.total)
         except Exception as e:
@@ -194,8 +204,10 @@ class SystemMetricsCollector(PrometheusCollectorBase):
                 try:
                     usage = psutil.disk_usage(partition.mountpoint)
                     device = partition.device.replace(":", "").replace("\\", "")
-                    self.metrics["disk_usage"].labels(device=device).set(
-                        (usage.used / usage.total) * 100
+                    percent = (usage.used / usage.total) * 100
+                    self.metrics["disk_usage"].labels(device=device).set(percent)
+                    self.store.set(
+                        "system_disk_usage_percent", percent, {"device": device}
                     )
                 except (PermissionError, FileNotFoundError):
                     continue
@@ -234,6 +246,7 @@ class SystemMetricsCollector(PrometheusCollectorBase):
         try:
             process_count = len(psutil.pids())
             self.metrics["process_count"].set(process_count)
+            self.store.set("system_process_count", process_count)
         except Exception as e:
             module_logger.error("收集進程指標失敗: %s", e)
 
@@ -245,5 +258,7 @@ class SystemMetricsCollector(PrometheusCollectorBase):
                 self.metrics["load_average"].labels(period="1m").set(load1)
                 self.metrics["load_average"].labels(period="5m").set(load5)
                 self.metrics["load_average"].labels(period="15m").set(load15)
+                for period, load in (("1m", load1), ("5m", load5), ("15m", load15)):
+                    self.store.set("system_load_average", load, {"period": period})
         except Exception as e:
             module_logger.error("收集系統負載指標失敗: %s", e)
@@ -1,10 +1,13 @@
 """交易效能指標收集器
 
 此模組實現交易相關指標的收集，包括訂單延遲、成交率、滑點統計等。
+
+記錄的數據同時寫入 Prometheus 指標與本地指標儲存（metrics_store），
+後者供告警規則以時間窗口即時評估。
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 try:
     from prometheus_client import Counter, Gauge, Histogram
@@ -13,11 +16,22 @@ except ImportError:
     Gauge = None
     Histogram = None
 
+from src.monitoring.metrics_store import MetricsStore, metrics_store
+
 from .base import PrometheusCollectorBase
 
 # 設置模組日誌
 module_logger = logging.getLogger(__name__)
 
+# 訂單延遲分桶（毫秒），Prometheus 直方圖與本地儲存共用
+ORDER_LATENCY_BUCKETS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# 滑點分桶（基點）
+SLIPPAGE_BUCKETS = [0.1, 0.5, 1, 2, 5, 10, 25, 50, 100]
+
+# 計算成交率的時間窗口（秒）
+FILL_RATE_WINDOW = 300
+
 
 class TradingMetricsCollector(PrometheusCollectorBase):
     """交易效能指標收集器
@@ -29,13 +43,17 @@ class TradingMetricsCollector(PrometheusCollectorBase):
         order_count: 訂單數量計數器
         trade_volume: 交易量指標
         slippage: 滑點統計
+        store: 本地指標儲存
     """
 
-    def __init__(self, collection_interval: int = 15):
+    def __init__(
+        self, collection_interval: int = 15, store: Optional[MetricsStore] = None
+    ):
         """初始化交易效能指標收集器
 
         Args:
             collection_interval: 指標收集間隔，預設 15 秒
+            store: 本地指標儲存，預設為全域的 metrics_store
 
         Raises:
             ImportError: 當 prometheus_client 套件未安裝時
@@ -44,6 +62,7 @@ class TradingMetricsCollector(PrometheusCollectorBase):
             raise ImportError("prometheus_client 套件未安裝")
 
         super().__init__(collection_interval)
+        self.store = store if store is not None else metrics_store
         self._init_metrics()
 
     def _init_metrics(self) -> None:
@@ -54,7 +73,7 @@ class TradingMetricsCollector(PrometheusCollectorBase):
                 "trading_order_latency_milliseconds",
                 "訂單處理延遲時間（毫秒）",
                 ["order_type", "symbol"],
-                buckets=[1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000],
+                buckets=ORDER_LATENCY_BUCKETS,
                 registry=self.registry,
             )
 
@@ -87,7 +106,7 @@ class TradingMetricsCollector(PrometheusCollectorBase):
                 "trading_slippage_basis_points",
                 "交易滑點（基點）",
                 ["symbol", "side"],
-                buckets=[0.1, 0.5, 1, 2, 5, 10, 25, 50, 100],
+                buckets=SLIPPAGE_BUCKETS,
                 registry=self.registry,
             )
 
@@ -152,6 +171,18 @@ class TradingMetricsCollector(PrometheusCollectorBase):
                 registry=self.registry,
             )
 
+            self.store.register(
+                "trading_order_latency_milliseconds",
+                "histogram",
+                ORDER_LATENCY_BUCKETS,
+            )
+            self.store.register(
+                "trading_slippage_basis_points", "histogram", SLIPPAGE_BUCKETS
+            )
+            self.store.register("trading_orders_total", "counter")
+            self.store.register("trading_volume_total", "counter")
+            self.store.register("trading_trades_total", "counter")
+
             module_logger.info("交易效能指標初始化完成")
 
         except Exception as e:
@@ -161,13 +192,9 @@ class TradingMetricsCollector(PrometheusCollectorBase):
     def _collect_metrics(self) -> None:
         """收集交易效能指標
 
-        Note:
-            此方法需要與交易系統整合來獲取實際數據。
-            當前實現為示例，實際使用時需要連接到交易數據源。
+        由本地指標儲存中 record_* 寫入的原始數據推導彙總指標。
         """
         try:
-            # 這裡應該從交易系統獲取實際數據
-            # 當前為示例實現
             self._collect_order_metrics()
             self._collect_position_metrics()
             self._collect_pnl_metrics()
@@ -178,13 +205,32 @@ class TradingMetricsCollector(PrometheusCollectorBase):
     def _collect_order_metrics(self) -> None:
         """收集訂單相關指標
 
-        Note:
-            需要與訂單管理系統整合
+        以 FILL_RATE_WINDOW 內記錄的訂單計算各標的與訂單類型的成交率，
+        以及整體的訂單成功率 ``trading_order_success_rate``。
         """
         try:
-            # 示例：這裡應該從訂單管理系統獲取數據
-            # 實際實現時需要替換為真實的數據源
-            pass
+            totals: Dict[Tuple[str, str], float] = {}
+            filled: Dict[Tuple[str, str], float] = {}
+            for labels in self.store.label_sets("trading_orders_total"):
+                key = (labels.get("symbol", ""), labels.get("order_type", ""))
+                count = self.store.aggregate(
+                    "trading_orders_total", "increase", FILL_RATE_WINDOW, labels
+                )
+                totals[key] = totals.get(key, 0.0) + count
+                if labels.get("status") == "filled":
+                    filled[key] = filled.get(key, 0.0) + count
+
+            for (symbol, order_type), total in totals.items():
+                if total > 0:
+                    self.metrics["fill_rate"].labels(
+                        symbol=symbol, order_type=order_type
+                    ).set(filled.get((symbol, order_type), 0.0) / total * 100)
+
+            total = sum(totals.values())
+            if total > 0:
+                self.store.set(
+                    "trading_order_success_rate", sum(filled.values()) / total * 100
+                )
 
         except Exception as e:
             module_logger.error("收集訂單指標失敗: %s", e)
@@ -192,13 +238,12 @@ class TradingMetricsCollector(PrometheusCollectorBase):
     def _collect_position_metrics(self) -> None:
         """收集持倉相關指標
 
-        Note:
-            需要與持倉管理系統整合
+        彙總各標的最新持倉價值為 ``trading_position_value_total``。
         """
         try:
-            # 示例：這裡應該從持倉管理系統獲取數據
-            # 實際實現時需要替換為真實的數據源
-            pass
+            values = self.store.last_values("trading_position_value")
+            if values:
+                self.store.set("trading_position_value_total", sum(values.values()))
 
         except Exception as e:
             module_logger.error("收集持倉指標失敗: %s", e)
@@ -206,17 +251,46 @@ class TradingMetricsCollector(PrometheusCollectorBase):
     def _collect_pnl_metrics(self) -> None:
         """收集盈虧相關指標
 
-        Note:
-            需要與盈虧計算系統整合
+        彙總各標的最新未實現盈虧為 ``trading_unrealized_pnl_total``。
         """
         try:
-            # 示例：這裡應該從盈虧計算系統獲取數據
-            # 實際實現時需要替換為真實的數據源
-            pass
+            values = self.store.last_values("trading_unrealized_pnl")
+            if values:
+                self.store.set("trading_unrealized_pnl_total", sum(values.values()))
 
         except Exception as e:
             module_logger.error("收集盈虧指標失敗: %s", e)
 
+    def record_order(
+        self,
+        order_type: str,
+        symbol: str,
+        status: str,
+        reason: Optional[str] = None,
+    ) -> None:
+        """記錄訂單的最終狀態
+
+        Args:
+            order_type: 訂單類型
+            symbol: 交易標的
+            status: 訂單狀態（filled、rejected、cancelled 等）
+            reason: 拒絕或取消原因
+        """
+        try:
+            labels = {"order_type": order_type, "symbol": symbol, "status": status}
+            self.store.inc("trading_orders_total", 1, labels)
+            self.metrics["order_count"].labels(**labels).inc()
+            if status == "rejected":
+                self.metrics["rejected_orders"].labels(
+                    symbol=symbol, reason=reason or "unknown"
+                ).inc()
+            elif status == "cancelled":
+                self.metrics["cancelled_orders"].labels(
+                    symbol=symbol, reason=reason or "unknown"
+                ).inc()
+        except Exception as e:
+            module_logger.error("記錄訂單失敗: %s", e)
+
     def record_order_latency(
         self, latency_ms: float, order_type: str, symbol: str
     ) -> None:
@@ -228,6 +302,11 @@ class TradingMetricsCollector(PrometheusCollectorBase):
             symbol: 交易標的
         """
         try:
+            self.store.observe(
+                "trading_order_latency_milliseconds",
+                latency_ms,
+                {"order_type": order_type, "symbol": symbol},
+            )
             self.metrics["order_latency"].labels(
                 order_type=order_type, symbol=symbol
             ).observe(latency_ms)
@@ -252,6 +331,12 @@ class TradingMetricsCollector(PrometheusCollectorBase):
             slippage_bp: 滑點（基點）
         """
         try:
+            labels = {"symbol": symbol, "side": side}
+            self.store.inc("trading_volume_total", volume * price, labels)
+            self.store.inc("trading_trades_total", 1, labels)
+            if slippage_bp is not None:
+                self.store.observe("trading_slippage_basis_points", slippage_bp, labels)
+
             # 記錄交易量和數量
             self.metrics["trade_volume"].labels(symbol=symbol, side=side).inc(
                 volume * price
@@ -277,6 +362,8 @@ class TradingMetricsCollector(PrometheusCollectorBase):
             pnl: 未實現盈虧
         """
         try:
+            self.store.set("trading_position_value", value, {"symbol": symbol})
+            self.store.set("trading_unrealized_pnl", pnl, {"symbol": symbol})
             self.metrics["position_value"].labels(symbol=symbol).set(value)
             self.metrics["unrealized_pnl"].labels(symbol=symbol).set(pnl)
         except Exception as e:
@@ -0,0 +1,318 @@
+"""效率前緣計算引擎
+
+此模組計算只做多（權重非負、總和為 1）的均值變異數效率前緣：
+
+- 以主動集合法求解每個目標報酬率的二次規劃，每次迭代只解一個 KKT 線性系統
+- 目標報酬率由低到高依序求解，每個點以前一個點的解與最高報酬資產的組合作為
+  可行起點，主動集合通常只需調整少數資產
+- 也可改用 SLSQP，並提供目標函數與約束的解析梯度
+- 以預期報酬率與共變異數矩陣的雜湊快取結果，重複計算同一組輸入時直接返回
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+# 可選依賴處理
+try:
+    import scipy.optimize as sco
+
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    sco = None
+
+# 設定日誌
+logger = logging.getLogger(__name__)
+
+# 支援的求解方法
+FRONTIER_METHODS = ("active_set", "slsqp")
+
+
+@dataclass
+class FrontierResult:
+    """效率前緣計算結果
+
+    Attributes:
+        returns: 各點的目標報酬率
+        volatility: 各點的波動率
+        weights: 各點的權重，形狀為 (點數, 資產數)
+    """
+
+    returns: np.ndarray
+    volatility: np.ndarray
+    weights: np.ndarray
+
+    def copy(self) -> "FrontierResult":
+        """複製結果，避免呼叫端修改快取內容"""
+        return FrontierResult(
+            self.returns.copy(), self.volatility.copy(), self.weights.copy()
+        )
+
+
+def _solve_equality_qp(
+    cov: np.ndarray, A: np.ndarray, b: np.ndarray, free: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """在固定為 0 的資產之外求解等式約束二次規劃
+
+    求解 min ½xᵀΣx s.t. Ax = b，且不在 free 中的 x 為 0。
+
+    Args:
+        cov: 共變異數矩陣
+        A: 等式約束矩陣
+        b: 等式約束右側
+        free: 可變動資產的布林遮罩
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 權重，以及所有資產的邊界乘數
+    """
+    n_free = int(free.sum())
+    k = len(b)
+    cov_ff = cov[np.ix_(free, free)]
+    a_f = A[:, free]
+
+    kkt = np.zeros((n_free + k, n_free + k))
+    kkt[:n_free, :n_free] = cov_ff
+    kkt[:n_free, n_free:] = a_f.T
+    kkt[n_free:, :n_free] = a_f
+    rhs = np.concatenate([np.zeros(n_free), b])
+    try:
+        solution = np.linalg.solve(kkt, rhs)
+    except np.linalg.LinAlgError:
+        # 可變動資產的報酬率相同時報酬約束與預算約束線性相依
+        solution = np.linalg.lstsq(kkt, rhs, rcond=None)[0]
+
+    x = np.zeros(len(free))
+    x[free] = solution[:n_free]
+    # 平穩條件 Σx + Aᵀz - ν = 0，固定為 0 的資產需要 ν ≥ 0
+    multipliers = cov @ x + A.T @ solution[n_free:]
+    return x, multipliers
+
+
+def active_set_qp(
+    cov: np.ndarray,
+    A: np.ndarray,
+    b: np.ndarray,
+    x0: np.ndarray,
+    max_iter: Optional[int] = None,
+    tol: float = 1e-10,
+) -> Optional[np.ndarray]:
+    """以主動集合法求解只做多的二次規劃
+
+    求解 min ½xᵀΣx s.t. Ax = b, x ≥ 0。
+
+    Args:
+        cov: 共變異數矩陣
+        A: 等式約束矩陣
+        b: 等式約束右側
+        x0: 可行起點，為 0 的資產作為初始主動集合
+        max_iter: 最大迭代次數，預設為資產數的 10 倍
+        tol: 數值容許誤差
+
+    Returns:
+        Optional[np.ndarray]: 最佳權重，未收斂時返回 None
+    """
+    n = len(x0)
+    x = np.maximum(np.asarray(x0, dtype=float), 0.0)
+    free = x > tol
+    x[~free] = 0.0
+    dual_tol = tol * max(1.0, float(np.abs(np.diag(cov)).max()))
+
+    for _ in range(max_iter or 10 * n):
+        target, multipliers = _solve_equality_qp(cov, A, b, free)
+        step = target - x
+
+        if np.abs(step).max() <= tol:
+            # 已是目前主動集合下的最佳解，檢查固定資產的乘數
+            bound = np.flatnonzero(~free)
+            if len(bound) == 0:
+                return target
+            worst = bound[np.argmin(multipliers[bound])]
+            if multipliers[worst] >= -dual_tol:
+                return target
+            free[worst] = True
+            x = target
+            continue
+
+        # 沿步進方向前進，直到第一個權重觸及 0
+        decreasing = free & (step < -tol)
+        alpha = 1.0
+        blocking = -1
+        if decreasing.any():
+            candidates = np.flatnonzero(decreasing)
+            ratios = -x[candidates] / step[candidates]
+            index = int(np.argmin(ratios))
+            if ratios[index] < 1.0:
+                alpha = float(ratios[index])
+                blocking = int(candidates[index])
+
+        x = x + alpha * step
+        if blocking >= 0:
+            x[blocking] = 0.0
+            free[blocking] = False
+        x[~free] = 0.0
+
+    return None
+
+
+class EfficientFrontierEngine:
+    """效率前緣計算引擎
+
+    Attributes:
+        method: 求解方法，"active_set" 或 "slsqp"
+        cache_size: 快取的前緣數
+    """
+
+    def __init__(self, method: str = "active_set", cache_size: int = 32):
+        """初始化效率前緣計算引擎
+
+        Args:
+            method: 求解方法，"active_set" 或 "slsqp"
+            cache_size: 快取的前緣數
+
+        Raises:
+            ValueError: 不支援的求解方法
+        """
+        if method not in FRONTIER_METHODS:
+            raise ValueError(f"不支援的求解方法: {method}")
+        self.method = method
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, FrontierResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(
+        expected_returns: np.ndarray,
+        cov_matrix: np.ndarray,
+        num_points: int,
+        method: str,
+    ) -> str:
+        """以輸入內容計算快取鍵"""
+        digest = hashlib.sha1()
+        for array in (expected_returns, cov_matrix):
+            array = np.ascontiguousarray(array, dtype=np.float64)
+            digest.update(str(array.shape).encode())
+            digest.update(array.tobytes())
+        digest.update(f"{num_points}:{method}".encode())
+        return digest.hexdigest()
+
+    def compute(
+        self,
+        expected_returns: np.ndarray,
+        cov_matrix: np.ndarray,
+        num_points: int = 100,
+    ) -> FrontierResult:
+        """計算效率前緣
+
+        Args:
+            expected_returns: 預期報酬率向量
+            cov_matrix: 共變異數矩陣
+            num_points: 前緣點數
+
+        Returns:
+            FrontierResult: 由最小變異數組合到最高報酬資產的前緣
+        """
+        mu = np.asarray(expected_returns, dtype=float).ravel()
+        cov = np.asarray(cov_matrix, dtype=float)
+        key = self.cache_key(mu, cov, num_points, self.method)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached.copy()
+            self.misses += 1
+
+        result = self._compute(mu, cov, num_points)
+
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result.copy()
+
+    def clear_cache(self) -> None:
+        """清除快取"""
+        with self._lock:
+            self._cache.clear()
+
+    def _compute(
+        self, mu: np.ndarray, cov: np.ndarray, num_points: int
+    ) -> FrontierResult:
+        n_assets = len(mu)
+        budget = np.ones((1, n_assets))
+
+        # 前緣起點為最小變異數組合，終點為報酬率最高的資產
+        min_var = self._solve(cov, budget, np.ones(1), np.full(n_assets, 1 / n_assets))
+        if min_var is None:
+            raise RuntimeError("最小變異數組合求解失敗")
+        top = int(np.argmax(mu))
+        target_returns = np.linspace(mu @ min_var, mu[top], num_points)
+
+        A = np.vstack([np.ones(n_assets), mu])
+        weights = np.full((num_points, n_assets), np.nan)
+        previous, previous_return = min_var, float(mu @ min_var)
+
+        for i, target in enumerate(target_returns):
+            # 前一個點與最高報酬資產的凸組合恰好達到目標報酬率，作為可行起點
+            x0 = previous.copy()
+            span = mu[top] - previous_return
+            if span > 0:
+                t = min(max((target - previous_return) / span, 0.0), 1.0)
+                x0 *= 1 - t
+                x0[top] += t
+
+            w = self._solve(cov, A, np.array([1.0, target]), x0)
+            if w is None:
+                logger.warning("效率前緣第 %d 點求解失敗，目標報酬率 %.6f", i, target)
+                continue
+            weights[i] = w
+            previous, previous_return = w, float(mu @ w)
+
+        variance = np.einsum("ij,jk,ik->i", weights, cov, weights)
+        volatility = np.sqrt(np.maximum(variance, 0.0))
+        return FrontierResult(target_returns, volatility, weights)
+
+    def _solve(
+        self, cov: np.ndarray, A: np.ndarray, b: np.ndarray, x0: np.ndarray
+    ) -> Optional[np.ndarray]:
+        if self.method == "active_set":
+            w = active_set_qp(cov, A, b, x0)
+            if w is not None:
+                return w
+            logger.debug("主動集合法未收斂，改用 SLSQP")
+        return self._solve_slsqp(cov, A, b, x0)
+
+    @staticmethod
+    def _solve_slsqp(
+        cov: np.ndarray, A: np.ndarray, b: np.ndarray, x0: np.ndarray
+    ) -> Optional[np.ndarray]:
+        """以 SLSQP 與解析梯度求解，x0 為暖啟動起點"""
+        if not SCIPY_AVAILABLE:
+            logger.error("scipy 不可用，無法使用 SLSQP 求解")
+            return None
+
+        result = sco.minimize(
+            lambda w: w @ cov @ w,
+            x0=x0,
+            jac=lambda w: 2 * cov @ w,
+            method="SLSQP",
+            bounds=[(0.0, 1.0)] * len(x0),
+            constraints=[
+                {"type": "eq", "fun": lambda w: A @ w - b, "jac": lambda w: A}
+            ],
+            options={"maxiter": 500, "ftol": 1e-12},
+        )
+        return result.x if result.success else None
+
+
+# 全域計算引擎，讓重新建立的分析器共用快取
+frontier_engine = EfficientFrontierEngine()
@@ -0,0 +1,587 @@
+"""投資組合最佳化核心
+
+此模組集中實作各服務共用的權重最佳化：
+
+- 最小變異數、均值變異數、最大夏普比率與風險平價目標函數，皆提供解析梯度
+- Ledoit-Wolf 收縮共變異數估計，可一次估計多個日期或投資組合
+- 單一問題以 SLSQP 搭配解析梯度求解，並以輸入內容的雜湊快取結果
+- 多個同規模問題可批次求解，二次目標以向量化的加速投影梯度法一次迭代所有問題
+
+權重限制為總和為 1 且介於上下限之間，上下限可為所有資產共用的 (下限, 上限)，
+或每個資產各自的上下限序列。
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# 可選依賴處理
+try:
+    import scipy.optimize as sco
+
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    sco = None
+
+# 設定日誌
+logger = logging.getLogger(__name__)
+
+# 支援的最佳化目標
+OPTIMIZATION_OBJECTIVES = ("min_variance", "mean_variance", "max_sharpe", "risk_parity")
+
+# 可以向量化批次求解的二次目標
+QUADRATIC_OBJECTIVES = ("min_variance", "mean_variance")
+
+# 年化交易日數
+TRADING_DAYS = 252
+
+Bounds = Union[Tuple[float, float], Sequence[Tuple[float, float]]]
+
+
+@dataclass
+class OptimizationResult:
+    """最佳化結果
+
+    Attributes:
+        weights: 最佳權重，未成功時為求解器最後的權重
+        success: 是否收斂
+        fun: 目標函數值
+        message: 求解器訊息
+    """
+
+    weights: np.ndarray
+    success: bool
+    fun: float
+    message: str = ""
+
+    def copy(self) -> "OptimizationResult":
+        """複製結果，避免呼叫端修改快取內容"""
+        return OptimizationResult(
+            self.weights.copy(), self.success, self.fun, self.message
+        )
+
+
+def ledoit_wolf_covariance(
+    returns: np.ndarray, annualization: float = TRADING_DAYS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Ledoit-Wolf 收縮共變異數估計
+
+    將樣本共變異數往等變異數對角矩陣收縮，收縮強度依 Ledoit & Wolf (2004)
+    的公式由資料估計。樣本數相對資產數少時比樣本共變異數穩定，矩陣條件數
+    也較小，最佳化結果較不受估計誤差影響。
+
+    Args:
+        returns: 報酬率，形狀為 (期數, 資產數)，或 (問題數, 期數, 資產數) 一次
+            估計多個日期或投資組合
+        annualization: 年化倍數
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 年化共變異數矩陣與收縮強度
+    """
+    returns = np.asarray(returns, dtype=float)
+    n_samples, n_assets = returns.shape[-2:]
+    centered = returns - returns.mean(axis=-2, keepdims=True)
+
+    sample_cov = np.swapaxes(centered, -1, -2) @ centered / n_samples
+    mu = np.trace(sample_cov, axis1=-2, axis2=-1) / n_assets
+    squared_norm = np.square(sample_cov).sum(axis=(-2, -1))
+
+    # 樣本共變異數的估計誤差與其和收縮目標的距離
+    row_norms = np.square(np.square(centered).sum(axis=-1)).sum(axis=-1)
+    beta = (row_norms / n_samples - squared_norm) / (n_assets * n_samples)
+    delta = (squared_norm - n_assets * mu**2) / n_assets
+    beta = np.minimum(beta, delta)
+    shrinkage = np.divide(beta, delta, out=np.zeros_like(delta), where=delta > 0)
+
+    identity = np.eye(n_assets)
+    shrunk = (1 - shrinkage)[..., None, None] * sample_cov + (shrinkage * mu)[
+        ..., None, None
+    ] * identity
+    return shrunk * annualization, shrinkage
+
+
+def _pairwise_covariance(returns: np.ndarray, ddof: int = 1) -> np.ndarray:
+    """以兩兩皆有資料的期數估計樣本共變異數，與 ``DataFrame.cov()`` 相同
+
+    Args:
+        returns: 報酬率，形狀為 (期數, 資產數)，缺失值為 NaN
+        ddof: 自由度修正
+
+    Returns:
+        np.ndarray: 共變異數矩陣，重疊期數不足的資產對為 NaN
+    """
+    present = ~np.isnan(returns)
+    # 先減去各資產平均值，降低平方和相減的數值誤差
+    centered = np.where(present, returns - np.nanmean(returns, axis=0), 0.0)
+    weights = present.astype(float)
+
+    counts = weights.T @ weights
+    sums = centered.T @ weights
+    products = centered.T @ centered
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (products - sums * sums.T / counts) / (counts - ddof)
+    cov[counts <= ddof] = np.nan
+    return cov
+
+
+def estimate_moments(
+    returns: Union[pd.DataFrame, np.ndarray],
+    annualization: float = TRADING_DAYS,
+    shrink: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """估計年化預期報酬率與共變異數矩陣
+
+    再平衡時只需呼叫一次，結果可供多種最佳化目標共用。資料有缺失值時，
+    預期報酬率以各資產自身的期數估計，共變異數以兩兩皆有資料的期數估計，
+    歷史較短的資產不會縮減其他資產的樣本。
+
+    Args:
+        returns: 報酬率資料，列為期數、欄為資產，缺失值為 NaN
+        annualization: 年化倍數
+        shrink: 是否使用 Ledoit-Wolf 收縮，否則使用樣本共變異數。有缺失值時
+            收縮強度以缺失值補為資產平均值的資料估計
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 年化預期報酬率與共變異數矩陣
+    """
+    if isinstance(returns, pd.DataFrame):
+        returns = returns.to_numpy(dtype=float)
+    else:
+        returns = np.asarray(returns, dtype=float)
+
+    missing = np.isnan(returns)
+    if not missing.any():
+        expected_returns = returns.mean(axis=0) * annualization
+        if shrink:
+            cov, _ = ledoit_wolf_covariance(returns, annualization)
+        else:
+            cov = np.cov(returns, rowvar=False).reshape(returns.shape[1], -1)
+            cov = cov * annualization
+        return expected_returns, cov
+
+    means = np.nanmean(returns, axis=0)
+    expected_returns = means * annualization
+    if not shrink:
+        return expected_returns, _pairwise_covariance(returns) * annualization
+
+    _, shrinkage = ledoit_wolf_covariance(
+        np.where(missing, means, returns), annualization
+    )
+    sample_cov = _pairwise_covariance(returns, ddof=0)
+    mu = np.trace(sample_cov) / returns.shape[1]
+    cov = (1 - shrinkage) * sample_cov + shrinkage * mu * np.eye(returns.shape[1])
+    return expected_returns, cov * annualization
+
+
+def _bounds_arrays(bounds: Bounds, n_assets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """將上下限轉為下限與上限陣列"""
+    array = np.asarray(bounds, dtype=float)
+    if array.ndim == 1:
+        array = np.tile(array, (n_assets, 1))
+    return array[..., 0].copy(), array[..., 1].copy()
+
+
+def _min_variance(w, cov, mu, params):
+    grad = cov @ w
+    return w @ grad, 2 * grad
+
+
+def _mean_variance(w, cov, mu, params):
+    grad = cov @ w
+    risk_aversion = params["risk_aversion"]
+    value = -(mu @ w) + risk_aversion * (w @ grad)
+    return value, -mu + 2 * risk_aversion * grad
+
+
+def _max_sharpe(w, cov, mu, params):
+    grad = cov @ w
+    volatility = np.sqrt(max(w @ grad, 1e-18))
+    excess = mu @ w - params["risk_free_rate"]
+    value = -excess / volatility
+    return value, -mu / volatility + excess * grad / volatility**3
+
+
+def _risk_parity(w, cov, mu, params):
+    # 風險貢獻比例 r = w∘Σw / wᵀΣw 與 1/n 的偏差平方和
+    grad = cov @ w
+    variance = max(w @ grad, 1e-18)
+    deviation = w * grad / variance - 1.0 / len(w)
+    value = deviation @ deviation
+    gradient = (
+        2 * (deviation * grad + cov @ (deviation * w)) / variance
+        - 4 * (deviation @ (w * grad)) * grad / variance**2
+    )
+    return value, gradient
+
+
+_OBJECTIVE_FUNCTIONS = {
+    "min_variance": _min_variance,
+    "mean_variance": _mean_variance,
+    "max_sharpe": _max_sharpe,
+    "risk_parity": _risk_parity,
+}
+
+
+def objective_function(
+    objective: str,
+    cov_matrix: np.ndarray,
+    expected_returns: Optional[np.ndarray] = None,
+    risk_free_rate: float = 0.0,
+    risk_aversion: float = 1.0,
+):
+    """建立目標函數
+
+    Args:
+        objective: 最佳化目標
+        cov_matrix: 共變異數矩陣
+        expected_returns: 預期報酬率向量
+        risk_free_rate: 無風險利率，最大夏普比率使用
+        risk_aversion: 風險厭惡係數，均值變異數使用
+
+    Returns:
+        Callable: 輸入權重，返回 (目標函數值, 梯度)
+
+    Raises:
+        ValueError: 不支援的最佳化目標
+    """
+    if objective not in _OBJECTIVE_FUNCTIONS:
+        raise ValueError(f"不支援的最佳化目標: {objective}")
+    cov = np.asarray(cov_matrix, dtype=float)
+    if expected_returns is None:
+        mu = np.zeros(len(cov))
+    else:
+        mu = np.asarray(expected_returns, dtype=float).ravel()
+    params = {"risk_free_rate": risk_free_rate, "risk_aversion": risk_aversion}
+    function = _OBJECTIVE_FUNCTIONS[objective]
+    return lambda w: function(w, cov, mu, params)
+
+
+def project_to_bounded_simplex(
+    points: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    max_iter: int = 100,
+    tol: float = 1e-12,
+) -> np.ndarray:
+    """將每一列投影到 {Σw = 1, 下限 ≤ w ≤ 上限}
+
+    投影為 clip(v - τ, 下限, 上限)，其總和對 τ 分段線性遞減。所有列同時以
+    牛頓法求 τ，斜率為未觸及上下限的資產數；牛頓步落在括號區間外時改用二分，
+    通常數次迭代即可找到精確的 τ。
+
+    Args:
+        points: 要投影的點，形狀為 (問題數, 資產數)
+        lower: 下限，可廣播到 points
+        upper: 上限，可廣播到 points
+        max_iter: 最大迭代次數
+        tol: 權重總和與 1 的容許誤差
+
+    Returns:
+        np.ndarray: 投影後的點
+    """
+    low = (points - upper).min(axis=1)
+    high = (points - lower).max(axis=1)
+    tau = np.clip((points.sum(axis=1) - 1) / points.shape[1], low, high)
+    for _ in range(max_iter):
+        shifted = points - tau[:, None]
+        excess = np.clip(shifted, lower, upper).sum(axis=1) - 1
+        if np.abs(excess).max() <= tol:
+            break
+        low = np.where(excess > 0, tau, low)
+        high = np.where(excess < 0, tau, high)
+        n_free = ((shifted > lower) & (shifted < upper)).sum(axis=1)
+        newton = tau + excess / np.maximum(n_free, 1)
+        inside = (n_free > 0) & (newton > low) & (newton < high)
+        tau = np.where(inside, newton, 0.5 * (low + high))
+    return np.clip(points - tau[:, None], lower, upper)
+
+
+class PortfolioOptimizer:
+    """投資組合最佳化核心
+
+    Attributes:
+        cache_size: 快取的結果數
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        """初始化投資組合最佳化核心
+
+        Args:
+            cache_size: 快取的結果數
+        """
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, OptimizationResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(
+        objective: str,
+        cov_matrix: np.ndarray,
+        expected_returns: Optional[np.ndarray],
+        lower: np.ndarray,
+        upper: np.ndarray,
+        params: Tuple,
+    ) -> str:
+        """以輸入內容計算快取鍵"""
+        digest = hashlib.sha1(objective.encode())
+        for array in (cov_matrix, expected_returns, lower, upper):
+            if array is None:
+                digest.update(b"none")
+                continue
+            array = np.ascontiguousarray(array, dtype=np.float64)
+            digest.update(str(array.shape).encode())
+            digest.update(array.tobytes())
+        digest.update(repr(params).encode())
+        return digest.hexdigest()
+
+    def optimize(
+        self,
+        objective: str,
+        cov_matrix: np.ndarray,
+        expected_returns: Optional[np.ndarray] = None,
+        bounds: Bounds = (0.0, 1.0),
+        risk_free_rate: float = 0.0,
+        risk_aversion: float = 1.0,
+        target_return: Optional[float] = None,
+        x0: Optional[np.ndarray] = None,
+    ) -> OptimizationResult:
+        """求解單一投資組合的最佳權重
+
+        Args:
+            objective: 最佳化目標，見 OPTIMIZATION_OBJECTIVES
+            cov_matrix: 年化共變異數矩陣
+            expected_returns: 年化預期報酬率向量，均值變異數與最大夏普比率需要
+            bounds: 權重上下限
+            risk_free_rate: 無風險利率，最大夏普比率使用
+            risk_aversion: 風險厭惡係數，均值變異數未指定目標報酬率時使用
+            target_return: 目標報酬率，均值變異數指定時改為在此報酬率下最小化變異數
+            x0: 起始權重，預設為等權重，風險平價預設為波動率倒數權重
+
+        Returns:
+            OptimizationResult: 最佳化結果
+
+        Raises:
+            ValueError: 不支援的最佳化目標，或缺少預期報酬率
+        """
+        if objective not in OPTIMIZATION_OBJECTIVES:
+            raise ValueError(f"不支援的最佳化目標: {objective}")
+        cov = np.asarray(cov_matrix, dtype=float)
+        mu = None
+        if expected_returns is not None:
+            mu = np.asarray(expected_returns, dtype=float).ravel()
+        elif objective in ("mean_variance", "max_sharpe"):
+            raise ValueError(f"{objective} 需要預期報酬率")
+        lower, upper = _bounds_arrays(bounds, len(cov))
+        params = (risk_free_rate, risk_aversion, target_return)
+
+        key = None
+        if x0 is None:
+            key = self.cache_key(objective, cov, mu, lower, upper, params)
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return cached.copy()
+                self.misses += 1
+
+        result = self._solve(
+            objective,
+            cov,
+            mu,
+            lower,
+            upper,
+            risk_free_rate,
+            risk_aversion,
+            target_return,
+            x0,
+        )
+
+        if key is not None:
+            with self._lock:
+                self._cache[key] = result
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result.copy()
+
+    def optimize_batch(
+        self,
+        objective: str,
+        cov_matrices: np.ndarray,
+        expected_returns: Optional[np.ndarray] = None,
+        bounds: Bounds = (0.0, 1.0),
+        risk_free_rate: float = 0.0,
+        risk_aversion: float = 1.0,
+        target_return: Optional[float] = None,
+        max_iter: int = 5000,
+        tol: float = 1e-10,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """批次求解多個同資產數的問題，例如多個再平衡日期或多個投資組合
+
+        最小變異數與未指定目標報酬率的均值變異數以加速投影梯度法（FISTA，
+        搭配動量重啟）同時迭代所有問題，每次迭代只需一次批次矩陣乘法與投影；
+        其他目標逐一以 optimize 求解並共用快取。
+
+        Args:
+            objective: 最佳化目標
+            cov_matrices: 共變異數矩陣，形狀為 (問題數, 資產數, 資產數)
+            expected_returns: 預期報酬率，形狀為 (問題數, 資產數)
+            bounds: 所有問題共用的權重上下限
+            risk_free_rate: 無風險利率
+            risk_aversion: 風險厭惡係數
+            target_return: 目標報酬率
+            max_iter: 投影梯度法最大迭代次數
+            tol: 權重變化小於此值時視為收斂
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 權重 (問題數, 資產數) 與各問題是否收斂
+        """
+        covs = np.asarray(cov_matrices, dtype=float)
+        n_problems, n_assets = covs.shape[:2]
+        mu = None
+        if expected_returns is not None:
+            mu = np.asarray(expected_returns, dtype=float).reshape(n_problems, n_assets)
+
+        if objective not in QUADRATIC_OBJECTIVES or target_return is not None:
+            weights = np.empty((n_problems, n_assets))
+            success = np.zeros(n_problems, dtype=bool)
+            for i in range(n_problems):
+                result = self.optimize(
+                    objective,
+                    covs[i],
+                    None if mu is None else mu[i],
+                    bounds,
+                    risk_free_rate,
+                    risk_aversion,
+                    target_return,
+                )
+                weights[i], success[i] = result.weights, result.success
+            return weights, success
+
+        if objective == "min_variance":
+            quadratic, linear = covs, np.zeros((n_problems, n_assets))
+        elif mu is None:
+            raise ValueError("mean_variance 需要預期報酬率")
+        else:
+            quadratic, linear = covs * risk_aversion, mu
+        lower, upper = _bounds_arrays(bounds, n_assets)
+        return self._projected_gradient(quadratic, linear, lower, upper, max_iter, tol)
+
+    def clear_cache(self) -> None:
+        """清除快取"""
+        with self._lock:
+            self._cache.clear()
+
+    @staticmethod
+    def _solve(
+        objective: str,
+        cov: np.ndarray,
+        mu: Optional[np.ndarray],
+        lower: np.ndarray,
+        upper: np.ndarray,
+        risk_free_rate: float,
+        risk_aversion: float,
+        target_return: Optional[float],
+        x0: Optional[np.ndarray],
+    ) -> OptimizationResult:
+        n_assets = len(cov)
+        if x0 is None:
+            if objective == "risk_parity":
+                x0 = 1 / np.sqrt(np.maximum(np.diag(cov), 1e-18))
+                x0 = x0 / x0.sum()
+            else:
+                x0 = np.full(n_assets, 1.0 / n_assets)
+        if not SCIPY_AVAILABLE:
+            return OptimizationResult(
+                np.asarray(x0, dtype=float), False, np.nan, "scipy 不可用"
+            )
+
+        budget = np.ones(n_assets)
+        constraints = [
+            {"type": "eq", "fun": lambda w: w.sum() - 1, "jac": lambda w: budget}
+        ]
+        if objective == "mean_variance" and target_return is not None:
+            # 指定目標報酬率時在該報酬率下最小化變異數
+            objective = "min_variance"
+            constraints.append(
+                {
+                    "type": "eq",
+                    "fun": lambda w: mu @ w - target_return,
+                    "jac": lambda w: mu,
+                }
+            )
+
+        function = objective_function(objective, cov, mu, risk_free_rate, risk_aversion)
+        result = sco.minimize(
+            function,
+            x0=x0,
+            jac=True,
+            method="SLSQP",
+            bounds=list(zip(lower, upper)),
+            constraints=constraints,
+            options={"maxiter": 500, "ftol": 1e-12},
+        )
+        return OptimizationResult(
+            np.asarray(result.x, dtype=float),
+            bool(result.success),
+            float(result.fun),
+            str(result.message),
+        )
+
+    @staticmethod
+    def _projected_gradient(
+        quadratic: np.ndarray,
+        linear: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        max_iter: int,
+        tol: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """以 FISTA 同時求解 min wᵀQw - cᵀw"""
+        n_problems, n_assets = linear.shape
+        feasible = (lower.sum() <= 1 + 1e-12) & (upper.sum() >= 1 - 1e-12)
+        if not feasible:
+            weights = np.full((n_problems, n_assets), 1.0 / n_assets)
+            return weights, np.zeros(n_problems, dtype=bool)
+
+        # 梯度 2Qw - c 的 Lipschitz 常數為 2λmax(Q)
+        step = 1 / (2 * np.linalg.eigvalsh(quadratic)[:, -1])[:, None]
+        weights = project_to_bounded_simplex(
+            np.full((n_problems, n_assets), 1.0 / n_assets), lower, upper
+        )
+        momentum = weights.copy()
+        t = np.ones(n_problems)
+        converged = np.zeros(n_problems, dtype=bool)
+
+        for _ in range(max_iter):
+            gradient = 2 * (quadratic @ momentum[..., None])[..., 0] - linear
+            updated = project_to_bounded_simplex(
+                momentum - step * gradient, lower, upper
+            )
+            change = updated - weights
+            converged = np.abs(change).max(axis=1) <= tol
+            if converged.all():
+                weights = updated
+                break
+
+            # 動量方向與梯度方向相反時重啟，避免在谷底來回震盪
+            restart = np.einsum("ij,ij->i", momentum - updated, change) > 0
+            t = np.where(restart, 1.0, t)
+            t_next = (1 + np.sqrt(1 + 4 * t**2)) / 2
+            momentum = updated + ((t - 1) / t_next)[:, None] * change
+            weights, t = updated, t_next
+
+        return weights, converged
+
+
+# 全域最佳化核心，讓各服務共用快取
+portfolio_optimizer = PortfolioOptimizer()
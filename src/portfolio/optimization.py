@@ -8,24 +8,18 @@
 - Kelly 公式權重計算
 - 有效前緣計算
 
-這些函數可以被投資組合策略類別使用，也可以獨立調用。
+這些函數可以被投資組合策略類別使用，也可以獨立調用。求解委派給
+src.portfolio.kernel，共變異數以 Ledoit-Wolf 收縮估計。
 """
 
 from typing import Dict, List
 import logging
 
-import numpy as np
 import pandas as pd
 
-# 可選依賴處理
-try:
-    import scipy.optimize as sco
-
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
-    sco = None
+from .kernel import SCIPY_AVAILABLE, estimate_moments, portfolio_optimizer
 
+# 可選依賴處理
 try:
     from pypfopt import EfficientFrontier, expected_returns, risk_models
 
@@ -178,38 +172,23 @@ def mean_variance_optimization(
         if returns_subset.empty:
             return equal_weight(available_stocks)
 
-        # 計算期望收益率和協方差矩陣
-        expected_returns_vec = returns_subset.mean() * 252  # 年化
-        cov_matrix = returns_subset.cov() * 252  # 年化
-
         if not SCIPY_AVAILABLE:
             logger.warning("SciPy 不可用，使用等權重分配")
             return equal_weight(available_stocks)
 
-        # 目標函數：最小化變異數
-        def objective(weights):
-            return np.dot(weights, np.dot(cov_matrix.values, weights))
-
-        # 約束條件
-        constraints = [
-            {"type": "eq", "fun": lambda x: np.sum(x) - 1},  # 權重和為1
-            {
-                "type": "eq",
-                "fun": lambda x: np.dot(x, expected_returns_vec.values) - target_return,
-            },  # 目標收益率
-        ]
-        bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-
-        # 初始權重
-        x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-        # 最佳化
-        result = sco.minimize(
-            objective, x0, method="SLSQP", bounds=bounds, constraints=constraints
+        # 計算期望收益率和收縮協方差矩陣（年化）
+        expected_returns_vec, cov_matrix = estimate_moments(returns_subset)
+
+        result = portfolio_optimizer.optimize(
+            "mean_variance",
+            cov_matrix,
+            expected_returns_vec,
+            bounds=(0.01, 0.5),
+            target_return=target_return,
         )
 
         if result.success:
-            return dict(zip(available_stocks, result.x))
+            return dict(zip(available_stocks, result.weights))
         else:
             logger.warning(f"均值變異數最佳化失敗: {result.message}")
             return equal_weight(available_stocks)
@@ -244,31 +223,19 @@ def minimum_variance_optimization(
         if returns_subset.empty:
             return equal_weight(available_stocks)
 
-        # 計算協方差矩陣
-        cov_matrix = returns_subset.cov() * 252  # 年化
-
         if not SCIPY_AVAILABLE:
             logger.warning("SciPy 不可用，使用等權重分配")
             return equal_weight(available_stocks)
 
-        # 目標函數：最小化變異數
-        def objective(weights):
-            return np.dot(weights, np.dot(cov_matrix.values, weights))
+        # 計算收縮協方差矩陣（年化）
+        _, cov_matrix = estimate_moments(returns_subset)
 
-        # 約束條件
-        constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-        bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-
-        # 初始權重
-        x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-        # 最佳化
-        result = sco.minimize(
-            objective, x0, method="SLSQP", bounds=bounds, constraints=constraints
+        result = portfolio_optimizer.optimize(
+            "min_variance", cov_matrix, bounds=(0.01, 0.5)
         )
 
         if result.success:
-            return dict(zip(available_stocks, result.x))
+            return dict(zip(available_stocks, result.weights))
         else:
             logger.warning(f"最小變異數最佳化失敗: {result.message}")
             return equal_weight(available_stocks)
@@ -304,36 +271,23 @@ def maximum_sharpe_optimization(
         if returns_subset.empty:
             return equal_weight(available_stocks)
 
-        # 計算期望收益率和協方差矩陣
-        expected_returns_vec = returns_subset.mean() * 252  # 年化
-        cov_matrix = returns_subset.cov() * 252  # 年化
-
         if not SCIPY_AVAILABLE:
             logger.warning("SciPy 不可用，使用等權重分配")
             return equal_weight(available_stocks)
 
-        # 負夏普比率目標函數（最小化負值等於最大化正值）
-        def negative_sharpe(weights):
-            portfolio_return = np.dot(weights, expected_returns_vec.values)
-            portfolio_vol = np.sqrt(np.dot(weights, np.dot(cov_matrix.values, weights)))
-            if portfolio_vol == 0:
-                return -np.inf
-            return -(portfolio_return - risk_free_rate) / portfolio_vol
-
-        # 約束條件
-        constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-        bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
+        # 計算期望收益率和收縮協方差矩陣（年化）
+        expected_returns_vec, cov_matrix = estimate_moments(returns_subset)
 
-        # 初始權重
-        x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-        # 最佳化
-        result = sco.minimize(
-            negative_sharpe, x0, method="SLSQP", bounds=bounds, constraints=constraints
+        result = portfolio_optimizer.optimize(
+            "max_sharpe",
+            cov_matrix,
+            expected_returns_vec,
+            bounds=(0.01, 0.5),
+            risk_free_rate=risk_free_rate,
         )
 
         if result.success:
-            return dict(zip(available_stocks, result.x))
+            return dict(zip(available_stocks, result.weights))
         else:
             logger.warning(f"最大夏普比率最佳化失敗: {result.message}")
             return equal_weight(available_stocks)
@@ -368,41 +322,19 @@ def risk_parity_optimization(
         if returns_subset.empty:
             return equal_weight(available_stocks)
 
-        # 計算協方差矩陣
-        cov_matrix = returns_subset.cov() * 252  # 年化
-
         if not SCIPY_AVAILABLE:
             logger.warning("SciPy 不可用，使用等權重分配")
             return equal_weight(available_stocks)
 
-        # 風險平價目標函數
-        def risk_parity_objective(weights):
-            portfolio_vol = np.sqrt(np.dot(weights, np.dot(cov_matrix.values, weights)))
-            if portfolio_vol == 0:
-                return np.inf
-            marginal_contrib = np.dot(cov_matrix.values, weights) / portfolio_vol
-            contrib = weights * marginal_contrib
-            target_contrib = portfolio_vol / len(weights)
-            return np.sum((contrib - target_contrib) ** 2)
-
-        # 約束條件
-        constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-        bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-
-        # 初始權重
-        x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-        # 最佳化
-        result = sco.minimize(
-            risk_parity_objective,
-            x0,
-            method="SLSQP",
-            bounds=bounds,
-            constraints=constraints,
+        # 計算收縮協方差矩陣（年化）
+        _, cov_matrix = estimate_moments(returns_subset)
+
+        result = portfolio_optimizer.optimize(
+            "risk_parity", cov_matrix, bounds=(0.01, 0.5)
         )
 
         if result.success:
-            return dict(zip(available_stocks, result.x))
+            return dict(zip(available_stocks, result.weights))
         else:
             logger.warning(f"風險平價最佳化失敗: {result.message}")
             return equal_weight(available_stocks)
@@ -17,14 +17,6 @@ import numpy as np
 import pandas as pd
 
 # 可選依賴處理
-try:
-    import scipy.optimize as sco
-
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
-    sco = None
-
 try:
     from pypfopt import EfficientFrontier, expected_returns, risk_models
 
@@ -36,6 +28,7 @@ except ImportError:
     risk_models = None
 
 from .base import Portfolio
+from .kernel import SCIPY_AVAILABLE, estimate_moments, portfolio_optimizer
 
 # 設定日誌
 logger = logging.getLogger(__name__)
@@ -206,39 +199,23 @@ class MeanVariancePortfolio(Portfolio):
 
             returns_data = returns_data[available_stocks]
 
-            expected_returns_vec = returns_data.mean() * 252  # 年化
-            cov_matrix = returns_data.cov() * 252  # 年化
-
             if not SCIPY_AVAILABLE:
                 logger.warning("SciPy 不可用，使用等權重分配")
                 weight = 1.0 / len(available_stocks)
                 return {stock: weight for stock in available_stocks}
 
-            # 目標函數：最小化變異數
-            def objective(weights):
-                return np.dot(weights, np.dot(cov_matrix.values, weights))
-
-            # 約束條件
-            constraints = [
-                {"type": "eq", "fun": lambda x: np.sum(x) - 1},  # 權重和為1
-                {
-                    "type": "eq",
-                    "fun": lambda x: np.dot(x, expected_returns_vec.values)
-                    - self.target_return,
-                },  # 目標收益率
-            ]
-            bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-
-            # 初始權重
-            x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-            # 最佳化
-            result = sco.minimize(
-                objective, x0, method="SLSQP", bounds=bounds, constraints=constraints
+            # 計算期望收益率和收縮協方差矩陣（年化）
+            expected_returns_vec, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "mean_variance",
+                cov_matrix,
+                expected_returns_vec,
+                bounds=(0.01, 0.5),
+                target_return=self.target_return,
             )
 
             if result.success:
-                weights_dict = dict(zip(available_stocks, result.x))
+                weights_dict = dict(zip(available_stocks, result.weights))
                 return weights_dict
             else:
                 logger.warning(f"最佳化失敗: {result.message}")
@@ -290,34 +267,22 @@ class MeanVariancePortfolio(Portfolio):
 
             returns_data = returns_data[available_stocks]
 
-            expected_returns_vec = returns_data.mean() * 252
-            cov_matrix = returns_data.cov() * 252
-
             if not SCIPY_AVAILABLE:
                 weight = 1.0 / len(available_stocks)
                 return {stock: weight for stock in available_stocks}
 
-            # 重新最佳化
-            def objective(w):
-                return np.dot(w, np.dot(cov_matrix.values, w))
-
-            constraints = [
-                {"type": "eq", "fun": lambda x: np.sum(x) - 1},
-                {
-                    "type": "eq",
-                    "fun": lambda x: np.dot(x, expected_returns_vec.values)
-                    - self.target_return,
-                },
-            ]
-            bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-            x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-            result = sco.minimize(
-                objective, x0, method="SLSQP", bounds=bounds, constraints=constraints
+            # 計算期望收益率和收縮協方差矩陣（年化）
+            expected_returns_vec, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "mean_variance",
+                cov_matrix,
+                expected_returns_vec,
+                bounds=(0.01, 0.5),
+                target_return=self.target_return,
             )
 
             if result.success:
-                return dict(zip(available_stocks, result.x))
+                return dict(zip(available_stocks, result.weights))
             else:
                 return weights
 
@@ -371,41 +336,19 @@ class RiskParityPortfolio(Portfolio):
                 return {}
 
             returns_data = returns_data[available_stocks]
-            cov_matrix = returns_data.cov() * 252  # 年化
-
             if not SCIPY_AVAILABLE:
                 logger.warning("SciPy 不可用，使用等權重分配")
                 weight = 1.0 / len(available_stocks)
                 return {stock: weight for stock in available_stocks}
 
-            # 風險平價目標函數
-            def risk_parity_objective(weights):
-                portfolio_vol = np.sqrt(
-                    np.dot(weights, np.dot(cov_matrix.values, weights))
-                )
-                marginal_contrib = np.dot(cov_matrix.values, weights) / portfolio_vol
-                contrib = weights * marginal_contrib
-                target_contrib = portfolio_vol / len(weights)
-                return np.sum((contrib - target_contrib) ** 2)
-
-            # 約束條件
-            constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-            bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-
-            # 初始權重
-            x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-            # 最佳化
-            result = sco.minimize(
-                risk_parity_objective,
-                x0,
-                method="SLSQP",
-                bounds=bounds,
-                constraints=constraints,
+            # 計算收縮協方差矩陣（年化）
+            _, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "risk_parity", cov_matrix, bounds=(0.01, 0.5)
             )
 
             if result.success:
-                return dict(zip(available_stocks, result.x))
+                return dict(zip(available_stocks, result.weights))
             else:
                 logger.warning(f"風險平價最佳化失敗: {result.message}")
                 weight = 1.0 / len(available_stocks)
@@ -442,33 +385,18 @@ class RiskParityPortfolio(Portfolio):
                 return weights
 
             returns_data = returns_data[available_stocks]
-            cov_matrix = returns_data.cov() * 252
-
             if not SCIPY_AVAILABLE:
                 weight = 1.0 / len(available_stocks)
                 return {stock: weight for stock in available_stocks}
 
-            def risk_parity_objective(w):
-                portfolio_vol = np.sqrt(np.dot(w, np.dot(cov_matrix.values, w)))
-                marginal_contrib = np.dot(cov_matrix.values, w) / portfolio_vol
-                contrib = w * marginal_contrib
-                target_contrib = portfolio_vol / len(w)
-                return np.sum((contrib - target_contrib) ** 2)
-
-            constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-            bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-            x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-            result = sco.minimize(
-                risk_parity_objective,
-                x0,
-                method="SLSQP",
-                bounds=bounds,
-                constraints=constraints,
+            # 計算收縮協方差矩陣（年化）
+            _, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "risk_parity", cov_matrix, bounds=(0.01, 0.5)
             )
 
             if result.success:
-                return dict(zip(available_stocks, result.x))
+                return dict(zip(available_stocks, result.weights))
             else:
                 return weights
 
@@ -527,42 +455,23 @@ class MaxSharpePortfolio(Portfolio):
                 return {}
 
             returns_data = returns_data[available_stocks]
-            expected_returns_vec = returns_data.mean() * 252  # 年化
-            cov_matrix = returns_data.cov() * 252  # 年化
-
             if not SCIPY_AVAILABLE:
                 logger.warning("SciPy 不可用，使用等權重分配")
                 weight = 1.0 / len(available_stocks)
                 return {stock: weight for stock in available_stocks}
 
-            # 負夏普比率目標函數（最小化負值等於最大化正值）
-            def negative_sharpe(weights):
-                portfolio_return = np.dot(weights, expected_returns_vec.values)
-                portfolio_vol = np.sqrt(
-                    np.dot(weights, np.dot(cov_matrix.values, weights))
-                )
-                if portfolio_vol == 0:
-                    return -np.inf
-                return -(portfolio_return - self.risk_free_rate) / portfolio_vol
-
-            # 約束條件
-            constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-            bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-
-            # 初始權重
-            x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-            # 最佳化
-            result = sco.minimize(
-                negative_sharpe,
-                x0,
-                method="SLSQP",
-                bounds=bounds,
-                constraints=constraints,
+            # 計算期望收益率和收縮協方差矩陣（年化）
+            expected_returns_vec, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "max_sharpe",
+                cov_matrix,
+                expected_returns_vec,
+                bounds=(0.01, 0.5),
+                risk_free_rate=self.risk_free_rate,
             )
 
             if result.success:
-                return dict(zip(available_stocks, result.x))
+                return dict(zip(available_stocks, result.weights))
             else:
                 logger.warning(f"最大夏普比率最佳化失敗: {result.message}")
                 weight = 1.0 / len(available_stocks)
@@ -599,34 +508,22 @@ class MaxSharpePortfolio(Portfolio):
                 return weights
 
             returns_data = returns_data[available_stocks]
-            expected_returns_vec = returns_data.mean() * 252
-            cov_matrix = returns_data.cov() * 252
-
             if not SCIPY_AVAILABLE:
                 weight = 1.0 / len(available_stocks)
                 return {stock: weight for stock in available_stocks}
 
-            def negative_sharpe(w):
-                portfolio_return = np.dot(w, expected_returns_vec.values)
-                portfolio_vol = np.sqrt(np.dot(w, np.dot(cov_matrix.values, w)))
-                if portfolio_vol == 0:
-                    return -np.inf
-                return -(portfolio_return - self.risk_free_rate) / portfolio_vol
-
-            constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-            bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-            x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-            result = sco.minimize(
-                negative_sharpe,
-                x0,
-                method="SLSQP",
-                bounds=bounds,
-                constraints=constraints,
+            # 計算期望收益率和收縮協方差矩陣（年化）
+            expected_returns_vec, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "max_sharpe",
+                cov_matrix,
+                expected_returns_vec,
+                bounds=(0.01, 0.5),
+                risk_free_rate=self.risk_free_rate,
             )
 
             if result.success:
-                return dict(zip(available_stocks, result.x))
+                return dict(zip(available_stocks, result.weights))
             else:
                 return weights
 
@@ -680,31 +577,19 @@ class MinVariancePortfolio(Portfolio):
                 return {}
 
             returns_data = returns_data[available_stocks]
-            cov_matrix = returns_data.cov() * 252  # 年化
-
             if not SCIPY_AVAILABLE:
                 logger.warning("SciPy 不可用，使用等權重分配")
                 weight = 1.0 / len(available_stocks)
                 return {stock: weight for stock in available_stocks}
 
-            # 目標函數：最小化變異數
-            def objective(weights):
-                return np.dot(weights, np.dot(cov_matrix.values, weights))
-
-            # 約束條件
-            constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-            bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-
-            # 初始權重
-            x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-            # 最佳化
-            result = sco.minimize(
-                objective, x0, method="SLSQP", bounds=bounds, constraints=constraints
+            # 計算收縮協方差矩陣（年化）
+            _, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "min_variance", cov_matrix, bounds=(0.01, 0.5)
             )
 
             if result.success:
-                return dict(zip(available_stocks, result.x))
+                return dict(zip(available_stocks, result.weights))
             else:
                 logger.warning(f"最小變異數最佳化失敗: {result.message}")
                 weight = 1.0 / len(available_stocks)
@@ -750,25 +635,18 @@ class MinVariancePortfolio(Portfolio):
                 return weights
 
             returns_data = returns_data[available_stocks]
-            cov_matrix = returns_data.cov() * 252
-
             if not SCIPY_AVAILABLE:
                 weight = 1.0 / len(available_stocks)
                 return {stock: weight for stock in available_stocks}
 
-            def objective(w):
-                return np.dot(w, np.dot(cov_matrix.values, w))
-
-            constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-            bounds = tuple((0.01, 0.5) for _ in range(len(available_stocks)))
-            x0 = np.array([1.0 / len(available_stocks)] * len(available_stocks))
-
-            result = sco.minimize(
-                objective, x0, method="SLSQP", bounds=bounds, constraints=constraints
+            # 計算收縮協方差矩陣（年化）
+            _, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "min_variance", cov_matrix, bounds=(0.01, 0.5)
             )
 
             if result.success:
-                return dict(zip(available_stocks, result.x))
+                return dict(zip(available_stocks, result.weights))
             else:
                 return weights
 
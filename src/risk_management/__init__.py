@@ -11,111 +11,60 @@
 - 自動停單機制
 """
 
-from .circuit_breakers import (
-    CircuitBreaker,
-    CompositeCircuitBreaker,
-    DrawdownCircuitBreaker,
-    LossCircuitBreaker,
-    TimeCircuitBreaker,
-    VolatilityCircuitBreaker,
-)
-from .portfolio_risk import (
-    ConcentrationRiskManager,
-    CorrelationAnalyzer,
-    DiversificationManager,
-    PortfolioRiskManager,
-    RiskParityStrategy,
-    SectorExposureManager,
-)
-from .position_sizing import (
-    FixedAmountPositionSizing,
-    KellyPositionSizing,
-    OptimalFPositionSizing,
-    PercentPositionSizing,
-    PositionSizingStrategy,
-    PyramidingPositionSizing,
-    RiskBasedPositionSizing,
-    VolatilityPositionSizing,
-)
+from src.utils.lazy_import import lazy_exports
 
-from .risk_manager_refactored import RiskManager
-from .strategy_manager import StrategyManager
-from .risk_monitoring import RiskMonitor
-from .risk_metrics import (
-    ConditionalValueAtRisk,
-    MaximumDrawdown,
-    RiskMetricsCalculator,
-    ValueAtRisk,
-)
-from .stop_loss import (
-    ATRStopLoss,
-    MultipleStopLoss,
-    PercentStopLoss,
-    StopLossStrategy,
-    SupportResistanceStopLoss,
-    TimeBasedStopLoss,
-    TrailingStopLoss,
-    VolatilityStopLoss,
-)
-from .take_profit import (
-    MultipleTakeProfit,
-    PercentTakeProfit,
-    RiskRewardTakeProfit,
-    TakeProfitStrategy,
-    TargetTakeProfit,
-    TimeBasedTakeProfit,
-    TrailingTakeProfit,
-)
-
-__all__ = [
+# 子模組在第一次存取對應名稱時才匯入
+_EXPORTS = {
     # 停損策略
-    "StopLossStrategy",
-    "PercentStopLoss",
-    "ATRStopLoss",
-    "TimeBasedStopLoss",
-    "TrailingStopLoss",
-    "VolatilityStopLoss",
-    "SupportResistanceStopLoss",
-    "MultipleStopLoss",
+    "StopLossStrategy": ".stop_loss",
+    "PercentStopLoss": ".stop_loss",
+    "ATRStopLoss": ".stop_loss",
+    "TimeBasedStopLoss": ".stop_loss",
+    "TrailingStopLoss": ".stop_loss",
+    "VolatilityStopLoss": ".stop_loss",
+    "SupportResistanceStopLoss": ".stop_loss",
+    "MultipleStopLoss": ".stop_loss",
     # 停利策略
-    "TakeProfitStrategy",
-    "PercentTakeProfit",
-    "TargetTakeProfit",
-    "TrailingTakeProfit",
-    "RiskRewardTakeProfit",
-    "TimeBasedTakeProfit",
-    "MultipleTakeProfit",
+    "TakeProfitStrategy": ".take_profit",
+    "PercentTakeProfit": ".take_profit",
+    "TargetTakeProfit": ".take_profit",
+    "TrailingTakeProfit": ".take_profit",
+    "RiskRewardTakeProfit": ".take_profit",
+    "TimeBasedTakeProfit": ".take_profit",
+    "MultipleTakeProfit": ".take_profit",
     # 倉位大小策略
-    "PositionSizingStrategy",
-    "FixedAmountPositionSizing",
-    "PercentPositionSizing",
-    "RiskBasedPositionSizing",
-    "KellyPositionSizing",
-    "VolatilityPositionSizing",
-    "OptimalFPositionSizing",
-    "PyramidingPositionSizing",
+    "PositionSizingStrategy": ".position_sizing",
+    "FixedAmountPositionSizing": ".position_sizing",
+    "PercentPositionSizing": ".position_sizing",
+    "RiskBasedPositionSizing": ".position_sizing",
+    "KellyPositionSizing": ".position_sizing",
+    "VolatilityPositionSizing": ".position_sizing",
+    "OptimalFPositionSizing": ".position_sizing",
+    "PyramidingPositionSizing": ".position_sizing",
     # 投資組合風險管理
-    "PortfolioRiskManager",
-    "DiversificationManager",
-    "CorrelationAnalyzer",
-    "RiskParityStrategy",
-    "SectorExposureManager",
-    "ConcentrationRiskManager",
+    "PortfolioRiskManager": ".portfolio_risk",
+    "DiversificationManager": ".portfolio_risk",
+    "CorrelationAnalyzer": ".portfolio_risk",
+    "RiskParityStrategy": ".portfolio_risk",
+    "SectorExposureManager": ".portfolio_risk",
+    "ConcentrationRiskManager": ".portfolio_risk",
     # 風險指標計算
-    "RiskMetricsCalculator",
-    "ValueAtRisk",
-    "ConditionalValueAtRisk",
-    "MaximumDrawdown",
+    "RiskMetricsCalculator": ".risk_metrics",
+    "ValueAtRisk": ".risk_metrics",
+    "ConditionalValueAtRisk": ".risk_metrics",
+    "MaximumDrawdown": ".risk_metrics",
     # 熔斷機制
-    "CircuitBreaker",
-    "DrawdownCircuitBreaker",
-    "VolatilityCircuitBreaker",
-    "LossCircuitBreaker",
-    "TimeCircuitBreaker",
-    "CompositeCircuitBreaker",
+    "CircuitBreaker": ".circuit_breakers",
+    "DrawdownCircuitBreaker": ".circuit_breakers",
+    "VolatilityCircuitBreaker": ".circuit_breakers",
+    "LossCircuitBreaker": ".circuit_breakers",
+    "TimeCircuitBreaker": ".circuit_breakers",
+    "CompositeCircuitBreaker": ".circuit_breakers",
     # 風險管理器
-    # "RiskManager",  # Temporarily commented due to snownlp dependency
-    "RiskManagerBase",
-    "StrategyManager",
-    "RiskMonitor",
-]
+    "RiskManager": ".risk_manager_refactored",
+    "StrategyManager": ".strategy_manager",
+    "RiskMonitor": ".risk_monitoring",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -14,6 +14,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Callable
 
 from src.execution.broker_base import BrokerBase
+from src.monitoring.latency_tracing import traced
 from .fund_monitor import FundMonitor
 from .dynamic_stop_loss import DynamicStopLoss
 from .emergency_risk_control import EmergencyRiskControl, EmergencyLevel, EmergencyAction
@@ -136,6 +137,7 @@ class UnifiedRiskController:
                 "last_update": datetime.now(),
             }
     
+    @traced("risk")
     def validate_new_trade(
         self, 
         symbol: str, 
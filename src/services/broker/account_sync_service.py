@@ -21,6 +21,8 @@ import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Callable
 
+from src.core.events.event import create_pnl_event
+from src.core.events.event_bus import EventBus, event_bus
 from src.core.trade_execution_brokers import TradeExecutionBrokerManager
 from .broker_connection_service import BrokerConnectionService
 
@@ -109,13 +111,15 @@ class AccountSyncService:
         _is_syncing: 同步狀態標誌
         _sync_interval: 同步間隔時間(秒)
         _sync_callbacks: 同步完成回調函數列表
+        _event_bus: 發布損益事件的事件總線
         _lock: 執行緒鎖
     """
 
     def __init__(
         self,
         connection_service: Optional[BrokerConnectionService] = None,
-        sync_interval: int = 30
+        sync_interval: int = 30,
+        bus: Optional[EventBus] = None
     ):
         """
         初始化帳戶同步服務
@@ -123,6 +127,7 @@ class AccountSyncService:
         Args:
             connection_service: 券商連接服務實例
             sync_interval: 同步間隔時間(秒)
+            bus: 發布損益事件的事件總線，預設為全局事件總線
         """
         self._connection_service = connection_service or BrokerConnectionService()
         self._trade_executor = self._connection_service._trade_executor
@@ -131,6 +136,7 @@ class AccountSyncService:
         self._is_syncing = False
         self._sync_interval = sync_interval
         self._sync_callbacks: List[Callable[[str, AccountInfo], None]] = []
+        self._event_bus = bus or event_bus
         self._lock = threading.Lock()
         
         logger.info("帳戶同步服務初始化成功")
@@ -214,6 +220,8 @@ class AccountSyncService:
                 except Exception as e:
                     logger.error("執行同步回調時發生錯誤: %s", e)
             
+            self._publish_pnl(account_info)
+            
             logger.info("券商 %s 帳戶資訊同步完成", broker_name)
             return account_info
             
@@ -354,6 +362,46 @@ class AccountSyncService:
                 logger.error("同步迴圈發生錯誤: %s", e)
                 time.sleep(60)  # 錯誤時等待更長時間
 
+    def _publish_pnl(self, account_info: AccountInfo) -> None:
+        """
+        將同步後的持倉與帳戶損益發布到事件總線
+        
+        每個持倉以 ``券商:代號`` 為主題，帳戶層級的損益以券商名稱為主題，
+        供推送閘道的損益主題轉送給客戶端。發布失敗只記錄錯誤，不影響同步結果。
+        
+        Args:
+            account_info: 同步後的帳戶資訊
+        """
+        broker_name = account_info.broker_name
+        try:
+            total_pnl = 0.0
+            for symbol, position in account_info.positions.items():
+                unrealized_pnl = position.get("unrealized_pnl", 0.0)
+                total_pnl += unrealized_pnl
+                self._event_bus.publish(
+                    create_pnl_event(
+                        f"{broker_name}:{symbol}",
+                        unrealized_pnl=unrealized_pnl,
+                        market_value=position.get("market_value"),
+                        symbol=symbol,
+                        quantity=position.get("quantity"),
+                        avg_cost=position.get("avg_cost"),
+                        broker_name=broker_name
+                    )
+                )
+            
+            self._event_bus.publish(
+                create_pnl_event(
+                    broker_name,
+                    unrealized_pnl=total_pnl,
+                    market_value=account_info.total_value,
+                    cash=account_info.cash,
+                    broker_name=broker_name
+                )
+            )
+        except Exception as e:
+            logger.error("發布券商 %s 損益事件失敗: %s", broker_name, e)
+
     def _is_broker_connected(self, broker_name: str) -> bool:
         """
         檢查券商是否已連接
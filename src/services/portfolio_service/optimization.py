@@ -16,13 +16,7 @@ import logging
 import pandas as pd
 import numpy as np
 
-# 可選依賴
-try:
-    from scipy.optimize import minimize
-
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
+from src.portfolio.kernel import SCIPY_AVAILABLE, estimate_moments, portfolio_optimizer
 
 from .core import PortfolioServiceCore
 
@@ -157,33 +151,19 @@ class PortfolioOptimizationService:
         if returns_data is None:
             returns_data = self._generate_mock_returns(symbols)
 
-        # 計算協方差矩陣
-        cov_matrix = returns_data.cov().values * 252  # 年化
-
-        # 目標函數：最小化變異數
-        def objective(weights):
-            return np.dot(weights, np.dot(cov_matrix, weights))
-
-        # 約束條件
-        constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-        bounds = tuple((0.01, 0.5) for _ in range(len(symbols)))
-
-        # 初始權重
-        x0 = np.array([1.0 / len(symbols)] * len(symbols))
-
-        # 最佳化
         if not SCIPY_AVAILABLE:
             logger.warning("SciPy 不可用，使用等權重分配")
             return self._equal_weight_optimization(symbols)
 
         try:
-            result = minimize(
-                objective, x0, method="SLSQP", bounds=bounds, constraints=constraints
+            # 計算收縮協方差矩陣（年化）
+            _, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "min_variance", cov_matrix, bounds=(0.01, 0.5)
             )
 
             if result.success:
-                weights = dict(zip(symbols, result.x))
-                return weights
+                return dict(zip(symbols, result.weights))
             else:
                 logger.warning(f"最小變異數最佳化失敗: {result.message}")
                 return self._equal_weight_optimization(symbols)
@@ -199,41 +179,19 @@ class PortfolioOptimizationService:
         if returns_data is None:
             returns_data = self._generate_mock_returns(symbols)
 
-        # 計算協方差矩陣
-        cov_matrix = returns_data.cov().values * 252  # 年化
-
-        # 風險平價目標函數
-        def risk_parity_objective(weights):
-            portfolio_vol = np.sqrt(np.dot(weights, np.dot(cov_matrix, weights)))
-            if portfolio_vol == 0:
-                return np.inf
-            marginal_contrib = np.dot(cov_matrix, weights) / portfolio_vol
-            contrib = weights * marginal_contrib
-            target_contrib = portfolio_vol / len(weights)
-            return np.sum((contrib - target_contrib) ** 2)
-
-        # 約束條件
-        constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-        bounds = tuple((0.01, 0.5) for _ in range(len(symbols)))
-
-        # 初始權重
-        x0 = np.array([1.0 / len(symbols)] * len(symbols))
-
         if not SCIPY_AVAILABLE:
             logger.warning("SciPy 不可用，使用等權重分配")
             return self._equal_weight_optimization(symbols)
 
         try:
-            result = minimize(
-                risk_parity_objective,
-                x0,
-                method="SLSQP",
-                bounds=bounds,
-                constraints=constraints,
+            # 計算收縮協方差矩陣（年化）
+            _, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "risk_parity", cov_matrix, bounds=(0.01, 0.5)
             )
 
             if result.success:
-                return dict(zip(symbols, result.x))
+                return dict(zip(symbols, result.weights))
             else:
                 logger.warning(f"風險平價最佳化失敗: {result.message}")
                 return self._equal_weight_optimization(symbols)
@@ -252,38 +210,23 @@ class PortfolioOptimizationService:
         if returns_data is None:
             returns_data = self._generate_mock_returns(symbols)
 
-        # 計算期望報酬率和協方差矩陣
-        expected_returns = returns_data.mean().values * 252  # 年化
-        cov_matrix = returns_data.cov().values * 252  # 年化
-
-        # 目標函數：最小化變異數
-        def objective(weights):
-            return np.dot(weights, np.dot(cov_matrix, weights))
-
-        # 約束條件
-        constraints = [
-            {"type": "eq", "fun": lambda x: np.sum(x) - 1},  # 權重和為1
-            {
-                "type": "eq",
-                "fun": lambda x: np.dot(x, expected_returns) - target_return,
-            },  # 目標報酬率
-        ]
-        bounds = tuple((0.01, 0.5) for _ in range(len(symbols)))
-
-        # 初始權重
-        x0 = np.array([1.0 / len(symbols)] * len(symbols))
-
         if not SCIPY_AVAILABLE:
             logger.warning("SciPy 不可用，使用等權重分配")
             return self._equal_weight_optimization(symbols)
 
         try:
-            result = minimize(
-                objective, x0, method="SLSQP", bounds=bounds, constraints=constraints
+            # 計算期望報酬率和收縮協方差矩陣（年化）
+            expected_returns, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "mean_variance",
+                cov_matrix,
+                expected_returns,
+                bounds=(0.01, 0.5),
+                target_return=target_return,
             )
 
             if result.success:
-                return dict(zip(symbols, result.x))
+                return dict(zip(symbols, result.weights))
             else:
                 logger.warning(f"均值變異數最佳化失敗: {result.message}")
                 return self._equal_weight_optimization(symbols)
@@ -302,40 +245,23 @@ class PortfolioOptimizationService:
         if returns_data is None:
             returns_data = self._generate_mock_returns(symbols)
 
-        # 計算期望報酬率和協方差矩陣
-        expected_returns = returns_data.mean().values * 252  # 年化
-        cov_matrix = returns_data.cov().values * 252  # 年化
-
-        # 負夏普比率目標函數（最小化負值等於最大化正值）
-        def negative_sharpe(weights):
-            portfolio_return = np.dot(weights, expected_returns)
-            portfolio_vol = np.sqrt(np.dot(weights, np.dot(cov_matrix, weights)))
-            if portfolio_vol == 0:
-                return -np.inf
-            return -(portfolio_return - risk_free_rate) / portfolio_vol
-
-        # 約束條件
-        constraints = {"type": "eq", "fun": lambda x: np.sum(x) - 1}
-        bounds = tuple((0.01, 0.5) for _ in range(len(symbols)))
-
-        # 初始權重
-        x0 = np.array([1.0 / len(symbols)] * len(symbols))
-
         if not SCIPY_AVAILABLE:
             logger.warning("SciPy 不可用，使用等權重分配")
             return self._equal_weight_optimization(symbols)
 
         try:
-            result = minimize(
-                negative_sharpe,
-                x0,
-                method="SLSQP",
-                bounds=bounds,
-                constraints=constraints,
+            # 計算期望報酬率和收縮協方差矩陣（年化）
+            expected_returns, cov_matrix = estimate_moments(returns_data)
+            result = portfolio_optimizer.optimize(
+                "max_sharpe",
+                cov_matrix,
+                expected_returns,
+                bounds=(0.01, 0.5),
+                risk_free_rate=risk_free_rate,
             )
 
             if result.success:
-                return dict(zip(symbols, result.x))
+                return dict(zip(symbols, result.weights))
             else:
                 logger.warning(f"最大夏普比率最佳化失敗: {result.message}")
                 return self._equal_weight_optimization(symbols)
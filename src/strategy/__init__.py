@@ -21,52 +21,30 @@
 - 各種訊號生成工具函數
 """
 
-# 基礎模組
-from .base import (
-    Strategy,
-    StrategyError,
-    ParameterError,
-    ModelNotTrainedError,
-    DataValidationError,
-)
+from src.utils.lazy_import import lazy_exports
 
-# 技術分析策略
-from .technical import MovingAverageCrossStrategy, RSIStrategy
-
-# 機器學習策略
-from .ml import MachineLearningStrategy
-
-# 工具函數
-from .utils import (
-    trade_point_decision,
-    continuous_trading_signal,
-    triple_barrier,
-    fixed_time_horizon,
-    generate_signals,
-)
-
-# 保持向後相容性
-from .momentum import MomentumStrategy
-from .mean_reversion import MeanReversionStrategy
-
-__all__ = [
+# 子模組在第一次存取對應名稱時才匯入
+_EXPORTS = {
     # 基礎類別
-    "Strategy",
-    "StrategyError",
-    "ParameterError",
-    "ModelNotTrainedError",
-    "DataValidationError",
+    "Strategy": ".base",
+    "StrategyError": ".base",
+    "ParameterError": ".base",
+    "ModelNotTrainedError": ".base",
+    "DataValidationError": ".base",
     # 技術分析策略
-    "MovingAverageCrossStrategy",
-    "RSIStrategy",
-    "MomentumStrategy",
-    "MeanReversionStrategy",
+    "MovingAverageCrossStrategy": ".technical",
+    "RSIStrategy": ".technical",
+    "MomentumStrategy": ".momentum",
+    "MeanReversionStrategy": ".mean_reversion",
     # 機器學習策略
-    "MachineLearningStrategy",
+    "MachineLearningStrategy": ".ml",
     # 工具函數
-    "trade_point_decision",
-    "continuous_trading_signal",
-    "triple_barrier",
-    "fixed_time_horizon",
-    "generate_signals",
-]
+    "trade_point_decision": ".utils",
+    "continuous_trading_signal": ".utils",
+    "triple_barrier": ".utils",
+    "fixed_time_horizon": ".utils",
+    "generate_signals": ".utils",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
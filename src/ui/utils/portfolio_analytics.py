@@ -13,6 +13,9 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 
+from src.portfolio.frontier import frontier_engine
+from src.portfolio.kernel import OptimizationResult, portfolio_optimizer
+
 logger = logging.getLogger(__name__)
 
 
@@ -197,6 +200,9 @@ class PortfolioAnalytics:
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """計算效率前緣
 
+        由效率前緣計算引擎以主動集合法與暖啟動求解，並依輸入內容快取結果，
+        頁面重新執行時不會重算相同的前緣。
+
         Args:
             expected_returns: 預期報酬率向量
             cov_matrix: 共變異數矩陣
@@ -206,63 +212,8 @@ class PortfolioAnalytics:
             (報酬率, 風險, 權重矩陣)
         """
         try:
-            n_assets = len(expected_returns)
-
-            # 設定約束條件
-            constraints = [
-                {"type": "eq", "fun": lambda x: np.sum(x) - 1}  # 權重總和為1
-            ]
-
-            bounds = tuple((0, 1) for _ in range(n_assets))  # 權重範圍 0-1
-
-            # 計算最小風險和最大報酬
-            min_vol_result = self._minimize_volatility(
-                expected_returns, cov_matrix, constraints, bounds
-            )
-            max_ret_result = self._maximize_return(
-                expected_returns, cov_matrix, constraints, bounds
-            )
-
-            min_ret = min_vol_result["fun"]
-            max_ret = max_ret_result["fun"]
-
-            # 生成目標報酬率序列
-            target_returns = np.linspace(min_ret, max_ret, num_points)
-
-            frontier_volatility = []
-            frontier_weights = []
-
-            for target_ret in target_returns:
-                # 添加報酬率約束
-                ret_constraint = {
-                    "type": "eq",
-                    "fun": lambda x, target=target_ret: np.dot(x, expected_returns)
-                    - target,
-                }
-
-                all_constraints = constraints + [ret_constraint]
-
-                result = optimize.minimize(
-                    self._portfolio_volatility,
-                    x0=np.array([1 / n_assets] * n_assets),
-                    args=(cov_matrix,),
-                    method="SLSQP",
-                    bounds=bounds,
-                    constraints=all_constraints,
-                )
-
-                if result.success:
-                    frontier_volatility.append(result.fun)
-                    frontier_weights.append(result.x)
-                else:
-                    frontier_volatility.append(np.nan)
-                    frontier_weights.append(np.array([np.nan] * n_assets))
-
-            return (
-                np.array(target_returns),
-                np.array(frontier_volatility),
-                np.array(frontier_weights),
-            )
+            result = frontier_engine.compute(expected_returns, cov_matrix, num_points)
+            return result.returns, result.volatility, result.weights
 
         except Exception as e:
             logger.error(f"效率前緣計算失敗: {e}")
@@ -377,19 +328,14 @@ class PortfolioAnalytics:
         bounds: Tuple,
     ) -> Dict[str, Any]:
         """最大化夏普比率"""
-        n_assets = len(expected_returns)
-        initial_guess = np.array([1 / n_assets] * n_assets)
-
-        result = optimize.minimize(
-            self._sharpe_ratio,
-            x0=initial_guess,
-            args=(expected_returns, cov_matrix),
-            method="SLSQP",
+        result = portfolio_optimizer.optimize(
+            "max_sharpe",
+            cov_matrix,
+            expected_returns,
             bounds=bounds,
-            constraints=constraints,
+            risk_free_rate=self.risk_free_rate,
         )
-
-        return result
+        return self._result_dict(result)
 
     def _minimize_volatility(
         self,
@@ -399,19 +345,9 @@ class PortfolioAnalytics:
         bounds: Tuple,
     ) -> Dict[str, Any]:
         """最小化波動率"""
-        n_assets = len(expected_returns)
-        initial_guess = np.array([1 / n_assets] * n_assets)
-
-        result = optimize.minimize(
-            self._portfolio_volatility,
-            x0=initial_guess,
-            args=(cov_matrix,),
-            method="SLSQP",
-            bounds=bounds,
-            constraints=constraints,
-        )
-
-        return result
+        result = portfolio_optimizer.optimize("min_variance", cov_matrix, bounds=bounds)
+        result.fun = float(np.sqrt(max(result.fun, 0.0)))
+        return self._result_dict(result)
 
     def _maximize_return(
         self,
@@ -442,25 +378,21 @@ class PortfolioAnalytics:
         bounds: Tuple,
     ) -> Dict[str, Any]:
         """風險平價優化"""
+        result = portfolio_optimizer.optimize("risk_parity", cov_matrix, bounds=bounds)
+        return self._result_dict(result)
 
-        def risk_parity_objective(weights):
-            portfolio_vol = self._portfolio_volatility(weights, cov_matrix)
-            marginal_contrib = np.dot(cov_matrix, weights) / portfolio_vol
-            contrib = weights * marginal_contrib
-            return np.sum((contrib - contrib.mean()) ** 2)
-
-        n_assets = len(expected_returns)
-        initial_guess = np.array([1 / n_assets] * n_assets)
+    @staticmethod
+    def _result_dict(result: OptimizationResult) -> Dict[str, Any]:
+        """將最佳化核心的結果轉為與 scipy 相同欄位的字典
 
-        result = optimize.minimize(
-            risk_parity_objective,
-            x0=initial_guess,
-            method="SLSQP",
-            bounds=bounds,
-            constraints=constraints,
-        )
-
-        return result
+        預算約束由最佳化核心處理，constraints 參數只保留以符合介面。
+        """
+        return {
+            "success": result.success,
+            "x": result.weights,
+            "fun": result.fun,
+            "message": result.message,
+        }
 
     def _maximize_diversification(
         self,
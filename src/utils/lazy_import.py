@@ -0,0 +1,57 @@
+"""延遲匯入工具
+
+此模組以 PEP 562 的模組層級 ``__getattr__`` 實作套件的延遲匯出：套件的
+``__init__.py`` 只宣告「名稱 → 子模組」的對照表，子模組在第一次存取對應名稱時
+才匯入，只使用其中一兩個類別的程式不必載入整個套件及其相依套件。
+
+Example:
+    ```python
+    # src/data_sources/__init__.py
+    from src.utils.lazy_import import lazy_exports
+
+    _EXPORTS = {
+        "YahooAdapter": ".yahoo_adapter",
+        "TWSECrawler": ".twse_crawler",
+    }
+
+    __all__ = list(_EXPORTS)
+    __getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+    ```
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+# 匯出來源：子模組名稱，或 (子模組名稱, 子模組中的屬性名稱)
+ExportSource = Union[str, Tuple[str, str]]
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, ExportSource]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """建立套件的延遲匯出函數
+
+    Args:
+        package: 套件名稱，通常為 ``__name__``
+        exports: 匯出名稱與來源子模組的對照，子模組可使用相對名稱；
+            匯出名稱與子模組中的名稱不同時以 (子模組, 屬性名稱) 表示
+
+    Returns:
+        Tuple[Callable, Callable]: 供套件指定為 ``__getattr__`` 與 ``__dir__`` 的函數
+    """
+
+    def __getattr__(name: str) -> Any:
+        source = exports.get(name)
+        if source is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, attribute = (source, name) if isinstance(source, str) else source
+        value = getattr(importlib.import_module(module_name, package), attribute)
+        # 寫回套件命名空間，之後的存取不再經過 __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,213 @@
+"""
+回測結果回應測試
+
+測試圖表序列降採樣、交易記錄鍵集分頁（查詢管理器與路由）與 NDJSON / Arrow 串流輸出。
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.utils.downsampling import (
+    downsample_indices,
+    lttb_indices,
+    minmax_indices,
+)
+from src.api.utils.streaming import iter_arrow, iter_ndjson, stream_batches
+from src.core.backtest.service import BacktestService
+from src.core.backtest_module.backtest_database import BacktestDatabaseManager
+from src.core.backtest_module.backtest_query_manager import BacktestQueryManager
+
+
+class TestDownsampling:
+    """降採樣測試"""
+
+    def test_lttb_keeps_endpoints_and_peak(self):
+        """LTTB 保留首尾點與明顯的峰值"""
+        y = np.zeros(1000)
+        y[437] = 50.0
+        indices = lttb_indices(y, 20)
+
+        assert len(indices) == 20
+        assert indices[0] == 0 and indices[-1] == 999
+        assert 437 in indices
+        assert np.all(np.diff(indices) > 0)
+
+    def test_minmax_keeps_extremes(self):
+        """min/max 保留每個區間的極值"""
+        rng = np.random.default_rng(0)
+        y = np.cumsum(rng.normal(size=5000))
+        indices = minmax_indices(y, 100)
+
+        assert len(indices) <= 100
+        assert int(np.argmax(y)) in indices
+        assert int(np.argmin(y)) in indices
+
+    def test_short_series_is_unchanged(self):
+        """點數不超過上限時返回全部索引"""
+        assert list(downsample_indices([1.0, 2.0, 3.0], 10)) == [0, 1, 2]
+
+    def test_unknown_method_is_rejected(self):
+        """不支持的方法拋出 ValueError"""
+        with pytest.raises(ValueError):
+            downsample_indices(range(100), 10, method="average")
+
+
+@pytest.fixture
+def query_manager(tmp_path):
+    db_path = str(tmp_path / "backtest.db")
+    BacktestDatabaseManager(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO backtest_trades
+            (backtest_id, symbol, entry_date, entry_price, quantity,
+             position_size, trade_type, commission_paid, tax_paid)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    "bt-1",
+                    f"{2330 + i % 3}.TW",
+                    f"2025-01-{1 + i // 4:02d}",
+                    100.0,
+                    1000,
+                    0.1,
+                    "long",
+                    1.0,
+                    0.0,
+                )
+                for i in range(25)
+            ],
+        )
+    return BacktestQueryManager(db_path, results_manager=None)
+
+
+class TestTransactionKeyset:
+    """交易記錄鍵集分頁測試"""
+
+    def test_pages_cover_all_records_once(self, query_manager):
+        """逐頁讀取涵蓋全部記錄且不重複，同日記錄依 id 排序"""
+        seen = []
+        after = None
+        while True:
+            page = query_manager.get_transaction_records("bt-1", after=after, limit=7)
+            if not page:
+                break
+            seen.extend(record["id"] for record in page)
+            after = (page[-1]["entry_date"], page[-1]["id"])
+
+        assert seen == sorted(seen)
+        assert len(seen) == len(set(seen)) == 25
+
+    def test_filters_apply_with_cursor(self, query_manager):
+        """篩選條件與游標同時生效"""
+        first = query_manager.get_transaction_records("bt-1", symbol="2330.TW", limit=3)
+        rest = query_manager.get_transaction_records(
+            "bt-1", symbol="2330.TW", after=(first[-1]["entry_date"], first[-1]["id"])
+        )
+
+        assert {record["symbol"] for record in first + rest} == {"2330.TW"}
+        assert len(first) + len(rest) == 9
+
+
+@pytest.fixture
+def routes(query_manager, tmp_path, monkeypatch):
+    backtest = pytest.importorskip("src.api.routers.backtest")
+    service = BacktestService(
+        db_path=query_manager.db_path,
+        results_dir=str(tmp_path / "results"),
+        use_cache=False,
+    )
+    # 回測狀態不在此測試範圍，直接視為已完成
+    monkeypatch.setattr(
+        service,
+        "get_backtest_info",
+        lambda backtest_id: {"status": "completed"},
+        raising=False,
+    )
+    monkeypatch.setattr(backtest, "backtest_service", service)
+    return backtest
+
+
+class TestTransactionRoutes:
+    """交易記錄路由測試"""
+
+    def test_stream_batches_cover_all_records(self, routes, monkeypatch):
+        """串流批次經回測服務分頁讀取全部記錄，且不輸出游標欄位"""
+        monkeypatch.setattr(routes, "STREAM_BATCH_SIZE", 10)
+        batches = list(routes._iter_transaction_batches("bt-1"))
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert not any("id" in record for batch in batches for record in batch)
+
+    def test_endpoint_follows_cursor(self, routes):
+        """交易明細端點依 next_cursor 逐頁返回全部記錄"""
+        app = FastAPI()
+        app.include_router(routes.router, prefix="/backtest")
+        client = TestClient(app)
+
+        items, cursor = [], None
+        while True:
+            params = {"page_size": 10, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/backtest/bt-1/transactions", params=params)
+            assert response.status_code == 200
+            page = response.json()["data"]
+            items.extend(page["items"])
+            cursor = page["next_cursor"]
+            if not page["has_more"]:
+                break
+
+        assert len(items) == 25
+        assert cursor is None
+
+
+class TestStreaming:
+    """串流輸出測試"""
+
+    BATCHES = [
+        [{"date": datetime(2025, 1, 2), "value": 1.5, "symbol": "2330.TW"}],
+        [
+            {"date": datetime(2025, 1, 3), "value": 2, "symbol": "2317.TW"},
+            {"date": datetime(2025, 1, 6), "value": np.nan, "symbol": None},
+        ],
+    ]
+
+    def test_ndjson_emits_one_chunk_per_batch(self):
+        """NDJSON 每批輸出一個區塊，每行一筆記錄"""
+        chunks = list(iter_ndjson(self.BATCHES))
+        lines = b"".join(chunks).splitlines()
+
+        assert len(chunks) == 2
+        assert [json.loads(line)["symbol"] for line in lines] == [
+            "2330.TW",
+            "2317.TW",
+            None,
+        ]
+
+    def test_arrow_stream_round_trips(self):
+        """Arrow 串流以第一批結構讀回全部記錄"""
+        table = pa.ipc.open_stream(b"".join(iter_arrow(self.BATCHES))).read_all()
+
+        assert table.num_rows == 3
+        assert table.column("value").to_pylist()[:2] == [1.5, 2.0]
+        assert pa.types.is_timestamp(table.schema.field("date").type)
+
+    def test_empty_arrow_stream_is_readable(self):
+        """沒有記錄時輸出可讀取的空串流"""
+        assert pa.ipc.open_stream(b"".join(iter_arrow([]))).read_all().num_rows == 0
+
+    def test_stream_response_headers(self):
+        """串流回應設定媒體類型與下載檔名"""
+        response = stream_batches(self.BATCHES, "arrow", "backtest_equity_bt-1")
+
+        assert response.media_type == "application/vnd.apache.arrow.stream"
+        assert "backtest_equity_bt-1.arrow" in response.headers["content-disposition"]
+        with pytest.raises(ValueError):
+            stream_batches(self.BATCHES, "csv", "backtest")
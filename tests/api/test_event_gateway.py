@@ -0,0 +1,288 @@
+"""
+即時推送閘道測試
+
+測試事件分類、增量計算、高頻主題合併、慢速客戶端快照、序號恢復，
+WebSocket / SSE 傳輸與事件總線橋接，以及 WebSocket 只接受訪問 Token。
+"""
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from src.api.middleware.auth import TokenManager, verified_token_cache
+from src.api.utils.event_gateway import (
+    EventGateway,
+    classify_event,
+    iter_sse,
+    serve_websocket,
+)
+from src.core.events.event import (
+    Event,
+    EventSource,
+    EventType,
+    create_market_event,
+    create_order_event,
+)
+from src.services.broker.account_sync_service import AccountSyncService
+
+
+def _order(event_type, order_id="o-1", stock_id="2330.TW"):
+    return create_order_event(event_type, order_id, stock_id, "buy", 1000, price=600.0)
+
+
+class TestClassifyEvent:
+    """事件分類測試"""
+
+    def test_topics(self):
+        """行情、訂單與損益事件對應到各自主題"""
+        quote = create_market_event(EventType.MARKET_DATA, "2330.TW", price=600.0)
+        pnl = Event(
+            event_type=EventType.SYSTEM_INFO,
+            source=EventSource.TRADING_SYSTEM,
+            tags=["pnl"],
+            data={"unrealized_pnl": 1200.0},
+        )
+        news = Event(event_type=EventType.NEWS, source=EventSource.NEWS_FEED)
+
+        assert classify_event(quote) == ("quotes", "2330.TW", {"price": 600.0})
+        topic, key, data = classify_event(_order(EventType.ORDER_FILLED))
+        assert (topic, key, data["status"]) == ("orders", "o-1", "ORDER_FILLED")
+        assert classify_event(pnl)[:2] == ("pnl", "portfolio")
+        assert classify_event(news) is None
+
+
+class TestEventGateway:
+    """閘道狀態測試"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_then_coalesced_deltas(self):
+        """連線先收到快照，之後同一鍵的多次更新合併為一筆只含變動欄位的增量"""
+        gateway = EventGateway()
+        gateway.publish("quotes", "2330.TW", {"price": 600.0, "volume": 10})
+        client = gateway.connect(topics=["quotes"])
+
+        snapshot = await client.next_message()
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["items"][0]["data"] == {"price": 600.0, "volume": 10}
+
+        gateway.publish("quotes", "2330.TW", {"price": 601.0, "volume": 10})
+        gateway.publish("quotes", "2330.TW", {"price": 602.0, "volume": 12})
+        gateway.publish("quotes", "2330.TW", {"price": 602.0, "volume": 12})
+        gateway.publish("orders", "o-1", {"status": "ORDER_CREATED"})
+
+        delta = await client.next_message()
+        assert delta == {
+            "type": "delta",
+            "seq": 4,
+            "items": [
+                {
+                    "topic": "quotes",
+                    "key": "2330.TW",
+                    "data": {"price": 602.0, "volume": 12},
+                }
+            ],
+        }
+
+    @pytest.mark.asyncio
+    async def test_symbol_filter(self):
+        """股票代號篩選套用於行情與訂單，組合層級損益不受限"""
+        gateway = EventGateway()
+        client = gateway.connect(symbols=["2330.TW"])
+        await client.next_message()
+
+        gateway.publish("quotes", "2317.TW", {"price": 100.0})
+        gateway.publish("orders", "o-2", {"stock_id": "2317.TW", "status": "NEW"})
+        gateway.publish("orders", "o-1", {"stock_id": "2330.TW", "status": "NEW"})
+        gateway.publish("pnl", "portfolio", {"unrealized_pnl": 10.0})
+
+        delta = await client.next_message()
+        assert [(item["topic"], item["key"]) for item in delta["items"]] == [
+            ("orders", "o-1"),
+            ("pnl", "portfolio"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_gets_snapshot(self):
+        """訂單待送筆數超過上限時改送快照"""
+        gateway = EventGateway(max_pending=3)
+        client = gateway.connect(topics=["orders"])
+        await client.next_message()
+
+        for i in range(5):
+            gateway.publish("orders", f"o-{i}", {"status": "ORDER_CREATED"})
+
+        message = await client.next_message()
+        assert client.overflows == 1
+        assert message["type"] == "snapshot"
+        assert len(message["items"]) == 5
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_missed_deltas(self):
+        """序號在重播緩衝區內時只補送遺漏的增量，否則送快照"""
+        gateway = EventGateway(replay_size=3)
+        for i in range(3):
+            gateway.publish("orders", "o-1", {"filled": i})
+
+        resumed = gateway.connect(topics=["orders"], resume_from=2)
+        message = await resumed.next_message()
+        assert message["type"] == "delta"
+        assert message["items"][0]["data"] == {"filled": 2}
+
+        for i in range(3, 6):
+            gateway.publish("orders", "o-1", {"filled": i})
+        stale = gateway.connect(topics=["orders"], resume_from=2)
+        assert (await stale.next_message())["type"] == "snapshot"
+
+    @pytest.mark.asyncio
+    async def test_event_bus_bridge(self):
+        """總線執行緒上的事件轉回事件迴圈發布"""
+
+        class Bus:
+            def subscribe(self, event_type, callback):
+                self.callback = callback
+                return (event_type, callback)
+
+            def unsubscribe(self, subscription):
+                self.callback = None
+
+        bus = Bus()
+        gateway = EventGateway()
+        gateway.start(bus)
+        client = gateway.connect(topics=["quotes"])
+        await client.next_message()
+
+        event = create_market_event(EventType.PRICE_CHANGE, "2330.TW", price=605.0)
+        thread = threading.Thread(target=bus.callback, args=(event,))
+        thread.start()
+        thread.join()
+
+        message = await asyncio.wait_for(client.next_message(), timeout=1)
+        assert message["items"][0]["data"] == {"price": 605.0}
+
+        gateway.stop()
+        assert bus.callback is None
+        assert gateway.client_count == 0
+
+    @pytest.mark.asyncio
+    async def test_account_sync_pnl_delivered(self):
+        """帳戶同步發布的損益事件經全域事件總線送達損益主題"""
+        broker = SimpleNamespace(
+            account_id="acc-1",
+            cash=1000.0,
+            total_value=7050.0,
+            positions={
+                "2330.TW": {
+                    "quantity": 10,
+                    "avg_cost": 600.0,
+                    "market_value": 6050.0,
+                    "unrealized_pnl": 50.0,
+                }
+            },
+            orders=[],
+        )
+        connection = Mock()
+        connection._trade_executor.brokers = {"sim": broker}
+        connection.get_connection_status.return_value = {"status": "connected"}
+        service = AccountSyncService(connection_service=connection)
+
+        gateway = EventGateway(flush_interval=0)
+        gateway.start()
+        client = gateway.connect(topics=["pnl"])
+        try:
+            assert (await client.next_message())["items"] == []
+            await asyncio.get_running_loop().run_in_executor(
+                None, service.sync_account, "sim"
+            )
+
+            received = {}
+            while len(received) < 2:
+                message = await asyncio.wait_for(client.next_message(), timeout=2)
+                received.update(
+                    {item["key"]: item["data"] for item in message["items"]}
+                )
+        finally:
+            gateway.stop()
+
+        assert received["sim:2330.TW"]["symbol"] == "2330.TW"
+        assert received["sim:2330.TW"]["unrealized_pnl"] == 50.0
+        assert received["sim"]["unrealized_pnl"] == 50.0
+        assert received["sim"]["cash"] == 1000.0
+
+
+class TestTransports:
+    """傳輸測試"""
+
+    def test_websocket_subscribe_and_push(self):
+        """WebSocket 連線收到快照，更新訂閱後收到新快照與增量"""
+        gateway = EventGateway(flush_interval=0)
+        gateway.publish("quotes", "2330.TW", {"price": 600.0})
+        app = FastAPI()
+
+        @app.websocket("/ws")
+        async def ws(websocket: WebSocket):
+            await websocket.accept()
+            await serve_websocket(websocket, gateway, gateway.connect(["orders"]))
+
+        @app.post("/publish")
+        async def publish():
+            gateway.publish("quotes", "2330.TW", {"price": 601.0})
+
+        with TestClient(app) as client:
+            with client.websocket_connect("/ws") as websocket:
+                assert websocket.receive_json()["items"] == []
+
+                websocket.send_json({"type": "subscribe", "topics": ["quotes"]})
+                snapshot = websocket.receive_json()
+                assert snapshot["items"][0]["data"] == {"price": 600.0}
+
+                client.post("/publish")
+                delta = websocket.receive_json()
+                assert delta["type"] == "delta"
+                assert delta["items"][0]["data"] == {"price": 601.0}
+
+        assert gateway.client_count == 0
+
+    @pytest.mark.asyncio
+    async def test_sse_format(self):
+        """SSE 事件以序號為 ID，閒置時送出註解行"""
+        gateway = EventGateway(flush_interval=0)
+        gateway.publish("pnl", "portfolio", {"unrealized_pnl": 1.0})
+        client = gateway.connect()
+        events = iter_sse(gateway, client, heartbeat=0.01)
+
+        first = await events.__anext__()
+        header, data = first.decode().split("data: ")
+        assert header == "id: 1\nevent: snapshot\n"
+        assert json.loads(data)["items"][0]["key"] == "portfolio"
+        assert await events.__anext__() == b": keepalive\n\n"
+
+        await events.aclose()
+        assert gateway.client_count == 0
+
+
+class TestStreamAuthentication:
+    """WebSocket Token 驗證測試"""
+
+    def test_refresh_token_rejected_on_cache_hit(self):
+        """刷新 Token 即使已由中間件驗證並快取，再次出示仍被拒絕"""
+        _authenticate = pytest.importorskip("src.api.routers.stream")._authenticate
+        refresh = TokenManager.create_refresh_token("u-1", "alice")
+        access = TokenManager.create_access_token("u-1", "alice", "user")
+        try:
+            assert _authenticate(refresh) is None
+            # 中間件驗證一般請求時會快取任何有效 Token 的載荷
+            verified_token_cache.put(refresh, TokenManager.verify_token(refresh))
+            assert _authenticate(refresh) is None
+
+            assert _authenticate(access)["type"] == "access"
+            assert verified_token_cache.get(access) is not None
+            assert _authenticate(access)["username"] == "alice"
+        finally:
+            verified_token_cache.invalidate(refresh)
+            verified_token_cache.invalidate(access)
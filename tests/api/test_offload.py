@@ -0,0 +1,163 @@
+"""
+同步服務呼叫卸載測試
+
+測試執行池卸載、路由併發上限、offload 裝飾器與 FastJSONResponse 序列化。
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+
+from src.api.utils import json_response
+from src.api.utils.json_response import FastJSONResponse, dumps
+from src.api.utils.offload import ServiceExecutor, offload, run_sync
+
+
+def _square(value):
+    return value * value
+
+
+@pytest.fixture
+def executor():
+    service_executor = ServiceExecutor(max_threads=8, max_processes=1)
+    yield service_executor
+    service_executor.shutdown()
+
+
+class TestServiceExecutor:
+    """執行器測試"""
+
+    @pytest.mark.asyncio
+    async def test_run_executes_off_event_loop_thread(self, executor):
+        """同步函數在執行池的線程中執行"""
+        loop_thread = threading.get_ident()
+        worker_thread = await executor.run(threading.get_ident, route="test")
+
+        assert worker_thread != loop_thread
+        assert await run_sync(_square, 3, route="test") == 9
+
+    @pytest.mark.asyncio
+    async def test_route_limit_is_enforced(self, executor):
+        """同一路由鍵的併發數不超過上限，其他路由鍵不受影響"""
+        executor.set_route_limit("limited", 2)
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def work():
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+
+        tasks = [
+            asyncio.create_task(executor.run(work, route="limited")) for _ in range(6)
+        ]
+        await asyncio.sleep(0.01)
+        stats = executor.get_stats()["routes"]["limited"]
+        assert stats == {"limit": 2, "active": 2, "waiting": 4}
+
+        # 其他路由鍵不需等待 limited 的請求
+        start = time.monotonic()
+        await executor.run(_square, 2, route="other")
+        assert time.monotonic() - start < 0.05
+
+        await asyncio.gather(*tasks)
+        assert running["peak"] == 2
+        assert executor.get_stats()["routes"]["limited"]["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self, executor):
+        """use_process 在行程池執行可序列化的函數"""
+        assert await executor.run(_square, 7, use_process=True) == 49
+
+    @pytest.mark.asyncio
+    async def test_offload_decorator(self):
+        """裝飾後的函數以協程呼叫，原函數保留在 sync 屬性"""
+
+        @offload(route="test.decorated", max_concurrency=1)
+        def add(a, b=0):
+            return a + b, threading.get_ident()
+
+        result, thread_id = await add(1, b=2)
+        assert result == 3
+        assert thread_id != threading.get_ident()
+        assert add.sync(1, 1)[0] == 2
+        assert add.__name__ == "add"
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self, executor):
+        """阻塞的服務呼叫不影響同一應用的其他請求"""
+        app = FastAPI()
+
+        @app.get("/slow")
+        async def slow():
+            await executor.run(time.sleep, 0.3, route="slow")
+            return {"done": True}
+
+        @app.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            slow_request = asyncio.create_task(c.get("/slow"))
+            await asyncio.sleep(0.05)
+            start = time.monotonic()
+            response = await c.get("/ping")
+            elapsed = time.monotonic() - start
+            assert (await slow_request).json() == {"done": True}
+
+        assert response.json() == {"ok": True}
+        assert elapsed < 0.2
+
+
+class TestFastJSONResponse:
+    """JSON 回應序列化測試"""
+
+    def _frame(self):
+        return pd.DataFrame(
+            {
+                "date": pd.to_datetime(["2025-01-02", None]),
+                "close": [101.5, np.nan],
+                "volume": np.array([1000, 2000], dtype="int64"),
+                "symbol": ["2330.TW", None],
+            }
+        )
+
+    def test_dataframe_is_serialized_by_column(self):
+        """DataFrame 依欄位輸出，缺失值轉為 null"""
+        payload = json.loads(dumps({"prices": self._frame(), "count": np.int64(2)}))
+
+        assert payload == {
+            "prices": {
+                "date": ["2025-01-02T00:00:00", None],
+                "close": [101.5, None],
+                "volume": [1000, 2000],
+                "symbol": ["2330.TW", None],
+            },
+            "count": 2,
+        }
+
+    def test_stdlib_fallback_matches_orjson(self, monkeypatch):
+        """未安裝 orjson 時輸出相同內容"""
+        content = {"prices": self._frame(), "ratio": np.float64(0.5)}
+        expected = json.loads(dumps(content))
+
+        monkeypatch.setattr(json_response, "ORJSON_AVAILABLE", False)
+        assert json.loads(dumps(content)) == expected
+
+    def test_response_renders_numpy_values(self):
+        """回應類別可直接渲染 numpy 值"""
+        response = FastJSONResponse({"values": np.array([1.0, np.nan])})
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {"values": [1.0, None]}
@@ -0,0 +1,187 @@
+"""認證快取測試
+
+測試已驗證 Token 快取的到期與淘汰、黑名單布隆過濾器、權限位元集、
+會話活動的延遲寫入，以及 AuthMiddleware 使用快取後的行為。
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import httpx
+import jwt
+import pytest
+from fastapi import FastAPI, Request
+
+from src.api.middleware.auth import (
+    AuthMiddleware,
+    PermissionChecker,
+    SessionManager,
+    TokenBlacklist,
+    TokenManager,
+)
+from src.api.middleware.auth_cache import BloomFilter, VerifiedTokenCache
+
+
+class TestVerifiedTokenCache:
+    """已驗證 Token 快取測試"""
+
+    def test_ttl_is_bounded_by_exp(self):
+        """項目在 Token exp 與最長存活時間中較早者到期"""
+        cache = VerifiedTokenCache(max_ttl=300)
+        cache.put("short", {"exp": 1030}, now=1000.0)
+        cache.put("long", {"exp": 9999}, now=1000.0)
+
+        assert cache.get("short", now=1029.0) == {"exp": 1030}
+        assert cache.get("short", now=1030.0) is None
+        assert cache.get("long", now=1299.0) is not None
+        assert cache.get("long", now=1300.0) is None
+
+    def test_expired_token_is_not_cached(self):
+        """已過期的載荷不寫入快取"""
+        cache = VerifiedTokenCache()
+        cache.put("expired", {"exp": 999}, now=1000.0)
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """超過上限時淘汰最久未使用的項目"""
+        cache = VerifiedTokenCache(max_size=2)
+        cache.put("a", {}, now=0.0)
+        cache.put("b", {}, now=0.0)
+        cache.get("a", now=1.0)
+        cache.put("c", {}, now=1.0)
+
+        assert cache.get("a", now=2.0) is not None
+        assert cache.get("b", now=2.0) is None
+
+
+class TestBloomFilter:
+    """布隆過濾器測試"""
+
+    def test_no_false_negatives_and_low_false_positives(self):
+        """加入的元素必定命中，未加入的元素誤判率接近目標"""
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+        for i in range(10_000):
+            bloom.add(f"token-{i}")
+
+        assert all(f"token-{i}" in bloom for i in range(10_000))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+        assert false_positives < 300
+
+
+class TestPermissionBitsets:
+    """權限位元集測試"""
+
+    def test_bitsets_match_role_permissions(self):
+        """位元集結果與角色權限映射一致"""
+        permissions = {
+            p for ps in PermissionChecker.ROLE_PERMISSIONS.values() for p in ps
+        }
+        for role, granted in PermissionChecker.ROLE_PERMISSIONS.items():
+            for permission in permissions | {"unknown"}:
+                assert PermissionChecker.has_permission(role, permission) == (
+                    permission in granted
+                )
+        assert PermissionChecker.role_mask("guest") == 0
+        assert not PermissionChecker.has_permission(None, "monitoring")
+
+
+class TestTokenBlacklist:
+    """Token 黑名單測試"""
+
+    def test_blacklist_and_remove(self):
+        """加入黑名單後失效，移除後恢復"""
+        token = TokenManager.create_access_token("u1", "alice", "user")
+        assert not TokenBlacklist.is_blacklisted(token)
+
+        TokenBlacklist.add_token(token)
+        assert TokenBlacklist.is_blacklisted(token)
+
+        TokenBlacklist.remove_token(token)
+        assert not TokenBlacklist.is_blacklisted(token)
+
+    def test_clear_expired_tokens(self):
+        """清理時移除已過期的 Token，保留未過期的 Token"""
+        expired = TokenManager.create_access_token(
+            "u1", "alice", "user", expires_delta=timedelta(seconds=-10)
+        )
+        valid = TokenManager.create_access_token("u2", "bob", "user")
+        TokenBlacklist.add_token(expired)
+        TokenBlacklist.add_token(valid)
+
+        TokenBlacklist.clear_expired_tokens()
+
+        assert expired not in TokenBlacklist._blacklist
+        assert TokenBlacklist.is_blacklisted(valid)
+        TokenBlacklist.remove_token(valid)
+
+
+class TestSessionActivity:
+    """會話活動延遲寫入測試"""
+
+    def test_activity_is_written_behind(self):
+        """活動時間在刷新前不修改會話，讀取會話時合併"""
+        token = "session-token"
+        SessionManager.create_session("u1", token, {})
+        created = SessionManager._active_sessions[token]["last_activity"]
+
+        with patch.object(SessionManager, "ACTIVITY_FLUSH_SECONDS", 3600.0):
+            SessionManager._last_flush = float("inf")
+            SessionManager.update_activity(token)
+            assert SessionManager._active_sessions[token]["last_activity"] == created
+
+            sessions = SessionManager.get_user_sessions("u1")
+        assert sessions[0]["last_activity"] >= created
+        assert token not in SessionManager._pending_activity
+
+        SessionManager.end_session(token)
+        TokenBlacklist.remove_token(token)
+
+
+class TestAuthMiddlewareCache:
+    """AuthMiddleware 快取整合測試"""
+
+    @pytest.mark.asyncio
+    async def test_token_is_verified_once(self):
+        """同一 Token 只驗證一次，撤銷後立即失效"""
+        app = FastAPI()
+
+        @app.get("/api/v1/monitoring/status")
+        async def status(request: Request):
+            return {
+                "username": request.state.username,
+                "permissions": request.state.permissions,
+            }
+
+        cache = VerifiedTokenCache()
+        app.add_middleware(AuthMiddleware, token_cache=cache)
+        token = TokenManager.create_access_token("u1", "alice", "readonly")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://api.example"
+        ) as client:
+            with patch.object(jwt, "decode", wraps=jwt.decode) as decode:
+                responses = [
+                    await client.get("/api/v1/monitoring/status", headers=headers)
+                    for _ in range(5)
+                ]
+            assert decode.call_count == 1
+            assert all(r.status_code == 200 for r in responses)
+            assert responses[0].json() == {
+                "username": "alice",
+                "permissions": PermissionChecker.role_mask("readonly"),
+            }
+
+            bad = await client.get(
+                "/api/v1/monitoring/status",
+                headers={"Authorization": "Bearer invalid"},
+            )
+            assert bad.status_code == 401
+
+            TokenBlacklist.add_token(token)
+            try:
+                revoked = await client.get("/api/v1/monitoring/status", headers=headers)
+                assert revoked.status_code == 401
+            finally:
+                TokenBlacklist.remove_token(token)
@@ -0,0 +1,162 @@
+"""日誌中間件測試
+
+測試請求 ID 產生、路由取樣、請求體擷取上限、背景寫入器，以及處理時間直方圖。
+"""
+
+import json
+import logging
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from src.api.middleware.logging import (
+    BackgroundLogWriter,
+    LoggingMiddleware,
+    metrics_response,
+    next_request_id,
+)
+
+
+def _build_app(writer, **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/monitoring/status")
+    async def status():
+        return {"ok": True}
+
+    @app.get("/api/v1/backtest/{backtest_id}")
+    async def backtest(backtest_id: str):
+        return {"id": backtest_id}
+
+    @app.post("/api/v1/auth/login")
+    async def login(request: Request):
+        return {"received": len(await request.body())}
+
+    @app.get("/api/v1/missing")
+    async def missing():
+        return {"ok": False}
+
+    app.add_middleware(LoggingMiddleware, writer=writer, **kwargs)
+    return app
+
+
+def _records(caplog, label):
+    return [
+        json.loads(record.getMessage().split(": ", 1)[1])
+        for record in caplog.records
+        if record.getMessage().startswith(label)
+    ]
+
+
+@pytest.fixture
+def writer():
+    return BackgroundLogWriter()
+
+
+class TestRequestId:
+    """請求 ID 測試"""
+
+    def test_ids_are_unique_and_increasing(self):
+        """同一行程內的請求 ID 不重複且遞增"""
+        ids = [next_request_id() for _ in range(1000)]
+        sequence = [int(request_id.rsplit("-", 1)[1], 16) for request_id in ids]
+
+        assert len(set(ids)) == 1000
+        assert sequence == sorted(sequence)
+
+
+class TestLoggingMiddleware:
+    """日誌中間件整合測試"""
+
+    @pytest.mark.asyncio
+    async def test_route_sampling(self, writer, caplog):
+        """取樣率為 0 的路由不記錄成功請求，錯誤請求仍記錄"""
+        app = _build_app(
+            writer,
+            sample_rate=1.0,
+            route_sample_rates={"/api/v1/monitoring": 0.0, "/api/v1/missing": 0.0},
+        )
+        transport = httpx.ASGITransport(app=app)
+        with caplog.at_level(logging.INFO, logger="src.api.middleware.logging"):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://api.example"
+            ) as client:
+                for _ in range(20):
+                    response = await client.get("/api/v1/monitoring/status")
+                    assert "X-Request-ID" in response.headers
+                await client.get("/api/v1/backtest/bt-1")
+                await client.get("/api/v1/missing/404")
+            writer.flush()
+
+        requests = _records(caplog, "API請求")
+        responses = _records(caplog, "API響應")
+        assert [r["path"] for r in requests] == ["/api/v1/backtest/bt-1"]
+        assert sorted(r["status_code"] for r in responses) == [200, 404]
+
+    @pytest.mark.asyncio
+    async def test_body_is_masked_and_capped(self, writer, caplog):
+        """請求體在背景遮罩，超過上限的請求體不讀取"""
+        app = _build_app(writer, max_body_bytes=64)
+        transport = httpx.ASGITransport(app=app)
+        with caplog.at_level(logging.INFO, logger="src.api.middleware.logging"):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://api.example"
+            ) as client:
+                small = await client.post(
+                    "/api/v1/auth/login",
+                    json={"username": "alice", "password": "hunter2"},
+                )
+                large = await client.post(
+                    "/api/v1/auth/login", json={"payload": "x" * 1000}
+                )
+            writer.flush()
+
+        # 端點仍能讀到完整請求體
+        assert small.json()["received"] > 0
+        assert large.json()["received"] > 1000
+
+        bodies = [r["body"] for r in _records(caplog, "API請求")]
+        assert bodies[0]["username"] == "alice"
+        assert bodies[0]["password"] != "hunter2"
+        assert "note" in bodies[1]
+
+    @pytest.mark.asyncio
+    async def test_latency_histogram_uses_route_template(self, writer):
+        """直方圖以路由模板為標籤並可輸出抓取格式"""
+        app = _build_app(writer, route_sample_rates={})
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://api.example"
+        ) as client:
+            for i in range(3):
+                await client.get(f"/api/v1/backtest/bt-{i}")
+        writer.flush()
+
+        body = metrics_response().body.decode()
+        assert 'route="/api/v1/backtest/{backtest_id}"' in body
+        assert "bt-1" not in body
+
+
+class TestBackgroundLogWriter:
+    """背景寫入器測試"""
+
+    def test_full_queue_drops_records(self):
+        """佇列已滿時丟棄日誌而不阻塞"""
+        writer = BackgroundLogWriter(max_queue_size=1)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_build():
+            started.set()
+            release.wait()
+            return {}
+
+        writer.submit(logging.INFO, "阻塞", blocking_build)
+        started.wait(timeout=5)
+        writer.submit(logging.INFO, "排隊", dict)
+        writer.submit(logging.INFO, "丟棄", dict)
+        release.set()
+        writer.flush()
+
+        assert writer.dropped == 1
@@ -74,9 +74,9 @@ class TestMiddlewareInitialization:
 
         middleware = RateLimitMiddleware(None)
         assert middleware is not None
-        assert hasattr(middleware, "ip_limiters")
-        assert hasattr(middleware, "user_limiters")
-        assert hasattr(middleware, "endpoint_limiters")
+        assert hasattr(middleware, "store")
+        assert hasattr(middleware, "default_rules")
+        assert hasattr(middleware, "endpoint_rules")
 
     def test_logging_middleware_init(self):
         """測試日誌中間件初始化"""
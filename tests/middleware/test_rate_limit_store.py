@@ -0,0 +1,219 @@
+"""速率限制存儲測試
+
+測試滑動窗口與令牌桶的計算、LRU 鍵數上限、跨行程共用的 SQLite 存儲，
+以及 RateLimitMiddleware 使用存儲後的回應標頭。
+"""
+
+import asyncio
+import multiprocessing
+import sqlite3
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api.middleware.rate_limit import RateLimitMiddleware
+from src.api.middleware.rate_limit_store import (
+    MemoryRateLimitStore,
+    SQLiteRateLimitStore,
+    create_rate_limit_store,
+)
+
+
+def _hit_many(path, count, queue):
+    """在子行程中對同一個鍵發送請求，回傳允許的次數"""
+
+    async def run():
+        store = SQLiteRateLimitStore(path)
+        allowed = 0
+        for _ in range(count):
+            result = await store.hit("ip:shared", limit=100, window_seconds=3600)
+            allowed += result.allowed
+        await store.close()
+        return allowed
+
+    queue.put(asyncio.run(run()))
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryRateLimitStore()
+    return SQLiteRateLimitStore(str(tmp_path / "rate_limits.db"))
+
+
+class TestSlidingWindow:
+    """滑動窗口測試"""
+
+    @pytest.mark.asyncio
+    async def test_limit_within_window(self, store):
+        """窗口內超過上限的請求被拒絕且不計入"""
+        results = [
+            await store.hit("ip:a", limit=3, window_seconds=60, now=120.0 + i)
+            for i in range(5)
+        ]
+
+        assert [r.allowed for r in results] == [True, True, True, False, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert results[0].reset_at == 180.0
+        # 其他鍵不受影響
+        assert (await store.hit("ip:b", limit=3, window_seconds=60, now=125.0)).allowed
+
+    @pytest.mark.asyncio
+    async def test_previous_window_is_weighted(self, store):
+        """前一窗口的計數依剩餘比例計入"""
+        for i in range(4):
+            await store.hit("ip:a", limit=4, window_seconds=60, now=60.0 + i)
+
+        # 新窗口開始 15 秒時，前一窗口仍計入 4 * 0.75 = 3 次
+        assert (await store.hit("ip:a", limit=4, window_seconds=60, now=135.0)).allowed
+        assert not (
+            await store.hit("ip:a", limit=4, window_seconds=60, now=136.0)
+        ).allowed
+        # 兩個窗口以後狀態完全重置
+        result = await store.hit("ip:a", limit=4, window_seconds=60, now=300.0)
+        assert result.allowed and result.remaining == 3
+
+
+class TestTokenBucket:
+    """令牌桶測試"""
+
+    @pytest.mark.asyncio
+    async def test_bucket_refills(self, store):
+        """令牌用盡後依補充速率恢復"""
+        allowed = [
+            await store.consume("bucket:a", capacity=2, refill_rate=1.0, now=10.0)
+            for _ in range(3)
+        ]
+        assert allowed == [True, True, False]
+        assert await store.consume("bucket:a", capacity=2, refill_rate=1.0, now=11.0)
+
+
+class TestStores:
+    """存儲後端測試"""
+
+    @pytest.mark.asyncio
+    async def test_memory_store_evicts_least_recently_used(self):
+        """鍵數超過上限時淘汰最久未使用的鍵"""
+        store = MemoryRateLimitStore(max_keys=2)
+        await store.hit("ip:a", limit=1, window_seconds=60, now=0.0)
+        await store.hit("ip:b", limit=1, window_seconds=60, now=0.0)
+        await store.hit("ip:a", limit=1, window_seconds=60, now=1.0)
+        await store.hit("ip:c", limit=1, window_seconds=60, now=1.0)
+
+        assert len(store) == 2
+        # ip:a 仍保留計數，ip:b 被淘汰後重新計數
+        assert not (
+            await store.hit("ip:a", limit=1, window_seconds=60, now=2.0)
+        ).allowed
+        assert (await store.hit("ip:b", limit=1, window_seconds=60, now=2.0)).allowed
+
+    def test_sqlite_store_is_shared_across_processes(self, tmp_path):
+        """多個行程共用 SQLite 存儲時合計不超過上限"""
+        path = str(tmp_path / "rate_limits.db")
+        SQLiteRateLimitStore(path)
+        queue = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_hit_many, args=(path, 40, queue))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        allowed = sum(queue.get(timeout=30) for _ in workers)
+        for worker in workers:
+            worker.join()
+
+        assert allowed == 100
+
+    @pytest.mark.asyncio
+    async def test_sqlite_prune_keeps_previous_window(self, tmp_path):
+        """清理過期列時保留滑動窗口估算仍需要的前一窗口計數"""
+        store = SQLiteRateLimitStore(str(tmp_path / "rate_limits.db"))
+        store.PRUNE_INTERVAL = 1
+        for i in range(3):
+            await store.hit("register:a", limit=3, window_seconds=3600, now=10.0 + i)
+
+        # 下一個窗口開始後觸發清理，前一窗口仍以約 97% 計入
+        await store.hit("ip:b", limit=10, window_seconds=60, now=3700.0)
+        result = await store.hit("register:a", limit=3, window_seconds=3600, now=3700.0)
+        assert not result.allowed
+
+        # 兩個窗口以後才刪除
+        await store.hit("ip:b", limit=10, window_seconds=60, now=7300.0)
+        conn = sqlite3.connect(store.path)
+        keys = [row[0] for row in conn.execute("SELECT key FROM rate_limits")]
+        conn.close()
+        await store.close()
+        assert "register:a" in keys
+
+    @pytest.mark.asyncio
+    async def test_sqlite_store_does_not_block_event_loop(self, tmp_path):
+        """等待其他 worker 釋放寫入鎖時事件迴圈仍可回應"""
+        path = str(tmp_path / "rate_limits.db")
+        store = SQLiteRateLimitStore(path)
+        holder = sqlite3.connect(path, isolation_level=None)
+        holder.execute("BEGIN IMMEDIATE")
+
+        hits = asyncio.gather(
+            *(
+                store.hit(f"ip:{i}", limit=10, window_seconds=60, now=0.0)
+                for i in range(4)
+            )
+        )
+        # 鎖被佔用期間計時器仍準時觸發
+        max_lag = 0.0
+        for _ in range(10):
+            start = time.perf_counter()
+            await asyncio.sleep(0.05)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.05)
+        assert not hits.done()
+        holder.execute("COMMIT")
+        holder.close()
+
+        results = await asyncio.wait_for(hits, timeout=5)
+        await store.close()
+        assert max_lag < 0.1
+        assert all(result.allowed for result in results)
+
+    def test_factory_rejects_unknown_backend(self):
+        """不支持的後端拋出 ValueError"""
+        assert isinstance(create_rate_limit_store("memory"), MemoryRateLimitStore)
+        with pytest.raises(ValueError):
+            create_rate_limit_store("memcached")
+
+
+class TestRateLimitMiddleware:
+    """中間件整合測試"""
+
+    @pytest.mark.asyncio
+    async def test_headers_and_rejection(self):
+        """回應帶有剩餘次數標頭，超過上限返回 429 與 Retry-After"""
+        app = FastAPI()
+
+        @app.get("/api/v1/data/market")
+        async def market():
+            return {"ok": True}
+
+        app.add_middleware(RateLimitMiddleware, store=MemoryRateLimitStore())
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://api.example"
+        ) as client:
+            headers = {"X-Forwarded-For": "10.0.0.1"}
+            first = await client.get("/api/v1/data/market", headers=headers)
+            assert first.status_code == 200
+            assert first.headers["X-RateLimit-Limit"] == "100"
+            assert first.headers["X-RateLimit-Remaining"] == "99"
+            assert first.headers["X-RateLimit-Endpoint-Remaining"] == "199"
+
+            # 令牌桶容量 10，連續請求在第 11 次被拒絕
+            statuses = [
+                (await client.get("/api/v1/data/market", headers=headers)).status_code
+                for _ in range(10)
+            ]
+            assert statuses.count(429) == 1
+
+            rejected = await client.get("/api/v1/data/market", headers=headers)
+            assert rejected.status_code == 429
+            assert int(rejected.headers["Retry-After"]) >= 1
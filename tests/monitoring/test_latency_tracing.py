@@ -0,0 +1,216 @@
+"""
+交易管線延遲追蹤測試
+
+測試追蹤上下文跨佇列傳遞、跨度環形陣列與環形檔案，以及各階段延遲報表。
+"""
+
+import queue
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.monitoring.latency_tracing import (
+    SPAN_DTYPE,
+    STAGE_INDEX,
+    STAGES,
+    LatencyTracer,
+    SpanRingFile,
+    format_report,
+    summarize,
+    traced,
+)
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    """不寫檔也不啟動匯出執行緒的追蹤器，並替換全域追蹤器"""
+    tracer = LatencyTracer(capacity=16, sample_every=1, trace_file=None, enabled=True)
+    tracer._export_thread = MagicMock()
+    monkeypatch.setattr("src.monitoring.latency_tracing.latency_tracer", tracer)
+    return tracer
+
+
+def _stages(records):
+    return [STAGES[stage] for stage in records["stage"]]
+
+
+class TestLatencyTracer:
+    """追蹤上下文與跨度記錄測試"""
+
+    def test_no_trace_records_nothing(self, tracer):
+        """沒有進行中的追蹤時不記錄跨度"""
+        with tracer.span("signal"):
+            pass
+        tracer.finish()
+
+        assert tracer.handoff() is None
+        assert len(tracer.drain()) == 0
+
+    def test_trace_across_queues(self, tracer):
+        """追蹤隨交接點跨執行緒傳遞，記錄排隊、處理與端到端耗時"""
+        ticks = queue.Queue()
+        orders = queue.Queue()
+
+        @traced("signal")
+        def generate(tick):
+            orders.put((tick, tracer.handoff()))
+
+        def strategy_worker():
+            tick, handoff = ticks.get()
+            with tracer.resume(handoff, "ws_queue"):
+                generate(tick)
+
+        worker = threading.Thread(target=strategy_worker)
+        worker.start()
+        ticks.put(("2330.TW", tracer.start_trace()))
+        worker.join()
+
+        tick, handoff = orders.get()
+        with tracer.resume(handoff, "order_queue"):
+            with tracer.span("broker"):
+                time.sleep(0.001)
+            tracer.finish()
+        assert tracer.current() is None
+
+        records = tracer.drain()
+        assert _stages(records) == [
+            "ws_queue",
+            "signal",
+            "order_queue",
+            "broker",
+            "tick_to_order",
+        ]
+        assert len(set(records["trace_id"])) == 1
+        assert records["duration_ns"][3] >= 1_000_000
+        assert records["duration_ns"][4] == max(records["duration_ns"])
+
+    def test_bind(self, tracer):
+        """綁定的函數在執行時恢復追蹤並記錄排隊時間"""
+        callback = MagicMock()
+        assert tracer.bind(callback) is callback
+
+        with tracer.resume(tracer.start_trace()):
+            bound = tracer.bind(callback, "ingest_queue")
+        bound("tick")
+
+        callback.assert_called_once_with("tick")
+        assert _stages(tracer.drain()) == ["ingest_queue"]
+
+    def test_sampling_and_disabled(self, tracer):
+        """只追蹤抽中的行情，停用時不建立追蹤"""
+        tracer.sample_every = 4
+        assert sum(tracer.start_trace() is not None for _ in range(8)) == 2
+
+        tracer.enabled = False
+        assert tracer.start_trace() is None
+
+    def test_disabled_by_default(self, tmp_path):
+        """預設不追蹤也不建立環形檔案，啟用後第一次匯出才建立"""
+        path = tmp_path / "spans.bin"
+        tracer = LatencyTracer(trace_file=str(path))
+
+        assert not tracer.enabled
+        assert tracer.start_trace() is None
+        assert tracer._export_thread is None
+
+        tracer.enabled = True
+        tracer._export_thread = MagicMock()
+        tracer.sample_every = 1
+        assert tracer.start_trace() is not None
+        assert not path.exists()
+        tracer.record("risk", 1, 0, 1)
+        tracer.export()
+        assert path.exists()
+
+    def test_ring_overflow_counts_dropped(self, tracer):
+        """匯出前被覆寫的跨度計入 dropped，只保留最新的跨度"""
+        for i in range(20):
+            tracer.record("risk", i, 0, i)
+
+        records = tracer.drain()
+        assert len(records) == 16
+        assert tracer.dropped == 4
+        assert list(records["trace_id"]) == list(range(4, 20))
+        assert list(records["duration_ns"]) == list(range(4, 20))
+
+
+class TestSpanRingFile:
+    """跨度環形檔案測試"""
+
+    @staticmethod
+    def _records(trace_ids):
+        records = np.zeros(len(trace_ids), dtype=SPAN_DTYPE)
+        records["trace_id"] = trace_ids
+        return records
+
+    def test_wraparound(self, tmp_path):
+        """寫滿後從頭覆寫，讀取時依寫入順序返回"""
+        path = tmp_path / "spans.bin"
+        ring = SpanRingFile(str(path), capacity=5)
+        ring.append(self._records([1, 2, 3]))
+        ring.append(self._records([4, 5, 6, 7]))
+
+        reopened = SpanRingFile(str(path), capacity=100)
+        assert reopened.capacity == 5
+        assert reopened.written == 7
+        assert list(reopened.read()["trace_id"]) == [3, 4, 5, 6, 7]
+
+        reopened.append(self._records(range(10, 22)))
+        assert list(reopened.read()["trace_id"]) == [17, 18, 19, 20, 21]
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """不是跨度環形檔案時拋出 ValueError"""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\0" * 128)
+
+        with pytest.raises(ValueError):
+            SpanRingFile(str(path))
+
+    def test_export_writes_file_and_histogram(self, tmp_path):
+        """匯出將跨度寫入環形檔案與各階段直方圖"""
+        from src.monitoring.latency_tracing import TRACING_REGISTRY
+
+        path = tmp_path / "spans.bin"
+        tracer = LatencyTracer(trace_file=str(path))
+        tracer._export_thread = MagicMock()
+        before = TRACING_REGISTRY.get_sample_value(
+            "trading_pipeline_stage_seconds_count", {"stage": "risk"}
+        )
+        tracer.record("risk", 1, 0, 2_000_000)
+
+        assert tracer.export() == 1
+        assert tracer.export() == 0
+        assert (
+            TRACING_REGISTRY.get_sample_value(
+                "trading_pipeline_stage_seconds_count", {"stage": "risk"}
+            )
+            == (before or 0) + 1
+        )
+        assert list(SpanRingFile(str(path)).read()["duration_ns"]) == [2_000_000]
+
+
+class TestReport:
+    """延遲報表測試"""
+
+    def test_summarize_by_session(self):
+        """依時段篩選並計算各階段分位數"""
+        session = int(datetime(2024, 1, 2, 9).timestamp() * 1e9)
+        records = np.zeros(201, dtype=SPAN_DTYPE)
+        records["stage"][:100] = STAGE_INDEX["risk"]
+        records["stage"][100:] = STAGE_INDEX["broker"]
+        records["start_ns"][:200] = session
+        records["duration_ns"][:100] = np.arange(1, 101) * 1000
+        records["duration_ns"][100:] = 5000
+
+        summary = summarize(records, start=datetime(2024, 1, 2, 9))
+
+        assert list(summary) == ["risk", "broker"]
+        assert summary["risk"]["count"] == 100
+        assert summary["risk"]["p50_us"] == pytest.approx(50.5)
+        assert 99 < summary["risk"]["p99_us"] <= 100
+        assert summary["broker"]["count"] == 100
+        assert "risk" in format_report(summary)
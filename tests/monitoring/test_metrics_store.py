@@ -0,0 +1,224 @@
+"""
+本地指標儲存測試
+
+測試時間桶環形緩衝區的窗口聚合、查詢表達式解析，以及告警規則與
+交易指標收集器的整合。
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.monitoring.intelligent_alert_manager import (
+    AlertRule,
+    AlertSeverity,
+    AlertStatus,
+    IntelligentAlertManager,
+)
+from src.monitoring.metrics_store import MetricsStore, parse_query
+from src.monitoring.prometheus_modules.trading_metrics import TradingMetricsCollector
+
+NOW = 1_700_000_000.0
+
+
+class TestMetricsStore:
+    """窗口聚合測試"""
+
+    def test_window_aggregates(self):
+        """rate、avg、max 只計算窗口內的時間桶"""
+        store = MetricsStore()
+        store.observe("latency", 500.0, timestamp=NOW - 30)
+        for i in range(10):
+            store.observe("latency", float(i + 1), timestamp=NOW - i * 0.1)
+
+        assert store.aggregate("latency", "count", 5, now=NOW) == 10
+        assert store.aggregate("latency", "rate", 5, now=NOW) == 2.0
+        assert store.aggregate("latency", "avg", 5, now=NOW) == 5.5
+        assert store.aggregate("latency", "max", 5, now=NOW) == 10.0
+        assert store.aggregate("latency", "max", 60, now=NOW) == 500.0
+        assert store.aggregate("latency", "max", 5, now=NOW + 100) is None
+
+    def test_ring_overwrites_old_slots(self):
+        """超過保留時間的時間桶被覆寫"""
+        store = MetricsStore(resolution=1.0, slots=10)
+        store.inc("orders", 5, timestamp=NOW)
+        store.inc("orders", 1, timestamp=NOW + 10)
+
+        assert store.aggregate("orders", "increase", 60, now=NOW + 10) == 1.0
+
+    def test_quantile_and_labels(self):
+        """分位數以分桶內插估計，標籤條件篩選序列"""
+        store = MetricsStore()
+        store.register("latency", "histogram", [10, 100, 1000])
+        for _ in range(90):
+            store.observe("latency", 5, {"symbol": "2330.TW"}, timestamp=NOW)
+        for _ in range(10):
+            store.observe("latency", 800, {"symbol": "2317.TW"}, timestamp=NOW)
+
+        p95 = store.aggregate("latency", "quantile", 10, q=0.95, now=NOW)
+        assert 100 < p95 <= 1000
+        assert (
+            store.aggregate(
+                "latency", "quantile", 10, {"symbol": "2330.TW"}, q=0.95, now=NOW
+            )
+            <= 10
+        )
+
+    def test_gauge_last_value(self):
+        """量測值取最新值，多個序列取最大值"""
+        store = MetricsStore()
+        store.set("disk", 50.0, {"device": "sda"}, timestamp=NOW - 5)
+        store.set("disk", 97.0, {"device": "sdb"}, timestamp=NOW - 5)
+        store.set("disk", 40.0, {"device": "sda"}, timestamp=NOW)
+
+        assert store.evaluate("disk", now=NOW) == 97.0
+        assert store.evaluate('disk{device="sda"}', now=NOW) == 40.0
+        assert store.evaluate("disk[1s]", now=NOW) == 40.0
+
+    def test_max_series(self):
+        """超過序列上限時捨棄新序列"""
+        store = MetricsStore(max_series=2)
+        for symbol in ("a", "b", "c"):
+            store.inc("orders", 1, {"symbol": symbol})
+
+        assert store.get_stats() == {"metrics": 1, "series": 2, "dropped": 1}
+
+
+class TestParseQuery:
+    """查詢表達式解析測試"""
+
+    def test_supported_expressions(self):
+        """解析選擇器、窗口函數與分位數"""
+        assert parse_query("system_cpu_usage_percent") == (
+            "last",
+            "system_cpu_usage_percent",
+            {},
+            None,
+            None,
+        )
+        assert parse_query('rate(orders_total{status="rejected"}[1m])') == (
+            "rate",
+            "orders_total",
+            {"status": "rejected"},
+            60.0,
+            None,
+        )
+        assert parse_query("histogram_quantile(0.95, rate(latency_bucket[500ms]))") == (
+            "quantile",
+            "latency",
+            {},
+            0.5,
+            0.95,
+        )
+
+    @pytest.mark.parametrize(
+        "expr",
+        [
+            'rate(api_requests_total{status_code=~"5.."}[5m])',
+            "sum(rate(api_requests_total[5m])) by (endpoint)",
+            "latency[5x]",
+        ],
+    )
+    def test_unsupported_expressions(self, expr):
+        """無法在本地評估的表達式返回 None"""
+        assert parse_query(expr) is None
+
+
+class TestAlertIntegration:
+    """告警規則與收集器整合測試"""
+
+    @pytest.fixture
+    def store(self):
+        return MetricsStore()
+
+    @pytest.fixture
+    def alert_manager(self, store):
+        with patch(
+            "src.monitoring.intelligent_alert_manager.Path.exists", return_value=False
+        ):
+            return IntelligentAlertManager(store=store)
+
+    def test_latency_spike_triggers_alert(self, alert_manager, store):
+        """交易收集器記錄的延遲尖峰在下一次評估時觸發告警"""
+        collector = TradingMetricsCollector(store=store)
+        metric, operator, threshold = alert_manager._parse_expression(
+            "max_over_time(trading_order_latency_milliseconds[1s]) > 2500"
+        )
+        rule = AlertRule(
+            id="latency-spike",
+            name="OrderLatencySpike",
+            description="訂單延遲尖峰",
+            metric_name=metric,
+            operator=operator,
+            threshold_value=threshold,
+            severity=AlertSeverity.CRITICAL,
+        )
+        alert_manager.rules[rule.id] = rule
+
+        collector.record_order_latency(12.0, "limit", "2330.TW")
+        alert_manager._evaluate_alert_rules()
+        assert not alert_manager.active_alerts
+
+        collector.record_order_latency(3200.0, "limit", "2330.TW")
+        alert_manager._evaluate_alert_rules()
+        alert = next(iter(alert_manager.active_alerts.values()))
+        assert alert.metric_value == 3200.0
+
+    def test_repeated_firing_during_suppression(self, alert_manager, store):
+        """抑制期間持續觸發的規則只保留一個告警，條件解除後一併解決"""
+        rule = AlertRule(
+            id="cpu-high",
+            name="HighCPU",
+            description="CPU 過高",
+            metric_name="system_cpu_usage_percent",
+            operator=">",
+            threshold_value=90.0,
+            severity=AlertSeverity.WARNING,
+        )
+        alert_manager.rules = {rule.id: rule}
+        alert_manager._send_alert_notification = MagicMock()
+
+        store.set("system_cpu_usage_percent", 95.0)
+        alert_manager._evaluate_alert_rules()
+        store.set("system_cpu_usage_percent", 50.0)
+        alert_manager._evaluate_alert_rules()
+        assert not alert_manager.active_alerts
+
+        # 抑制窗口內再次觸發並持續 60 次評估
+        store.set("system_cpu_usage_percent", 97.0)
+        for _ in range(60):
+            alert_manager._evaluate_alert_rules()
+
+        alerts = list(alert_manager.active_alerts.values())
+        assert len(alerts) == 1
+        assert alerts[0].status == AlertStatus.SUPPRESSED
+        assert alerts[0].metric_value == 97.0
+        assert alert_manager._send_alert_notification.call_count == 1
+
+        store.set("system_cpu_usage_percent", 50.0)
+        alert_manager._evaluate_alert_rules()
+        assert not alert_manager.active_alerts
+
+    def test_unknown_metric_does_not_alert(self, alert_manager):
+        """沒有資料的指標不觸發也不解除告警"""
+        assert alert_manager._get_metric_value("system_cpu_usage_percent") is None
+
+    def test_order_success_rate(self, store):
+        """訂單收集計算窗口內的成功率"""
+        collector = TradingMetricsCollector(store=store)
+        for status in ("filled", "filled", "filled", "rejected"):
+            collector.record_order("limit", "2330.TW", status)
+        collector.update_position("2330.TW", 600_000, 1_000)
+        collector.update_position("2317.TW", 100_000, -400)
+
+        collector._collect_metrics()
+
+        assert store.evaluate("trading_order_success_rate") == 75.0
+        assert store.evaluate("trading_unrealized_pnl_total") == 600.0
+        assert (
+            collector.registry.get_sample_value(
+                "trading_fill_rate_percent",
+                {"symbol": "2330.TW", "order_type": "limit"},
+            )
+            == 75.0
+        )
@@ -0,0 +1,84 @@
+"""同步服務呼叫卸載效能測試
+
+在同一應用中混合阻塞的報表請求與輕量的 /ping 請求，比較路由直接呼叫同步
+函數與以 run_sync 卸載時 /ping 的尾端延遲。
+
+執行方式：
+    pytest tests/performance/test_api_offload_performance.py -m performance -s --noconftest
+"""
+
+import asyncio
+import time
+
+import httpx
+import numpy as np
+import pytest
+from fastapi import FastAPI
+
+from src.api.utils.offload import ServiceExecutor
+
+SLOW_CALL_SECONDS = 0.05
+NUM_SLOW_REQUESTS = 16
+NUM_PINGS = 100
+
+
+def _generate_report() -> dict:
+    """模擬同步報表生成（資料庫查詢與 pandas 運算）"""
+    time.sleep(SLOW_CALL_SECONDS)
+    return {"rows": 1000}
+
+
+def _build_app(executor: ServiceExecutor, offloaded: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/report")
+    async def report():
+        if offloaded:
+            return await executor.run(_generate_report, route="reports.generate")
+        return _generate_report()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def _ping_latencies(app: FastAPI) -> np.ndarray:
+    """穿插送出報表與 /ping 請求，延遲自請求建立起計算以包含事件迴圈的停頓"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+
+        async def timed_ping(created: float) -> float:
+            await c.get("/ping")
+            return time.perf_counter() - created
+
+        slow, pings = [], []
+        for i in range(NUM_PINGS):
+            if i % (NUM_PINGS // NUM_SLOW_REQUESTS) == 0:
+                slow.append(asyncio.create_task(c.get("/report")))
+            pings.append(asyncio.create_task(timed_ping(time.perf_counter())))
+            await asyncio.sleep(0.005)
+        latencies = await asyncio.gather(*pings)
+        await asyncio.gather(*slow)
+    return np.array(latencies)
+
+
+@pytest.mark.performance
+def test_offload_keeps_ping_latency_low():
+    """卸載後阻塞請求不再拉高 /ping 的 p99 延遲"""
+    executor = ServiceExecutor(max_threads=8)
+    try:
+        blocking = asyncio.run(_ping_latencies(_build_app(executor, offloaded=False)))
+        offloaded = asyncio.run(_ping_latencies(_build_app(executor, offloaded=True)))
+    finally:
+        executor.shutdown()
+
+    blocking_p99 = np.percentile(blocking, 99) * 1000
+    offloaded_p99 = np.percentile(offloaded, 99) * 1000
+    print(
+        f"\n/ping p99: 直接呼叫 {blocking_p99:.1f} ms，run_sync 卸載 {offloaded_p99:.1f} ms"
+    )
+
+    assert offloaded_p99 < blocking_p99
+    assert offloaded_p99 < SLOW_CALL_SECONDS * 1000
@@ -0,0 +1,67 @@
+"""認證中間件效能測試
+
+比較每次請求重新驗證 JWT 與使用已驗證 Token 快取時的認證開銷，以及權限檢查與
+黑名單查詢的單次耗時。
+
+執行方式：
+    pytest tests/performance/test_auth_performance.py -m performance -s --noconftest
+"""
+
+import time
+
+import pytest
+
+from src.api.middleware.auth import (
+    AuthMiddleware,
+    PermissionChecker,
+    TokenBlacklist,
+    TokenManager,
+)
+from src.api.middleware.auth_cache import VerifiedTokenCache
+
+NUM_CALLS = 20_000
+
+
+def _per_call_us(func, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(NUM_CALLS):
+        func(*args)
+    return (time.perf_counter() - start) / NUM_CALLS * 1e6
+
+
+@pytest.mark.performance
+def test_cached_verification_overhead():
+    """快取命中時的認證開銷降到微秒級"""
+    middleware = AuthMiddleware(None, token_cache=VerifiedTokenCache())
+    token = TokenManager.create_access_token("u1", "alice", "user")
+
+    def uncached(token):
+        TokenBlacklist.is_blacklisted(token)
+        middleware._verify_token(token)
+
+    def cached(token):
+        TokenBlacklist.is_blacklisted(token)
+        payload = middleware.token_cache.get(token)
+        if payload is None:
+            payload = middleware._verify_token(token)
+            middleware.token_cache.put(token, payload)
+
+    for i in range(10_000):
+        TokenBlacklist.add_token(f"revoked-{i}")
+    try:
+        full = _per_call_us(uncached, token)
+        fast = _per_call_us(cached, token)
+    finally:
+        TokenBlacklist._blacklist.clear()
+        TokenBlacklist.clear_expired_tokens()
+
+    print(f"\n每請求認證: 完整驗證 {full:.1f} µs，快取命中 {fast:.1f} µs")
+    assert fast * 3 < full
+
+
+@pytest.mark.performance
+def test_permission_check():
+    """權限位元集檢查的單次耗時"""
+    elapsed = _per_call_us(PermissionChecker.has_permission, "user", "trading")
+    print(f"\n權限檢查: {elapsed * 1000:.0f} ns")
+    assert elapsed < 5
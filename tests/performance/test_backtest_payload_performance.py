@@ -0,0 +1,57 @@
+"""回測圖表回應效能測試
+
+比較完整解析度與降採樣後的權益曲線回應大小與序列化時間。
+
+執行方式：
+    pytest tests/performance/test_backtest_payload_performance.py -m performance -s --noconftest
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.utils.downsampling import downsample_indices
+from src.api.utils.json_response import dumps
+
+NUM_POINTS = 500_000
+MAX_POINTS = 2_000
+
+
+def _chart_data() -> dict:
+    rng = np.random.default_rng(42)
+    values = 1_000_000 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, NUM_POINTS)))
+    peak = np.maximum.accumulate(values)
+    dates = pd.date_range("2000-01-01", periods=NUM_POINTS, freq="h")
+    return {
+        "dates": dates.strftime("%Y-%m-%d %H:%M").tolist(),
+        "portfolio_values": values.tolist(),
+        "drawdown": ((values - peak) / peak).tolist(),
+        "returns": np.r_[0.0, np.diff(values) / values[:-1]].tolist(),
+    }
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsampled_chart_payload(method):
+    """降採樣後回應大小降到完整序列的百分之一以下"""
+    chart_data = _chart_data()
+
+    start = time.perf_counter()
+    full = dumps(chart_data)
+    full_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indices = downsample_indices(chart_data["portfolio_values"], MAX_POINTS, method)
+    sampled = dumps(
+        {key: [series[i] for i in indices] for key, series in chart_data.items()}
+    )
+    sampled_seconds = time.perf_counter() - start
+
+    print(
+        f"\n{method}: 完整 {len(full) / 1e6:.1f} MB / {full_seconds * 1000:.0f} ms，"
+        f"降採樣 {len(sampled) / 1e3:.0f} KB / {sampled_seconds * 1000:.0f} ms"
+    )
+
+    assert len(sampled) * 100 < len(full)
@@ -0,0 +1,114 @@
+"""回測結果快取效能測試
+
+5 檔股票、兩年日資料的回測，比較完整計算、相同回測直接讀取快取，以及結束
+日期延後一個月時只計算尾段的等待時間。
+
+執行方式：
+    pytest tests/performance/test_backtest_result_store_performance.py -m performance -s --noconftest
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.backtest import BacktestConfig, BacktestService
+
+SYMBOLS = [f"S{i:02d}" for i in range(5)]
+MIN_CACHED_SPEEDUP = 50.0
+MIN_TAIL_SPEEDUP = 5.0
+
+
+class TrendStrategy:
+    """收盤價高於 20 日均線即買入的確定性策略"""
+
+    version = "trend-1"
+
+    def generate_signals(self, market_data):
+        data = market_data.sort_values(["symbol", "date"])
+        average = data.groupby("symbol")["close"].transform(
+            lambda close: close.rolling(20, min_periods=1).mean()
+        )
+        return pd.DataFrame(
+            {
+                "date": data["date"].to_numpy(),
+                "symbol": data["symbol"].to_numpy(),
+                "signal": np.where(data["close"] > average, 1, -1),
+                "weight": 0.2,
+            }
+        ).sort_values(["date", "symbol"], ignore_index=True)
+
+
+class SnapshotDataManager:
+    """固定價格快照的數據管理器"""
+
+    def __init__(self):
+        rng = np.random.default_rng(13)
+        dates = pd.bdate_range("2022-01-03", "2023-12-29")
+        close = 50 * np.exp(
+            np.cumsum(rng.normal(0, 0.02, (len(dates), len(SYMBOLS))), 0)
+        )
+        self.market = pd.DataFrame(
+            {
+                "symbol": np.tile(SYMBOLS, len(dates)),
+                "date": np.repeat(dates, len(SYMBOLS)),
+                "close": close.ravel(),
+                "volume": 1000,
+            }
+        )
+
+    def get_data_version(self, symbols, start_date, end_date):
+        return "snapshot-1"
+
+    def load_market_data(self, symbols, start_date, end_date):
+        dates = self.market["date"]
+        return self.market[(dates >= start_date) & (dates <= end_date)]
+
+    def load_strategy(self, strategy_name, strategy_params=None):
+        return TrendStrategy()
+
+
+def _timed_run(service, end_date):
+    config = BacktestConfig(
+        strategy_name="trend",
+        symbols=SYMBOLS,
+        start_date="2022-01-03",
+        end_date=end_date,
+    )
+    start = time.perf_counter()
+    backtest_id = service.start_backtest(config)
+    while service.get_backtest_status(backtest_id)["status"] not in (
+        "completed",
+        "failed",
+    ):
+        time.sleep(0.001)
+    seconds = time.perf_counter() - start
+    assert service.get_backtest_status(backtest_id)["status"] == "completed"
+    return seconds, service.get_backtest_results(backtest_id)
+
+
+@pytest.mark.performance
+def test_cached_and_tail_runs(tmp_path):
+    """相同回測立即返回，延後結束日期只計算尾段，結果與完整重算相同"""
+    service = BacktestService(results_dir=str(tmp_path / "cached"))
+    service.data_manager = SnapshotDataManager()
+    uncached = BacktestService(results_dir=str(tmp_path / "fresh"), use_cache=False)
+    uncached.data_manager = SnapshotDataManager()
+
+    full_seconds, _ = _timed_run(service, "2023-11-30")
+    cached_seconds, _ = _timed_run(service, "2023-11-30")
+    tail_seconds, tail = _timed_run(service, "2023-12-29")
+    recompute_seconds, recomputed = _timed_run(uncached, "2023-12-29")
+
+    print(
+        f"\n完整計算：{full_seconds:.2f}s"
+        f"\n相同回測（快取）：{cached_seconds * 1e3:.1f}ms"
+        f"（{full_seconds / cached_seconds:.0f}x）"
+        f"\n延後一個月（尾段）：{tail_seconds:.2f}s，"
+        f"完整重算 {recompute_seconds:.2f}s（{recompute_seconds / tail_seconds:.1f}x）"
+    )
+    assert tail["summary"] == recomputed["summary"]
+    pd.testing.assert_frame_equal(tail["daily_values"], recomputed["daily_values"])
+    assert full_seconds / cached_seconds > MIN_CACHED_SPEEDUP
+    assert recompute_seconds / tail_seconds > MIN_TAIL_SPEEDUP
@@ -0,0 +1,97 @@
+"""Backtrader 批次預測效能測試
+
+500 檔股票、一年日資料，模型每根 K 棒對全部標的給出訊號。比較原本逐根
+組成單列特徵並呼叫模型、以預設 Backtrader 設定執行，與批次預測並以
+stdstats=False 省去每個資料的買賣點觀察器的執行時間與記憶體峰值。
+
+執行方式：
+    pytest tests/performance/test_backtrader_precompute_performance.py -m performance -s --noconftest
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.backtrader_integration import BacktestEngine, ModelSignalStrategy
+
+NUM_SYMBOLS = 500
+NUM_BARS = 250
+MIN_SPEEDUP = 2.0
+
+
+class MomentumModel:
+    """以開收盤價差產生各標的訊號的確定性模型"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, features):
+        self.calls += 1
+        close = features.filter(like="_close").to_numpy()
+        open_ = features.filter(like="_open").to_numpy()
+        return np.tanh((close - open_) / open_ * 50)
+
+
+def _market() -> pd.DataFrame:
+    rng = np.random.default_rng(21)
+    dates = pd.bdate_range("2023-01-02", periods=NUM_BARS)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.015, (NUM_BARS, NUM_SYMBOLS)), 0))
+    open_ = close * (1 + rng.normal(0, 0.01, close.shape))
+    symbols = [f"S{i:03d}" for i in range(NUM_SYMBOLS)]
+    return pd.DataFrame(
+        {
+            "date": np.tile(dates, NUM_SYMBOLS),
+            "symbol": np.repeat(symbols, NUM_BARS),
+            "open": open_.T.ravel(),
+            "high": np.maximum(open_, close).T.ravel() * 1.005,
+            "low": np.minimum(open_, close).T.ravel() * 0.995,
+            "close": close.T.ravel(),
+            "volume": 1e5,
+        }
+    )
+
+
+def _run(market, tmp_path, precompute, **engine_kwargs):
+    model = MomentumModel()
+    engine = BacktestEngine(cash=1e7, output_dir=str(tmp_path), **engine_kwargs)
+    engine.add_symbols(market)
+    engine.add_strategy(
+        ModelSignalStrategy,
+        model=model,
+        precompute=precompute,
+        rebalance_freq=1,
+        position_size=0.01,
+        max_positions=50,
+    )
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    engine.cerebro.run()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, engine.cerebro.broker.getvalue(), model.calls
+
+
+@pytest.mark.performance
+def test_500_symbols(tmp_path):
+    """批次預測搭配觀察器設定明顯較快、記憶體峰值不增加，回測結果相同"""
+    market = _market()
+
+    per_bar = _run(market, tmp_path / "per_bar", False)
+    batched = _run(market, tmp_path / "batched", True, stdstats=False)
+
+    print(
+        f"\n逐根預測：{per_bar[0]:.2f}s，峰值 {per_bar[1] / 2**20:.0f}MB，"
+        f"模型呼叫 {per_bar[3]} 次"
+        f"\n批次預測：{batched[0]:.2f}s，峰值 {batched[1] / 2**20:.0f}MB，"
+        f"模型呼叫 {batched[3]} 次（{per_bar[0] / batched[0]:.1f}x）"
+    )
+    assert batched[3] == 1
+    assert batched[2] == per_bar[2]
+    assert per_bar[0] / batched[0] > MIN_SPEEDUP
+    # 批次特徵矩陣的記憶體由省去的觀察器抵銷
+    assert batched[1] < per_bar[1] * 1.05
@@ -0,0 +1,78 @@
+"""事件關聯分析效能測試
+
+以複合事件處理器串接主題關聯、規則關聯與異常檢測器，量測每秒可處理的事件數，
+並確認緩衝區變大時每個事件的處理成本不變。
+
+執行方式：
+    pytest tests/performance/test_event_correlation_performance.py -m performance -s --noconftest
+"""
+
+import time
+
+import pytest
+
+from src.core.events.anomaly_detector import (
+    FrequencyAnomalyDetector,
+    PatternAnomalyDetector,
+    ValueAnomalyDetector,
+)
+from src.core.events.event import Event, EventSource, EventType
+from src.core.events.event_correlation import RuleBasedCorrelator, SubjectCorrelator
+from src.core.events.event_processor import CompositeEventProcessor
+
+NUM_EVENTS = 100_000
+NUM_SYMBOLS = 500
+TARGET_EVENTS_PER_SECOND = 50_000
+EVENT_TYPES = [EventType.PRICE_CHANGE, EventType.VOLUME_SPIKE]
+
+
+def _build(max_events: int) -> CompositeEventProcessor:
+    correlators = [
+        SubjectCorrelator("subject", EVENT_TYPES, window_size=300, threshold=50),
+        RuleBasedCorrelator(
+            "rule",
+            EVENT_TYPES,
+            [lambda event, buffer: event.data.get("price", 0) > 1_000],
+            window_size=300,
+        ),
+    ]
+    for correlator in correlators:
+        correlator.max_events = max_events
+    processors = correlators + [
+        FrequencyAnomalyDetector("frequency", EVENT_TYPES, window_size=1),
+        ValueAnomalyDetector("value", EVENT_TYPES, "price"),
+        PatternAnomalyDetector("pattern", EVENT_TYPES),
+    ]
+    composite = CompositeEventProcessor("composite", processors)
+    for processor in processors:
+        processor.running = True
+    return composite
+
+
+def _events():
+    return [
+        Event(
+            event_type=EVENT_TYPES[i % 2],
+            source=EventSource.MARKET_DATA,
+            subject=f"{1000 + i % NUM_SYMBOLS}.TW",
+            data={"price": 100.0 + i % 7},
+        )
+        for i in range(NUM_EVENTS)
+    ]
+
+
+@pytest.mark.performance
+def test_composite_throughput():
+    """每秒處理至少 5 萬個事件，且不隨緩衝區大小變慢"""
+    events = _events()
+    rates = {}
+    for max_events in (1_000, NUM_EVENTS):
+        composite = _build(max_events)
+        start = time.perf_counter()
+        for event in events:
+            composite.process_event(event)
+        rates[max_events] = NUM_EVENTS / (time.perf_counter() - start)
+        print(f"\n緩衝區上限 {max_events}: 每秒 {rates[max_events]:,.0f} 個事件")
+
+    assert min(rates.values()) > TARGET_EVENTS_PER_SECOND
+    assert rates[NUM_EVENTS] > rates[1_000] * 0.5
@@ -0,0 +1,65 @@
+"""推送閘道效能測試
+
+模擬大量儀表板連線訂閱部分股票，量測閘道發布一筆行情更新的耗時，以及高頻
+更新合併後實際送出的項目數。
+
+執行方式：
+    pytest tests/performance/test_event_gateway_performance.py -m performance -s --noconftest
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from src.api.utils.event_gateway import EventGateway
+
+NUM_CLIENTS = 1_000
+NUM_SYMBOLS = 500
+SYMBOLS_PER_CLIENT = 10
+NUM_UPDATES = 50_000
+
+
+@pytest.mark.performance
+def test_publish_fanout_and_coalescing():
+    """發布耗時與合併後的推送項目數"""
+
+    async def run():
+        rng = np.random.default_rng(0)
+        symbols = [f"{1000 + i}.TW" for i in range(NUM_SYMBOLS)]
+        gateway = EventGateway()
+        clients = [
+            gateway.connect(
+                topics=["quotes"],
+                symbols=rng.choice(symbols, SYMBOLS_PER_CLIENT, replace=False),
+            )
+            for _ in range(NUM_CLIENTS)
+        ]
+        for client in clients:
+            await client.next_message()
+
+        updates = rng.integers(0, NUM_SYMBOLS, NUM_UPDATES)
+        prices = 100 + rng.normal(size=NUM_UPDATES).cumsum()
+        start = time.perf_counter()
+        for index, price in zip(updates, prices):
+            gateway.publish("quotes", symbols[index], {"price": float(price)})
+        elapsed = time.perf_counter() - start
+
+        matched = sum(
+            len(client.symbols & {symbols[i] for i in updates}) for client in clients
+        )
+        sent = 0
+        for client in clients:
+            sent += len((await client.next_message())["items"])
+        return elapsed / NUM_UPDATES * 1e6, matched, sent
+
+    per_update_us, matched, sent = asyncio.run(run())
+    print(
+        f"\n{NUM_CLIENTS} 個連線: 每筆行情發布 {per_update_us:.1f} µs，"
+        f"合併後送出 {sent} 個項目（未合併需送出約 "
+        f"{NUM_UPDATES * NUM_CLIENTS * SYMBOLS_PER_CLIENT // NUM_SYMBOLS} 個）"
+    )
+
+    assert sent == matched
+    assert per_update_us < 200
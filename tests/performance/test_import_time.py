@@ -0,0 +1,108 @@
+"""匯入時間預算測試
+
+以 ``python -X importtime`` 在獨立程序中匯入各進入點與常用套件，解析輸出的
+累計匯入時間並與預算比較，避免新增的頂層匯入拖慢 API、CLI 與 Web UI 的啟動。
+
+執行方式：
+    pytest tests/performance/test_import_time.py -m performance -s --noconftest
+"""
+
+import os
+import re
+import subprocess
+import sys
+from typing import List, Tuple
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+# 進入點的匯入時間預算（秒）
+ENTRY_POINT_BUDGETS = {
+    "src.api.main": 3.0,
+    "src.core.main": 3.0,
+    "src.ui.web_ui": 5.0,
+}
+
+# 延遲匯出的套件只應載入 __init__ 本身
+LAZY_PACKAGE_BUDGETS = {
+    "src.data_sources": 0.1,
+    "src.risk_management": 0.1,
+    "src.execution": 0.1,
+    "src.monitoring": 0.1,
+    "src.strategy": 0.1,
+    "src.log_system": 0.1,
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """在獨立程序中匯入模組並解析 ``-X importtime`` 輸出
+
+    Args:
+        module: 模組名稱
+
+    Returns:
+        Tuple[float, List[Tuple[float, str]]]: 累計匯入秒數，以及依累計時間排序的
+            直接匯入的模組 (秒數, 模組名稱)
+
+    Raises:
+        ImportError: 模組匯入失敗時，訊息為子程序錯誤的最後一行
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    lines = result.stderr.splitlines()
+    if result.returncode != 0:
+        errors = [line for line in lines if not line.startswith("import time:")]
+        raise ImportError(errors[-1] if errors else f"無法匯入 {module}")
+
+    entries = []
+    for line in lines:
+        match = _LINE.match(line)
+        if match:
+            depth = len(match.group(3))
+            entries.append((depth, int(match.group(2)) / 1e6, match.group(4)))
+
+    # 子模組的輸出行位於父模組之前且縮排較深
+    index = max(i for i, entry in enumerate(entries) if entry[2] == module)
+    depth, total, _ = entries[index]
+    children = []
+    for child_depth, cumulative, name in reversed(entries[:index]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 2:
+            children.append((cumulative, name))
+    slowest = sorted(children, reverse=True)
+    return total, slowest
+
+
+def _check_budget(module: str, budget: float) -> None:
+    try:
+        elapsed, slowest = measure_import(module)
+    except ImportError as e:
+        pytest.skip(f"{module} 無法匯入: {e}")
+
+    top = ", ".join(f"{name} {seconds:.2f}s" for seconds, name in slowest[:5])
+    print(f"\n{module}: {elapsed:.3f}s（預算 {budget:.1f}s）；最慢的直接匯入: {top}")
+    assert elapsed < budget, f"{module} 匯入耗時 {elapsed:.2f}s 超過預算 {budget:.1f}s"
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("module,budget", sorted(ENTRY_POINT_BUDGETS.items()))
+def test_entry_point_import_budget(module, budget):
+    """進入點匯入時間不超過預算"""
+    _check_budget(module, budget)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("module,budget", sorted(LAZY_PACKAGE_BUDGETS.items()))
+def test_lazy_package_import_budget(module, budget):
+    """延遲匯出的套件匯入時不載入子模組"""
+    _check_budget(module, budget)
@@ -0,0 +1,74 @@
+"""異步日誌處理器效能測試
+
+以本地 HTTP 接收端比較逐筆發送與批次 _bulk 發送的吞吐量。
+
+執行方式：
+    pytest tests/performance/test_log_handler_performance.py -m performance -s --noconftest
+"""
+
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.log_system.handlers import ElasticsearchHandler
+
+NUM_RECORDS = 2_000
+
+
+class _StubElasticsearch(BaseHTTPRequestHandler):
+    """只回應成功的 Elasticsearch 替身"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        payload = b'{"errors": false}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _ship(url: str, batch_size: int) -> float:
+    handler = ElasticsearchHandler(
+        host=url,
+        max_queue_size=NUM_RECORDS,
+        batch_size=batch_size,
+        batch_interval=0.05,
+    )
+    handler.setFormatter(logging.Formatter('{"message": "%(message)s"}'))
+    start = time.perf_counter()
+    for i in range(NUM_RECORDS):
+        handler.handle(
+            logging.LogRecord("bench", logging.INFO, __file__, 0, f"m{i}", None, None)
+        )
+    assert handler.flush(timeout=120)
+    elapsed = time.perf_counter() - start
+    stats = handler.get_stats()
+    handler.close()
+
+    assert stats["processed"] == NUM_RECORDS
+    assert stats["dropped"] == 0
+    return NUM_RECORDS / elapsed
+
+
+@pytest.mark.performance
+def test_bulk_shipping_throughput():
+    """逐筆與批次發送的吞吐量基準"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubElasticsearch)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        results = {batch_size: _ship(url, batch_size) for batch_size in (1, 500)}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    for batch_size, records_per_s in results.items():
+        print(f"batch_size={batch_size}: {records_per_s:,.0f} records/s")
+    assert results[500] > results[1]
@@ -0,0 +1,69 @@
+"""日誌索引效能測試
+
+比較一週日誌以索引查詢與逐行解析的儀表板統計耗時。
+
+執行方式：
+    pytest tests/performance/test_log_indexer_performance.py -m performance -s --noconftest
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.log_system.analyzer import LogAnalyzer
+
+RECORDS_PER_HOUR = 1_200
+HOURS = 7 * 24
+LEVELS = ("DEBUG", "INFO", "INFO", "INFO", "WARNING", "ERROR")
+
+
+def _write_week_of_logs(log_dir: str) -> None:
+    start = datetime(2025, 1, 6)
+    with open(os.path.join(log_dir, "app.log"), "w", encoding="utf-8") as f:
+        for hour in range(HOURS):
+            base = start + timedelta(hours=hour)
+            for i in range(RECORDS_PER_HOUR):
+                record = {
+                    "timestamp": (base + timedelta(seconds=i * 3)).strftime(
+                        "%Y-%m-%dT%H:%M:%S.%fZ"
+                    ),
+                    "level": LEVELS[i % len(LEVELS)],
+                    "logger": "bench",
+                    "message": f"operation {i % 50} completed",
+                    "category": "system",
+                    "data": {"execution_time": (i % 100) / 10},
+                }
+                f.write(json.dumps(record) + "\n")
+
+
+@pytest.mark.performance
+def test_week_dashboard_latency(tmp_path):
+    """一週日誌的級別統計：索引查詢與逐行解析"""
+    log_dirs = {"system": str(tmp_path / "system")}
+    os.makedirs(log_dirs["system"])
+    _write_week_of_logs(log_dirs["system"])
+
+    analyzer = LogAnalyzer(log_dirs, index_dir=str(tmp_path / "index"))
+    start = time.perf_counter()
+    analyzer.indexer.update()
+    index_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = analyzer.count_logs_by_level("system")
+    indexed_query = time.perf_counter() - start
+
+    legacy = LogAnalyzer(log_dirs, use_index=False)
+    start = time.perf_counter()
+    df = legacy.load_logs("system", limit=RECORDS_PER_HOUR * HOURS)
+    parsed = dict(df["level"].value_counts())
+    parse_query = time.perf_counter() - start
+
+    print(
+        f"records={RECORDS_PER_HOUR * HOURS:,} index_build={index_build:.2f}s "
+        f"indexed={indexed_query:.3f}s parse={parse_query:.2f}s"
+    )
+    assert indexed == parsed
+    assert indexed_query < 1.0
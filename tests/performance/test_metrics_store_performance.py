@@ -0,0 +1,59 @@
+"""本地指標儲存效能測試
+
+量測訂單延遲寫入與窗口查詢的耗時，確認查詢成本不隨寫入筆數增加。
+
+執行方式：
+    pytest tests/performance/test_metrics_store_performance.py -m performance -s --noconftest
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.monitoring.metrics_store import MetricsStore
+
+NUM_SYMBOLS = 200
+NUM_QUERIES = 200
+BUCKETS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def _fill(store: MetricsStore, samples: int, now: float) -> float:
+    """在最近一分鐘內寫入延遲樣本，返回每筆寫入的微秒數"""
+    rng = np.random.default_rng(0)
+    symbols = [{"symbol": f"{1000 + i}.TW"} for i in range(NUM_SYMBOLS)]
+    picks = rng.integers(0, NUM_SYMBOLS, samples)
+    latencies = rng.lognormal(3, 1, samples)
+    stamps = now - 60 + np.sort(rng.random(samples)) * 60
+    start = time.perf_counter()
+    for index, latency, stamp in zip(picks, latencies, stamps):
+        store.observe("latency", float(latency), symbols[index], float(stamp))
+    return (time.perf_counter() - start) / samples * 1e6
+
+
+def _query(store: MetricsStore, now: float) -> float:
+    """查詢一秒與一分鐘窗口，返回每次查詢的微秒數"""
+    start = time.perf_counter()
+    for _ in range(NUM_QUERIES):
+        store.aggregate("latency", "max", 1, now=now)
+        store.aggregate("latency", "quantile", 60, {"symbol": "1000.TW"}, 0.95, now)
+    return (time.perf_counter() - start) / (2 * NUM_QUERIES) * 1e6
+
+
+@pytest.mark.performance
+def test_record_and_window_query():
+    """寫入耗時與查詢耗時不隨樣本數成長"""
+    now = time.time()
+    results = {}
+    for samples in (10_000, 100_000):
+        store = MetricsStore()
+        store.register("latency", "histogram", BUCKETS)
+        results[samples] = (_fill(store, samples, now), _query(store, now))
+        print(
+            f"\n{samples} 筆樣本: 每筆寫入 {results[samples][0]:.2f} µs，"
+            f"每次查詢 {results[samples][1]:.1f} µs"
+        )
+
+    assert results[100_000][0] < 20
+    # 查詢成本由窗口內的時間桶與序列數決定，與樣本數無關
+    assert results[100_000][1] < results[10_000][1] * 3
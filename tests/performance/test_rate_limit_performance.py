@@ -0,0 +1,86 @@
+"""速率限制中間件效能測試
+
+量測 RateLimitMiddleware 使用不同存儲後端時每個請求增加的延遲，以及大量
+客戶端 IP 下行程內存儲的鍵數上限。
+
+執行方式：
+    pytest tests/performance/test_rate_limit_performance.py -m performance -s --noconftest
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api.middleware.rate_limit import RateLimitMiddleware
+from src.api.middleware.rate_limit_store import (
+    MemoryRateLimitStore,
+    SQLiteRateLimitStore,
+)
+
+NUM_REQUESTS = 2_000
+NUM_CLIENTS = 500
+
+
+def _build_app(store=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/data/quotes")
+    async def quotes():
+        return {"ok": True}
+
+    if store is not None:
+        app.add_middleware(RateLimitMiddleware, store=store)
+    return app
+
+
+async def _per_request_us(app: FastAPI) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://api.example"
+    ) as client:
+        start = time.perf_counter()
+        for i in range(NUM_REQUESTS):
+            headers = {"X-Forwarded-For": f"10.0.{i % NUM_CLIENTS // 256}.{i % 256}"}
+            response = await client.get("/api/v1/data/quotes", headers=headers)
+            assert response.status_code == 200
+        return (time.perf_counter() - start) / NUM_REQUESTS * 1e6
+
+
+@pytest.mark.performance
+def test_middleware_overhead_per_request(tmp_path):
+    """各存儲後端的每請求額外延遲"""
+    baseline = asyncio.run(_per_request_us(_build_app()))
+    memory = asyncio.run(_per_request_us(_build_app(MemoryRateLimitStore())))
+    sqlite = asyncio.run(
+        _per_request_us(_build_app(SQLiteRateLimitStore(str(tmp_path / "rl.db"))))
+    )
+
+    print(
+        f"\n每請求延遲: 無中間件 {baseline:.0f} µs，"
+        f"memory +{memory - baseline:.0f} µs，sqlite +{sqlite - baseline:.0f} µs"
+    )
+    # 存儲本身的開銷應遠小於中間件與請求處理的固定成本
+    assert memory < baseline * 3
+    assert sqlite < baseline * 5
+
+
+@pytest.mark.performance
+def test_memory_store_keyspace_is_bounded():
+    """大量客戶端 IP 下鍵數維持在上限，單次檢查時間不隨鍵數增長"""
+    store = MemoryRateLimitStore(max_keys=10_000)
+
+    async def hit_all(count):
+        start = time.perf_counter()
+        for i in range(count):
+            await store.hit(f"ip:{i}", limit=100, window_seconds=60)
+        return (time.perf_counter() - start) / count * 1e6
+
+    small = asyncio.run(hit_all(10_000))
+    large = asyncio.run(hit_all(200_000))
+    print(f"\n單次檢查: 1 萬個鍵 {small:.2f} µs，20 萬個鍵 {large:.2f} µs")
+
+    assert len(store) == 10_000
+    assert large < small * 3
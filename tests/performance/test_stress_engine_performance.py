@@ -0,0 +1,136 @@
+"""批次壓力測試引擎效能測試
+
+模擬每晚的風險委員會報表：50 檔股票、3 年日資料，500 個歷史與假設情境
+（崩盤、復甦、波動率、相關性、流動性與歷史重播的組合）。與原本逐一複製
+資料框架、以 pandas 套用衝擊並重新回測的做法比較，舊做法只取 20 個情境
+量測後換算為 500 個。
+
+執行方式：
+    pytest tests/performance/test_stress_engine_performance.py -m performance -s --noconftest
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.stress_engine import (
+    CorrelationShock,
+    HistoricalShock,
+    LiquidityShock,
+    PriceShock,
+    Scenario,
+    StressEngine,
+    VolatilityShock,
+)
+
+NUM_ASSETS = 50
+NUM_DAYS = 750
+NUM_SCENARIOS = 500
+LEGACY_SAMPLE = 20
+MIN_SPEEDUP = 10.0
+
+
+def _data() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2021-01-04", periods=NUM_DAYS)
+    returns = rng.normal(0.0003, 0.012, (NUM_DAYS, NUM_ASSETS))
+    prices = 100 * np.exp(np.cumsum(returns, axis=0))
+    symbols = [f"S{j:02d}" for j in range(NUM_ASSETS)]
+    return pd.DataFrame(
+        {
+            "date": np.tile(dates, NUM_ASSETS),
+            "symbol": np.repeat(symbols, NUM_DAYS),
+            "open": prices.T.ravel(),
+            "high": prices.T.ravel() * 1.01,
+            "low": prices.T.ravel() * 0.99,
+            "close": prices.T.ravel(),
+            "volume": 1e6,
+        }
+    )
+
+
+def _scenarios(dates: pd.DatetimeIndex):
+    rng = np.random.default_rng(11)
+    scenarios = []
+    for i in range(NUM_SCENARIOS):
+        start = int(rng.integers(20, NUM_DAYS - 130))
+        period = (str(dates[start].date()), str(dates[start + 60].date()))
+        after = (str(dates[start + 61].date()), str(dates[start + 120].date()))
+        kind = i % 5
+        if kind == 0:
+            shocks = [
+                PriceShock(period, -rng.uniform(0.1, 0.5)),
+                PriceShock(after, rng.uniform(0.0, 0.3)),
+            ]
+        elif kind == 1:
+            shocks = [VolatilityShock(period, rng.uniform(1.5, 4.0))]
+        elif kind == 2:
+            shocks = [CorrelationShock(period, rng.uniform(0.5, 0.95))]
+        elif kind == 3:
+            shocks = [LiquidityShock(period, slippage_increase=rng.uniform(2, 10))]
+        else:
+            shocks = [HistoricalShock(period, start=after[0])]
+        scenarios.append(Scenario(f"scenario_{i}", shocks))
+    return scenarios
+
+
+def _legacy(data: pd.DataFrame, scenario: Scenario) -> float:
+    """原本的寫法：複製資料框架、以 pandas 套用衝擊並重新回測"""
+    stress_data = data.copy()
+    for shock in scenario.shocks:
+        mask = (stress_data["date"] >= shock.period[0]) & (
+            stress_data["date"] <= shock.period[1]
+        )
+        for symbol, group in stress_data[mask].groupby("symbol"):
+            index = group.index
+            if isinstance(shock, PriceShock):
+                last = stress_data.loc[
+                    (stress_data["symbol"] == symbol)
+                    & (stress_data["date"] < shock.period[0]),
+                    "close",
+                ].iloc[-1]
+                daily = (1 + shock.total_return) ** (1 / len(index)) - 1
+                stress_data.loc[index, "close"] = last * (1 + daily) ** np.arange(
+                    1, len(index) + 1
+                )
+            elif isinstance(shock, VolatilityShock):
+                returns = group["close"].pct_change().fillna(0)
+                shocked = returns.mean() + (returns - returns.mean()) * (
+                    shock.multiplier
+                )
+                stress_data.loc[index, "close"] = (
+                    group["close"].iloc[0] * (1 + shocked).cumprod()
+                )
+            else:
+                stress_data.loc[index, "volume"] = group["volume"] * 0.2
+
+    close = stress_data.pivot(index="date", columns="symbol", values="close")
+    portfolio = (1 + close.pct_change().fillna(0).mean(axis=1)).cumprod()
+    return float(portfolio.iloc[-1] - 1)
+
+
+@pytest.mark.performance
+def test_nightly_scenario_matrix():
+    """500 個情境的情境 × 指標矩陣明顯快於逐一重建資料並回測"""
+    data = _data()
+
+    start = time.perf_counter()
+    engine = StressEngine.from_frame(data)
+    scenarios = _scenarios(engine.dates)
+    matrix = engine.run(scenarios)
+    engine_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for scenario in scenarios[:LEGACY_SAMPLE]:
+        _legacy(data, scenario)
+    legacy_seconds = (time.perf_counter() - start) * NUM_SCENARIOS / LEGACY_SAMPLE
+
+    print(
+        f"\n{NUM_SCENARIOS} 個情境：引擎 {engine_seconds:.2f}s，"
+        f"舊做法約 {legacy_seconds:.2f}s（{legacy_seconds / engine_seconds:.1f}x）"
+    )
+    assert matrix.shape == (NUM_SCENARIOS, 7)
+    assert np.isfinite(matrix.to_numpy()).all()
+    assert legacy_seconds / engine_seconds > MIN_SPEEDUP
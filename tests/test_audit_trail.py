@@ -0,0 +1,199 @@
+"""
+審計跟蹤測試
+
+測試批次雜湊鏈簽名、背景寫入、寫入失敗重試、程序結束時寫入剩餘事件、
+索引查詢與竄改偵測。
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.audit_trail import AuditEventType, AuditTrail
+
+
+@pytest.fixture
+def trail(tmp_path):
+    """建立使用暫存目錄的審計跟蹤（重設單例）"""
+    AuditTrail._instance = None
+    audit = AuditTrail(
+        log_dir=str(tmp_path / "audit"),
+        key_dir=str(tmp_path / "keys"),
+        batch_size=8,
+    )
+    yield audit
+    audit.close()
+    AuditTrail._instance = None
+
+
+def _reopen(tmp_path):
+    AuditTrail._instance = None
+    return AuditTrail(log_dir=str(tmp_path / "audit"), key_dir=str(tmp_path / "keys"))
+
+
+def _log_orders(trail, count, user_id="trader"):
+    return [
+        trail.log_event(AuditEventType.ORDER_CREATED, user_id, {"order_id": i})
+        for i in range(count)
+    ]
+
+
+class TestAuditTrail:
+    """審計跟蹤測試"""
+
+    def test_log_event_does_not_write_on_caller_thread(self, trail):
+        """log_event 只放入佇列，寫入後才設定鏈結雜湊與簽名"""
+        event = trail.log_event(AuditEventType.ORDER_CREATED, "trader", {"id": 1})
+        trail.flush()
+
+        assert event.chain_hash is not None
+        assert event.signature is not None
+
+    def test_batches_are_signed_once(self, trail):
+        """每批只產生一行封存記錄與一次簽名"""
+        _log_orders(trail, 20)
+        trail.flush()
+
+        with open(trail.current_log_file, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        seals = [r for r in records if r.get("record_type") == "seal"]
+
+        assert len(records) - len(seals) == 20
+        assert 3 <= len(seals) <= 20
+        assert sum(seal["count"] for seal in seals) == 20
+        for prev, seal in zip(seals, seals[1:]):
+            assert seal["start_hash"] == prev["last_hash"]
+        assert trail.verify_chain()
+
+    def test_failed_batch_is_retried(self, trail, monkeypatch):
+        """寫入失敗的批次重試而不丟棄，批次編號與雜湊鏈保持連續"""
+        write_batch = trail._write_batch
+        failures = []
+
+        def flaky(batch, conn):
+            if not failures:
+                failures.append(len(batch))
+                raise OSError("disk full")
+            write_batch(batch, conn)
+
+        monkeypatch.setattr(trail, "_write_batch", flaky)
+        _log_orders(trail, 20)
+        trail.flush()
+
+        assert failures
+        events = trail.get_events()
+        assert [e.details["order_id"] for e in events] == list(range(20))
+        with open(trail.current_log_file, encoding="utf-8") as f:
+            seals = [r for r in map(json.loads, f) if r.get("record_type") == "seal"]
+        assert [seal["batch_id"] for seal in seals] == list(range(1, len(seals) + 1))
+        assert trail.verify_chain()
+
+    def test_pending_events_written_at_exit(self, tmp_path):
+        """程序結束前未呼叫 close 時仍寫入所有事件"""
+        script = textwrap.dedent(f"""
+            from src.core.audit_trail import AuditEventType, AuditTrail
+
+            AuditTrail._instance = None
+            trail = AuditTrail(log_dir={str(tmp_path / "audit")!r},
+                               key_dir={str(tmp_path / "keys")!r})
+            for i in range(2000):
+                trail.log_event(AuditEventType.ORDER_CREATED, "trader", {{"id": i}})
+            """)
+        subprocess.run(
+            [sys.executable, "-c", script],
+            check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            timeout=120,
+        )
+
+        trail = _reopen(tmp_path)
+        try:
+            assert len(trail.get_events(limit=5000)) == 2000
+            assert trail.verify_chain()
+        finally:
+            trail.close()
+            AuditTrail._instance = None
+
+    def test_indexed_queries(self, trail):
+        """依用戶、事件類型與時間範圍查詢"""
+        _log_orders(trail, 5, user_id="alice")
+        _log_orders(trail, 3, user_id="bob")
+        trail.log_event(AuditEventType.USER_LOGIN, "alice", {})
+
+        alice = trail.get_events(user_id="alice")
+        assert len(alice) == 6
+        assert [e.details.get("order_id") for e in alice[:5]] == list(range(5))
+
+        logins = trail.get_events(event_types=[AuditEventType.USER_LOGIN])
+        assert [e.user_id for e in logins] == ["alice"]
+
+        assert len(trail.get_events(limit=4)) == 4
+        future = datetime.now() + timedelta(hours=1)
+        assert trail.get_events(start_time=future) == []
+
+    def test_tampered_event_is_rejected(self, tmp_path, trail):
+        """竄改事件內容後該批次驗證失敗"""
+        _log_orders(trail, 3)
+        trail.flush()
+        log_file = trail.current_log_file
+        trail.close()
+
+        with open(log_file, encoding="utf-8") as f:
+            lines = f.readlines()
+        record = json.loads(lines[0])
+        record["details"]["order_id"] = 999
+        lines[0] = json.dumps(record) + "\n"
+        with open(log_file, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+
+        reopened = _reopen(tmp_path)
+        try:
+            reopened.rebuild_index()
+            assert reopened.get_events() == []
+            assert not reopened.verify_chain()
+        finally:
+            reopened.close()
+
+    def test_chain_continues_after_restart(self, tmp_path, trail):
+        """重新啟動後雜湊鏈從最後一批延續"""
+        _log_orders(trail, 3)
+        trail.close()
+
+        reopened = _reopen(tmp_path)
+        try:
+            _log_orders(reopened, 2)
+            assert len(reopened.get_events()) == 5
+            assert reopened.verify_chain()
+        finally:
+            reopened.close()
+
+    def test_index_is_rebuilt_from_logs(self, tmp_path, trail):
+        """索引遺失時從日誌文件重建"""
+        _log_orders(trail, 4)
+        trail.close()
+        os.remove(os.path.join(str(tmp_path / "audit"), "audit_index.sqlite"))
+
+        reopened = _reopen(tmp_path)
+        try:
+            assert len(reopened.get_events(user_id="trader")) == 4
+        finally:
+            reopened.close()
+
+    def test_legacy_signed_lines_are_readable(self, tmp_path, trail):
+        """舊版逐筆簽名的事件仍可讀取"""
+        event = trail.log_event(AuditEventType.USER_LOGIN, "legacy", {})
+        trail.flush()
+        event.chain_hash = None
+        event.signature = trail._sign_event(event)
+        legacy_file = os.path.join(trail.log_dir, "audit_20000101_000000.jsonl")
+        with open(legacy_file, "w", encoding="utf-8") as f:
+            f.write(json.dumps(event.to_dict()) + "\n")
+
+        trail.rebuild_index()
+        users = [e.user_id for e in trail.get_events()]
+        assert users.count("legacy") == 2
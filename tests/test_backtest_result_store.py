@@ -0,0 +1,285 @@
+"""
+測試回測結果快取
+
+測試結果以 Parquet 與 SQLite 索引保存後可完整還原、快取鍵與配置鍵順序無關，
+以及 BacktestService 對相同回測直接回傳快取結果、結束日期延後時只計算尾段
+且與完整重算的結果相同。
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.backtest import BacktestConfig, BacktestResultStore, BacktestService
+from src.core.backtest.engine import BacktestEngine
+from src.core.backtest.metrics import calculate_performance_metrics
+from src.core.backtest import result_store
+from src.core.backtest.result_store import code_version, result_key
+
+SYMBOLS = ["AAA", "BBB", "CCC"]
+
+
+class MomentumStrategy:
+    """前一日上漲即買入、下跌即賣出的確定性策略"""
+
+    version = "momentum-1"
+
+    def generate_signals(self, market_data):
+        data = market_data.sort_values(["symbol", "date"])
+        change = data.groupby("symbol")["close"].diff().fillna(0)
+        signal = np.sign(change).astype(int)
+        return pd.DataFrame(
+            {
+                "date": data["date"].to_numpy(),
+                "symbol": data["symbol"].to_numpy(),
+                "signal": signal.to_numpy(),
+                "weight": 0.3,
+            }
+        ).sort_values(["date", "symbol"], ignore_index=True)
+
+
+class FixedDataManager:
+    """由固定價格表切出回測區間的數據管理器"""
+
+    def __init__(self):
+        rng = np.random.default_rng(5)
+        dates = pd.bdate_range("2023-01-02", "2023-12-29")
+        self.market = pd.DataFrame(
+            {
+                "symbol": np.tile(SYMBOLS, len(dates)),
+                "date": np.repeat(dates, len(SYMBOLS)),
+                "close": 50 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates) * 3))),
+                "volume": 1000,
+            }
+        )
+        self.version = "snapshot-1"
+        self.strategy = MomentumStrategy()
+
+    def get_data_version(self, symbols, start_date, end_date):
+        return self.version
+
+    def load_market_data(self, symbols, start_date, end_date):
+        dates = self.market["date"]
+        window = (dates >= start_date) & (dates <= end_date)
+        return self.market[window & self.market["symbol"].isin(symbols)]
+
+    def load_strategy(self, strategy_name, strategy_params=None):
+        return self.strategy
+
+
+def _config(end_date="2023-06-30", **kwargs):
+    return BacktestConfig(
+        strategy_name="momentum",
+        symbols=SYMBOLS,
+        start_date="2023-01-02",
+        end_date=end_date,
+        **kwargs,
+    )
+
+
+def _service(tmp_path, **kwargs):
+    service = BacktestService(results_dir=str(tmp_path), **kwargs)
+    service.data_manager = FixedDataManager()
+    return service
+
+
+def _run(service, config):
+    backtest_id = service.start_backtest(config)
+    while service.get_backtest_status(backtest_id)["status"] not in (
+        "completed",
+        "failed",
+    ):
+        time.sleep(0.01)
+    status = service.get_backtest_status(backtest_id)
+    assert status["status"] == "completed", status["message"]
+    return service.get_backtest_results(backtest_id)
+
+
+def _count_trading_days(service, monkeypatch):
+    calls = []
+    process = service.engine._process_trading_day
+    monkeypatch.setattr(
+        service.engine,
+        "_process_trading_day",
+        lambda date, *args: calls.append(date) or process(date, *args),
+    )
+    return calls
+
+
+def _assert_results_equal(actual, expected):
+    assert actual["summary"] == expected["summary"]
+    assert actual["final_positions"] == expected["final_positions"]
+    for name in ("trades", "daily_values", "daily_returns", "daily_positions"):
+        pd.testing.assert_frame_equal(
+            actual[name].reset_index(drop=True), expected[name].reset_index(drop=True)
+        )
+
+
+@pytest.fixture
+def computed():
+    """以確定性策略執行的回測結果與績效指標"""
+    manager = FixedDataManager()
+    config = _config()
+    market = manager.load_market_data(SYMBOLS, config.start_date, config.end_date)
+    results = BacktestEngine().run_backtest(
+        manager.strategy.generate_signals(market), market
+    )
+    return config, results, calculate_performance_metrics(results, config)
+
+
+class TestBacktestResultStore:
+    """結果儲存測試"""
+
+    def test_roundtrip(self, tmp_path, computed):
+        """保存後讀回的結果表、倉位與績效指標完全相同"""
+        config, results, metrics = computed
+        store = BacktestResultStore(tmp_path)
+
+        key = store.put(config, "code-1", "data-1", results, metrics)
+        cached = store.get(key)
+
+        assert key == result_key(config, "code-1", "data-1")
+        assert len(results["trades"]) > 0
+        _assert_results_equal(cached["results"], results)
+        assert cached["metrics"] == metrics
+        assert list(tmp_path.glob("objects/*/*/*.parquet"))
+
+    def test_key_is_canonical(self):
+        """配置內容相同即得到相同鍵，任一組成改變則鍵不同"""
+        base = result_key(_config(strategy_params={"a": 1, "b": 2}), "c", "d")
+
+        assert base == result_key(_config(strategy_params={"b": 2, "a": 1}), "c", "d")
+        assert base != result_key(_config(strategy_params={"a": 1, "b": 3}), "c", "d")
+        assert base != result_key(_config(strategy_params={"a": 1, "b": 2}), "x", "d")
+        assert base != result_key(_config(strategy_params={"a": 1, "b": 2}), "c", "x")
+
+    def test_code_version(self):
+        """物件的 version 屬性或類別原始碼決定程式碼版本"""
+        strategy = MomentumStrategy()
+
+        assert code_version(strategy) == code_version(MomentumStrategy())
+        strategy.version = "momentum-2"
+        assert code_version(strategy) != code_version(MomentumStrategy())
+        assert code_version(BacktestEngine()) != code_version(strategy)
+
+    def test_code_version_covers_package_modules(self, monkeypatch):
+        """績效指標等回測模組的原始碼或套件版本改變時程式碼版本不同"""
+        strategy = MomentumStrategy()
+        base = code_version(strategy)
+        source = result_store.inspect.getsource
+
+        def edited(obj):
+            text = source(obj)
+            if getattr(obj, "__name__", "") == "src.core.backtest.metrics":
+                text += "\n# edited\n"
+            return text
+
+        result_store.package_version.cache_clear()
+        monkeypatch.setattr(result_store.inspect, "getsource", edited)
+        assert code_version(strategy) != base
+        monkeypatch.undo()
+
+        result_store.package_version.cache_clear()
+        monkeypatch.setattr("src.core.backtest.__version__", "0.0.0")
+        assert code_version(strategy) != base
+        monkeypatch.undo()
+
+        result_store.package_version.cache_clear()
+        assert code_version(strategy) == base
+
+    def test_find_prefix(self, tmp_path, computed):
+        """只接續同一譜系中結束日期較早且資料版本未變的最長結果"""
+        config, results, metrics = computed
+        store = BacktestResultStore(tmp_path)
+        short_key = store.put(_config("2023-03-31"), "code", "v1", results, metrics)
+        long_key = store.put(config, "code", "v1", results, metrics)
+
+        longer = _config("2023-09-29")
+        assert store.find_prefix(longer, "code", lambda end: "v1") == (
+            long_key,
+            pd.Timestamp("2023-06-30"),
+        )
+        # 後段資料已更新時退回較短的前段
+        versions = {pd.Timestamp("2023-06-30"): "v2"}
+        prefix = store.find_prefix(longer, "code", lambda end: versions.get(end, "v1"))
+        assert prefix[0] == short_key
+        assert store.find_prefix(longer, "other", lambda end: "v1") is None
+        assert (
+            store.find_prefix(_config("2023-02-28"), "code", lambda end: "v1") is None
+        )
+
+    def test_corrupt_artifact_is_dropped(self, tmp_path, computed):
+        """檔案損毀時視為未命中並移除索引"""
+        config, results, metrics = computed
+        store = BacktestResultStore(tmp_path)
+        key = store.put(config, "code", "data", results, metrics)
+        next(tmp_path.glob("objects/*/*/trades.parquet")).write_bytes(b"broken")
+
+        assert store.get(key) is None
+        assert not store.contains(key)
+
+    def test_clean(self, tmp_path, computed):
+        """刪除超過保留天數未被讀取的結果"""
+        config, results, metrics = computed
+        store = BacktestResultStore(tmp_path)
+        key = store.put(config, "code", "data", results, metrics)
+
+        assert store.clean(days=30) == 0
+        assert store.clean(days=-1) == 1
+        assert not store.contains(key)
+        assert not list(tmp_path.glob("objects/*/*"))
+
+
+class TestServiceCache:
+    """回測服務快取測試"""
+
+    def test_identical_run_returns_cached(self, tmp_path, monkeypatch):
+        """相同回測在 start_backtest 返回時即已完成，且不再執行引擎"""
+        first = _run(_service(tmp_path), _config())
+
+        service = _service(tmp_path)
+        days = _count_trading_days(service, monkeypatch)
+        backtest_id = service.start_backtest(_config())
+
+        assert service.get_backtest_status(backtest_id)["status"] == "completed"
+        assert backtest_id not in service.backtest_threads
+        assert days == []
+        _assert_results_equal(service.get_backtest_results(backtest_id), first)
+
+    def test_extended_end_date_computes_tail(self, tmp_path, monkeypatch):
+        """結束日期延後時只執行新增的交易日，結果與完整重算相同"""
+        service = _service(tmp_path)
+        _run(service, _config("2023-06-30"))
+
+        days = _count_trading_days(service, monkeypatch)
+        extended = _run(service, _config("2023-09-29"))
+        uncached = _service(tmp_path / "fresh", use_cache=False)
+        full = _run(uncached, _config("2023-09-29"))
+
+        assert days and min(days) > pd.Timestamp("2023-06-30")
+        _assert_results_equal(extended, full)
+
+    def test_new_versions_recompute(self, tmp_path, monkeypatch):
+        """策略程式碼或資料版本改變時重新計算"""
+        _run(_service(tmp_path), _config())
+
+        service = _service(tmp_path)
+        days = _count_trading_days(service, monkeypatch)
+        service.data_manager.strategy.version = "momentum-2"
+        _run(service, _config())
+        assert days
+
+        days.clear()
+        service.data_manager.version = "snapshot-2"
+        _run(service, _config("2023-09-29"))
+        assert min(days) == pd.Timestamp("2023-01-02")
+
+    def test_disabled(self, tmp_path):
+        """停用快取時不建立結果儲存"""
+        service = _service(tmp_path, use_cache=False)
+        _run(service, _config())
+
+        assert service.result_store is None
+        assert not (tmp_path / "cache").exists()
@@ -0,0 +1,181 @@
+"""
+測試 Backtrader 整合模組
+
+測試批次添加多標的資料，以及 ModelSignalStrategy 的批次預測模式與逐根預測
+產生相同的訊號與回測結果，且模型只被呼叫一次。
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.backtrader_integration import BacktestEngine, ModelSignalStrategy
+
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+class SineModel:
+    """逐列計算的確定性模型，記錄被呼叫的次數"""
+
+    def __init__(self, multi_output=True):
+        self.multi_output = multi_output
+        self.calls = 0
+
+    def predict(self, features):
+        self.calls += 1
+        close = features[[c for c in features.columns if c.endswith("_close")]]
+        values = np.sin(close.to_numpy() / 3.0)
+        return values if self.multi_output else values[:, 0]
+
+
+class StrictSineModel(SineModel):
+    """與 scikit-learn 模型相同，特徵含缺值時拋出 ValueError"""
+
+    def predict(self, features):
+        if features.isna().to_numpy().any():
+            raise ValueError("Input X contains NaN.")
+        return super().predict(features)
+
+
+class RecordingStrategy(ModelSignalStrategy):
+    """記錄每次再平衡訊號的策略"""
+
+    def __init__(self):
+        super().__init__()
+        self.history = []
+
+    def generate_signals(self):
+        signals = super().generate_signals()
+        self.history.append(
+            (self.datetime[0], {k: float(v) for k, v in signals.items()})
+        )
+        return signals
+
+
+@pytest.fixture
+def market():
+    """長格式多標的資料，其中一檔較晚上市且缺少部分交易日"""
+    rng = np.random.default_rng(8)
+    dates = pd.bdate_range("2023-01-02", periods=120)
+    frames = []
+    for i, symbol in enumerate(SYMBOLS):
+        close = 50 + np.cumsum(rng.normal(0, 1, len(dates)))
+        frame = pd.DataFrame(
+            {
+                "date": dates,
+                "symbol": symbol,
+                "open": close + rng.normal(0, 0.2, len(dates)),
+                "high": close + 1,
+                "low": close - 1,
+                "close": close,
+                "volume": 1e5,
+            }
+        )
+        if i == len(SYMBOLS) - 1:
+            frame = frame.iloc[10:].drop(frame.index[[30, 31, 55]])
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0)
+
+
+def _run(market, tmp_path, precompute, model, **engine_kwargs):
+    engine = BacktestEngine(cash=1e6, output_dir=str(tmp_path), **engine_kwargs)
+    engine.add_symbols(market)
+    engine.add_strategy(
+        RecordingStrategy,
+        model=model,
+        precompute=precompute,
+        rebalance_freq=1,
+        position_size=0.1,
+        signal_threshold=0.3,
+    )
+    strategy = engine.cerebro.run()[0]
+    trades = strategy.analyzers.trades.get_analysis()
+    return engine.cerebro.broker.getvalue(), trades.total.total, strategy
+
+
+class TestAddSymbols:
+    """批次添加資料測試"""
+
+    def test_one_feed_per_symbol(self, market, tmp_path):
+        """長格式資料依標的分組，每個標的一個資料饋送且依日期排序"""
+        engine = BacktestEngine(output_dir=str(tmp_path))
+        symbols = engine.add_symbols(market)
+
+        assert symbols == SYMBOLS
+        assert [data._name for data in engine.cerebro.datas] == SYMBOLS
+        frame = engine.cerebro.datas[-1].p.dataname
+        assert frame.index.is_monotonic_increasing
+        assert len(frame) == 107
+
+    def test_dict_input(self, market, tmp_path):
+        """也接受以標的為鍵的資料字典"""
+        frames = {
+            symbol: group.set_index("date").sort_index()
+            for symbol, group in market.groupby("symbol")
+        }
+        engine = BacktestEngine(output_dir=str(tmp_path))
+
+        assert engine.add_symbols(frames) == SYMBOLS
+
+
+class TestPrecomputedSignals:
+    """批次預測模式測試"""
+
+    @pytest.mark.parametrize("multi_output", [True, False])
+    def test_matches_per_bar(self, market, tmp_path, multi_output):
+        """批次預測與逐根預測的訊號與回測結果相同"""
+        per_bar_model = SineModel(multi_output)
+        batched_model = SineModel(multi_output)
+
+        per_bar_value, per_bar_trades, per_bar_strategy = _run(
+            market, tmp_path / "per_bar", False, per_bar_model
+        )
+        batched_value, batched_trades, batched_strategy = _run(
+            market, tmp_path / "batched", True, batched_model
+        )
+
+        assert batched_model.calls == 1
+        assert per_bar_model.calls == len(per_bar_strategy.history)
+        assert batched_strategy.history == per_bar_strategy.history
+        assert per_bar_trades > 0
+        assert (batched_value, batched_trades) == (per_bar_value, per_bar_trades)
+
+    def test_late_feed_does_not_pass_nan(self, market, tmp_path):
+        """較晚開始的資料上市前的日期不送入模型，不接受缺值的模型也能批次預測"""
+        per_bar_model = StrictSineModel()
+        batched_model = StrictSineModel()
+
+        per_bar_value, _, per_bar_strategy = _run(
+            market, tmp_path / "per_bar", False, per_bar_model
+        )
+        batched_value, _, batched_strategy = _run(
+            market, tmp_path / "batched", True, batched_model
+        )
+
+        assert batched_model.calls == 1
+        assert batched_strategy.history == per_bar_strategy.history
+        assert batched_value == per_bar_value
+        late_start = market.loc[market["symbol"] == SYMBOLS[-1], "date"].min()
+        assert len(batched_strategy.features_df) == len(
+            market.loc[market["date"] >= late_start, "date"].unique()
+        )
+
+    def test_memory_settings(self, market, tmp_path):
+        """exactbars 為 -1 且關閉預設觀察器時仍可批次預測，結果不變"""
+        model = SineModel()
+        tuned, _, strategy = _run(
+            market, tmp_path / "tuned", True, model, exactbars=-1, stdstats=False
+        )
+        default, _, _ = _run(market, tmp_path / "default", True, SineModel())
+
+        assert model.calls == 1
+        assert strategy.predictions is not None
+        assert tuned == default
+
+    def test_falls_back_without_preload(self, market, tmp_path):
+        """資料未預先載入時改回逐根預測"""
+        model = SineModel()
+        _, _, strategy = _run(market, tmp_path, True, model, preload=False)
+
+        assert strategy.predictions is None
+        assert model.calls == len(strategy.history) > 1
@@ -0,0 +1,155 @@
+"""
+事件關聯分析與異常檢測測試
+
+測試滑動窗口緩衝區的過期與索引維護，以及異常檢測器的增量統計。
+"""
+
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.events.anomaly_detector import (
+    FrequencyAnomalyDetector,
+    PatternAnomalyDetector,
+    ValueAnomalyDetector,
+    _RollingMoments,
+)
+from src.core.events.event import Event, EventSource, EventType
+from src.core.events.event_correlation import RuleBasedCorrelator, SubjectCorrelator
+
+
+def _event(subject="2330.TW", event_type=EventType.PRICE_CHANGE, age=0.0, **data):
+    return Event(
+        event_type=event_type,
+        source=EventSource.MARKET_DATA,
+        subject=subject,
+        timestamp=datetime.now() - timedelta(seconds=age),
+        data=data,
+    )
+
+
+class TestEventCorrelator:
+    """滑動窗口緩衝區測試"""
+
+    def test_expiry_keeps_indexes_in_sync(self):
+        """過期事件從緩衝區左端移出，並同步移出主題與類型索引"""
+        correlator = SubjectCorrelator("test", [EventType.PRICE_CHANGE], 60, 100)
+        correlator.process_event(_event("2317.TW", age=120))
+        correlator.process_event(_event("2330.TW", EventType.VOLUME_SPIKE, age=30))
+        correlator.process_event(_event("2330.TW"))
+
+        assert len(correlator.event_buffer) == 2
+        assert "2317.TW" not in correlator.events_by_subject
+        assert len(correlator.events_by_subject["2330.TW"]) == 2
+        assert set(correlator.events_by_type) == {
+            EventType.PRICE_CHANGE,
+            EventType.VOLUME_SPIKE,
+        }
+
+    def test_max_events(self):
+        """超過緩衝區容量時移出最舊的事件"""
+        correlator = RuleBasedCorrelator("test", [EventType.PRICE_CHANGE], [])
+        correlator.max_events = 3
+        events = [_event(f"{i}.TW") for i in range(5)]
+        for event in events:
+            correlator.process_event(event)
+
+        assert list(correlator.event_buffer) == events[2:]
+        assert set(correlator.events_by_subject) == {"2.TW", "3.TW", "4.TW"}
+
+
+class TestSubjectCorrelator:
+    """主題關聯測試"""
+
+    def test_correlates_once_per_window(self):
+        """達到閾值時產生關聯事件，已關聯的事件不再計入"""
+        correlator = SubjectCorrelator("test", [EventType.PRICE_CHANGE], threshold=3)
+        results = [correlator.process_event(_event()) for _ in range(6)]
+
+        assert [r is not None for r in results] == [False, False, True] + [False] * 3
+        assert results[2].data["count"] == 3
+        assert len(correlator.events_by_subject["2330.TW"]) == 3
+        # 已清空的索引不影響緩衝區過期
+        assert len(correlator.event_buffer) == 6
+
+    def test_expired_events_do_not_count(self):
+        """窗口外的事件不計入閾值"""
+        correlator = SubjectCorrelator("test", [EventType.PRICE_CHANGE], 60, 3)
+        correlator.process_event(_event(age=120))
+        correlator.process_event(_event(age=90))
+
+        assert correlator.process_event(_event()) is None
+
+
+class TestRuleBasedCorrelator:
+    """規則關聯測試"""
+
+    def test_rules_receive_buffer(self):
+        """規則收到窗口內的事件緩衝區，匹配時以規則索引產生事件"""
+        seen = []
+
+        def burst(event, buffer):
+            seen.append(len(buffer))
+            return len(buffer) >= 2
+
+        correlator = RuleBasedCorrelator(
+            "test", [EventType.PRICE_CHANGE], [lambda e, b: False, burst], 60
+        )
+        assert correlator.process_event(_event(age=120)) is None
+        assert correlator.process_event(_event()) is None
+        results = correlator.process_event(_event())
+
+        assert seen == [0, 1, 2]
+        assert [r.data["rule_index"] for r in results] == [1]
+
+
+class TestAnomalyDetectors:
+    """異常檢測器測試"""
+
+    def test_rolling_moments_match_statistics(self):
+        """增量平均值與標準差與重新計算的結果一致"""
+        moments = _RollingMoments(10)
+        values = [600.0 + (i * 37 % 11) * 0.5 for i in range(50)]
+        for i, value in enumerate(values):
+            moments.push(value)
+            window = values[max(0, i - 9) : i + 1]
+            assert moments.mean == pytest.approx(statistics.mean(window))
+            if len(window) > 1:
+                assert moments.stdev() == pytest.approx(statistics.stdev(window))
+
+    def test_value_anomaly(self):
+        """偏離歷史分布的數值產生異常事件，歷史不包含當前值"""
+        detector = ValueAnomalyDetector("test", [EventType.PRICE_CHANGE], "price")
+        for i in range(20):
+            assert detector.process_event(_event(price=100.0 + i % 3)) is None
+
+        anomaly = detector.process_event(_event(price=150.0))
+        assert anomaly.data["value"] == 150.0
+        assert anomaly.data["mean"] == pytest.approx(100.95)
+        assert len(detector.values["2330.TW"]) == 21
+
+    def test_frequency_anomaly(self, monkeypatch):
+        """當前窗口計數遠高於歷史窗口時產生異常事件"""
+        clock = [1_000.0]
+        monkeypatch.setattr(
+            "src.core.events.anomaly_detector.time.time", lambda: clock[0]
+        )
+        detector = FrequencyAnomalyDetector("test", [EventType.PRICE_CHANGE], 10)
+        for count in (5, 6, 5, 4):
+            for _ in range(count):
+                assert detector.process_event(_event()) is None
+            clock[0] += 10
+
+        results = [detector.process_event(_event()) for _ in range(20)]
+        anomaly = next(r for r in results if r is not None)
+        assert anomaly.data["mean"] == pytest.approx(5.0)
+
+    def test_pattern_uses_recent_types(self):
+        """模式只取最近 pattern_size 個事件的類型"""
+        detector = PatternAnomalyDetector("test", [EventType.PRICE_CHANGE])
+        for _ in range(12):
+            detector.process_event(_event())
+
+        assert detector.total_patterns == 10
+        assert detector.pattern_counts[(EventType.PRICE_CHANGE,) * 3] == 10
@@ -0,0 +1,205 @@
+"""
+特徵存儲測試
+
+測試分區格式的保存與載入、欄位投影、日期與股票篩選、追加模式與目錄索引。
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.feature_store import FeatureStore
+
+
+def _panel_features(symbols, start="2024-01-01", days=90) -> pd.DataFrame:
+    dates = pd.date_range(start, periods=days, freq="D")
+    index = pd.MultiIndex.from_product([symbols, dates], names=["stock_id", "date"])
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "rsi": rng.normal(50, 10, len(index)),
+            "momentum": rng.normal(0, 1, len(index)),
+            "volume_ratio": rng.random(len(index)),
+        },
+        index=index,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    """建立使用暫存目錄的特徵存儲"""
+    return FeatureStore(base_dir=str(tmp_path), symbol_buckets=4)
+
+
+class TestPartitionedStorage:
+    """分區格式測試"""
+
+    def test_round_trip_preserves_order_and_index(self, store):
+        """全量載入與原始資料完全相同，包括遞減的日期索引"""
+        dates = [datetime(2024, 3, 1) - timedelta(days=i) for i in range(100)]
+        features = pd.DataFrame(
+            np.random.default_rng(1).normal(size=(100, 3)),
+            columns=["a", "b", "c"],
+            index=dates,
+        )
+
+        version = store.save_features(features, "daily", metadata={"note": "x"})
+        loaded, metadata = store.load_features("daily", version)
+
+        pd.testing.assert_frame_equal(loaded, features)
+        assert metadata["note"] == "x"
+        assert metadata["storage"] == "partitioned"
+
+    def test_writes_hive_partitions(self, tmp_path, store):
+        """依月份與股票桶分區寫入"""
+        version = store.save_features(_panel_features(["2330", "2317"]), "panel")
+
+        data_dir = tmp_path / "panel" / version / "data"
+        periods = sorted(p.name for p in data_dir.iterdir())
+        assert periods == [
+            "feature_period=2024-01",
+            "feature_period=2024-02",
+            "feature_period=2024-03",
+        ]
+        assert all(
+            child.name.startswith("symbol_bucket=")
+            for child in (data_dir / periods[0]).iterdir()
+        )
+
+    def test_projection_and_filters(self, store):
+        """欄位投影與日期、股票篩選"""
+        features = _panel_features(["2330", "2317", "2454"])
+        store.save_features(features, "panel")
+
+        loaded, _ = store.load_features(
+            "panel",
+            columns=["rsi"],
+            start_date="2024-02-01",
+            end_date="2024-02-10",
+            symbols=["2317"],
+        )
+
+        dates = features.index.get_level_values("date")
+        mask = (
+            (features.index.get_level_values("stock_id") == "2317")
+            & (dates >= "2024-02-01")
+            & (dates <= "2024-02-10")
+        )
+        expected = features.loc[mask, ["rsi"]]
+        pd.testing.assert_frame_equal(loaded, expected)
+
+    def test_unknown_column_raises(self, store):
+        """要求不存在的欄位時拋出 KeyError"""
+        store.save_features(_panel_features(["2330"]), "panel")
+        with pytest.raises(KeyError):
+            store.load_features("panel", columns=["missing"])
+
+    def test_append_adds_rows_without_rewriting(self, tmp_path, store):
+        """追加模式只新增檔案並更新元數據"""
+        features = _panel_features(["2330", "2317"], days=30)
+        version = store.save_features(features, "panel")
+        data_dir = tmp_path / "panel" / version / "data"
+        before = {p: p.stat().st_mtime_ns for p in data_dir.rglob("*.parquet")}
+
+        increment = _panel_features(["2330", "2317"], start="2024-01-31", days=1)
+        assert store.append_features(increment, "panel") == version
+
+        after = {p: p.stat().st_mtime_ns for p in data_dir.rglob("*.parquet")}
+        assert all(after[p] == mtime for p, mtime in before.items())
+        assert len(after) > len(before)
+
+        loaded, metadata = store.load_features("panel")
+        pd.testing.assert_frame_equal(loaded, pd.concat([features, increment]))
+        assert metadata["row_count"] == 62
+        assert metadata["end_date"].startswith("2024-01-31")
+
+    def test_resave_replaces_version(self, tmp_path, store):
+        """重新保存同一版本時取代舊資料而不與其混合"""
+        features = _panel_features(["2330", "2317"], days=5)
+        store.save_features(features, "panel", version="v1")
+        replacement = features * 2
+        store.save_features(replacement, "panel", version="v1")
+
+        loaded, metadata = store.load_features("panel", "v1")
+        pd.testing.assert_frame_equal(loaded, replacement)
+        assert metadata["row_count"] == 10
+
+        # 改以單檔格式保存時也不殘留分區資料
+        plain = pd.DataFrame({"rsi": [1.0, 2.0]})
+        store.save_features(plain, "panel", version="v1")
+        assert not (tmp_path / "panel" / "v1" / "data").exists()
+        pd.testing.assert_frame_equal(store.load_features("panel", "v1")[0], plain)
+
+    def test_append_rejects_mismatched_columns(self, store):
+        """追加欄位不一致時拋出 ValueError"""
+        store.save_features(_panel_features(["2330"]), "panel")
+        with pytest.raises(ValueError):
+            store.append_features(_panel_features(["2330"])[["rsi"]], "panel")
+
+
+class TestSingleFileStorage:
+    """單檔格式測試"""
+
+    def test_non_datetime_index_uses_single_file(self, tmp_path, store):
+        """無日期索引的特徵以單檔保存並可讀回"""
+        features = pd.DataFrame({"x": [1.0, 2.0], "y": [3.0, 4.0]})
+        version = store.save_features(features, "plain")
+
+        assert (tmp_path / "plain" / version / "features.parquet").exists()
+        loaded, _ = store.load_features("plain", version, columns=["y"])
+        pd.testing.assert_frame_equal(loaded, features[["y"]])
+
+    def test_legacy_version_is_filtered_in_pandas(self, tmp_path, store):
+        """舊版單檔特徵仍可載入並套用篩選"""
+        features = _panel_features(["2330", "2317"], days=10)
+        legacy_dir = tmp_path / "legacy" / "20240101_000000_abcdef12"
+        legacy_dir.mkdir(parents=True)
+        features.to_parquet(legacy_dir / "features.parquet")
+        (legacy_dir / "metadata.json").write_text(
+            json.dumps({"name": "legacy", "version": legacy_dir.name, "tags": []})
+        )
+        store.rebuild_catalog()
+
+        loaded, _ = store.load_features(
+            "legacy", start_date="2024-01-05", symbols=["2330"]
+        )
+        mask = (features.index.get_level_values("stock_id") == "2330") & (
+            features.index.get_level_values("date") >= "2024-01-05"
+        )
+        expected = features[mask]
+        pd.testing.assert_frame_equal(loaded, expected)
+
+
+class TestCatalog:
+    """目錄索引測試"""
+
+    def test_list_and_search(self, store):
+        """列表與搜尋查詢目錄索引"""
+        store.save_features(_panel_features(["2330"]), "alpha", version="v1")
+        store.save_features(
+            _panel_features(["2330"]), "alpha", version="v2", tags=["t"]
+        )
+        store.save_features(_panel_features(["2330"]), "beta", tags=["t", "u"])
+
+        assert store.list_features() == ["alpha", "beta"]
+        assert store.list_versions("alpha") == ["v1", "v2"]
+        assert [m["name"] for m in store.search_features(tags=["t"])] == [
+            "alpha",
+            "beta",
+        ]
+        assert [m["name"] for m in store.search_features(tags=["t", "u"])] == ["beta"]
+        results = store.search_features(name_pattern="alp")
+        assert len(results) == 1 and results[0]["version"] == "v2"
+
+    def test_catalog_rebuilt_for_existing_directory(self, tmp_path, store):
+        """目錄索引遺失時從既有元數據重建"""
+        store.save_features(_panel_features(["2330"]), "alpha", tags=["t"])
+        os.remove(tmp_path / "catalog.sqlite")
+
+        reopened = FeatureStore(base_dir=str(tmp_path))
+        assert reopened.list_features() == ["alpha"]
+        assert reopened.search_features(tags=["t"])[0]["name"] == "alpha"
@@ -0,0 +1,182 @@
+"""
+分塊特徵計算測試
+
+測試分塊規劃、暖身重疊、以全域統計量清理與標準化後與單程序結果相同、
+由子程序自行載入價格檔案，以及逐塊寫入特徵存儲。
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import features as features_module
+from src.core.feature_store import FeatureStore
+
+
+def _price_panel(symbols, days=300) -> pd.DataFrame:
+    dates = pd.bdate_range("2022-01-03", periods=days)
+    index = pd.MultiIndex.from_product([symbols, dates], names=["stock_id", "date"])
+    rng = np.random.default_rng(0)
+    close = 100 + np.abs(rng.normal(0, 1, len(index)).cumsum())
+    return pd.DataFrame(
+        {
+            "開盤價": close,
+            "最高價": close + 1,
+            "最低價": close - 1,
+            "收盤價": close,
+            "成交股數": rng.integers(1000, 5000, len(index)).astype(float),
+        },
+        index=index,
+    )
+
+
+def _compute(price_df, postprocess=False, **kwargs):
+    return features_module._compute_features_chunked(
+        {"price": price_df},
+        normalize=postprocess,
+        remove_extremes=postprocess,
+        clean_data=postprocess,
+        max_workers=2,
+        **kwargs,
+    )
+
+
+def _single_process(price_df):
+    """單程序路徑：完整特徵表的清理、標準化與極端值處理"""
+    calculator = features_module.FeatureCalculator({"price": price_df})
+    return features_module.process_chunk(None, calculator)
+
+
+class TestPlanFeatureChunks:
+    """分塊規劃測試"""
+
+    def test_symbols_are_grouped_within_chunk_rows(self):
+        """以股票為單位分組，每組不超過列數上限"""
+        price_df = _price_panel([f"{i:04d}" for i in range(10)], days=100)
+
+        tasks = features_module._plan_feature_chunks(price_df, 350, 50)
+
+        assert [len(positions) for positions, _ in tasks] == [300, 300, 300, 100]
+        assert all(keep_from is None for _, keep_from in tasks)
+        covered = np.sort(np.concatenate([positions for positions, _ in tasks]))
+        np.testing.assert_array_equal(covered, np.arange(len(price_df)))
+
+    def test_long_history_is_split_with_warmup_overlap(self):
+        """單一股票超過上限時依時間切分並重疊暖身 K 棒"""
+        price_df = _price_panel(["2330"], days=300)
+        dates = price_df.index.get_level_values("date")
+
+        tasks = features_module._plan_feature_chunks(price_df, 150, 50)
+
+        assert [len(positions) for positions, _ in tasks] == [100, 150, 150]
+        assert tasks[0][1] is None
+        assert tasks[1][1] == dates[100]
+        assert dates[tasks[1][0][0]] == dates[50]
+
+
+class TestComputeFeaturesChunked:
+    """分塊特徵計算測試"""
+
+    def test_time_split_matches_single_chunk(self):
+        """時間切分加上暖身後結果與不切分相同"""
+        # ChunkProcessor 的最小分塊為 1000 列，單一股票 1500 列會被切分
+        price_df = _price_panel(["2330", "2317"], days=1500)
+
+        whole, _ = _compute(price_df, max_memory_mb=1e6)
+        split, _ = _compute(price_df, max_memory_mb=1e-6, warmup_bars=60)
+
+        assert len(split) == len(price_df)
+        pd.testing.assert_frame_equal(split, whole)
+
+    @pytest.mark.parametrize("max_memory_mb", [1e6, 1e-6])
+    def test_postprocessing_matches_single_process(self, max_memory_mb):
+        """清理、標準化與極端值處理的結果與單程序相同，不受分塊數量影響"""
+        price_df = _price_panel([f"{i:04d}" for i in range(6)], days=400)
+
+        chunked, _ = _compute(price_df, postprocess=True, max_memory_mb=max_memory_mb)
+        expected = _single_process(price_df)
+
+        assert len(chunked) < len(price_df)
+        pd.testing.assert_frame_equal(chunked, expected)
+
+    def test_workers_load_price_file(self, tmp_path):
+        """提供價格檔案時由子程序載入，結果與記憶體中的價格資料相同"""
+        # 以日期為主排序，各股票的列在檔案中交錯
+        price_df = _price_panel(["2330", "2317", "2454"], days=1500)
+        price_path = str(tmp_path / "price.parquet")
+        price_df.sort_index(level="date", sort_remaining=False).to_parquet(price_path)
+
+        in_memory, _ = _compute(price_df, postprocess=True, max_memory_mb=1e-6)
+        from_file, _ = features_module._compute_features_chunked(
+            {"price": pd.DataFrame()},
+            normalize=True,
+            remove_extremes=True,
+            clean_data=True,
+            max_workers=2,
+            max_memory_mb=1e-6,
+            price_path=price_path,
+        )
+
+        pd.testing.assert_frame_equal(from_file, in_memory)
+
+    def test_price_file_date_range(self, tmp_path):
+        """價格檔案依開始與結束日期篩選"""
+        price_df = _price_panel(["2330", "2317"], days=300)
+        price_path = str(tmp_path / "price.parquet")
+        price_df.to_parquet(price_path)
+        dates = price_df.index.get_level_values("date").unique()
+
+        features, _ = features_module._compute_features_chunked(
+            {"price": pd.DataFrame()},
+            normalize=False,
+            remove_extremes=False,
+            clean_data=False,
+            max_workers=2,
+            price_path=price_path,
+            start_date=dates[100],
+            end_date=dates[199],
+        )
+        window = price_df[
+            (price_df.index.get_level_values("date") >= dates[100])
+            & (price_df.index.get_level_values("date") <= dates[199])
+        ]
+        expected, _ = _compute(window)
+
+        pd.testing.assert_frame_equal(features, expected)
+
+    def test_streams_chunks_to_feature_store(self, tmp_path, monkeypatch):
+        """逐塊追加至特徵存儲，讀回的結果與單程序處理相同"""
+        price_df = _price_panel([f"{i:04d}" for i in range(6)], days=200)
+        store = FeatureStore(base_dir=str(tmp_path))
+        appended = []
+        append_features = store.append_features
+        monkeypatch.setattr(
+            store,
+            "append_features",
+            lambda features, *args, **kwargs: appended.append(len(features))
+            or append_features(features, *args, **kwargs),
+        )
+
+        features, version = _compute(
+            price_df,
+            postprocess=True,
+            max_memory_mb=1e-6,
+            feature_store=store,
+            feature_name="chunked",
+            metadata={"description": "chunked"},
+            return_features=False,
+        )
+
+        assert features.empty
+        assert appended
+        stored, metadata = store.load_features("chunked", version)
+        assert metadata["description"] == "chunked"
+        pd.testing.assert_frame_equal(
+            stored, _single_process(price_df), check_freq=False
+        )
+
+    def test_requires_stock_id_index(self):
+        """價格資料缺少 stock_id 層級時拋出 ValueError"""
+        price_df = _price_panel(["2330"]).droplevel("stock_id")
+        with pytest.raises(ValueError):
+            _compute(price_df)
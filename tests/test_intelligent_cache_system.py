@@ -0,0 +1,170 @@
+"""
+智能快取系統測試
+
+測試 IntelligentCacheSystem 的大小計算、O(1) 淘汰索引、
+TTL 堆積清理與分片鎖模式。
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.intelligent_cache_system import (
+    CacheConfig,
+    CacheStrategy,
+    IntelligentCacheSystem,
+    _LFUIndex,
+    estimate_size,
+)
+
+
+def _make_cache(**kwargs) -> IntelligentCacheSystem:
+    config = CacheConfig(preload_enabled=False, cleanup_interval=3600, **kwargs)
+    return IntelligentCacheSystem(config)
+
+
+class TestEstimateSize:
+    """大小計算測試"""
+
+    def test_dataframe_uses_deep_memory_usage(self):
+        """DataFrame 應以 memory_usage(deep=True) 計算"""
+        df = pd.DataFrame({"a": np.arange(1000), "b": ["x" * 10] * 1000})
+        assert estimate_size(df) == int(df.memory_usage(index=True, deep=True).sum())
+
+    def test_ndarray_uses_nbytes(self):
+        """ndarray 應以 nbytes 計算"""
+        arr = np.zeros((100, 50), dtype=np.float64)
+        assert estimate_size(arr) == arr.nbytes
+
+    def test_containers_include_nested_values(self):
+        """容器大小應包含內部元素"""
+        arr = np.zeros(10_000)
+        assert estimate_size([arr]) > arr.nbytes
+        assert estimate_size({"prices": arr}) > arr.nbytes
+
+
+class TestLFUIndex:
+    """LFU 頻率桶測試"""
+
+    def test_evicts_least_frequent_in_insertion_order(self):
+        """同頻率時淘汰最早插入的鍵"""
+        index = _LFUIndex()
+        for key in ("a", "b", "c"):
+            index.add(key)
+        index.touch("a")
+        index.touch("a")
+        index.touch("c")
+
+        assert index.peek_least() == "b"
+        index.remove("b")
+        assert index.peek_least() == "c"
+        assert index.frequency("a") == 3
+
+    def test_remove_unlinks_empty_buckets(self):
+        """移除後空的頻率桶應被移除"""
+        index = _LFUIndex()
+        index.add("a")
+        index.remove("a")
+        assert index.peek_least() is None
+        assert len(index) == 0
+
+
+class TestIntelligentCacheSystem:
+    """快取系統測試"""
+
+    def test_lru_eviction(self):
+        """LRU 淘汰最久未使用的條目"""
+        cache = _make_cache(max_size=3, strategy=CacheStrategy.LRU)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        cache.get("a")
+        cache.set("d", "d")
+
+        assert cache.exists("a")
+        assert not cache.exists("b")
+        assert cache.get_stats().evictions == 1
+
+    def test_lfu_eviction(self):
+        """LFU 淘汰使用頻率最低的條目"""
+        cache = _make_cache(max_size=3, strategy=CacheStrategy.LFU)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        for _ in range(3):
+            cache.get("a")
+            cache.get("b")
+        cache.set("d", "d")
+
+        assert not cache.exists("c")
+        assert cache.exists("a") and cache.exists("b") and cache.exists("d")
+
+    def test_ttl_eviction_removes_earliest_expiring(self):
+        """TTL 策略淘汰最快到期的條目"""
+        cache = _make_cache(max_size=2, strategy=CacheStrategy.TTL)
+        cache.set("long", 1, ttl=1000)
+        cache.set("short", 2, ttl=10)
+        cache.set("new", 3, ttl=500)
+
+        assert cache.exists("long")
+        assert not cache.exists("short")
+
+    def test_cleanup_expired_entries(self):
+        """背景清理從堆積頂端移除過期條目"""
+        cache = _make_cache()
+        cache.set("expiring", "v", ttl=1)
+        cache.set("kept", "v", ttl=1000)
+
+        removed = cache._shards[0].cleanup_expired(time.monotonic() + 2)
+
+        assert removed == 1
+        assert cache.get_keys() == ["kept"]
+        assert cache.get_stats().expires == 1
+
+    def test_memory_limit_evicts_until_fits(self):
+        """超過記憶體上限時持續淘汰直到可容納"""
+        cache = _make_cache(max_memory=10_000)
+        for i in range(4):
+            cache.set(f"arr_{i}", np.zeros(250))  # 2000 bytes
+        cache.set("big", np.zeros(1000))  # 8000 bytes
+
+        usage = cache.get_memory_usage()
+        assert usage["total_size_bytes"] <= 10_000
+        assert cache.exists("big")
+
+    def test_overwrite_keeps_size_consistent(self):
+        """覆寫同一鍵時大小統計保持一致"""
+        cache = _make_cache()
+        df = pd.DataFrame({"close": np.arange(100, dtype=float)})
+        for _ in range(5):
+            cache.set("df", df)
+
+        stats = cache.get_stats()
+        assert stats.entry_count == 1
+        assert stats.total_size == estimate_size(df)
+
+    @pytest.mark.parametrize("shard_count", [1, 8])
+    def test_sharded_mode_respects_limits(self, shard_count):
+        """分片模式下仍遵守條目上限並正確彙總統計"""
+        cache = _make_cache(max_size=64, shard_count=shard_count)
+        for i in range(500):
+            cache.set(f"key_{i}", i)
+        for i in range(500):
+            cache.get(f"key_{i}")
+
+        stats = cache.get_stats()
+        assert stats.entry_count == len(cache.get_keys())
+        assert stats.entry_count <= 64
+        assert stats.hits + stats.misses == 500
+        assert stats.sets == 500
+
+    def test_tags_across_shards(self):
+        """標籤查詢與失效涵蓋所有分片"""
+        cache = _make_cache(shard_count=4)
+        for i in range(20):
+            cache.set(f"user:{i}", i, tags={"user"})
+        cache.set("post:1", "p", tags={"post"})
+
+        assert len(cache.get_by_tags({"user"})) == 20
+        assert cache.invalidate_by_tags({"user"}) == 20
+        assert cache.get_keys() == ["post:1"]
@@ -0,0 +1,60 @@
+"""
+延遲匯入工具測試
+"""
+
+import subprocess
+import sys
+import types
+
+import pytest
+
+from src.utils.lazy_import import lazy_exports
+
+
+@pytest.fixture
+def package():
+    """以 json 套件的子模組建立一個暫時的延遲匯出套件"""
+    module = types.ModuleType("lazy_pkg")
+    sys.modules["lazy_pkg"] = module
+    module.__getattr__, module.__dir__ = lazy_exports(
+        "lazy_pkg",
+        {
+            "JSONDecoder": "json.decoder",
+            "Encoder": ("json.encoder", "JSONEncoder"),
+        },
+    )
+    yield module
+    del sys.modules["lazy_pkg"]
+
+
+class TestLazyExports:
+    """延遲匯出測試"""
+
+    def test_resolves_and_caches(self, package):
+        """第一次存取時匯入，之後直接從套件命名空間取得"""
+        import json.decoder
+        import json.encoder
+
+        assert "JSONDecoder" not in vars(package)
+        assert package.JSONDecoder is json.decoder.JSONDecoder
+        assert package.Encoder is json.encoder.JSONEncoder
+        assert vars(package)["JSONDecoder"] is json.decoder.JSONDecoder
+
+    def test_unknown_name(self, package):
+        """未宣告的名稱拋出 AttributeError"""
+        with pytest.raises(AttributeError, match="Missing"):
+            package.Missing
+
+    def test_dir_lists_exports(self, package):
+        """dir() 包含尚未匯入的匯出名稱"""
+        assert {"JSONDecoder", "Encoder"} <= set(dir(package))
+
+    def test_package_import_is_lazy(self):
+        """匯入 src.data_sources 不會載入資料源子模組"""
+        code = (
+            "import sys, src.data_sources as d;"
+            "assert 'src.data_sources.yahoo_adapter' not in sys.modules;"
+            "d.YahooAdapter;"
+            "assert 'src.data_sources.yahoo_adapter' in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,260 @@
+"""
+異步日誌處理器測試
+
+測試批次取出、隊列滿載策略、_bulk 批次發送與傳輸重試。
+"""
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.log_system.handlers import (
+    AsyncHandler,
+    ElasticsearchHandler,
+    LogstashHandler,
+)
+
+
+class _StubReceiver:
+    """本地 HTTP 接收端，記錄請求並依序回傳指定狀態碼"""
+
+    def __init__(self, statuses=None):
+        self.requests = []
+        self.statuses = list(statuses or [])
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                status = receiver.statuses.pop(0) if receiver.statuses else 200
+                if status == 200:
+                    receiver.requests.append((self.path, body.decode("utf-8")))
+                payload = json.dumps({"errors": False}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _CollectingHandler(AsyncHandler):
+    """將批次收集在記憶體中的處理器"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    def _process_batch(self, records):
+        self.batches.append([record.getMessage() for record in records])
+
+
+def _record(message, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 0, message, None, None)
+
+
+@pytest.fixture
+def receiver():
+    stub = _StubReceiver()
+    yield stub
+    stub.close()
+
+
+def _stalled(handler):
+    """停用背景線程，讓記錄停留在隊列中"""
+    handler._ensure_thread_running = lambda: None
+    return handler
+
+
+class TestAsyncHandlerBatching:
+    """批次取出測試"""
+
+    def test_records_are_drained_in_batches(self):
+        """依批次大小取出並保持寫入順序"""
+        handler = _stalled(_CollectingHandler(batch_size=4, batch_interval=5))
+        for i in range(10):
+            level = logging.DEBUG if i % 3 == 0 else logging.INFO
+            handler.emit(_record(f"m{i}", level))
+        del handler._ensure_thread_running
+
+        handler._ensure_thread_running()
+        assert handler.flush()
+        handler.close()
+
+        assert [len(batch) for batch in handler.batches] == [4, 4, 2]
+        assert sum(handler.batches, []) == [f"m{i}" for i in range(10)]
+        stats = handler.get_stats()
+        assert stats["processed"] == 10
+        assert stats["batches"] == 3
+        assert stats["queue_depth"] == 0
+
+    def test_partial_batch_is_sent_after_interval(self):
+        """未滿批次在批次間隔後送出"""
+        handler = _CollectingHandler(batch_size=100, batch_interval=0.05)
+        handler.emit(_record("only"))
+        time.sleep(0.3)
+
+        assert handler.batches == [["only"]]
+        handler.close()
+
+
+class TestOverflowPolicies:
+    """隊列滿載策略測試"""
+
+    def test_drop_debug_first_evicts_oldest_debug(self):
+        """滿載時先淘汰最舊的 DEBUG 記錄"""
+        handler = _stalled(_CollectingHandler(max_queue_size=3))
+        handler.emit(_record("debug-1", logging.DEBUG))
+        handler.emit(_record("info-1"))
+        handler.emit(_record("debug-2", logging.DEBUG))
+        handler.emit(_record("error-1", logging.ERROR))
+        handler.emit(_record("error-2", logging.ERROR))
+
+        remaining = [r.getMessage() for r in handler._take(10)]
+        assert remaining == ["info-1", "error-1", "error-2"]
+        assert handler.get_stats()["dropped"] == 2
+
+    def test_drop_debug_first_drops_new_record_without_debug(self):
+        """沒有 DEBUG 記錄可淘汰時丟棄新記錄"""
+        handler = _stalled(_CollectingHandler(max_queue_size=2))
+        for i in range(3):
+            handler.emit(_record(f"info-{i}"))
+
+        assert [r.getMessage() for r in handler._take(10)] == ["info-0", "info-1"]
+        assert handler.get_stats()["dropped"] == 1
+
+    def test_block_waits_then_drops(self):
+        """block 策略等待逾時後丟棄"""
+        handler = _stalled(
+            _CollectingHandler(
+                max_queue_size=1, overflow_policy="block", block_timeout=0.1
+            )
+        )
+        handler.emit(_record("first"))
+        start = time.monotonic()
+        handler.emit(_record("second"))
+
+        assert time.monotonic() - start >= 0.1
+        assert handler.get_stats()["dropped"] == 1
+
+    def test_block_applies_backpressure_without_loss(self):
+        """block 策略在消費端跟上時不遺失記錄"""
+        handler = _CollectingHandler(
+            max_queue_size=2, batch_size=1, overflow_policy="block", block_timeout=5
+        )
+        for i in range(50):
+            handler.emit(_record(f"m{i}"))
+        handler.flush()
+        handler.close()
+
+        assert sum(handler.batches, []) == [f"m{i}" for i in range(50)]
+        assert handler.get_stats()["dropped"] == 0
+
+    def test_sample_keeps_warnings_above_watermark(self):
+        """sample 策略超過高水位後只取樣低級別記錄"""
+        handler = _stalled(
+            _CollectingHandler(
+                max_queue_size=10,
+                overflow_policy="sample",
+                sample_rate=0.0,
+                high_watermark=0.5,
+            )
+        )
+        for i in range(5):
+            handler.emit(_record(f"info-{i}"))
+        handler.emit(_record("info-sampled"))
+        handler.emit(_record("warning", logging.WARNING))
+
+        messages = [r.getMessage() for r in handler._take(10)]
+        assert "info-sampled" not in messages
+        assert messages[-1] == "warning"
+        assert handler.get_stats()["dropped"] == 1
+
+    def test_unknown_policy_is_rejected(self):
+        """不支持的策略拋出 ValueError"""
+        with pytest.raises(ValueError):
+            _CollectingHandler(overflow_policy="spill")
+
+
+class TestTransportHandlers:
+    """批次發送與重試測試"""
+
+    def test_elasticsearch_uses_bulk_api(self, receiver):
+        """一批記錄以單一 _bulk NDJSON 請求發送"""
+        handler = ElasticsearchHandler(
+            host=receiver.url, index_name="logs", batch_size=50, batch_interval=5
+        )
+        handler.setFormatter(logging.Formatter('{"message": "%(message)s"}'))
+        for i in range(5):
+            handler.handle(_record(f"m{i}"))
+        handler.flush()
+        handler.close()
+
+        assert len(receiver.requests) == 1
+        path, body = receiver.requests[0]
+        lines = [json.loads(line) for line in body.splitlines()]
+        assert path == "/_bulk"
+        assert lines[0] == {"index": {"_index": "logs"}}
+        assert [line["message"] for line in lines[1::2]] == [f"m{i}" for i in range(5)]
+
+    def test_logstash_sends_json_array(self, receiver):
+        """Logstash 每批以 JSON 陣列發送，非 JSON 輸出包裝為 message 欄位"""
+        handler = LogstashHandler(host=receiver.url, batch_size=50, batch_interval=5)
+        for i in range(3):
+            handler.handle(_record(f"m{i}"))
+        handler.flush()
+        handler.close()
+
+        assert len(receiver.requests) == 1
+        events = json.loads(receiver.requests[0][1])
+        assert [event["message"] for event in events] == ["m0", "m1", "m2"]
+
+    def test_transport_retries_unavailable_receiver(self):
+        """接收端暫時不可用時重試後送達"""
+        stub = _StubReceiver(statuses=[503, 503])
+        try:
+            handler = LogstashHandler(
+                host=stub.url, batch_size=10, batch_interval=0.01, retry_backoff=0.01
+            )
+            handler.handle(_record("retried"))
+            handler.flush()
+            handler.close()
+
+            assert len(stub.requests) == 1
+            assert handler.get_stats()["failed"] == 0
+        finally:
+            stub.close()
+
+    def test_failed_batch_is_counted(self, monkeypatch):
+        """重試用盡後計入發送失敗"""
+        monkeypatch.setattr(logging, "raiseExceptions", False)
+        stub = _StubReceiver(statuses=[503] * 10)
+        try:
+            handler = LogstashHandler(
+                host=stub.url,
+                batch_size=10,
+                batch_interval=0.01,
+                max_retries=1,
+                retry_backoff=0.01,
+            )
+            handler.handle(_record("lost"))
+            handler.flush()
+            handler.close()
+
+            assert handler.get_stats()["failed"] == 1
+        finally:
+            stub.close()
@@ -0,0 +1,186 @@
+"""
+日誌索引測試
+
+測試增量索引、輪換與壓縮後的檢查點接續，以及 LogAnalyzer 的索引查詢。
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.log_system.analyzer import LogAnalyzer
+from src.log_system.indexer import LogIndexer
+
+BASE_TIME = datetime(2025, 1, 6, 9, 0)
+
+
+def _log_line(i, level="INFO", minutes=0, **extra):
+    record = {
+        "timestamp": (BASE_TIME + timedelta(minutes=minutes)).strftime(
+            "%Y-%m-%dT%H:%M:%S.%fZ"
+        ),
+        "level": level,
+        "logger": "test",
+        "message": f"message {i}",
+        "category": "system",
+        "id": f"id-{i}",
+    }
+    record.update(extra)
+    return json.dumps(record) + "\n"
+
+
+def _append(path, lines):
+    with open(path, "a", encoding="utf-8") as f:
+        f.writelines(lines)
+
+
+@pytest.fixture
+def log_dirs(tmp_path):
+    dirs = {"system": str(tmp_path / "system"), "trade": str(tmp_path / "trade")}
+    for path in dirs.values():
+        os.makedirs(path)
+    return dirs
+
+
+@pytest.fixture
+def indexer(tmp_path, log_dirs):
+    return LogIndexer(log_dirs, str(tmp_path / "index"))
+
+
+class TestLogIndexer:
+    """日誌索引器測試"""
+
+    def test_update_is_incremental(self, indexer, log_dirs):
+        """只索引新增的完整行，寫入中的最後一行留待下次"""
+        path = os.path.join(log_dirs["system"], "app.log")
+        _append(path, [_log_line(i) for i in range(3)])
+        assert indexer.update() == 3
+        assert indexer.update() == 0
+
+        _append(path, [_log_line(3), '{"level": "IN'])
+        assert indexer.update() == 1
+        _append(path, ['FO"}\n'])
+        assert indexer.update() == 1
+
+        assert len(indexer.query(columns=["message"])) == 5
+
+    def test_rotated_and_compressed_files_resume_from_checkpoint(
+        self, indexer, log_dirs
+    ):
+        """輪換並壓縮後從檢查點接續，不重複索引"""
+        path = os.path.join(log_dirs["system"], "app.log")
+        _append(path, [_log_line(i) for i in range(3)])
+        indexer.update()
+
+        # 輪換前又寫入兩行，之後舊文件被壓縮
+        _append(path, [_log_line(i) for i in range(3, 5)])
+        with open(path, "rb") as f_in, gzip.open(path + ".1.gzip", "wb") as f_out:
+            f_out.write(f_in.read())
+        os.remove(path)
+        _append(path, [_log_line(i) for i in range(5, 7)])
+
+        assert indexer.update() == 4
+        messages = sorted(indexer.query(columns=["message"])["message"])
+        assert messages == sorted(f"message {i}" for i in range(7))
+
+    def test_query_prunes_by_category_time_and_level(self, indexer, log_dirs):
+        """依類別、時間與級別篩選"""
+        _append(
+            os.path.join(log_dirs["system"], "app.log"),
+            [
+                _log_line(0, minutes=0),
+                _log_line(1, level="ERROR", minutes=90),
+                _log_line(2, minutes=180),
+            ],
+        )
+        _append(os.path.join(log_dirs["trade"], "trade.log"), [_log_line(3)])
+        indexer.update()
+
+        window = indexer.query(
+            categories=["system"],
+            start_time=BASE_TIME + timedelta(hours=1),
+            end_time=BASE_TIME + timedelta(hours=2),
+        )
+        assert list(window["message"]) == ["message 1"]
+
+        errors = indexer.query(levels=["ERROR"], columns=["level"])
+        assert list(errors["level"]) == ["ERROR"]
+        assert len(indexer.query(categories=["trade"])) == 1
+
+        partitions = sorted(
+            os.listdir(os.path.join(indexer.index_dir, "log_category=system"))
+        )
+        assert partitions == [
+            "log_hour=2025010609",
+            "log_hour=2025010610",
+            "log_hour=2025010612",
+        ]
+
+    def test_missing_checkpoints_rebuild_without_duplicates(
+        self, tmp_path, indexer, log_dirs
+    ):
+        """檢查點遺失時重新建立索引"""
+        _append(
+            os.path.join(log_dirs["system"], "app.log"),
+            [_log_line(i) for i in range(4)],
+        )
+        indexer.update()
+        os.remove(indexer.checkpoint_path)
+
+        rebuilt = LogIndexer(log_dirs, indexer.index_dir)
+        rebuilt.update()
+        assert len(rebuilt.query(columns=["message"])) == 4
+
+
+class TestLogAnalyzerIndex:
+    """LogAnalyzer 索引查詢測試"""
+
+    @pytest.fixture
+    def analyzer(self, tmp_path, log_dirs):
+        _append(
+            os.path.join(log_dirs["system"], "app.log"),
+            [
+                _log_line(0, minutes=0),
+                _log_line(1, level="ERROR", minutes=10),
+                _log_line(2, minutes=20, data={"execution_time": 7.5}),
+                _log_line(3, level="WARNING", minutes=30, data={"execution_time": 0.2}),
+            ],
+        )
+        return LogAnalyzer(log_dirs, index_dir=str(tmp_path / "index"))
+
+    def test_load_logs_returns_newest_records(self, analyzer):
+        """載入最新的記錄並保留原始欄位"""
+        df = analyzer.load_logs(category="system", limit=2)
+
+        assert list(df["message"]) == ["message 3", "message 2"]
+        assert df["data"].iloc[1] == {"execution_time": 7.5}
+        assert df["timestamp"].iloc[0] == BASE_TIME + timedelta(minutes=30)
+
+    def test_aggregations_match_legacy_parser(self, tmp_path, log_dirs, analyzer):
+        """索引查詢與逐行解析的統計結果一致"""
+        legacy = LogAnalyzer(log_dirs, use_index=False)
+
+        assert analyzer.count_logs_by_level("system") == legacy.count_logs_by_level(
+            "system"
+        )
+        assert analyzer.count_logs_by_category() == {"system": 4}
+        assert sum(analyzer.count_logs_by_time("system").values()) == 4
+        assert list(analyzer.find_errors("system")["message"]) == ["message 1"]
+
+    def test_slow_operations_and_anomalies(self, analyzer):
+        """慢操作與效能異常只展開超過門檻的記錄"""
+        slow = analyzer.find_slow_operations("system", threshold=1.0)
+        assert list(slow["message"]) == ["message 2"]
+        assert slow["execution_time"].iloc[0] == 7.5
+
+        anomalies = analyzer.detect_anomalies("system")
+        assert [
+            issue["execution_time"] for issue in anomalies["performance_issues"]
+        ] == [7.5]
+
+        report = analyzer.generate_analysis_report("system")
+        assert report["total_logs"] == 4
+        assert report["summary"]["error_logs"] == 1
@@ -0,0 +1,87 @@
+"""
+測試效率前緣計算引擎
+
+測試主動集合法與 SLSQP 的結果一致、前緣的可行性，以及依輸入內容的快取。
+"""
+
+import numpy as np
+import pytest
+
+from src.portfolio.frontier import EfficientFrontierEngine, active_set_qp
+
+
+@pytest.fixture
+def market():
+    """隨機產生的預期報酬率與正定共變異數矩陣"""
+    rng = np.random.default_rng(7)
+    n_assets = 12
+    factors = rng.standard_normal((n_assets, n_assets))
+    cov = factors @ factors.T * 0.01 / n_assets + np.eye(n_assets) * 1e-4
+    mu = rng.uniform(0.02, 0.2, n_assets)
+    return mu, cov
+
+
+class TestActiveSetQP:
+    """主動集合法測試"""
+
+    def test_min_variance_matches_closed_form(self):
+        """沒有權重觸及 0 時與封閉解相同"""
+        cov = np.diag([0.04, 0.09, 0.16])
+        w = active_set_qp(cov, np.ones((1, 3)), np.ones(1), np.full(3, 1 / 3))
+
+        expected = (1 / np.diag(cov)) / (1 / np.diag(cov)).sum()
+        np.testing.assert_allclose(w, expected)
+
+    def test_long_only_bound(self):
+        """無限制解需要放空時權重停在 0"""
+        cov = np.array([[0.04, 0.05], [0.05, 0.09]])
+        w = active_set_qp(cov, np.ones((1, 2)), np.ones(1), np.array([0.5, 0.5]))
+
+        np.testing.assert_allclose(w, [1.0, 0.0])
+
+
+class TestEfficientFrontierEngine:
+    """效率前緣計算測試"""
+
+    def test_frontier_is_feasible_and_efficient(self, market):
+        """每個點滿足約束，波動率隨目標報酬率遞增"""
+        mu, cov = market
+        result = EfficientFrontierEngine().compute(mu, cov, num_points=50)
+
+        assert result.weights.shape == (50, len(mu))
+        assert result.returns[-1] == pytest.approx(mu.max())
+        np.testing.assert_allclose(result.weights.sum(axis=1), 1.0)
+        np.testing.assert_allclose(result.weights @ mu, result.returns, atol=1e-12)
+        assert result.weights.min() >= 0
+        assert np.all(np.diff(result.volatility) >= -1e-12)
+
+    def test_matches_slsqp(self, market):
+        """主動集合法與 SLSQP 的前緣一致"""
+        mu, cov = market
+        active = EfficientFrontierEngine("active_set").compute(mu, cov, 15)
+        slsqp = EfficientFrontierEngine("slsqp").compute(mu, cov, 15)
+
+        valid = ~np.isnan(slsqp.volatility)
+        np.testing.assert_allclose(
+            active.volatility[valid], slsqp.volatility[valid], rtol=1e-4
+        )
+
+    def test_cache(self, market):
+        """相同輸入返回快取結果，呼叫端修改結果不影響快取"""
+        mu, cov = market
+        engine = EfficientFrontierEngine(cache_size=1)
+        first = engine.compute(mu, cov, 20)
+        first.weights[:] = 0
+        second = engine.compute(mu.copy(), cov.copy(), 20)
+
+        assert (engine.hits, engine.misses) == (1, 1)
+        np.testing.assert_allclose(second.weights.sum(axis=1), 1.0)
+
+        engine.compute(mu * 1.1, cov, 20)
+        engine.compute(mu, cov, 20)
+        assert engine.misses == 3
+
+    def test_unknown_method(self):
+        """不支援的求解方法拋出 ValueError"""
+        with pytest.raises(ValueError):
+            EfficientFrontierEngine("cla")
@@ -0,0 +1,219 @@
+"""
+測試投資組合最佳化核心
+
+測試 Ledoit-Wolf 收縮估計、目標函數的解析梯度、單一與批次求解，以及結果快取。
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.optimize import check_grad
+
+from src.portfolio.kernel import (
+    OPTIMIZATION_OBJECTIVES,
+    PortfolioOptimizer,
+    estimate_moments,
+    ledoit_wolf_covariance,
+    objective_function,
+    project_to_bounded_simplex,
+)
+from src.portfolio.optimization import minimum_variance_optimization
+
+
+@pytest.fixture
+def returns():
+    """含共同因子的日報酬率"""
+    rng = np.random.default_rng(11)
+    common = rng.normal(0, 0.008, (250, 1))
+    return rng.normal(0.0005, 0.015, (250, 10)) + common
+
+
+class TestLedoitWolf:
+    """收縮共變異數估計測試"""
+
+    def test_matches_sklearn(self, returns):
+        """與 scikit-learn 的 Ledoit-Wolf 估計一致"""
+        covariance = pytest.importorskip("sklearn.covariance")
+        expected, expected_shrinkage = covariance.ledoit_wolf(returns)
+
+        cov, shrinkage = ledoit_wolf_covariance(returns, annualization=1)
+
+        np.testing.assert_allclose(cov, expected, atol=1e-15)
+        assert shrinkage == pytest.approx(expected_shrinkage)
+
+    def test_batched(self, returns):
+        """一次估計多個窗口與逐一估計相同"""
+        windows = np.stack([returns[i : i + 60] for i in range(0, 180, 60)])
+        covs, shrinkage = ledoit_wolf_covariance(windows)
+
+        assert covs.shape == (3, 10, 10)
+        for i, window in enumerate(windows):
+            cov, value = ledoit_wolf_covariance(window)
+            np.testing.assert_allclose(covs[i], cov)
+            assert shrinkage[i] == pytest.approx(value)
+
+    def test_estimate_moments_complete_data(self, returns):
+        """資料完整時使用 Ledoit-Wolf 收縮，預期報酬率與共變異數皆年化"""
+        mu, cov = estimate_moments(pd.DataFrame(returns))
+
+        np.testing.assert_allclose(mu, returns.mean(axis=0) * 252)
+        np.testing.assert_allclose(cov, ledoit_wolf_covariance(returns)[0])
+
+    def test_estimate_moments_short_history(self, returns):
+        """歷史較短的資產不縮減其他資產的樣本，與 DataFrame 兩兩估計一致"""
+        frame = pd.DataFrame(returns)
+        frame.iloc[:200, 3] = np.nan
+        frame.iloc[5, 7] = np.nan
+        mu, cov = estimate_moments(frame, shrink=False)
+
+        np.testing.assert_allclose(mu, frame.mean().to_numpy() * 252)
+        np.testing.assert_allclose(cov, frame.cov().to_numpy() * 252)
+        np.testing.assert_allclose(
+            cov[:3, :3], np.cov(returns[:, :3], rowvar=False) * 252
+        )
+
+        shrunk = estimate_moments(frame)[1]
+        assert np.isfinite(shrunk).all()
+        np.testing.assert_allclose(shrunk, shrunk.T)
+        assert np.linalg.eigvalsh(shrunk).min() > 0
+
+
+class TestObjectives:
+    """目標函數測試"""
+
+    @pytest.mark.parametrize("objective", OPTIMIZATION_OBJECTIVES)
+    def test_analytic_gradient(self, returns, objective):
+        """解析梯度與有限差分一致"""
+        mu, cov = estimate_moments(returns)
+        function = objective_function(objective, cov, mu, 0.02, 3.0)
+        w = np.random.default_rng(0).dirichlet(np.ones(len(mu)))
+
+        error = check_grad(lambda x: function(x)[0], lambda x: function(x)[1], w)
+        assert error < 1e-6
+
+    def test_projection(self):
+        """投影結果總和為 1 且在上下限之間，可行點投影後不變"""
+        points = np.random.default_rng(3).normal(size=(50, 8))
+        lower, upper = np.full(8, 0.05), np.full(8, 0.3)
+        projected = project_to_bounded_simplex(points, lower, upper)
+
+        np.testing.assert_allclose(projected.sum(axis=1), 1.0)
+        assert projected.min() >= 0.05 and projected.max() <= 0.3
+        np.testing.assert_allclose(
+            project_to_bounded_simplex(projected, lower, upper), projected
+        )
+
+
+class TestPortfolioOptimizer:
+    """單一與批次求解測試"""
+
+    def test_min_variance_closed_form(self):
+        """對角共變異數的最小變異數權重與變異數倒數成正比"""
+        cov = np.diag([0.04, 0.09, 0.16])
+        result = PortfolioOptimizer().optimize("min_variance", cov)
+
+        expected = (1 / np.diag(cov)) / (1 / np.diag(cov)).sum()
+        assert result.success
+        np.testing.assert_allclose(result.weights, expected, atol=1e-6)
+
+    def test_risk_parity_equal_contributions(self, returns):
+        """風險平價的各資產風險貢獻相同"""
+        _, cov = estimate_moments(returns)
+        w = PortfolioOptimizer().optimize("risk_parity", cov).weights
+
+        contributions = w * (cov @ w) / (w @ cov @ w)
+        np.testing.assert_allclose(contributions, 1 / len(w), atol=1e-5)
+
+    def test_target_return_and_bounds(self, returns):
+        """指定目標報酬率時達到該報酬率，且遵守各資產的上下限"""
+        mu, cov = estimate_moments(returns)
+        bounds = [(0.02, 0.3)] * 5 + [(0.0, 0.2)] * 5
+        target = float(np.median(mu))
+        result = PortfolioOptimizer().optimize(
+            "mean_variance", cov, mu, bounds=bounds, target_return=target
+        )
+
+        assert result.success
+        assert result.weights @ mu == pytest.approx(target)
+        assert result.weights[:5].min() >= 0.02 - 1e-9
+        assert result.weights[5:].max() <= 0.2 + 1e-9
+
+    def test_missing_expected_returns(self, returns):
+        """需要預期報酬率的目標缺少時拋出 ValueError"""
+        _, cov = estimate_moments(returns)
+        with pytest.raises(ValueError):
+            PortfolioOptimizer().optimize("max_sharpe", cov)
+        with pytest.raises(ValueError):
+            PortfolioOptimizer().optimize("cvar", cov)
+
+    def test_cache(self, returns):
+        """相同輸入返回快取結果，呼叫端修改結果不影響快取"""
+        mu, cov = estimate_moments(returns)
+        optimizer = PortfolioOptimizer(cache_size=1)
+        first = optimizer.optimize("max_sharpe", cov, mu, risk_free_rate=0.02)
+        first.weights[:] = 0
+        second = optimizer.optimize(
+            "max_sharpe", cov.copy(), mu.copy(), risk_free_rate=0.02
+        )
+
+        assert (optimizer.hits, optimizer.misses) == (1, 1)
+        assert second.weights.sum() == pytest.approx(1.0)
+
+        optimizer.optimize("max_sharpe", cov, mu, risk_free_rate=0.03)
+        optimizer.optimize("max_sharpe", cov, mu, risk_free_rate=0.02)
+        assert optimizer.misses == 3
+
+    @pytest.mark.parametrize(
+        "objective, bounds",
+        [
+            ("min_variance", (0.0, 1.0)),
+            ("min_variance", (0.05, 0.3)),
+            ("mean_variance", (0.0, 1.0)),
+        ],
+    )
+    def test_batch_matches_single(self, returns, objective, bounds):
+        """向量化批次求解與逐一以 SLSQP 求解的結果一致"""
+        windows = np.stack([returns[i : i + 120] for i in range(0, 130, 10)])
+        covs = ledoit_wolf_covariance(windows)[0]
+        mus = windows.mean(axis=1) * 252
+        optimizer = PortfolioOptimizer()
+
+        weights, success = optimizer.optimize_batch(
+            objective, covs, mus, bounds=bounds, risk_aversion=2.0
+        )
+
+        assert success.all()
+        for i in range(len(covs)):
+            single = optimizer.optimize(
+                objective, covs[i], mus[i], bounds=bounds, risk_aversion=2.0
+            )
+            np.testing.assert_allclose(weights[i], single.weights, atol=1e-4)
+
+    def test_batch_other_objectives(self, returns):
+        """非二次目標逐一求解，並共用快取"""
+        windows = np.stack([returns[:120], returns[120:240]])
+        covs = ledoit_wolf_covariance(windows)[0]
+        optimizer = PortfolioOptimizer()
+
+        weights, success = optimizer.optimize_batch("risk_parity", covs)
+        optimizer.optimize_batch("risk_parity", covs)
+
+        assert success.all()
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+        assert (optimizer.hits, optimizer.misses) == (2, 2)
+
+
+class TestDelegation:
+    """既有最佳化函數委派給核心的測試"""
+
+    def test_minimum_variance_optimization(self, returns):
+        """最小變異數函數使用收縮共變異數與原有的權重上下限"""
+        frame = pd.DataFrame(returns, columns=[f"S{i}" for i in range(10)])
+        weights = minimum_variance_optimization(list(frame.columns), frame)
+
+        _, cov = estimate_moments(frame)
+        expected = PortfolioOptimizer().optimize(
+            "min_variance", cov, bounds=(0.01, 0.5)
+        )
+        np.testing.assert_allclose(list(weights.values()), expected.weights)
+        assert min(weights.values()) >= 0.01 - 1e-9
@@ -0,0 +1,137 @@
+"""
+共享市場數據快取測試
+
+測試面板發佈、版本切換、零複製讀取與跨程序存取。
+"""
+
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.shared_market_data_cache import (
+    SharedCacheError,
+    SharedMarketDataCache,
+)
+
+
+def _make_bars(symbols, days=10, start="2024-01-01", offset=0.0) -> pd.DataFrame:
+    dates = pd.bdate_range(start, periods=days)
+    rows = []
+    for i, symbol in enumerate(symbols):
+        close = 100.0 + i * 10 + np.arange(days) + offset
+        for date, price in zip(dates, close):
+            rows.append(
+                {
+                    "symbol": symbol,
+                    "date": date,
+                    "open": price - 1,
+                    "high": price + 1,
+                    "low": price - 2,
+                    "close": price,
+                    "volume": 1000.0 + i,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def _read_close_in_child(base_dir, symbol, queue):
+    cache = SharedMarketDataCache(base_dir)
+    bars = cache.get_symbol_bars(symbol)
+    queue.put((cache.current_version(), float(bars["close"].iloc[-1])))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """建立使用暫存目錄的共享快取"""
+    return SharedMarketDataCache(str(tmp_path), check_interval=0)
+
+
+class TestSharedMarketDataCache:
+    """共享快取測試"""
+
+    def test_empty_cache_returns_empty_frames(self, cache):
+        """尚未發佈時回傳空資料"""
+        assert not cache.is_available()
+        assert cache.get_panel("close").empty
+        assert cache.get_symbol_bars("2330.TW").empty
+
+    def test_publish_and_read_panel(self, cache):
+        """發佈後可讀取 日期×股票 面板"""
+        bars = _make_bars(["2330.TW", "2317.TW"])
+        cache.publish_bars(bars, version="2024-01-12")
+
+        close = cache.get_panel("close")
+        assert cache.current_version() == "2024-01-12"
+        assert close.shape == (10, 2)
+        assert close.loc["2024-01-01", "2330.TW"] == 100.0
+        assert close.loc["2024-01-01", "2317.TW"] == 110.0
+
+    def test_panel_is_zero_copy_view(self, cache):
+        """面板為記憶體映射的唯讀視圖"""
+        cache.publish_bars(_make_bars(["A", "B"]), version="v1")
+
+        values = cache.get_panel("close").to_numpy()
+        assert not values.flags.writeable
+        assert not values.flags.owndata
+
+    def test_date_range_and_symbol_filters(self, cache):
+        """日期範圍以二分搜尋切片，股票篩選正確"""
+        cache.publish_bars(_make_bars(["A", "B", "C"], days=20), version="v1")
+
+        panel = cache.get_panel(
+            "close", symbols=["C", "A"], start_date="2024-01-05", end_date="2024-01-10"
+        )
+        assert list(panel.columns) == ["C", "A"]
+        assert panel.index.min() == pd.Timestamp("2024-01-05")
+        assert panel.index.max() == pd.Timestamp("2024-01-10")
+
+        bars = cache.get_symbol_bars("B", start_date="2024-01-08")
+        assert list(bars.columns) == ["open", "high", "low", "close", "volume"]
+        assert bars.index.min() == pd.Timestamp("2024-01-08")
+
+    def test_get_bars_long_format_matches_input(self, cache):
+        """長格式讀取與原始資料一致"""
+        bars = _make_bars(["A", "B"])
+        cache.publish_bars(bars, version="v1")
+
+        result = cache.get_bars(["A", "B"])
+        expected = bars.sort_values(["symbol", "date"]).reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            result[expected.columns], expected, check_dtype=False
+        )
+        assert cache.get_bars(["A", "MISSING"]).empty
+
+    def test_new_version_is_picked_up_and_old_pruned(self, tmp_path, cache):
+        """讀取端切換至新版本，舊版本依保留數量清除"""
+        cache.keep_versions = 2
+        for day, offset in enumerate((0.0, 5.0, 9.0)):
+            cache.publish_bars(_make_bars(["A"], offset=offset), version=f"v{day}")
+
+        assert cache.current_version() == "v2"
+        assert cache.get_panel("close")["A"].iloc[0] == 109.0
+        version_dirs = [p for p in tmp_path.iterdir() if p.is_dir()]
+        assert len(version_dirs) == 2
+
+    def test_concurrent_writer_is_rejected(self, tmp_path, cache):
+        """同時只允許單一寫入端"""
+        (tmp_path / ".writer.lock").write_text("12345")
+        with pytest.raises(SharedCacheError):
+            cache.publish_bars(_make_bars(["A"]), version="v1")
+
+    def test_readable_from_another_process(self, tmp_path, cache):
+        """其他程序可直接讀取已發佈版本"""
+        cache.publish_bars(_make_bars(["2330.TW"]), version="2024-01-12")
+
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        process = ctx.Process(
+            target=_read_close_in_child, args=(str(tmp_path), "2330.TW", queue)
+        )
+        process.start()
+        version, last_close = queue.get(timeout=60)
+        process.join(timeout=60)
+
+        assert version == "2024-01-12"
+        assert last_close == 109.0
@@ -0,0 +1,169 @@
+"""
+訊號快取管理器測試
+
+測試內容定址的快取鍵值、非同步 Arrow 持久化與分層統計。
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.signal_generators.cache_manager import SignalCacheManager, cached
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """建立使用暫存目錄的快取管理器"""
+    cache_manager = SignalCacheManager(cache_dir=str(tmp_path), max_memory_items=10)
+    yield cache_manager
+    cache_manager.shutdown()
+
+
+def _price_frame(values) -> pd.DataFrame:
+    index = pd.date_range("2024-01-01", periods=len(values), freq="D")
+    return pd.DataFrame({"close": values}, index=index)
+
+
+class TestCacheKey:
+    """快取鍵值測試"""
+
+    def test_equal_dataframes_share_key(self, manager):
+        """相同內容的 DataFrame 產生相同鍵值"""
+        df1 = _price_frame(np.arange(5000, dtype=float))
+        df2 = _price_frame(np.arange(5000, dtype=float))
+        assert manager._generate_cache_key("f", df1) == manager._generate_cache_key(
+            "f", df2
+        )
+
+    def test_values_hidden_by_repr_change_key(self, manager):
+        """repr 被截斷的中段資料變動也會改變鍵值"""
+        values = np.arange(5000, dtype=float)
+        changed = values.copy()
+        changed[2500] = -1.0
+        assert str(_price_frame(values)) == str(_price_frame(changed))
+        assert manager._generate_cache_key(
+            "f", _price_frame(values)
+        ) != manager._generate_cache_key("f", _price_frame(changed))
+
+    def test_dtype_and_shape_are_part_of_key(self, manager):
+        """相同位元組但不同型別或形狀的陣列鍵值不同"""
+        arr = np.zeros(8, dtype=np.int64)
+        assert manager._generate_cache_key("f", arr) != manager._generate_cache_key(
+            "f", arr.view(np.float64)
+        )
+        assert manager._generate_cache_key("f", arr) != manager._generate_cache_key(
+            "f", arr.reshape(2, 4)
+        )
+
+    def test_zero_dim_arrays(self, manager):
+        """0 維陣列與其檢視依內容產生鍵值"""
+        values = np.array([1.5, 2.5])
+        key = manager._generate_cache_key("f", np.array(1.5))
+
+        assert manager._generate_cache_key("f", values[0, ...]) == key
+        assert manager._generate_cache_key("f", values[1, ...]) != key
+        assert manager._generate_cache_key("f", values[:1]) != key
+        assert manager._generate_cache_key(
+            "f", np.array("ab")
+        ) != manager._generate_cache_key("f", np.array("ac"))
+
+    def test_unhashable_object_values(self, manager):
+        """含 list 或 dict 的欄位也能產生鍵值，內容不同則鍵值不同"""
+        frame = pd.DataFrame({"legs": [[1, 2], [3]], "meta": [{"a": 1}, {"b": 2}]})
+        key = manager._generate_cache_key("f", frame)
+
+        assert manager._generate_cache_key("f", frame.copy()) == key
+        changed = frame.copy()
+        changed.at[1, "legs"] = [4]
+        assert manager._generate_cache_key("f", changed) != key
+
+    def test_kwargs_order_does_not_matter(self, manager):
+        """關鍵字參數順序不影響鍵值"""
+        assert manager._generate_cache_key(
+            "f", a=1, b="x"
+        ) == manager._generate_cache_key("f", b="x", a=1)
+
+
+class TestPersistence:
+    """磁碟持久化測試"""
+
+    def test_dataframe_round_trips_through_arrow(self, tmp_path, manager):
+        """DataFrame 以 Arrow IPC 寫入並可讀回"""
+        df = _price_frame(np.linspace(100, 110, 30))
+        manager.put("frame", df)
+        manager.flush()
+
+        assert (tmp_path / "frame.arrow").exists()
+
+        reader = SignalCacheManager(cache_dir=str(tmp_path))
+        try:
+            pd.testing.assert_frame_equal(reader.get("frame"), df, check_freq=False)
+            assert reader.get_stats()["disk_hits"] == 1
+        finally:
+            reader.shutdown()
+
+    def test_series_round_trips_with_name(self, tmp_path, manager):
+        """Series 讀回時保留名稱"""
+        series = pd.Series([1.0, 2.0, 3.0], name="rsi")
+        manager.put("series", series)
+        manager.flush()
+
+        reader = SignalCacheManager(cache_dir=str(tmp_path))
+        try:
+            pd.testing.assert_series_equal(reader.get("series"), series)
+        finally:
+            reader.shutdown()
+
+    def test_non_tabular_values_use_pickle(self, tmp_path, manager):
+        """非表格資料使用 pickle 持久化"""
+        manager.put("obj", {"signal": 1})
+        manager.flush()
+
+        assert (tmp_path / "obj.pkl").exists()
+        assert manager.get_stats()["disk_writes"] == 1
+
+
+class TestMemoryTier:
+    """記憶體層測試"""
+
+    def test_byte_limit_evicts_lru(self, tmp_path):
+        """超過位元組上限時淘汰最久未使用的項目"""
+        manager = SignalCacheManager(
+            cache_dir=str(tmp_path), max_memory_items=100, max_memory_bytes=20_000
+        )
+        try:
+            for i in range(4):
+                manager.put(f"arr_{i}", np.zeros(1000), persist=False)  # 8000 bytes
+
+            stats = manager.get_stats()
+            assert stats["memory_items"] == 2
+            assert stats["memory_bytes"] <= 20_000
+            assert stats["evictions"] == 2
+        finally:
+            manager.shutdown()
+
+    def test_cached_decorator_reports_tier_stats(self, tmp_path):
+        """裝飾器分別統計記憶體層與磁碟層命中"""
+        manager = SignalCacheManager(cache_dir=str(tmp_path))
+        calls = []
+
+        @cached(expire_hours=1, persist=True, manager=manager)
+        def compute(df):
+            calls.append(1)
+            return df * 2
+
+        try:
+            df = _price_frame(np.arange(10, dtype=float))
+            compute(df)
+            compute(df.copy())
+            manager.flush()
+            manager.memory_cache.clear()
+            compute(df)
+
+            stats = compute.get_cache_stats()
+            assert len(calls) == 1
+            assert stats["memory_hits"] == 1
+            assert stats["disk_hits"] == 1
+            assert stats["misses"] == 1
+        finally:
+            manager.shutdown()
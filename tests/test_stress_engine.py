@@ -0,0 +1,271 @@
+"""
+測試批次壓力測試引擎
+
+測試各類衝擊的陣列轉換、向量化重新評價、情境資料重建與行程池重播。
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.stress_engine import (
+    STRESS_METRICS,
+    CorrelationShock,
+    HistoricalShock,
+    LiquidityShock,
+    PriceShock,
+    Scenario,
+    Shock,
+    StressEngine,
+    VolatilityShock,
+)
+
+CRASH = ("2022-06-01", "2022-06-30")
+WINDOW = ("2022-03-01", "2022-08-31")
+
+
+@pytest.fixture
+def data():
+    """長格式的多資產 OHLCV 資料"""
+    rng = np.random.default_rng(5)
+    dates = pd.bdate_range("2022-01-03", periods=250)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, (250, 4)), axis=0))
+    frames = [
+        pd.DataFrame(
+            {
+                "date": dates,
+                "symbol": f"S{j}",
+                "open": prices[:, j],
+                "high": prices[:, j] * 1.01,
+                "low": prices[:, j] * 0.99,
+                "close": prices[:, j],
+                "volume": 1000.0,
+            }
+        )
+        for j in range(4)
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def engine(data):
+    """由長格式資料建立的引擎"""
+    return StressEngine.from_frame(data)
+
+
+def _window(engine, period):
+    dates = engine.dates
+    return (dates >= period[0]) & (dates <= period[1])
+
+
+def replay_backtest(data, slippage_multiplier=1.0):
+    """重播用的回測函數，需為模組層級才能傳給行程池"""
+    close = data.pivot(index="date", columns="symbol", values="close")
+    return {
+        "total_return": float(close.iloc[-1].mean() / close.iloc[0].mean() - 1),
+        "slippage_multiplier": slippage_multiplier,
+        "name": "ignored",
+    }
+
+
+class TestShocks:
+    """衝擊轉換測試"""
+
+    def test_price_shock(self, engine):
+        """崩盤與復甦期間的累積報酬率等於設定值，期間外不變"""
+        scenario = Scenario(
+            "crash",
+            [
+                PriceShock(CRASH, -0.3),
+                PriceShock(("2022-07-01", "2022-08-31"), 0.1, assets=["S0"]),
+            ],
+        )
+        paths = engine.generate([scenario])
+        returns = paths.log_returns[0]
+
+        np.testing.assert_allclose(
+            np.exp(returns[_window(engine, CRASH)].sum(axis=0)), 0.7
+        )
+        recovery = _window(engine, ("2022-07-01", "2022-08-31"))
+        assert np.exp(returns[recovery, 0].sum()) == pytest.approx(1.1)
+        np.testing.assert_array_equal(
+            returns[recovery, 1:], paths.base_log_returns[recovery, 1:]
+        )
+        before = engine.dates < "2022-06-01"
+        np.testing.assert_array_equal(returns[before], paths.base_log_returns[before])
+
+    def test_volatility_shock(self, engine):
+        """期間內波動率乘以倍數，平均報酬率不變"""
+        paths = engine.generate([Scenario("vol", [VolatilityShock(WINDOW, 2.5)])])
+        mask = _window(engine, WINDOW)
+        shocked, base = paths.log_returns[0][mask], paths.base_log_returns[mask]
+
+        np.testing.assert_allclose(shocked.std(axis=0), base.std(axis=0) * 2.5)
+        np.testing.assert_allclose(shocked.mean(axis=0), base.mean(axis=0))
+
+    def test_correlation_shock(self, engine):
+        """期間內樣本相關係數變為目標值，各資產波動率不變"""
+        paths = engine.generate(
+            [Scenario("corr", [CorrelationShock(WINDOW, 0.8, assets=["S1", "S2"])])]
+        )
+        mask = _window(engine, WINDOW)
+        shocked, base = paths.log_returns[0][mask], paths.base_log_returns[mask]
+
+        assert np.corrcoef(shocked[:, 1], shocked[:, 2])[0, 1] == pytest.approx(0.8)
+        np.testing.assert_allclose(shocked.std(axis=0), base.std(axis=0))
+        np.testing.assert_array_equal(shocked[:, [0, 3]], base[:, [0, 3]])
+
+    def test_historical_shock(self, engine):
+        """歷史期間的報酬率複製到指定位置"""
+        source = ("2022-02-01", "2022-02-28")
+        paths = engine.generate(
+            [Scenario("hist", [HistoricalShock(source, start="2022-10-03")])]
+        )
+        mask = _window(engine, source)
+        start = engine.dates.searchsorted(pd.Timestamp("2022-10-03"))
+
+        np.testing.assert_array_equal(
+            paths.log_returns[0][start : start + mask.sum()],
+            paths.base_log_returns[mask],
+        )
+
+    def test_batched_matches_individual(self, engine):
+        """一次產生多個情境與逐一產生的結果相同"""
+        scenarios = [
+            Scenario(
+                f"s{i}",
+                [
+                    VolatilityShock(WINDOW, 1.5 + i),
+                    CorrelationShock(WINDOW, 0.2 * i),
+                    PriceShock(CRASH, -0.1 * i),
+                    LiquidityShock(CRASH, slippage_increase=2.0 + i),
+                ],
+            )
+            for i in range(4)
+        ]
+        batched = engine.generate(scenarios)
+
+        for i, scenario in enumerate(scenarios):
+            single = engine.generate([scenario])
+            np.testing.assert_allclose(batched.log_returns[i], single.log_returns[0])
+            np.testing.assert_array_equal(
+                batched.cost_multiplier[i], single.cost_multiplier[0]
+            )
+
+    def test_shock_requires_apply_batch(self):
+        """未實作 apply_batch 的衝擊類別無法建立實例"""
+
+        class IncompleteShock(Shock):
+            pass
+
+        with pytest.raises(TypeError):
+            Shock(CRASH)
+        with pytest.raises(TypeError):
+            IncompleteShock(CRASH)
+
+
+class TestRevaluation:
+    """向量化重新評價測試"""
+
+    def test_matrix_shape_and_baseline(self, engine):
+        """輸出情境 × 指標矩陣，無衝擊情境的報酬率等於基準"""
+        matrix = engine.revalue(
+            engine.generate([Scenario("base"), Scenario("crash", [PriceShock(CRASH)])]),
+            rebalance=False,
+        )
+        prices = engine.prices.to_numpy()
+
+        assert list(matrix.index) == ["base", "crash"]
+        assert list(matrix.columns) == list(STRESS_METRICS)
+        assert matrix.loc["base", "total_return"] == pytest.approx(
+            (prices[-1] / prices[0]).mean() - 1
+        )
+        assert matrix.loc["crash", "max_drawdown"] < matrix.loc["base", "max_drawdown"]
+
+    def test_constant_mix_costs(self, engine):
+        """每日再平衡的成本隨滑價倍數增加"""
+        paths = engine.generate(
+            [Scenario("base"), Scenario("liquidity", [LiquidityShock(WINDOW)])]
+        )
+        matrix = engine.revalue(paths, weights={"S0": 0.4, "S1": 0.6})
+
+        assert (
+            matrix.loc["liquidity", "transaction_cost"]
+            > matrix.loc["base", "transaction_cost"]
+        )
+        assert (
+            matrix.loc["liquidity", "total_return"] < matrix.loc["base", "total_return"]
+        )
+
+
+class TestReplay:
+    """情境資料重建與重播測試"""
+
+    def test_scenario_frame(self, engine, data):
+        """重建的資料反映價格、價差與成交量衝擊"""
+        paths = engine.generate(
+            [Scenario("s", [PriceShock(CRASH, -0.3), LiquidityShock(CRASH)])]
+        )
+        frame = engine.scenario_frame(paths, 0).set_index(["symbol", "date"])
+        base = data.set_index(["symbol", "date"])
+
+        close = frame.loc["S2", "close"]
+        assert close["2022-06-30"] / close["2022-05-31"] == pytest.approx(0.7)
+        day = ("S2", pd.Timestamp("2022-06-15"))
+        assert frame.loc[day, "volume"] == pytest.approx(200.0)
+        assert frame.loc[day, "high"] - frame.loc[day, "low"] == pytest.approx(
+            3
+            * (base.loc[day, "high"] - base.loc[day, "low"])
+            * frame.loc[day, "close"]
+            / base.loc[day, "close"]
+        )
+
+    def test_wide_format(self):
+        """寬格式資料依 {資產}_close 欄位重建"""
+        dates = pd.bdate_range("2022-01-03", periods=60)
+        data = pd.DataFrame(
+            {
+                "date": dates,
+                "A_close": np.linspace(100, 110, 60),
+                "B_close": np.linspace(50, 40, 60),
+            }
+        )
+        engine = StressEngine.from_frame(data)
+        frame = engine.scenario_frame(
+            engine.generate(
+                [Scenario("s", [PriceShock(("2022-02-01", "2022-02-28"))])]
+            ),
+            0,
+        )
+
+        assert engine.assets == ["A", "B"]
+        ratio = frame["A_close"] / data["A_close"]
+        assert ratio.iloc[-1] == pytest.approx(
+            0.8 / (data["A_close"].iloc[40] / data["A_close"].iloc[20])
+        )
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_run_replays_in_pool(self, engine, max_workers):
+        """重播情境的回測結果併入矩陣，非數值結果被忽略"""
+        scenarios = [
+            Scenario("base"),
+            Scenario("crash", [PriceShock(CRASH, -0.3)], replay=True),
+            Scenario("liquidity", [LiquidityShock(WINDOW)], replay=True),
+        ]
+        matrix = engine.run(
+            scenarios, backtest_func=replay_backtest, max_workers=max_workers
+        )
+
+        assert "replay_name" not in matrix.columns
+        assert np.isnan(matrix.loc["base", "replay_total_return"])
+        assert matrix.loc["liquidity", "replay_slippage_multiplier"] == 5.0
+        assert matrix.loc["crash", "replay_slippage_multiplier"] == 1.0
+        assert (
+            matrix.loc["crash", "replay_total_return"]
+            < matrix.loc["liquidity", "replay_total_return"]
+        )
+
+    def test_replay_requires_backtest_func(self, engine):
+        """有重播情境但沒有回測函數時拋出 ValueError"""
+        with pytest.raises(ValueError):
+            engine.run([Scenario("s", replay=True)])
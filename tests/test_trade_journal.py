@@ -0,0 +1,170 @@
+"""
+交易記錄日誌測試
+
+測試僅附加日誌的寫入、跨日滾動、區段索引與 TradeLogger 整合。
+"""
+
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.core.logger import TradeLogger
+from src.core.trade_journal import TradeJournal
+
+
+def _write_old_journal(journal, day, records):
+    path = os.path.join(journal.directory, f"journal-{day}.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    return path
+
+
+@pytest.fixture
+def journal(tmp_path):
+    """建立使用暫存目錄的日誌"""
+    trade_journal = TradeJournal(str(tmp_path), "trades", fsync_batch_size=2)
+    yield trade_journal
+    trade_journal.close()
+
+
+class TestTradeJournal:
+    """日誌測試"""
+
+    def test_append_writes_one_line_per_record(self, journal):
+        """每筆記錄只附加一行"""
+        for i in range(3):
+            journal.append({"stock_id": "2330", "quantity": i})
+        journal.flush()
+
+        files = [f for f in os.listdir(journal.directory) if f.endswith(".jsonl")]
+        assert len(files) == 1
+        with open(os.path.join(journal.directory, files[0]), encoding="utf-8") as f:
+            assert len(f.readlines()) == 3
+        assert list(journal.read()["quantity"]) == [0, 1, 2]
+
+    def test_stale_journal_rolls_into_segment(self, tmp_path, journal):
+        """跨日的日誌檔滾動為 Parquet 區段並建立索引"""
+        path = _write_old_journal(
+            journal,
+            "20240102",
+            [
+                {"stock_id": "2330", "timestamp": "2024-01-02 09:00:00"},
+                {"stock_id": "2317", "timestamp": "2024-01-02 13:00:00"},
+            ],
+        )
+
+        journal.roll()
+
+        assert not os.path.exists(path)
+        assert os.path.exists(os.path.join(journal.segment_dir, "20240102.parquet"))
+        entry = journal.segment_index()["20240102"]
+        assert entry["rows"] == 2
+        assert entry["min_time"] == "2024-01-02T09:00:00"
+        assert entry["max_time"] == "2024-01-02T13:00:00"
+
+    def test_read_only_opens_overlapping_segments(self, journal, monkeypatch):
+        """讀取時只開啟與時間範圍重疊的區段"""
+        for day in ("20240102", "20240103", "20240104"):
+            _write_old_journal(
+                journal, day, [{"timestamp": f"{day[:4]}-{day[4:6]}-{day[6:]}"}]
+            )
+        journal.roll()
+
+        opened = []
+        original = pd.read_parquet
+
+        def tracking_read(path, *args, **kwargs):
+            opened.append(os.path.basename(path))
+            return original(path, *args, **kwargs)
+
+        monkeypatch.setattr(pd, "read_parquet", tracking_read)
+        df = journal.read(
+            start_time=datetime(2024, 1, 3), end_time=datetime(2024, 1, 3)
+        )
+
+        assert opened == ["20240103.parquet"]
+        assert list(df["timestamp"]) == ["2024-01-03"]
+
+    def test_truncated_last_line_is_ignored(self, journal):
+        """寫入中斷的最後一行不影響讀取"""
+        journal.append({"stock_id": "2330"})
+        journal.flush()
+        with open(journal._journal_path(journal._today()), "ab") as f:
+            f.write(b'{"stock_id": "23')
+
+        assert list(journal.read()["stock_id"]) == ["2330"]
+
+    def test_index_is_rebuilt_when_missing(self, tmp_path, journal):
+        """區段索引遺失時從區段檔案重建"""
+        _write_old_journal(journal, "20240102", [{"timestamp": "2024-01-02"}])
+        journal.roll()
+        os.remove(journal.index_path)
+
+        reopened = TradeJournal(str(tmp_path), "trades")
+        try:
+            assert reopened.segment_index()["20240102"]["rows"] == 1
+        finally:
+            reopened.close()
+
+
+class TestTradeLoggerJournal:
+    """TradeLogger 整合測試"""
+
+    def test_log_and_query_records(self, tmp_path):
+        """記錄交易、訂單與投資組合價值並依條件查詢"""
+        trade_logger = TradeLogger(log_dir=str(tmp_path))
+        try:
+            trade_logger.log_trade(
+                {
+                    "stock_id": "2330",
+                    "action": "buy",
+                    "quantity": 1000,
+                    "price": 600.0,
+                    "timestamp": datetime(2024, 1, 2, 9, 0),
+                }
+            )
+            trade_logger.log_trade(
+                {
+                    "stock_id": "2317",
+                    "action": "sell",
+                    "quantity": 2000,
+                    "price": 100.0,
+                    "timestamp": datetime(2024, 1, 3, 9, 0),
+                }
+            )
+            trade_logger.log_order(
+                {
+                    "order_id": "o1",
+                    "stock_id": "2330",
+                    "status": "filled",
+                    "timestamp": datetime(2024, 1, 2, 9, 0),
+                }
+            )
+            trade_logger.log_portfolio_value(
+                {"timestamp": datetime(2024, 1, 2), "total_value": 1_000_000}
+            )
+
+            trades = trade_logger.get_trades(start_time=datetime(2024, 1, 3))
+            assert list(trades["stock_id"]) == ["2317"]
+            assert len(trade_logger.get_orders(status="filled")) == 1
+            assert len(trade_logger.get_portfolio_values()) == 1
+            assert not os.path.exists(tmp_path / "trades.csv")
+        finally:
+            trade_logger.close()
+
+    def test_legacy_csv_is_imported_once(self, tmp_path):
+        """舊版 CSV 記錄只在首次啟動時匯入"""
+        pd.DataFrame(
+            [{"stock_id": "2330", "action": "buy", "timestamp": "2023-12-29 09:00:00"}]
+        ).to_csv(tmp_path / "trades.csv", index=False)
+
+        for _ in range(2):
+            trade_logger = TradeLogger(log_dir=str(tmp_path))
+            trade_logger.close()
+
+        trades = trade_logger.get_trades()
+        assert list(trades["stock_id"]) == [2330]
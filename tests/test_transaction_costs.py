@@ -0,0 +1,163 @@
+"""
+測試交易成本模型
+
+測試編譯後的成本表與各成本模型原本的逐筆公式完全一致，
+以及向量化 costs 與逐筆 getcommission 的結果相同。
+"""
+
+import numpy as np
+import pytest
+
+from src.backtest.transaction_costs import (
+    CombinedCostScheme,
+    CostTable,
+    FixedCommissionScheme,
+    PercentCommissionScheme,
+    TaxScheme,
+    TieredCommissionScheme,
+    TWStockCostScheme,
+    USStockCostScheme,
+    get_cost_scheme,
+)
+
+TIERS = {0: 0.002, 10000: 0.0015, 100000: 0.001, 1000000: 0.0005}
+
+
+@pytest.fixture
+def fills():
+    """含買賣方向、零數量與門檻邊界的成交"""
+    rng = np.random.default_rng(3)
+    sizes = rng.integers(-5000, 5000, 2000).astype(float)
+    prices = rng.uniform(1, 800, 2000).round(2)
+    # 成交金額剛好落在階梯門檻上
+    sizes[:4], prices[:4] = [100, -100, 1000, 0], [100.0, 1000.0, 1000.0, 50.0]
+    return sizes, prices
+
+
+def _percent(size, price, rate, min_commission):
+    commission = abs(size) * price * rate
+    if commission < min_commission:
+        commission = min_commission
+    return commission
+
+
+def _tiered(size, price, tiers, tier_type, min_commission):
+    value = abs(size) * price if tier_type == "amount" else abs(size)
+    rate = tiers.get(0, 0.0)
+    for threshold, tier_rate in sorted(tiers.items()):
+        if value >= threshold:
+            rate = tier_rate
+        else:
+            break
+    commission = value * rate
+    if commission < min_commission:
+        commission = min_commission
+    return commission
+
+
+def _tw(size, price, p):
+    commission = _percent(size, price, p.commission_rate, p.min_commission)
+    tax = 0.0
+    if size < 0:
+        tax = abs(size) * price * p.tax_rate
+    return commission + tax
+
+
+def _us(size, price, p):
+    commission = _percent(size, price, p.commission_rate, p.min_commission)
+    sec_fee = abs(size) * price * p.sec_fee_rate if size < 0 else 0.0
+    finra_fee = abs(size) * price * p.finra_fee if size < 0 else 0.0
+    return commission + sec_fee + finra_fee
+
+
+def _combined(size, price, p):
+    commission = _percent(size, price, p.commission_rate, p.min_commission)
+    if p.tax_on_sell_only and size > 0:
+        tax = 0.0
+    else:
+        tax = abs(size) * price * p.tax_rate
+    return commission + tax
+
+
+def _slippage(size, price, perc):
+    slippage = price * perc
+    return price + slippage if size > 0 else price - slippage
+
+
+SCHEMES = [
+    (FixedCommissionScheme, {}, lambda s, p, x: x.commission),
+    (
+        PercentCommissionScheme,
+        {"min_commission": 5.0},
+        lambda s, p, x: _percent(s, p, x.commission, x.min_commission),
+    ),
+    (
+        TieredCommissionScheme,
+        {"tiers": TIERS, "min_commission": 20.0},
+        lambda s, p, x: _tiered(s, p, x.tiers, "amount", x.min_commission),
+    ),
+    (
+        TieredCommissionScheme,
+        {"tiers": {100: 0.01, 1000: 0.005}, "tier_type": "size"},
+        lambda s, p, x: _tiered(s, p, x.tiers, "size", x.min_commission),
+    ),
+    (
+        TaxScheme,
+        {},
+        lambda s, p, x: 0.0 if s > 0 else abs(s) * p * x.tax_rate,
+    ),
+    (
+        TaxScheme,
+        {"tax_on_sell_only": False},
+        lambda s, p, x: abs(s) * p * x.tax_rate,
+    ),
+    (CombinedCostScheme, {"min_commission": 1.0}, _combined),
+    (CombinedCostScheme, {"tax_on_sell_only": False}, _combined),
+    (TWStockCostScheme, {}, _tw),
+    (USStockCostScheme, {"commission_rate": 0.0001, "min_commission": 1.0}, _us),
+]
+
+
+class TestCostTable:
+    """編譯成本表測試"""
+
+    @pytest.mark.parametrize(
+        "scheme_class, params, reference",
+        SCHEMES,
+        ids=[f"{cls.__name__}-{i}" for i, (cls, _, _) in enumerate(SCHEMES)],
+    )
+    def test_matches_per_fill_formula(self, fills, scheme_class, params, reference):
+        """逐筆與向量化結果皆與原本的逐筆公式完全相同"""
+        scheme = scheme_class(**params)
+        sizes, prices = fills
+        expected = [reference(s, p, scheme.p) for s, p in zip(sizes, prices)]
+
+        per_fill = [scheme.getcommission(s, p) for s, p in zip(sizes, prices)]
+        np.testing.assert_array_equal(per_fill, expected)
+        np.testing.assert_array_equal(scheme.costs(sizes, prices), expected)
+
+    @pytest.mark.parametrize("market", ["TW", "US", "other"])
+    def test_slippage(self, fills, market):
+        """滑價後的價格與原本的逐筆公式相同"""
+        scheme = get_cost_scheme(market, slippage_perc=0.002)
+        sizes, prices = fills
+        expected = [_slippage(s, p, 0.002) for s, p in zip(sizes, prices)]
+
+        per_fill = [scheme.get_slippage(s, p) for s, p in zip(sizes, prices)]
+        np.testing.assert_array_equal(per_fill, expected)
+        np.testing.assert_array_equal(scheme.slipped_prices(sizes, prices), expected)
+
+    def test_tier_boundaries(self):
+        """門檻本身適用該級費率，低於最小門檻時使用閾值 0 的費率"""
+        table = CostTable(tiers={1000: 0.01, 5000: 0.005}, default_rate=0.02)
+
+        costs = table.costs([1, 10, 50, 100], 100.0)
+        np.testing.assert_array_equal(costs, [2.0, 10.0, 25.0, 50.0])
+
+    def test_broadcast_price(self):
+        """單一價格可與多筆數量廣播"""
+        scheme = TWStockCostScheme()
+        costs = scheme.costs(np.array([1000, -1000]), 50.0)
+
+        assert costs[0] == pytest.approx(71.25)
+        assert costs[1] == pytest.approx(71.25 + 150.0)